@@ -9,6 +9,7 @@ from enum import Enum
 from pathlib import Path
 from typing import IO, Any, Dict, List, Optional, Tuple, Type, cast
 
+from samcli.cli.global_config import GlobalConfig
 from samcli.commands._utils.template import TemplateFailedParsingException, TemplateNotFoundException
 from samcli.commands.exceptions import ContainersInitializationException
 from samcli.commands.local.cli_common.user_exceptions import DebugContextException, InvokeContextException
@@ -18,16 +19,26 @@ from samcli.lib.providers.provider import Function, Stack
 from samcli.lib.providers.sam_function_provider import RefreshableSamFunctionProvider, SamFunctionProvider
 from samcli.lib.providers.sam_stack_provider import SamLocalStackProvider
 from samcli.lib.utils import osutils
-from samcli.lib.utils.async_utils import AsyncContext
+from samcli.lib.utils.invoke_timing import get_recorder as get_invoke_timing_recorder
 from samcli.lib.utils.packagetype import ZIP
 from samcli.lib.utils.stream_writer import StreamWriter
+from samcli.local.docker.image_digest_cache import RemoteImageDigestCache
 from samcli.local.docker.lambda_image import LambdaImage
 from samcli.local.docker.manager import ContainerManager
+from samcli.local.lambdafn.config import FunctionConfig
+from samcli.local.lambdafn.containers_initializer import ContainersInitializer
 from samcli.local.lambdafn.runtime import LambdaRuntime, WarmLambdaRuntime
+from samcli.local.lambdafn.invocation_recorder import get_invocation_recorder
 from samcli.local.layers.layer_downloader import LayerDownloader
 
 LOG = logging.getLogger(__name__)
 
+# Prepare the images of all the functions when the local services start, before they accept any request
+PREFETCH_IMAGES = os.environ.get("SAM_CLI_PREFETCH_IMAGES", "1").lower() in ("1", "true")
+
+# File of the SAM CLI config directory the digests of the remote base images are cached in
+REMOTE_IMAGE_DIGESTS_CACHE_FILE_NAME = "remote-image-digests.json"
+
 
 class DockerIsNotReachableException(InvokeContextException):
     """
@@ -286,6 +297,7 @@ class InvokeContext:
         """
         Cleanup any necessary opened resources
         """
+        get_invoke_timing_recorder().log_summary()
 
         if self._log_file_handle:
             self._log_file_handle.close()
@@ -293,25 +305,20 @@ class InvokeContext:
 
         if self._containers_mode == ContainersMode.WARM:
             self._clean_running_containers_and_related_resources()
+        elif self._is_debugging and self._lambda_runtimes:
+            self.lambda_runtime.stop_debugging_containers()
 
     def _initialize_all_functions_containers(self) -> None:
         """
-        Create and run a container for each available lambda function
+        Create and run a container for each available lambda function, preparing the distinct images of the functions
+        first, then starting the containers with a bounded concurrency
         """
         LOG.info("Initializing the lambda functions containers.")
 
-        def initialize_function_container(function: Function) -> None:
-            function_config = self.local_lambda_runner.get_invoke_config(function)
-            self.lambda_runtime.run(
-                None, function_config, self._debug_context, self._container_host, self._container_host_interface
-            )
-
         try:
-            async_context = AsyncContext()
-            for function in self._function_provider.get_all():
-                async_context.add_async_task(initialize_function_container, function)
-
-            async_context.run_async(default_executor=False)
+            ContainersInitializer(self.lambda_runtime, self._start_function_container).initialize(
+                self._get_all_function_configs()
+            )
             LOG.info("Containers Initialization is done.")
         except KeyboardInterrupt:
             LOG.debug("Ctrl+C was pressed. Aborting containers initialization")
@@ -322,6 +329,35 @@ class InvokeContext:
             self._clean_running_containers_and_related_resources()
             raise ContainersInitializationException("Lambda functions containers initialization failed") from ex
 
+    def prefetch_images(self) -> None:
+        """
+        Prepare the distinct images of all the functions in parallel, pulling their base images, so the first requests
+        served by the local services do not wait for them. The images are already prepared if the containers are
+        initialized eagerly, and this can be disabled by setting the SAM_CLI_PREFETCH_IMAGES env var to 0.
+        """
+        if not PREFETCH_IMAGES or self._containers_initializing_mode == ContainersInitializationMode.EAGER:
+            return
+
+        LOG.info("Prefetching the lambda functions images.")
+        try:
+            ContainersInitializer(self.lambda_runtime, self._start_function_container).prepare_images(
+                self._get_all_function_configs()
+            )
+        except KeyboardInterrupt:
+            LOG.debug("Ctrl+C was pressed. Aborting images prefetch")
+            raise
+        except Exception as ex:  # pylint: disable=broad-except
+            # the images are prepared again on the first invocation of their functions, reporting the error if any
+            LOG.warning("Lambda functions images prefetch failed because of %s", ex)
+
+    def _get_all_function_configs(self) -> List[FunctionConfig]:
+        return [self.local_lambda_runner.get_invoke_config(function) for function in self._function_provider.get_all()]
+
+    def _start_function_container(self, function_config: FunctionConfig) -> None:
+        self.lambda_runtime.run(
+            None, function_config, self._debug_context, self._container_host, self._container_host_interface
+        )
+
     def _clean_running_containers_and_related_resources(self) -> None:
         """
         Clean the running containers and any other related open resources,
@@ -363,7 +399,13 @@ class InvokeContext:
         if not self._lambda_runtimes:
             layer_downloader = LayerDownloader(self._layer_cache_basedir, self.get_cwd(), self._stacks)
             image_builder = LambdaImage(
-                layer_downloader, self._skip_pull_image, self._force_image_build, invoke_images=self._invoke_images
+                layer_downloader,
+                self._skip_pull_image,
+                self._force_image_build,
+                invoke_images=self._invoke_images,
+                remote_image_digest_cache=RemoteImageDigestCache(
+                    str(GlobalConfig().config_dir.joinpath(REMOTE_IMAGE_DIGESTS_CACHE_FILE_NAME))
+                ),
             )
             self._lambda_runtimes = {
                 ContainersMode.WARM: WarmLambdaRuntime(self._container_manager, image_builder),
@@ -393,6 +435,7 @@ class InvokeContext:
             debug_context=self._debug_context,
             container_host=self._container_host,
             container_host_interface=self._container_host_interface,
+            invocation_recorder=get_invocation_recorder(self.get_cwd()),
         )
         return self._local_lambda_runner
 
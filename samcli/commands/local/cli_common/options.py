@@ -231,9 +231,10 @@ def warm_containers_common_options(f):
         ),
         click.option(
             "--debug-function",
-            help="Optional. Specifies the Lambda Function logicalId to apply debug options to when"
-            " --warm-containers is specified.  This parameter applies to --debug-port, --debugger-path,"
-            " and --debug-args.",
+            help="Optional. Specifies the Lambda Function logicalId to apply debug options to. The invocations of"
+            " this function run one at a time while the other functions keep running concurrently. It must be set"
+            " when --warm-containers is specified for several functions.  This parameter applies to --debug-port,"
+            " --debugger-path, and --debug-args.",
             type=click.STRING,
             multiple=False,
         ),
@@ -2,9 +2,11 @@
 Implementation of Local Lambda runner
 """
 
+import io
 import logging
 import os
-from typing import Any, Dict, Optional, cast
+import threading
+from typing import Any, Dict, Optional, Tuple, cast
 
 import boto3
 from botocore.credentials import Credentials
@@ -18,14 +20,17 @@ from samcli.commands.local.lib.exceptions import (
 )
 from samcli.lib.providers.provider import Function
 from samcli.lib.providers.sam_function_provider import SamFunctionProvider
+from samcli.lib.utils import invoke_timing
 from samcli.lib.utils.architecture import validate_architecture_runtime
 from samcli.lib.utils.codeuri import resolve_code_path
 from samcli.lib.utils.packagetype import IMAGE, ZIP
 from samcli.lib.utils.stream_writer import StreamWriter
 from samcli.local.docker.container import ContainerConnectionTimeoutException, ContainerResponseException
+from samcli.local.lambdafn.concurrency import ConcurrencyLimiter
 from samcli.local.lambdafn.config import FunctionConfig
 from samcli.local.lambdafn.env_vars import EnvironmentVariables
 from samcli.local.lambdafn.exceptions import FunctionNotFound
+from samcli.local.lambdafn.invocation_recorder import InvocationRecorder
 from samcli.local.lambdafn.runtime import LambdaRuntime
 
 LOG = logging.getLogger(__name__)
@@ -51,6 +56,7 @@ class LocalLambdaRunner:
         debug_context: Optional[DebugContext] = None,
         container_host: Optional[str] = None,
         container_host_interface: Optional[str] = None,
+        invocation_recorder: Optional[InvocationRecorder] = None,
     ) -> None:
         """
         Initializes the class
@@ -65,6 +71,8 @@ class LocalLambdaRunner:
         :param DebugContext debug_context: Optional. Debug context for the function (includes port, args, and path).
         :param string container_host: Optional. Host of locally emulated Lambda container
         :param string container_host_interface: Optional. Interface that Docker host binds ports to
+        :param InvocationRecorder invocation_recorder: Optional. Recorder the responses of the functions are recorded
+            into and replayed from
         """
 
         self.local_runtime = local_runtime
@@ -78,6 +86,15 @@ class LocalLambdaRunner:
         self._boto3_region: Optional[str] = None
         self.container_host = container_host
         self.container_host_interface = container_host_interface
+        self.invocation_recorder = invocation_recorder
+        # shared by all the invocations of the runner, so the services invoking it are throttled together
+        self.concurrency_limiter = ConcurrencyLimiter()
+        # invoke configurations by function full path, with the function and the AWS credentials they were made from
+        self._invoke_configs: Dict[str, Tuple[Function, Dict[str, str], FunctionConfig]] = {}
+        self._invoke_configs_lock = threading.Lock()
+        # serializes the invocations of the debugged functions, which share the debugger ports, while the invocations
+        # of the other functions keep running concurrently
+        self._debug_lock = threading.Lock()
 
     def invoke(
         self,
@@ -135,21 +152,47 @@ class LocalLambdaRunner:
                 )
             LOG.info("Invoking Container created from %s", function.imageuri)
 
-        validate_architecture_runtime(function)
-
-        config = self.get_invoke_config(function)
+        config = self._get_cached_invoke_config(function)
+        is_debugging_function = self.is_debugging_function(function)
+
+        # The invocations are neither recorded nor replayed while debugging, the function must run
+        recorder = None if is_debugging_function else self.invocation_recorder
+        if recorder and recorder.is_replaying:
+            with invoke_timing.phase("replay"):
+                recorded_response = recorder.get(config, event)
+            if recorded_response is not None:
+                LOG.info("Replaying the recorded response of %s", function.name)
+                if stdout:
+                    stdout.write(recorded_response)
+                    stdout.flush()
+                return
+
+        invoke_stdout = stdout
+        if recorder:
+            # the response is written to the given stream once it is complete and recorded
+            response_stream = io.BytesIO()
+            invoke_stdout = StreamWriter(response_stream, auto_flush=True)
+
+        # The debugged invocations are not throttled, the debugger may keep them running for a long time. They run one
+        # at a time instead, as a debugger attaches to a single container
+        execution = (
+            self._debug_lock
+            if is_debugging_function
+            else self.concurrency_limiter.execution(function.full_path, self._get_reserved_concurrency(function))
+        )
 
         # Invoke the function
         try:
-            self.local_runtime.invoke(
-                config,
-                event,
-                debug_context=self.debug_context,
-                stdout=stdout,
-                stderr=stderr,
-                container_host=self.container_host,
-                container_host_interface=self.container_host_interface,
-            )
+            with execution:
+                self.local_runtime.invoke(
+                    config,
+                    event,
+                    debug_context=self.debug_context if is_debugging_function else None,
+                    stdout=invoke_stdout,
+                    stderr=stderr,
+                    container_host=self.container_host,
+                    container_host_interface=self.container_host_interface,
+                )
         except ContainerResponseException:
             # NOTE(sriram-mv): This should still result in a exit code zero to avoid regressions.
             LOG.info("No response from invoke container for %s", function.name)
@@ -169,6 +212,44 @@ class LocalLambdaRunner:
 
             raise
 
+        if recorder:
+            response = response_stream.getvalue()
+            if response:
+                recorder.record(config, event, response)
+            if stdout:
+                stdout.write(response)
+                stdout.flush()
+
+    @staticmethod
+    def _get_reserved_concurrency(function: Function) -> Optional[int]:
+        """
+        Returns the ReservedConcurrentExecutions of a function, 0 throttling all its invocations, or None if it is not
+        set or not a valid number
+        """
+        if function.reserved_concurrent_executions is None:
+            return None
+        try:
+            reserved_concurrency = int(function.reserved_concurrent_executions)
+        except (TypeError, ValueError):
+            reserved_concurrency = -1
+        if reserved_concurrency < 0:
+            LOG.debug(
+                "Ignoring invalid ReservedConcurrentExecutions value %s of Lambda function '%s'",
+                function.reserved_concurrent_executions,
+                function.full_path,
+            )
+            return None
+        return reserved_concurrency
+
+    def _update_reserved_concurrencies(self) -> None:
+        """
+        Passes the reserved concurrency of all the functions of the template to the concurrency limiter, so the
+        concurrency reserved by the functions not invoked yet is not used by the unreserved ones
+        """
+        self.concurrency_limiter.set_reserved_concurrencies(
+            {function.full_path: self._get_reserved_concurrency(function) for function in self.provider.get_all()}
+        )
+
     def is_debugging(self) -> bool:
         """
         Are we debugging the invoke?
@@ -181,6 +262,57 @@ class LocalLambdaRunner:
         """
         return bool(self.debug_context)
 
+    def is_debugging_function(self, function: Function) -> bool:
+        """
+        Is the given function debugged? All the functions are debugged when no debug function is set, otherwise only
+        the debug function is
+
+        Parameters
+        ----------
+        function samcli.lib.providers.provider.Function
+            Lambda function to check
+
+        Returns
+        -------
+        bool
+            True, if the invocations of the function break into the debugger
+        """
+        if not self.debug_context:
+            return False
+        debug_function = self.debug_context.debug_function
+        return not debug_function or debug_function in (function.name, function.function_id, function.full_path)
+
+    def _get_cached_invoke_config(self, function: Function) -> FunctionConfig:
+        """
+        Returns the invoke configuration of a function, which is only validated and made again when the function is
+        reloaded from a changed template, or when the AWS credentials passed to the function changed, as they do once
+        the credentials of the session expired and were refreshed
+
+        Parameters
+        ----------
+        function samcli.lib.providers.provider.Function
+            Lambda function to get the configuration of
+
+        Returns
+        -------
+        samcli.local.lambdafn.config.FunctionConfig
+            Function configuration to pass to Lambda runtime
+        """
+        aws_creds = self.get_aws_creds()
+        with self._invoke_configs_lock:
+            cached = self._invoke_configs.get(function.full_path)
+        # the provider loads new functions when it is refreshed, so a reloaded function is never the cached one
+        if cached and cached[0] is function and cached[1] == aws_creds:
+            return cached[2]
+
+        validate_architecture_runtime(function)
+        # first invoke of the function, or the template was reloaded, and the reserved concurrencies may have changed
+        self._update_reserved_concurrencies()
+        config = self.get_invoke_config(function)
+        with self._invoke_configs_lock:
+            self._invoke_configs[function.full_path] = (function, aws_creds, config)
+        return config
+
     def get_invoke_config(self, function: Function) -> FunctionConfig:
         """
         Returns invoke configuration to pass to Lambda Runtime to invoke the given function
@@ -200,7 +332,7 @@ class LocalLambdaRunner:
         # The Runtime container handles timeout inside the container. When debugging with short timeouts, this can
         # cause the container execution to stop. When in debug mode, we set the timeout in the container to a max 10
         # hours. This will ensure the container doesn't unexpectedly stop while debugging function code
-        if self.is_debugging():
+        if self.is_debugging_function(function):
             function_timeout = self.MAX_DEBUG_TIMEOUT
 
         return FunctionConfig(
@@ -218,6 +350,7 @@ class LocalLambdaRunner:
             timeout=function_timeout,
             env_vars=env_vars,
             runtime_management_config=function.runtime_management_config,
+            reserved_concurrent_executions=function.reserved_concurrent_executions,
         )
 
     def _make_env_vars(self, function: Function) -> EnvironmentVariables:
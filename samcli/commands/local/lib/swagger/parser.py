@@ -94,6 +94,7 @@ class SwaggerParser:
                     payload_format_version=payload_format_version,
                     operation_name=method_config.get("operationId"),
                     stack_path=self.stack_path,
+                    cache_key_parameters=self._get_cache_key_parameters(method_config),
                 )
                 result.append(route)
         return result
@@ -172,3 +173,23 @@ class SwaggerParser:
             return None
 
         return integration.get("payloadFormatVersion")
+
+    def _get_cache_key_parameters(self, method_config):
+        """
+        Get the "cacheKeyParameters" from the Integration defined in the method configuration.
+
+        Parameters
+        ----------
+        method_config : dict
+            Dictionary containing the method configuration which might contain integration settings
+
+        Returns
+        -------
+        list of str or None
+            Cache key parameters, if exists. None, if not.
+        """
+        integration = self._get_integration(method_config)
+        if integration is None:
+            return None
+
+        return integration.get("cacheKeyParameters")
@@ -7,6 +7,7 @@ import click
 
 from .generate_event.cli import cli as generate_event_cli
 from .invoke.cli import cli as invoke_cli
+from .prune_images.cli import cli as prune_images_cli
 from .start_api.cli import cli as start_api_cli
 from .start_lambda.cli import cli as start_lambda_cli
 
@@ -23,3 +24,4 @@ cli.add_command(invoke_cli)
 cli.add_command(start_api_cli)
 cli.add_command(generate_event_cli)
 cli.add_command(start_lambda_cli)
+cli.add_command(prune_images_cli)
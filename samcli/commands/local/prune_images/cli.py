@@ -0,0 +1,71 @@
+"""
+CLI command for "local prune-images" command
+"""
+
+import logging
+
+import click
+
+from samcli.cli.main import common_options as cli_framework_options
+from samcli.cli.main import pass_context, print_cmdline_args
+from samcli.lib.telemetry.metric import track_command
+
+LOG = logging.getLogger(__name__)
+
+HELP_TEXT = """
+You can use this command to free the disk space taken by the images SAM CLI builds to add layers to your functions.
+These images are shared by all the functions and projects using the same layers, and are kept to speed up
+the next invokes. The least recently created images are removed until the remaining ones fit in the given size.\n
+\b
+Remove all the images with layers which are not used by a container
+$ sam local prune-images\n
+\b
+Keep at most 2 GB of images with layers
+$ sam local prune-images --max-size 2048
+"""
+
+
+@click.command(
+    "prune-images",
+    help=HELP_TEXT,
+    short_help="Removes the images built to add layers to your functions.",
+)
+@click.option(
+    "--max-size",
+    type=click.IntRange(min=0),
+    default=0,
+    show_default=True,
+    help="Disk space in MB the images with layers can keep using.",
+)
+@cli_framework_options
+@pass_context
+@track_command
+@print_cmdline_args
+def cli(ctx, max_size):
+    """
+    `sam local prune-images` command entry point
+    """
+    # All logic must be implemented in the ``do_cli`` method. This helps with easy unit testing
+
+    do_cli(max_size)  # pragma: no cover
+
+
+def do_cli(max_size):
+    """
+    Implementation of the ``cli`` method, just separated out for unit testing purposes
+    """
+    from samcli.commands.exceptions import UserException
+    from samcli.local.docker import utils
+    from samcli.local.docker.layer_image_cache import LayerImageCache
+
+    LOG.debug("local prune-images command is called")
+
+    layer_image_cache = LayerImageCache()
+    if not utils.is_docker_reachable(layer_image_cache.docker_client):
+        raise UserException("Running AWS SAM projects locally requires Docker. Have you got it installed and running?")
+
+    removed_tags, freed_size = layer_image_cache.prune(max_size)
+
+    for tag in removed_tags:
+        click.echo(f"Removed {tag}")
+    click.echo(f"Freed {freed_size / (1024 * 1024):.1f} MB")
@@ -221,6 +221,8 @@ def do_cli(  # pylint: disable=R0914
             container_host_interface=container_host_interface,
             invoke_images=processed_invoke_images,
         ) as invoke_context:
+            invoke_context.prefetch_images()
+
             service = LocalLambdaService(lambda_invoke_context=invoke_context, port=port, host=host)
             service.start()
             command_suggestions = generate_next_command_recommendation(
@@ -23,6 +23,9 @@ class ApiCollector:
         self.binary_media_types_set: Set[str] = set()
         self.stage_name: Optional[str] = None
         self.stage_variables: Optional[Dict] = None
+        self.cache_cluster_enabled: Union[bool, str] = False
+        self.method_settings: Optional[List[Dict]] = None
+        self.minimum_compression_size: Optional[Union[int, str]] = None
         self.cors: Optional[Cors] = None
 
     def __iter__(self) -> Iterator[Tuple[str, List[Route]]]:
@@ -108,6 +111,9 @@ class ApiCollector:
         api.binary_media_types_set = self.binary_media_types_set
         api.stage_name = self.stage_name
         api.stage_variables = self.stage_variables
+        api.cache_cluster_enabled = self.cache_cluster_enabled
+        api.method_settings = self.method_settings
+        api.minimum_compression_size = self.minimum_compression_size
         api.cors = self.cors
         return api
 
@@ -165,6 +171,7 @@ class ApiCollector:
                 payload_format_version=route.payload_format_version,
                 operation_name=route.operation_name,
                 stack_path=route.stack_path,
+                cache_key_parameters=route.cache_key_parameters or (config.cache_key_parameters if config else None),
             )
         return list(grouped_routes.values())
 
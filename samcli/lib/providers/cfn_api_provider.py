@@ -104,6 +104,9 @@ class CfnApiProvider(CfnBaseApiProvider):
         body = properties.get("Body")
         body_s3_location = properties.get("BodyS3Location")
         binary_media = properties.get("BinaryMediaTypes", [])
+        minimum_compression_size = properties.get("MinimumCompressionSize")
+        if minimum_compression_size is not None:
+            collector.minimum_compression_size = minimum_compression_size
 
         if not body and not body_s3_location:
             # Swagger is not found anywhere.
@@ -133,6 +136,8 @@ class CfnApiProvider(CfnBaseApiProvider):
         properties = stage_resource.get("Properties", {})
         stage_name = properties.get("StageName")
         stage_variables = properties.get("Variables")
+        cache_cluster_enabled = properties.get("CacheClusterEnabled", False)
+        method_settings = properties.get("MethodSettings")
 
         logical_id = properties.get("RestApiId")
         if not logical_id:
@@ -147,6 +152,8 @@ class CfnApiProvider(CfnBaseApiProvider):
 
         collector.stage_name = stage_name
         collector.stage_variables = stage_variables
+        collector.cache_cluster_enabled = cache_cluster_enabled
+        collector.method_settings = method_settings
 
     def _extract_cloud_formation_method(
         self,
@@ -219,6 +226,7 @@ class CfnApiProvider(CfnBaseApiProvider):
             path=resource_path,
             operation_name=operation_name,
             stack_path=stack_path,
+            cache_key_parameters=integration.get("CacheKeyParameters"),
         )
         collector.add_routes(rest_api_id, [routes])
 
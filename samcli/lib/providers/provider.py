@@ -86,6 +86,8 @@ class Function(NamedTuple):
     stack_path: str = ""
     # Configuration for runtime management. Includes the fields `UpdateRuntimeOn` and `RuntimeVersionArn` (optional).
     runtime_management_config: Optional[Dict] = None
+    # Maximum number of concurrent executions reserved for this function (`ReservedConcurrentExecutions`)
+    reserved_concurrent_executions: Optional[int] = None
 
     @property
     def full_path(self) -> str:
@@ -429,6 +431,13 @@ class Api:
         self.stage_name: Optional[str] = None
         self.stage_variables: Optional[Dict] = None
 
+        # Stage cache settings: the CacheClusterEnabled and MethodSettings properties of the stage
+        self.cache_cluster_enabled: Union[bool, str] = False
+        self.method_settings: Optional[List[Dict]] = None
+
+        # Smallest size of the response bodies compressed by a REST API, their compression is disabled if None
+        self.minimum_compression_size: Optional[Union[int, str]] = None
+
     def __hash__(self) -> int:
         # Other properties are not a part of the hash
         return hash(self.routes) * hash(self.cors) * hash(self.binary_media_types_set)
@@ -87,6 +87,9 @@ class SamApiProvider(CfnBaseApiProvider):
         cors = self.extract_cors(properties.get("Cors", {}))
         stage_name = properties.get("StageName")
         stage_variables = properties.get("Variables")
+        cache_cluster_enabled = properties.get("CacheClusterEnabled", False)
+        method_settings = properties.get("MethodSettings")
+        minimum_compression_size = properties.get("MinimumCompressionSize")
         if not body and not uri:
             # Swagger is not found anywhere.
             LOG.debug(
@@ -96,6 +99,9 @@ class SamApiProvider(CfnBaseApiProvider):
         CfnBaseApiProvider.extract_swagger_route(stack_path, logical_id, body, uri, binary_media, collector, cwd=cwd)
         collector.stage_name = stage_name
         collector.stage_variables = stage_variables
+        collector.cache_cluster_enabled = cache_cluster_enabled
+        collector.method_settings = method_settings
+        collector.minimum_compression_size = minimum_compression_size
         collector.cors = cors
 
     def _extract_from_serverless_http(
@@ -304,6 +310,8 @@ class SamApiProvider(CfnBaseApiProvider):
                 route = all_routes.get(key)
                 if route and route.payload_format_version and config.payload_format_version is None:
                     config.payload_format_version = route.payload_format_version
+                if route and route.cache_key_parameters and config.cache_key_parameters is None:
+                    config.cache_key_parameters = route.cache_key_parameters
                 all_routes[key] = config
 
         result = set(all_routes.values())  # Assign to a set() to de-dupe
@@ -68,6 +68,9 @@ class SamFunctionProvider(SamBaseProvider):
         self.functions = SamFunctionProvider._extract_functions(
             self._stacks, use_raw_codeuri, ignore_code_extraction_warnings, locate_layer_nested
         )
+        # functions by function id, logical id and function name, made from the functions they were indexed from
+        self._functions_index: Dict[str, List[Function]] = {}
+        self._indexed_functions: Optional[Dict[str, Function]] = None
 
         self._colored = Colored()
 
@@ -124,18 +127,11 @@ class SamFunctionProvider(SamBaseProvider):
             resolved_function = self.functions.get(name)
 
         if not resolved_function:
-            # If function is not found by full path, search through all functions
-
-            found_fs = []
-
-            for f in self.get_all():
-                if name in (f.function_id, f.name, f.functionname):
-                    found_fs.append(f)
+            # If function is not found by full path, search it by its ids, sorted by full path
+            found_fs = self._get_functions_index().get(name, [])
 
             # If multiple functions are found, only return one of them
             if len(found_fs) > 1:
-                found_fs.sort(key=lambda f0: f0.full_path.lower())
-
                 message = (
                     f"Multiple functions found with keyword {name}! Function {found_fs[0].full_path} will be "
                     f"invoked! If it's not the function you are going to invoke, please choose one of them from"
@@ -156,6 +152,21 @@ class SamFunctionProvider(SamBaseProvider):
 
         return resolved_function
 
+    def _get_functions_index(self) -> Dict[str, List[Function]]:
+        """
+        Returns the functions by function id, logical id and function name, sorted by full path. The index is made
+        once for the loaded functions, and made again once the functions are loaded again from the templates.
+        """
+        functions = self.functions
+        if self._indexed_functions is not functions:
+            functions_index: Dict[str, List[Function]] = {}
+            for function in sorted(functions.values(), key=lambda f: f.full_path.lower()):
+                for key in {function.function_id, function.name, function.functionname}:
+                    functions_index.setdefault(key, []).append(function)
+            self._functions_index = functions_index
+            self._indexed_functions = functions
+        return self._functions_index
+
     def _deprecate_notification(self, runtime: Optional[str]) -> None:
         if runtime in DEPRECATED_RUNTIMES:
             message = (
@@ -467,6 +478,7 @@ class SamFunctionProvider(SamBaseProvider):
             architectures=resource_properties.get("Architectures", None),
             function_url_config=resource_properties.get("FunctionUrlConfig"),
             runtime_management_config=resource_properties.get("RuntimeManagementConfig"),
+            reserved_concurrent_executions=resource_properties.get("ReservedConcurrentExecutions"),
         )
 
     @staticmethod
@@ -0,0 +1,72 @@
+"""
+Settings read from the SAM_CLI_* environment variables
+"""
+import logging
+import os
+from typing import Callable, Optional, TypeVar, Union
+
+LOG = logging.getLogger(__name__)
+
+T = TypeVar("T", int, float)
+
+
+def get_int_setting(name: str, default: int, minimum: Optional[int] = None, maximum: Optional[int] = None) -> int:
+    """
+    Returns the integer value of an environment variable, or the default if the variable is not set or not valid
+
+    Parameters
+    ----------
+    name str
+        Name of the environment variable
+    default int
+        Value of the setting when the variable is not set or not valid
+    minimum int
+        Optional. Smallest valid value of the setting
+    maximum int
+        Optional. Largest valid value of the setting
+    """
+    return _get_setting(name, default, int, minimum, maximum)
+
+
+def get_float_setting(
+    name: str, default: float, minimum: Optional[float] = None, maximum: Optional[float] = None
+) -> float:
+    """
+    Returns the number value of an environment variable, or the default if the variable is not set or not valid
+
+    Parameters
+    ----------
+    name str
+        Name of the environment variable
+    default float
+        Value of the setting when the variable is not set or not valid
+    minimum float
+        Optional. Smallest valid value of the setting
+    maximum float
+        Optional. Largest valid value of the setting
+    """
+    return _get_setting(name, default, float, minimum, maximum)
+
+
+def _get_setting(
+    name: str,
+    default: T,
+    parse: Callable[[str], T],
+    minimum: Optional[Union[int, float]],
+    maximum: Optional[Union[int, float]],
+) -> T:
+    value = os.environ.get(name)
+    if value is None or not value.strip():
+        return default
+    try:
+        setting = parse(value)
+    except ValueError:
+        LOG.warning("Ignoring invalid %s value '%s', using the default value %s", name, value, default)
+        return default
+    if minimum is not None and setting < minimum:
+        LOG.warning("Ignoring %s value %s lower than %s, using the default value %s", name, setting, minimum, default)
+        return default
+    if maximum is not None and setting > maximum:
+        LOG.warning("Ignoring %s value %s greater than %s, using the default value %s", name, setting, maximum, default)
+        return default
+    return setting
@@ -0,0 +1,228 @@
+"""
+Latency breakdown of local invokes. Each phase of an invoke (building the image, creating and starting the container,
+waiting for the runtime to listen, running the function, parsing its response...) records its monotonic start and end
+times into the timing of the invoke which is in progress on the current thread, along with counters such as the
+bytes saved by compressing the response.
+
+Set SAM_CLI_INVOKE_TIMING_FILE to append the timing of each invoke to a file as a JSON line, and
+SAM_CLI_INVOKE_SERVER_TIMING to add a Server-Timing header to the responses of the local API.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+LOG = logging.getLogger(__name__)
+
+INVOKE_TIMING_FILE = os.environ.get("SAM_CLI_INVOKE_TIMING_FILE")
+INVOKE_SERVER_TIMING = os.environ.get("SAM_CLI_INVOKE_SERVER_TIMING", "").lower() in ("1", "true")
+
+
+class InvokeTiming:
+    """
+    Monotonic timestamps of the phases of a single invoke
+    """
+
+    def __init__(self, function_name: str):
+        """
+        Parameters
+        ----------
+        function_name str
+            Name of the invoked function
+        """
+        self.function_name = function_name
+        self.started_at = time.monotonic()
+        self.ended_at: Optional[float] = None
+        # (phase name, start, end) in the order the phases ended
+        self.phases: List[Tuple[str, float, float]] = []
+        # quantities measured during the invoke, such as the bytes saved by compressing the response
+        self.counters: Dict[str, int] = {}
+
+    def record(self, name: str, start: float, end: float) -> None:
+        self.phases.append((name, start, end))
+
+    def add(self, name: str, value: int) -> None:
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    @property
+    def duration_ms(self) -> float:
+        return ((self.ended_at or time.monotonic()) - self.started_at) * 1000
+
+    def phase_durations_ms(self) -> Dict[str, float]:
+        """
+        Returns the duration of each phase in milliseconds, phases which happened several times are summed up
+        """
+        durations: Dict[str, float] = {}
+        for name, start, end in self.phases:
+            durations[name] = durations.get(name, 0) + (end - start) * 1000
+        return durations
+
+    def to_dict(self) -> Dict:
+        return {
+            "function": self.function_name,
+            "timestamp": time.time() - (time.monotonic() - self.started_at),
+            "duration_ms": round(self.duration_ms, 3),
+            "phases": [
+                {
+                    "name": name,
+                    "start_ms": round((start - self.started_at) * 1000, 3),
+                    "duration_ms": round((end - start) * 1000, 3),
+                }
+                for name, start, end in self.phases
+            ],
+            "counters": dict(self.counters),
+        }
+
+    def server_timing_header(self) -> str:
+        """
+        Returns the phases and the total duration as a Server-Timing header value
+        """
+        metrics = [f"{name};dur={duration:.3f}" for name, duration in self.phase_durations_ms().items()]
+        metrics.append(f"total;dur={self.duration_ms:.3f}")
+        return ", ".join(metrics)
+
+
+class InvokeTimingRecorder:
+    """
+    Collects the timing of the finished invokes, writes them to the timing file and aggregates them per phase for the
+    summary. This class is thread-safe.
+    """
+
+    def __init__(self, timing_file: Optional[str] = None):
+        """
+        Parameters
+        ----------
+        timing_file str
+            Optional. Path of the file the invokes timing is appended to as JSON lines
+        """
+        self.timing_file = timing_file
+        self._lock = threading.Lock()
+        self._invokes_count = 0
+        # phase name -> [count, total ms, max ms]
+        self._phases: Dict[str, List[float]] = {}
+        # counter name -> [count, total, max]
+        self._counters: Dict[str, List[int]] = {}
+
+    def record(self, timing: InvokeTiming) -> None:
+        with self._lock:
+            self._invokes_count += 1
+            for name, duration in list(timing.phase_durations_ms().items()) + [("total", timing.duration_ms)]:
+                stats = self._phases.setdefault(name, [0, 0.0, 0.0])
+                stats[0] += 1
+                stats[1] += duration
+                stats[2] = max(stats[2], duration)
+            for name, value in timing.counters.items():
+                counter = self._counters.setdefault(name, [0, 0, 0])
+                counter[0] += 1
+                counter[1] += value
+                counter[2] = max(counter[2], value)
+
+            if self.timing_file:
+                try:
+                    with open(self.timing_file, "a", encoding="utf-8") as timing_file:
+                        timing_file.write(json.dumps(timing.to_dict()) + "\n")
+                except OSError as ex:
+                    LOG.debug("Failed to write the invoke timing to %s", self.timing_file, exc_info=ex)
+
+    def summary(self) -> Optional[str]:
+        """
+        Returns the count, average and maximum duration of each phase over all the recorded invokes, or None if
+        nothing was recorded
+        """
+        with self._lock:
+            if not self._invokes_count:
+                return None
+
+            lines = [f"Latency breakdown of {self._invokes_count} invoke(s):"]
+            for name, (count, total, maximum) in self._phases.items():
+                lines.append(f"  {name}: count={count} avg={total / count:.1f}ms max={maximum:.1f}ms")
+            for name, (count, total_value, max_value) in self._counters.items():
+                lines.append(
+                    f"  {name}: count={count} total={total_value} avg={total_value / count:.0f} max={max_value}"
+                )
+            return "\n".join(lines)
+
+    def log_summary(self) -> None:
+        summary = self.summary()
+        if summary:
+            # only show the summary by default if the user asked for timing data
+            LOG.log(logging.INFO if self.timing_file or INVOKE_SERVER_TIMING else logging.DEBUG, summary)
+
+
+_RECORDER = InvokeTimingRecorder(INVOKE_TIMING_FILE)
+_CURRENT = threading.local()
+
+
+def get_recorder() -> InvokeTimingRecorder:
+    return _RECORDER
+
+
+def current_invoke() -> Optional[InvokeTiming]:
+    """
+    Returns the timing of the invoke in progress on the current thread, if any
+    """
+    return getattr(_CURRENT, "timing", None)
+
+
+@contextmanager
+def track_invoke(function_name: str) -> Iterator[InvokeTiming]:
+    """
+    Tracks the phases of an invoke happening on the current thread. Nested calls join the invoke already tracked, so
+    the outermost caller decides when the invoke is over and gets recorded.
+
+    Parameters
+    ----------
+    function_name str
+        Name of the invoked function
+    """
+    timing = current_invoke()
+    if timing:
+        yield timing
+        return
+
+    timing = InvokeTiming(function_name)
+    _CURRENT.timing = timing
+    try:
+        yield timing
+    finally:
+        _CURRENT.timing = None
+        timing.ended_at = time.monotonic()
+        _RECORDER.record(timing)
+
+
+def add(name: str, value: int) -> None:
+    """
+    Adds a value to a counter of the invoke tracked on the current thread, does nothing if there is none
+
+    Parameters
+    ----------
+    name str
+        Name of the counter
+    value int
+        Value added to the counter
+    """
+    timing = current_invoke()
+    if timing:
+        timing.add(name, value)
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """
+    Records the duration of a phase into the invoke tracked on the current thread, does nothing if there is none
+
+    Parameters
+    ----------
+    name str
+        Name of the phase
+    """
+    timing = current_invoke()
+    start = time.monotonic()
+    try:
+        yield
+    finally:
+        if timing:
+            timing.record(name, start, time.monotonic())
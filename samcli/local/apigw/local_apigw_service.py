@@ -5,15 +5,16 @@ import json
 import logging
 from datetime import datetime
 from time import time
-from typing import List, Optional
+from typing import Dict, List, Optional
 
-from flask import Flask, request
+from flask import request
 from werkzeug.datastructures import Headers
 from werkzeug.routing import BaseConverter
 from werkzeug.serving import WSGIRequestHandler
 
 from samcli.commands.local.lib.exceptions import UnsupportedInlineCodeError
 from samcli.lib.providers.provider import Cors
+from samcli.lib.utils import invoke_timing
 from samcli.lib.utils.stream_writer import StreamWriter
 from samcli.local.events.api_event import (
     ApiGatewayLambdaEvent,
@@ -23,10 +24,13 @@ from samcli.local.events.api_event import (
     RequestContext,
     RequestContextV2,
 )
-from samcli.local.lambdafn.exceptions import FunctionNotFound
-from samcli.local.services.base_local_service import BaseLocalService, LambdaOutputParser
+from samcli.local.lambdafn.exceptions import FunctionNotFound, FunctionThrottled
+from samcli.local.services.base_local_service import STATS_PATH, BaseLocalService, LambdaOutputParser
 
 from .path_converter import PathConverter
+from .response_cache import ResponseCache, get_cache_key, get_cache_ttl, is_enabled
+from .response_compression import compress_response, get_minimum_compression_size
+from .route_table import RouteTableFlask
 from .service_error_responses import ServiceErrorResponses
 
 LOG = logging.getLogger(__name__)
@@ -59,6 +63,7 @@ class Route:
         is_default_route: bool = False,
         operation_name=None,
         stack_path: str = "",
+        cache_key_parameters: Optional[List[str]] = None,
     ):
         """
         Creates an ApiGatewayRoute
@@ -71,6 +76,7 @@ class Route:
         :param bool is_default_route: determines if the default route or not
         :param string operation_name: Swagger operationId for the route
         :param str stack_path: path of the stack the route is located
+        :param list(str) cache_key_parameters: request parameters keying the cached responses of the route
         """
         self.methods = self.normalize_method(methods)
         self.function_name = function_name
@@ -80,6 +86,7 @@ class Route:
         self.is_default_route = is_default_route
         self.operation_name = operation_name
         self.stack_path = stack_path
+        self.cache_key_parameters = cache_key_parameters
 
     def __eq__(self, other):
         return (
@@ -153,6 +160,12 @@ class LocalApigwService(BaseLocalService):
         self.lambda_runner = lambda_runner
         self.static_dir = static_dir
         self._dict_of_routes = {}
+        # static parts of the events sent to the functions, by route key
+        self._dict_of_event_templates: Dict[str, dict] = {}
+        # seconds the responses of the cached routes are kept in the stage cache, by route key
+        self._dict_of_cache_ttls: Dict[str, int] = {}
+        self._response_cache = ResponseCache()
+        self._minimum_compression_size: Optional[int] = None
         self.stderr = stderr
 
     def create(self):
@@ -162,7 +175,7 @@ class LocalApigwService(BaseLocalService):
         # Setting sam local start-api to respond using HTTP/1.1 instead of the default HTTP/1.0
         WSGIRequestHandler.protocol_version = "HTTP/1.1"
 
-        self._app = Flask(
+        self._app = RouteTableFlask(
             __name__,
             static_url_path="",  # Mount static files at root '/'
             static_folder=self.static_dir,  # Serve static files from this directory
@@ -176,6 +189,8 @@ class LocalApigwService(BaseLocalService):
 
         # This will normalize all endpoints and strip any trailing '/'
         self._app.url_map.strict_slashes = False
+
+        self._minimum_compression_size = get_minimum_compression_size(self.api.minimum_compression_size)
         default_route = None
 
         for api_gateway_route in self.api.routes:
@@ -183,26 +198,24 @@ class LocalApigwService(BaseLocalService):
                 default_route = api_gateway_route
                 continue
             path = PathConverter.convert_path_to_flask(api_gateway_route.path)
-            for route_key in self._generate_route_keys(api_gateway_route.methods, path):
+            for method, route_key in zip(
+                api_gateway_route.methods, self._generate_route_keys(api_gateway_route.methods, path)
+            ):
                 self._dict_of_routes[route_key] = api_gateway_route
-            self._app.add_url_rule(
-                path,
-                endpoint=path,
-                view_func=self._request_handler,
-                methods=api_gateway_route.methods,
-                provide_automatic_options=False,
-            )
+                self._dict_of_event_templates[route_key] = self._create_event_template(api_gateway_route, method, path)
+                cache_ttl = self._get_cache_ttl(api_gateway_route, method)
+                if cache_ttl:
+                    self._dict_of_cache_ttls[route_key] = cache_ttl
+            self._app.add_route(path, self._request_handler, api_gateway_route.methods)
+
+        # the routes of the API take precedence over the statistics of the service
+        if not self._app.route_table.methods(STATS_PATH):
+            self._app.add_route(STATS_PATH, self._stats_request_handler, ["GET"])
 
         if default_route:
             LOG.debug("add catch-all route")
-            all_methods = Route.ANY_HTTP_METHODS
-            try:
-                rules_iter = self._app.url_map.iter_rules("/")
-                while True:
-                    rule = next(rules_iter)
-                    all_methods = [method for method in all_methods if method not in rule.methods]
-            except (KeyError, StopIteration):
-                pass
+            root_methods = self._app.route_table.methods("/")
+            all_methods = [method for method in Route.ANY_HTTP_METHODS if method not in root_methods]
 
             self._add_catch_all_path(all_methods, "/", default_route)
             self._add_catch_all_path(Route.ANY_HTTP_METHODS, "/<path:any_path>", default_route)
@@ -218,23 +231,19 @@ class LocalApigwService(BaseLocalService):
         :param Route route: contains the default route configurations
         """
 
-        self._app.add_url_rule(
-            path,
-            endpoint=path,
-            view_func=self._request_handler,
+        self._app.add_route(path, self._request_handler, methods)
+        catch_all_route = Route(
+            function_name=route.function_name,
+            path=path,
             methods=methods,
-            provide_automatic_options=False,
+            event_type=Route.HTTP,
+            payload_format_version=route.payload_format_version,
+            is_default_route=True,
+            stack_path=route.stack_path,
         )
-        for route_key in self._generate_route_keys(methods, path):
-            self._dict_of_routes[route_key] = Route(
-                function_name=route.function_name,
-                path=path,
-                methods=methods,
-                event_type=Route.HTTP,
-                payload_format_version=route.payload_format_version,
-                is_default_route=True,
-                stack_path=route.stack_path,
-            )
+        for method, route_key in zip(methods, self._generate_route_keys(methods, path)):
+            self._dict_of_routes[route_key] = catch_all_route
+            self._dict_of_event_templates[route_key] = self._create_event_template(catch_all_route, method, path)
 
     def _generate_route_keys(self, methods, path):
         """
@@ -266,6 +275,21 @@ class LocalApigwService(BaseLocalService):
     def _route_key(method, path):
         return "{}:{}".format(path, method)
 
+    def _stats_request_handler(self):
+        """
+        Request Handler of the statistics of the service: the executions in flight and the throttles of the account
+        and of each function, and the hit and miss counts of the stage cache
+
+        Returns
+        -------
+        A Flask Response with the statistics as JSON
+        """
+        stats = {
+            "concurrency": self.lambda_runner.concurrency_limiter.stats(),
+            "response_cache": self._response_cache.stats(),
+        }
+        return self.service_response(json.dumps(stats), {"Content-Type": "application/json"}, 200)
+
     def _construct_error_handling(self):
         """
         Updates the Flask app with Error Handlers for different Error Codes
@@ -317,21 +341,124 @@ class LocalApigwService(BaseLocalService):
             headers = Headers(cors_headers)
             return self.service_response("", headers, 200)
 
+        with invoke_timing.track_invoke(route.function_name) as timing:
+            response = self._invoke_route(route, method, endpoint)
+            if invoke_timing.INVOKE_SERVER_TIMING:
+                response.headers["Server-Timing"] = timing.server_timing_header()
+            return response
+
+    def _invoke_route(self, route, method, endpoint):
+        """
+        Invokes the Lambda function of the route with an event constructed from the current request, and transforms
+        its output into the response
+
+        Parameters
+        ----------
+        route Route
+            Route matching the current request
+        method str
+            HTTP method of the current request
+        endpoint str
+            Endpoint of the current request
+
+        Returns
+        -------
+        Response object
+        """
+        cache_ttl = self._dict_of_cache_ttls.get(self._route_key(method, endpoint))
+        cache_key = get_cache_key(request, route.cache_key_parameters) if cache_ttl else None
+        lambda_response = None
+        # like API Gateway, Cache-Control: max-age=0 skips the cached response and replaces it with a new one
+        if cache_key and request.cache_control.max_age != 0:
+            lambda_response = self._response_cache.get(cache_key)
+        is_cached_response = lambda_response is not None
+
+        if not is_cached_response:
+            try:
+                event = self._construct_event(route, method, endpoint)
+            except UnicodeDecodeError as error:
+                LOG.error("UnicodeDecodeError while processing HTTP request: %s", error)
+                return ServiceErrorResponses.lambda_failure_response()
+
+            stdout_stream = io.BytesIO()
+            stdout_stream_writer = StreamWriter(stdout_stream, auto_flush=True)
+
+            try:
+                self.lambda_runner.invoke(route.function_name, event, stdout=stdout_stream_writer, stderr=self.stderr)
+            except FunctionNotFound:
+                return ServiceErrorResponses.lambda_not_found_response()
+            except FunctionThrottled:
+                return ServiceErrorResponses.too_many_requests()
+            except UnsupportedInlineCodeError:
+                return ServiceErrorResponses.not_implemented_locally(
+                    "Inline code is not supported for sam local commands. Please write your code in a separate file."
+                )
+
+            with invoke_timing.phase("response_parsing"):
+                lambda_response, _ = LambdaOutputParser.get_lambda_output(stdout_stream)
+
         try:
+            with invoke_timing.phase("response_parsing"):
+                if route.event_type == Route.HTTP and (
+                    not route.payload_format_version or route.payload_format_version == "2.0"
+                ):
+                    (status_code, headers, body) = self._parse_v2_payload_format_lambda_output(
+                        lambda_response, self.api.binary_media_types, request
+                    )
+                else:
+                    (status_code, headers, body) = self._parse_v1_payload_format_lambda_output(
+                        lambda_response, self.api.binary_media_types, request, route.event_type
+                    )
+        except LambdaResponseParseException as ex:
+            LOG.error("Invalid lambda response received: %s", ex)
+            return ServiceErrorResponses.lambda_failure_response()
+
+        # only the successful responses are cached
+        if cache_key and not is_cached_response and 200 <= status_code < 300:
+            self._response_cache.put(cache_key, lambda_response, cache_ttl)
+
+        response = self.service_response(body, headers, status_code)
+        # MinimumCompressionSize is a setting of the REST APIs only
+        if route.event_type == Route.API and self._minimum_compression_size is not None:
+            with invoke_timing.phase("response_compression"):
+                sizes = compress_response(response, request.accept_encodings, self._minimum_compression_size)
+            if sizes:
+                invoke_timing.add("compression_saved_bytes", sizes[0] - sizes[1])
+        return response
+
+    def _construct_event(self, route, method, endpoint):
+        """
+        Constructs the event sent to the Lambda function of the route from the current request
+
+        Parameters
+        ----------
+        route Route
+            Route matching the current request
+        method str
+            HTTP method of the current request
+        endpoint str
+            Endpoint of the current request
+
+        Returns
+        -------
+        str
+            Event sent to the function
+        """
+        with invoke_timing.phase("event_construction"):
+            event_template = self._get_event_template(route, method, endpoint)
             # TODO: Rewrite the logic below to use version 2.0 when an invalid value is provided
-            # the Lambda Event 2.0 is only used for the HTTP API gateway with defined payload format version equal 2.0
-            # or none, as the default value to be used is 2.0
+            # the Lambda Event 2.0 is only used for the HTTP API gateway with defined payload format version
+            # equal 2.0 or none, as the default value to be used is 2.0
             # https://docs.aws.amazon.com/apigatewayv2/latest/api-reference/apis-apiid-integrations.html#apis-apiid-integrations-prop-createintegrationinput-payloadformatversion
             if route.event_type == Route.HTTP and route.payload_format_version in [None, "2.0"]:
-                apigw_endpoint = PathConverter.convert_path_to_api_gateway(endpoint)
-                route_key = self._v2_route_key(method, apigw_endpoint, route.is_default_route)
                 event = self._construct_v_2_0_event_http(
                     request,
                     self.port,
                     self.api.binary_media_types,
                     self.api.stage_name,
                     self.api.stage_variables,
-                    route_key,
+                    event_template["routeKey"],
+                    event_template=event_template,
                 )
             elif route.event_type == Route.API:
                 # The OperationName is only sent to the Lambda Function from API Gateway V1(Rest API).
@@ -342,6 +469,7 @@ class LocalApigwService(BaseLocalService):
                     self.api.stage_name,
                     self.api.stage_variables,
                     route.operation_name,
+                    event_template=event_template,
                 )
             else:
                 # For Http Apis with payload version 1.0, API Gateway never sends the OperationName.
@@ -352,41 +480,64 @@ class LocalApigwService(BaseLocalService):
                     self.api.stage_name,
                     self.api.stage_variables,
                     None,
+                    event_template=event_template,
                 )
-        except UnicodeDecodeError as error:
-            LOG.error("UnicodeDecodeError while processing HTTP request: %s", error)
-            return ServiceErrorResponses.lambda_failure_response()
+        return event
 
-        stdout_stream = io.BytesIO()
-        stdout_stream_writer = StreamWriter(stdout_stream, auto_flush=True)
+    def _get_cache_ttl(self, route, method):
+        """
+        Returns the seconds the responses of a route are kept in the stage cache, or None if they are not cached. Only
+        the REST APIs of stages with a cache cluster have their responses cached.
 
-        try:
-            self.lambda_runner.invoke(route.function_name, event, stdout=stdout_stream_writer, stderr=self.stderr)
-        except FunctionNotFound:
-            return ServiceErrorResponses.lambda_not_found_response()
-        except UnsupportedInlineCodeError:
-            return ServiceErrorResponses.not_implemented_locally(
-                "Inline code is not supported for sam local commands. Please write your code in a separate file."
-            )
+        :param Route route: Route to get the cache time to live of
+        :param str method: HTTP method of the route
+        :return int: seconds the responses are cached for
+        """
+        if route.event_type != Route.API or not is_enabled(self.api.cache_cluster_enabled):
+            return None
+        return get_cache_ttl(self.api.method_settings, route.path, method)
 
-        lambda_response, _ = LambdaOutputParser.get_lambda_output(stdout_stream)
+    def _get_event_template(self, route, method, endpoint):
+        """
+        Returns the static parts of the events sent to the function of a route, computed when the service was created,
+        or computed now for the routes added since
 
-        try:
-            if route.event_type == Route.HTTP and (
-                not route.payload_format_version or route.payload_format_version == "2.0"
-            ):
-                (status_code, headers, body) = self._parse_v2_payload_format_lambda_output(
-                    lambda_response, self.api.binary_media_types, request
-                )
-            else:
-                (status_code, headers, body) = self._parse_v1_payload_format_lambda_output(
-                    lambda_response, self.api.binary_media_types, request, route.event_type
-                )
-        except LambdaResponseParseException as ex:
-            LOG.error("Invalid lambda response received: %s", ex)
-            return ServiceErrorResponses.lambda_failure_response()
+        :param Route route: Route matching the request
+        :param str method: HTTP method of the request
+        :param str endpoint: Flask endpoint of the request
+        :return dict: event with the static parts of the request
+        """
+        route_key = self._route_key(method, endpoint)
+        event_template = self._dict_of_event_templates.get(route_key)
+        if event_template is None:
+            event_template = self._create_event_template(route, method, endpoint)
+            self._dict_of_event_templates[route_key] = event_template
+        return event_template
+
+    def _create_event_template(self, route, method, path):
+        """
+        Computes the static parts of the events sent to the function of a route, which only depend on the route and
+        on the Api: its stage, stage variables, route key and API Gateway resource path
+
+        :param Route route: Route to compute the event template of
+        :param str method: HTTP method of the route
+        :param str path: Flask path of the route
+        :return dict: event with the static parts of the request
+        """
+        apigw_endpoint = PathConverter.convert_path_to_api_gateway(path)
+        if route.event_type == Route.HTTP and route.payload_format_version in [None, "2.0"]:
+            return self._v_2_0_event_template(
+                method,
+                self.api.stage_name,
+                self.api.stage_variables,
+                self._v2_route_key(method, apigw_endpoint, route.is_default_route),
+            )
 
-        return self.service_response(body, headers, status_code)
+        # For Http Apis with payload version 1.0, API Gateway never sends the OperationName.
+        operation_name = route.operation_name if route.event_type == Route.API else None
+        return self._v_1_0_event_template(
+            apigw_endpoint, method, self.api.stage_name, self.api.stage_variables, operation_name
+        )
 
     def _get_current_route(self, flask_request):
         """
@@ -672,9 +823,40 @@ class LocalApigwService(BaseLocalService):
 
         return processed_headers
 
+    @staticmethod
+    def _v_1_0_event_template(endpoint, method, stage_name=None, stage_variables=None, operation_name=None):
+        """
+        Constructs the parts of the Event to be passed to Lambda which do not depend on the request
+
+        :param str endpoint: API Gateway resource path of the route
+        :param str method: HTTP method of the route
+        :param stage_name: Optional, the stage name string
+        :param stage_variables: Optional, API Gateway Stage Variables
+        :param operation_name: Optional, Swagger operationId for the route
+        :return dict: Event with the static parts of the request
+        """
+        context = RequestContext(
+            resource_path=endpoint,
+            http_method=method,
+            stage=stage_name,
+            identity=ContextIdentity(),
+            path=endpoint,
+            operation_name=operation_name,
+        )
+        event = ApiGatewayLambdaEvent(
+            http_method=method, resource=endpoint, request_context=context, stage_variables=stage_variables
+        )
+        return event.to_dict()
+
     @staticmethod
     def _construct_v_1_0_event(
-        flask_request, port, binary_types, stage_name=None, stage_variables=None, operation_name=None
+        flask_request,
+        port,
+        binary_types,
+        stage_name=None,
+        stage_variables=None,
+        operation_name=None,
+        event_template=None,
     ):
         """
         Helper method that constructs the Event to be passed to Lambda
@@ -684,16 +866,16 @@ class LocalApigwService(BaseLocalService):
         :param binary_types: list of binary types
         :param stage_name: Optional, the stage name string
         :param stage_variables: Optional, API Gateway Stage Variables
+        :param operation_name: Optional, Swagger operationId for the route
+        :param event_template: Optional, the static parts of the event computed for the route, which take precedence
+            over the stage name, stage variables and operation name
         :return: String representing the event
         """
-        # pylint: disable-msg=too-many-locals
-
-        identity = ContextIdentity(source_ip=flask_request.remote_addr)
-
-        endpoint = PathConverter.convert_path_to_api_gateway(flask_request.endpoint)
-        method = flask_request.method
-        protocol = flask_request.environ.get("SERVER_PROTOCOL", "HTTP/1.1")
-        host = flask_request.host
+        if event_template is None:
+            endpoint = PathConverter.convert_path_to_api_gateway(flask_request.endpoint)
+            event_template = LocalApigwService._v_1_0_event_template(
+                endpoint, flask_request.method, stage_name, stage_variables, operation_name
+            )
 
         request_data = flask_request.get_data()
 
@@ -713,38 +895,46 @@ class LocalApigwService(BaseLocalService):
 
         query_string_dict, multi_value_query_string_dict = LocalApigwService._query_string_params(flask_request)
 
-        context = RequestContext(
-            resource_path=endpoint,
-            http_method=method,
-            stage=stage_name,
-            identity=identity,
-            path=endpoint,
-            protocol=protocol,
-            domain_name=host,
-            operation_name=operation_name,
-        )
-
         headers_dict, multi_value_headers_dict = LocalApigwService._event_headers(flask_request, port)
 
-        event = ApiGatewayLambdaEvent(
-            http_method=method,
-            body=request_data,
-            resource=endpoint,
-            request_context=context,
-            query_string_params=query_string_dict,
-            multi_value_query_string_params=multi_value_query_string_dict,
-            headers=headers_dict,
-            multi_value_headers=multi_value_headers_dict,
-            path_parameters=flask_request.view_args,
-            path=flask_request.path,
-            is_base_64_encoded=is_base_64,
-            stage_variables=stage_variables,
+        # only copy the parts of the template changed by the request, the rest of it is shared by all the events
+        context = dict(event_template["requestContext"])
+        context["identity"] = dict(context["identity"], sourceIp=flask_request.remote_addr)
+        context["protocol"] = flask_request.environ.get("SERVER_PROTOCOL", "HTTP/1.1")
+        context["domainName"] = flask_request.host
+
+        event = dict(event_template)
+        event["requestContext"] = context
+        event["body"] = request_data if request_data else None
+        event["queryStringParameters"] = query_string_dict if query_string_dict else None
+        event["multiValueQueryStringParameters"] = (
+            multi_value_query_string_dict if multi_value_query_string_dict else None
         )
+        event["headers"] = headers_dict if headers_dict else None
+        event["multiValueHeaders"] = multi_value_headers_dict if multi_value_headers_dict else None
+        event["pathParameters"] = dict(flask_request.view_args) if flask_request.view_args else None
+        event["path"] = flask_request.path
+        event["isBase64Encoded"] = is_base_64
 
-        event_str = json.dumps(event.to_dict(), sort_keys=True)
+        event_str = json.dumps(event, sort_keys=True)
         LOG.debug("Constructed String representation of Event to invoke Lambda. Event: %s", event_str)
         return event_str
 
+    @staticmethod
+    def _v_2_0_event_template(method, stage_name=None, stage_variables=None, route_key=None):
+        """
+        Constructs the parts of the Event 2.0 to be passed to Lambda which do not depend on the request
+
+        :param str method: HTTP method of the route
+        :param stage_name: Optional, the stage name string
+        :param stage_variables: Optional, API Gateway Stage Variables
+        :param route_key: Optional, the route key for the route
+        :return dict: Event with the static parts of the request
+        """
+        context = RequestContextV2(http=ContextHTTP(method=method), route_key=route_key, stage=stage_name)
+        event = ApiGatewayV2LambdaEvent(route_key=route_key, request_context=context, stage_variables=stage_variables)
+        return event.to_dict()
+
     @staticmethod
     def _construct_v_2_0_event_http(
         flask_request,
@@ -755,6 +945,7 @@ class LocalApigwService(BaseLocalService):
         route_key=None,
         request_time_epoch=int(time()),
         request_time=datetime.utcnow().strftime("%d/%b/%Y:%H:%M:%S +0000"),
+        event_template=None,
     ):
         """
         Helper method that constructs the Event 2.0 to be passed to Lambda
@@ -767,10 +958,14 @@ class LocalApigwService(BaseLocalService):
         :param stage_name: Optional, the stage name string
         :param stage_variables: Optional, API Gateway Stage Variables
         :param route_key: Optional, the route key for the route
+        :param event_template: Optional, the static parts of the event computed for the route, which take precedence
+            over the stage name, stage variables and route key
         :return: String representing the event
         """
-        # pylint: disable-msg=too-many-locals
-        method = flask_request.method
+        if event_template is None:
+            event_template = LocalApigwService._v_2_0_event_template(
+                flask_request.method, stage_name, stage_variables, route_key
+            )
 
         request_data = flask_request.get_data()
 
@@ -788,32 +983,25 @@ class LocalApigwService(BaseLocalService):
 
         query_string_dict = LocalApigwService._query_string_params_v_2_0(flask_request)
 
-        cookies = LocalApigwService._event_http_cookies(flask_request)
-        headers = LocalApigwService._event_http_headers(flask_request, port)
-        context_http = ContextHTTP(method=method, path=flask_request.path, source_ip=flask_request.remote_addr)
-        context = RequestContextV2(
-            http=context_http,
-            route_key=route_key,
-            stage=stage_name,
-            request_time_epoch=request_time_epoch,
-            request_time=request_time,
-        )
-
-        event = ApiGatewayV2LambdaEvent(
-            route_key=route_key,
-            raw_path=flask_request.path,
-            raw_query_string=flask_request.query_string.decode("utf-8"),
-            cookies=cookies,
-            headers=headers,
-            query_string_params=query_string_dict,
-            request_context=context,
-            body=request_data,
-            path_parameters=flask_request.view_args,
-            is_base_64_encoded=is_base_64,
-            stage_variables=stage_variables,
-        )
-
-        event_str = json.dumps(event.to_dict())
+        # only copy the parts of the template changed by the request, the rest of it is shared by all the events
+        context = dict(event_template["requestContext"])
+        context["http"] = dict(context["http"], path=flask_request.path, sourceIp=flask_request.remote_addr)
+        context["time"] = request_time
+        context["timeEpoch"] = request_time_epoch
+
+        event = dict(event_template)
+        event["rawPath"] = flask_request.path
+        event["rawQueryString"] = flask_request.query_string.decode("utf-8")
+        event["cookies"] = LocalApigwService._event_http_cookies(flask_request)
+        event["headers"] = LocalApigwService._event_http_headers(flask_request, port)
+        event["requestContext"] = context
+        event["body"] = request_data
+        event["pathParameters"] = flask_request.view_args
+        event["isBase64Encoded"] = is_base_64
+        if query_string_dict:
+            event["queryStringParameters"] = query_string_dict
+
+        event_str = json.dumps(event)
         LOG.debug("Constructed String representation of Event Version 2.0 to invoke Lambda. Event: %s", event_str)
         return event_str
 
@@ -0,0 +1,181 @@
+"""
+In-memory cache of the function responses of the local API, emulating the cache of an API Gateway stage
+"""
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Hashable, List, Optional, Tuple
+
+from samcli.lib.utils.env_settings import get_float_setting, get_int_setting
+
+LOG = logging.getLogger(__name__)
+
+# Maximum number of responses kept by the stage cache of the local API
+API_CACHE_MAX_ENTRIES = get_int_setting("SAM_CLI_API_CACHE_MAX_ENTRIES", 1000, minimum=0)
+# Maximum size of the responses kept by the stage cache of the local API, in megabytes
+API_CACHE_MAX_SIZE_MB = get_float_setting("SAM_CLI_API_CACHE_MAX_SIZE_MB", 64, minimum=0)
+
+# CacheTtlInSeconds of API Gateway, when it is not set in the method settings
+DEFAULT_CACHE_TTL = 300
+_MAX_CACHE_TTL = 3600
+
+_ALL_RESOURCES = "/*"
+_ALL_METHODS = "*"
+
+# Sources of the cache key parameters, such as method.request.querystring.page or method.request.header.Accept
+_CACHE_KEY_PARAMETER_PREFIX = "method.request."
+_QUERY_STRING_SOURCES = ("querystring", "multivaluequerystring")
+_HEADER_SOURCES = ("header", "multivalueheader")
+
+
+def is_enabled(value) -> bool:
+    """
+    Returns True if a boolean property of the template, such as CacheClusterEnabled, is set, as booleans or strings
+    """
+    return value is True or str(value).lower() == "true"
+
+
+def get_cache_ttl(method_settings: Optional[List[Dict]], resource_path: str, method: str) -> Optional[int]:
+    """
+    Returns the time to live of the cached responses of a method, as set by the MethodSettings of its stage. The
+    settings of the method take precedence over the ones of its resource, which take precedence over the ones of all
+    the resources (/*). Like API Gateway, only the GET methods are cached by the settings of all the methods (*).
+
+    Parameters
+    ----------
+    method_settings list(dict)
+        MethodSettings of the stage, with their ResourcePath, HttpMethod, CachingEnabled and CacheTtlInSeconds
+    resource_path str
+        API Gateway path of the resource, such as /users/{id}
+    method str
+        HTTP method
+
+    Returns
+    -------
+    int
+        Seconds the responses are cached for, or None if the responses of the method are not cached
+    """
+    matching_settings: Dict[Tuple[bool, bool], Dict] = {}
+    for settings in method_settings or []:
+        if not isinstance(settings, dict):
+            continue
+        # the slashes of the resource paths are escaped as ~1, /~1users~1{id} is the resource /users/{id}
+        settings_path = str(settings.get("ResourcePath", _ALL_RESOURCES))
+        settings_path = settings_path if settings_path == _ALL_RESOURCES else settings_path[1:].replace("~1", "/")
+        settings_method = str(settings.get("HttpMethod", _ALL_METHODS)).upper()
+
+        is_resource_matching = settings_path == resource_path
+        is_method_matching = settings_method == method
+        if (is_resource_matching or settings_path == _ALL_RESOURCES) and (
+            is_method_matching or (settings_method == _ALL_METHODS and method == "GET")
+        ):
+            matching_settings[(is_resource_matching, is_method_matching)] = settings
+
+    if not matching_settings:
+        return None
+    settings = matching_settings[max(matching_settings)]
+    if not is_enabled(settings.get("CachingEnabled", False)):
+        return None
+
+    ttl = int(settings.get("CacheTtlInSeconds", DEFAULT_CACHE_TTL))
+    return min(ttl, _MAX_CACHE_TTL) if ttl > 0 else None
+
+
+def get_cache_key(flask_request, cache_key_parameters: Optional[List[str]]) -> Tuple:
+    """
+    Returns the key of the cached response of a request: its method, its path, which includes the path parameters,
+    and the values of the query string parameters and headers set as cache key parameters of its method
+
+    Parameters
+    ----------
+    flask_request flask.Request
+        Request to get the cache key of
+    cache_key_parameters list(str)
+        CacheKeyParameters of the method, such as method.request.querystring.page
+    """
+    key: List[Hashable] = [flask_request.method, flask_request.path]
+    for parameter in sorted(cache_key_parameters or []):
+        if not parameter.startswith(_CACHE_KEY_PARAMETER_PREFIX):
+            continue
+        source, _, name = parameter[len(_CACHE_KEY_PARAMETER_PREFIX) :].partition(".")
+        if source in _QUERY_STRING_SOURCES:
+            key.append((parameter, tuple(flask_request.args.getlist(name))))
+        elif source in _HEADER_SOURCES:
+            key.append((parameter, tuple(flask_request.headers.getlist(name))))
+    return tuple(key)
+
+
+class ResponseCache:
+    """
+    Least recently used function responses, bounded by their count and their size, which expire after the time to
+    live of their method. Counts the cache hits and misses, as API Gateway does with its CacheHitCount and
+    CacheMissCount metrics.
+
+    This class is thread-safe.
+    """
+
+    def __init__(self, max_entries: int = API_CACHE_MAX_ENTRIES, max_size_mb: float = API_CACHE_MAX_SIZE_MB):
+        """
+        Parameters
+        ----------
+        max_entries int
+            Maximum number of cached responses
+        max_size_mb float
+            Maximum size of the cached responses, in megabytes
+        """
+        self._max_entries = max_entries
+        self._max_size = int(max_size_mb * 1024 * 1024)
+        self._lock = threading.Lock()
+        # (response, size, expiration time) by cache key, the least recently used first
+        self._entries: "OrderedDict[Tuple, Tuple[str, int, float]]" = OrderedDict()
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Tuple) -> Optional[str]:
+        """
+        Returns the cached response of the key, or None if it is not cached or has expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[2] <= time.monotonic():
+                self._remove(key)
+                entry = None
+
+            if entry:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+            LOG.debug("Stage cache %s (hits: %d, misses: %d)", "hit" if entry else "miss", self.hits, self.misses)
+            return entry[0] if entry else None
+
+    def put(self, key: Tuple, response: str, ttl: float) -> None:
+        """
+        Caches the response of the key for ttl seconds, evicting the least recently used responses to stay within
+        the bounds of the cache
+        """
+        size = len(response.encode("utf-8"))
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            if size > self._max_size:
+                LOG.debug("Response of %d bytes is too large to be cached", size)
+                return
+
+            self._entries[key] = (response, size, time.monotonic() + ttl)
+            self._size += size
+            while len(self._entries) > self._max_entries or self._size > self._max_size:
+                self._remove(next(iter(self._entries)))
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns the hit and miss counts, with the number and the size of the cached responses
+        """
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries), "size": self._size}
+
+    def _remove(self, key: Tuple) -> None:
+        _, size, _ = self._entries.pop(key)
+        self._size -= size
@@ -0,0 +1,89 @@
+"""
+Compression of the responses of the local API, emulating the MinimumCompressionSize setting of API Gateway
+"""
+import logging
+import zlib
+from typing import Optional, Tuple
+
+from samcli.lib.utils.env_settings import get_int_setting
+
+LOG = logging.getLogger(__name__)
+
+GZIP_ENCODING = "gzip"
+DEFLATE_ENCODING = "deflate"
+# Content encodings supported by API Gateway, the preferred one first
+SUPPORTED_ENCODINGS = [GZIP_ENCODING, DEFLATE_ENCODING]
+
+# zlib compression level of the responses, from 1 (fastest) to 9 (smallest)
+API_COMPRESSION_LEVEL = get_int_setting("SAM_CLI_API_COMPRESSION_LEVEL", 6, minimum=1, maximum=9)
+
+# Maximum value of the MinimumCompressionSize property of API Gateway, in bytes
+_MAX_MINIMUM_COMPRESSION_SIZE = 10485760
+# zlib window bits writing the gzip header, or the zlib header of the deflate encoding
+_WBITS = {GZIP_ENCODING: 16 + zlib.MAX_WBITS, DEFLATE_ENCODING: zlib.MAX_WBITS}
+
+
+def get_minimum_compression_size(value) -> Optional[int]:
+    """
+    Returns the MinimumCompressionSize of a REST API as an int, or None if the compression is disabled or the value is
+    not valid
+
+    Parameters
+    ----------
+    value int or str
+        MinimumCompressionSize property of the REST API, which can be a string in the templates
+    """
+    if value is None:
+        return None
+    try:
+        minimum_size = int(value)
+    except (TypeError, ValueError):
+        LOG.warning("Ignoring invalid MinimumCompressionSize '%s', the responses are not compressed", value)
+        return None
+    if not 0 <= minimum_size <= _MAX_MINIMUM_COMPRESSION_SIZE:
+        LOG.warning(
+            "Ignoring MinimumCompressionSize %d, which must be between 0 and %d, the responses are not compressed",
+            minimum_size,
+            _MAX_MINIMUM_COMPRESSION_SIZE,
+        )
+        return None
+    return minimum_size
+
+
+def compress_response(response, accept_encodings, minimum_size: int) -> Optional[Tuple[int, int]]:
+    """
+    Compresses the body of a response with the encoding preferred by the client, if the body is at least
+    minimum_size bytes long and the response is not encoded already
+
+    Parameters
+    ----------
+    response flask.Response
+        Response to compress, its body, Content-Encoding and Vary headers are updated
+    accept_encodings werkzeug.datastructures.Accept
+        Accept-Encoding header of the request
+    minimum_size int
+        Minimum size in bytes of the bodies to compress
+
+    Returns
+    -------
+    tuple(int, int)
+        Sizes of the body before and after the compression, or None if the response was not compressed
+    """
+    if response.headers.get("Content-Encoding"):
+        return None
+    encoding = accept_encodings.best_match(SUPPORTED_ENCODINGS)
+    if not encoding:
+        return None
+
+    body = response.get_data()
+    if len(body) < minimum_size:
+        return None
+
+    # the body of the response is whole already, as the function responds with a single JSON document, so it is
+    # compressed in a single pass and sent with its Content-Length rather than streamed
+    compressor = zlib.compressobj(API_COMPRESSION_LEVEL, zlib.DEFLATED, _WBITS[encoding])
+    compressed_body = compressor.compress(body) + compressor.flush()
+    response.set_data(compressed_body)
+    response.headers["Content-Encoding"] = encoding
+    response.vary.add("Accept-Encoding")
+    return len(body), len(compressed_body)
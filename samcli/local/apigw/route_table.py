@@ -0,0 +1,219 @@
+"""
+Route table matching the requests of the local API Gateway with a trie of path segments
+"""
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from flask import Flask
+from werkzeug.exceptions import MethodNotAllowed, NotFound
+from werkzeug.routing import MapAdapter, Rule
+
+# Flask path parameters, matching a single segment or, for the greedy ones, all the remaining segments
+# Example: /id/<id>/<path:proxy> is equivalent to the APIGW path /id/{id}/{proxy+}
+_PARAM_PREFIX = "<"
+_PARAM_SUFFIX = ">"
+_GREEDY_PARAM_PREFIX = "<path:"
+
+
+class _Node:
+    """
+    Node of the trie, matching one segment of the path
+    """
+
+    __slots__ = ("static", "params", "greedy_params", "rules")
+
+    def __init__(self):
+        # children matching a segment equal to their key
+        self.static: Dict[str, "_Node"] = {}
+        # children matching any non empty segment, by parameter name
+        self.params: Dict[str, "_Node"] = {}
+        # leaves matching all the remaining segments, by parameter name
+        self.greedy_params: Dict[str, "_Node"] = {}
+        # rules of the paths ending at this node, by method
+        self.rules: Dict[str, Rule] = {}
+
+
+class RouteTable:
+    """
+    Matches a path and a method against the Flask paths of the routes, with a trie keyed by path segments built once
+    when the service is created. Matching walks down one segment at a time, whatever the number of routes, preferring
+    static segments to parameters and parameters to greedy parameters, as API Gateway does.
+
+    Trailing slashes are ignored, like Flask does with strict_slashes disabled.
+    """
+
+    def __init__(self):
+        self._root = _Node()
+
+    def add(self, path: str, methods: List[str], endpoint: Optional[str] = None) -> None:
+        """
+        Adds the route of a Flask path
+
+        Parameters
+        ----------
+        path str
+            Flask path of the route, such as /id/<id> or /<path:proxy>
+        methods list(str)
+            HTTP methods of the route
+        endpoint str
+            Optional. Flask endpoint the requests matching the route are dispatched to. Defaults to the path
+        """
+        node = self._root
+        segments = self._split(path)
+        for index, segment in enumerate(segments):
+            if segment.startswith(_GREEDY_PARAM_PREFIX) and segment.endswith(_PARAM_SUFFIX):
+                if index != len(segments) - 1:
+                    raise ValueError(f"Greedy path parameter {segment} of {path} must be the last segment")
+                node = node.greedy_params.setdefault(segment[len(_GREEDY_PARAM_PREFIX) : -1], _Node())
+            elif segment.startswith(_PARAM_PREFIX) and segment.endswith(_PARAM_SUFFIX):
+                node = node.params.setdefault(segment[1:-1], _Node())
+            else:
+                node = node.static.setdefault(segment, _Node())
+
+        rule = next(iter(node.rules.values()), None)
+        if not rule:
+            rule = Rule(path, endpoint=endpoint or path)
+            rule.provide_automatic_options = False
+        for method in methods:
+            node.rules.setdefault(method, rule)
+
+    def methods(self, path: str) -> Set[str]:
+        """
+        Returns the methods of the route of the given Flask path
+        """
+        node: Optional[_Node] = self._root
+        for segment in self._split(path):
+            if segment.startswith(_GREEDY_PARAM_PREFIX) and segment.endswith(_PARAM_SUFFIX):
+                node = node.greedy_params.get(segment[len(_GREEDY_PARAM_PREFIX) : -1])
+            elif segment.startswith(_PARAM_PREFIX) and segment.endswith(_PARAM_SUFFIX):
+                node = node.params.get(segment[1:-1])
+            else:
+                node = node.static.get(segment)
+            if not node:
+                return set()
+        return set(node.rules)
+
+    def match(self, path: str, method: str) -> Optional[Tuple[Rule, Dict[str, str]]]:
+        """
+        Finds the route of a request
+
+        Parameters
+        ----------
+        path str
+            Path of the request
+        method str
+            HTTP method of the request
+
+        Returns
+        -------
+        tuple(werkzeug.routing.Rule, dict)
+            The rule of the matching route, with the values of its path parameters, or None if no route matches
+        """
+        for node, view_args in self._iter_matches(self._root, self._split(path), 0, []):
+            rule = node.rules.get(method)
+            if rule:
+                return rule, dict(view_args)
+        return None
+
+    def allowed_methods(self, path: str) -> Set[str]:
+        """
+        Returns the methods of all the routes matching the path of a request
+        """
+        allowed: Set[str] = set()
+        for node, _ in self._iter_matches(self._root, self._split(path), 0, []):
+            allowed.update(node.rules)
+        return allowed
+
+    def _iter_matches(
+        self, node: _Node, segments: List[str], index: int, view_args: List[Tuple[str, str]]
+    ) -> Iterator[Tuple[_Node, List[Tuple[str, str]]]]:
+        """
+        Yields the nodes with rules matching the segments from the given index, the most specific ones first
+        """
+        if index == len(segments):
+            if node.rules:
+                yield node, view_args
+            return
+
+        segment = segments[index]
+        child = node.static.get(segment)
+        if child:
+            yield from self._iter_matches(child, segments, index + 1, view_args)
+        if segment:
+            for name, child in node.params.items():
+                yield from self._iter_matches(child, segments, index + 1, view_args + [(name, segment)])
+        if node.greedy_params:
+            remaining = "/".join(segments[index:])
+            if remaining:
+                for name, child in node.greedy_params.items():
+                    if child.rules:
+                        yield child, view_args + [(name, remaining)]
+
+    @staticmethod
+    def _split(path: str) -> List[str]:
+        if len(path) > 1 and path.endswith("/"):
+            path = path[:-1]
+        return path.lstrip("/").split("/")
+
+
+class RouteTableMapAdapter:
+    """
+    URL adapter matching the requests with a route table, before the rules of the Flask application such as the one
+    of its static files
+    """
+
+    def __init__(self, route_table: RouteTable, adapter: MapAdapter):
+        self._route_table = route_table
+        self._adapter = adapter
+
+    def match(self, path_info: Optional[str] = None, method: Optional[str] = None, return_rule: bool = False, **kwargs):
+        path_info = path_info if path_info is not None else self._adapter.path_info
+        method = (method or self._adapter.default_method).upper()
+
+        matched = self._route_table.match(path_info, method)
+        if matched:
+            rule, view_args = matched
+            return (rule if return_rule else rule.endpoint), view_args
+
+        try:
+            return self._adapter.match(path_info, method, return_rule, **kwargs)
+        except NotFound:
+            allowed_methods = self._route_table.allowed_methods(path_info)
+            if allowed_methods:
+                raise MethodNotAllowed(valid_methods=sorted(allowed_methods)) from None
+            raise
+
+    def __getattr__(self, name):
+        return getattr(self._adapter, name)
+
+
+class RouteTableFlask(Flask):
+    """
+    Flask application dispatching the requests with a route table. The view functions of the routes are registered
+    by endpoint, without adding a rule to the url map for each of them.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.route_table = RouteTable()
+
+    def add_route(self, path: str, view_func, methods: List[str]) -> None:
+        """
+        Dispatches the requests matching the Flask path and methods to the view function
+
+        Parameters
+        ----------
+        path str
+            Flask path of the route, which is also its endpoint
+        view_func Callable
+            Function handling the requests of the route
+        methods list(str)
+            HTTP methods of the route
+        """
+        self.route_table.add(path, methods)
+        self.view_functions[path] = view_func
+
+    def create_url_adapter(self, request):
+        adapter = super().create_url_adapter(request)
+        if request is None or adapter is None:
+            return adapter
+        return RouteTableMapAdapter(self.route_table, adapter)
@@ -7,10 +7,12 @@ class ServiceErrorResponses:
     _NO_LAMBDA_INTEGRATION = {"message": "No function defined for resource method"}
     _MISSING_AUTHENTICATION = {"message": "Missing Authentication Token"}
     _LAMBDA_FAILURE = {"message": "Internal server error"}
+    _TOO_MANY_REQUESTS = {"message": "Too Many Requests"}
 
     HTTP_STATUS_CODE_501 = 501
     HTTP_STATUS_CODE_502 = 502
     HTTP_STATUS_CODE_403 = 403
+    HTTP_STATUS_CODE_429 = 429
 
     @staticmethod
     def lambda_failure_response(*args):
@@ -22,6 +24,16 @@ class ServiceErrorResponses:
         response_data = jsonify(ServiceErrorResponses._LAMBDA_FAILURE)
         return make_response(response_data, ServiceErrorResponses.HTTP_STATUS_CODE_502)
 
+    @staticmethod
+    def too_many_requests(*args):
+        """
+        Constructs a Flask Response for when the invocation of the Lambda function of an endpoint is throttled
+
+        :return: a Flask Response
+        """
+        response_data = jsonify(ServiceErrorResponses._TOO_MANY_REQUESTS)
+        return make_response(response_data, ServiceErrorResponses.HTTP_STATUS_CODE_429)
+
     @staticmethod
     def not_implemented_locally(message):
         """
@@ -9,16 +9,18 @@ import socket
 import tempfile
 import threading
 import time
-from typing import Optional
+from typing import List, Optional
 
 import docker
 import requests
 from docker.errors import NotFound as DockerNetworkNotFound
 
+from samcli.lib.utils import invoke_timing
 from samcli.lib.utils.retry import retry
 from samcli.lib.utils.tar import extract_tarfile
 from samcli.local.docker.effective_user import ROOT_USER_ID, EffectiveUser
 
+from .container_log_multiplexer import get_log_multiplexer
 from .exceptions import ContainerNotStartableException
 from .utils import NoFreePortsError, find_free_port, to_posix_path
 
@@ -56,6 +58,11 @@ class Container:
     URL = "http://{host}:{port}/2015-03-31/functions/{function_name}/invocations"
     # Set connection timeout to 1 sec to support the large input.
     RAPID_CONNECTION_TIMEOUT = 1
+    # Size of the chunks the function result is read from RAPID with
+    RAPID_RESPONSE_CHUNK_SIZE = 64 * 1024
+    # Delays between two attempts to connect to RAPID while it is starting, doubled after each failed attempt
+    _SOCKET_CONNECTION_INITIAL_BACKOFF = 0.001
+    _SOCKET_CONNECTION_MAX_BACKOFF = 0.1
 
     def __init__(
         self,
@@ -109,6 +116,14 @@ class Container:
         self._container_opts = container_opts
         self._additional_volumes = additional_volumes
         self._logs_thread = None
+        self._started_at: Optional[float] = None
+        self._is_socket_ready = False
+        # Seconds between starting the container and RAPID accepting connections, once measured
+        self.time_to_ready: Optional[float] = None
+        # Keep-alive connections to RAPID, reused across the invokes of a warm container
+        self._http_session: Optional[requests.Session] = None
+        # True while the processes of the container are paused, the container must be unpaused before serving requests
+        self.is_paused = False
 
         # Use the given Docker client or create new one
         self.docker_client = docker_client or docker.from_env()
@@ -235,11 +250,16 @@ class Container:
             Optional. Number of seconds between SIGTERM and SIGKILL. Effectively, the amount of time
             the container has to perform shutdown steps. Default: 3
         """
+        self._close_http_session()
+
         if not self.is_created():
             LOG.debug("Container was not created, cannot run stop.")
             return
 
         try:
+            if self.is_paused:
+                # unpause the container first, so its processes can handle SIGTERM
+                self.unpause()
             self.docker_client.containers.get(self.id).stop(timeout=timeout)
         except docker.errors.NotFound:
             # Container is already removed
@@ -258,6 +278,8 @@ class Container:
         """
         Removes a container that was created earlier.
         """
+        self._close_http_session()
+
         if not self.is_created():
             LOG.debug("Container was not created. Skipping deletion")
             return
@@ -285,6 +307,7 @@ class Container:
                     LOG.debug("Successfully removed temporary directory %s on the host.", self._host_tmp_dir)
 
         self.id = None
+        self._is_socket_ready = False
 
     def start(self, input_data=None):
         """
@@ -313,40 +336,81 @@ class Container:
         real_container = self.docker_client.containers.get(self.id)
 
         # Start the container
+        self._close_http_session()
+        self._is_socket_ready = False
+        self._started_at = time.monotonic()
         real_container.start()
 
-    @retry(exc=requests.exceptions.RequestException, exc_raise=ContainerResponseException)
     def wait_for_http_response(self, name, event, stdout):
+        """
+        Sends the event to RAPID and writes the function result to stdout as it is received, in chunks of
+        RAPID_RESPONSE_CHUNK_SIZE bytes, so the result is never held in memory twice.
+        """
+        resp = self._post_event(event)
+        try:
+            for chunk in resp.iter_content(chunk_size=self.RAPID_RESPONSE_CHUNK_SIZE):
+                stdout.write(chunk)
+        except requests.exceptions.RequestException as ex:
+            # the function already ran, so don't retry the invoke while its result is being received
+            self._close_http_session()
+            raise ContainerResponseException("Failed to receive the response of the container") from ex
+        finally:
+            resp.close()
+
+    @retry(exc=requests.exceptions.RequestException, exc_raise=ContainerResponseException)
+    def _post_event(self, event):
         # TODO(sriram-mv): `aws-lambda-rie` is in a mode where the function_name is always "function"
         # NOTE(sriram-mv): There is a connection timeout set on the http call to `aws-lambda-rie`, however there is not
         # a read time out for the response received from the server.
+        try:
+            return self._get_http_session().post(
+                self.URL.format(host=self._container_host, port=self.rapid_port_host, function_name="function"),
+                data=event.encode("utf-8"),
+                timeout=(self.RAPID_CONNECTION_TIMEOUT, None),
+                stream=True,
+            )
+        except requests.exceptions.RequestException:
+            # the kept alive connection might be broken, open a new one for the next attempt
+            self._close_http_session()
+            raise
 
-        resp = requests.post(
-            self.URL.format(host=self._container_host, port=self.rapid_port_host, function_name="function"),
-            data=event.encode("utf-8"),
-            timeout=(self.RAPID_CONNECTION_TIMEOUT, None),
-        )
-        stdout.write(resp.content)
+    def _get_http_session(self) -> requests.Session:
+        """
+        Returns the HTTP session used to send invokes to RAPID, so the connection is kept alive between invokes
+        """
+        if not self._http_session:
+            self._http_session = requests.Session()
+        return self._http_session
+
+    def _close_http_session(self) -> None:
+        """
+        Closes the connections to RAPID, they are not valid anymore once the container is stopped or restarted
+        """
+        if self._http_session:
+            self._http_session.close()
+            self._http_session = None
 
     def wait_for_result(self, full_path, event, stdout, stderr, start_timer=None):
         # NOTE(sriram-mv): Let logging happen in its own thread, so that a http request can be sent.
         # NOTE(sriram-mv): All logging is re-directed to stderr, so that only the lambda function return
         # will be written to stdout.
 
-        # the log thread will not be closed until the container itself got deleted,
-        # so as long as the container is still there, no need to start a new log thread
-        if not self._logs_thread or not self._logs_thread.is_alive():
-            self._logs_thread = threading.Thread(target=self.wait_for_logs, args=(stderr, stderr), daemon=True)
-            self._logs_thread.start()
+        # the logs will be read until the container itself got deleted,
+        # so as long as the container is still there, no need to read them again
+        if not self._are_logs_read():
+            self._read_logs(full_path, stderr)
 
         # wait_for_http_response will attempt to establish a connection to the socket
         # but it'll fail if the socket is not listening yet, so we wait for the socket
-        self._wait_for_socket_connection()
+        with invoke_timing.phase("socket_wait"):
+            self._wait_for_socket_connection()
 
         # start the timer for function timeout right before executing the function, as waiting for the socket
         # can take some time
         timer = start_timer() if start_timer else None
-        self.wait_for_http_response(full_path, event, stdout)
+        # function init, when the runtime was not initialized yet, is part of this phase
+        with invoke_timing.phase("function"):
+            self.wait_for_http_response(full_path, event, stdout)
         if timer:
             timer.cancel()
 
@@ -365,21 +429,67 @@ class Container:
 
         self._write_container_output(logs_itr, stdout=stdout, stderr=stderr)
 
+    def _are_logs_read(self) -> bool:
+        """
+        Checks if the logs of the container are still being read, by the log multiplexer or by a dedicated thread
+        """
+        if self._logs_thread:
+            return self._logs_thread.is_alive()
+        return bool(self.id) and get_log_multiplexer().is_attached(self.id)
+
+    def _read_logs(self, name, stream):
+        """
+        Writes the stdout and stderr of the container into the given stream in the background. The logs of all the
+        containers are read by a single log multiplexer thread, or by a thread per container when the Docker attach
+        socket cannot be multiplexed (named pipes on Windows).
+
+        Parameters
+        ----------
+        name str
+            Name of the function run by the container
+        stream samcli.lib.utils.stream_writer.StreamWriter
+            Stream writer to write the stdout and stderr data of the container into
+        """
+        if not self.is_created():
+            LOG.debug("Container does not exist. Cannot get logs for this container")
+            return
+
+        log_multiplexer = get_log_multiplexer()
+        attach_socket = self.docker_client.api.attach_socket(
+            self.id, params={"stdout": 1, "stderr": 1, "stream": 1, "logs": 1}
+        )
+        if log_multiplexer.is_supported(attach_socket):
+            log_multiplexer.attach(self.id, attach_socket, name, stdout=stream, stderr=stream)
+            return
+
+        attach_socket.close()
+        self._logs_thread = threading.Thread(target=self.wait_for_logs, args=(stream, stream), daemon=True)
+        self._logs_thread.start()
+
     def _wait_for_socket_connection(self) -> None:
         """
-        Waits for a successful connection to the socket used to communicate with Docker.
+        Waits for a successful connection to the socket used to communicate with Docker. Attempts are retried with an
+        exponential backoff starting at 1 ms, so the invoke is sent as soon as RAPID starts listening. Once connected,
+        the container is considered ready until it is started again.
         """
+        if self._is_socket_ready:
+            return
 
-        start_time = time.time()
+        start_time = time.monotonic()
+        backoff = self._SOCKET_CONNECTION_INITIAL_BACKOFF
         while not self._can_connect_to_socket():
-            time.sleep(0.1)
-            current_time = time.time()
-            if current_time - start_time > CONTAINER_CONNECTION_TIMEOUT:
+            if time.monotonic() - start_time > CONTAINER_CONNECTION_TIMEOUT:
                 raise ContainerConnectionTimeoutException(
                     f"Timed out while attempting to establish a connection to the container. You can increase this "
                     f"timeout by setting the SAM_CLI_CONTAINER_CONNECTION_TIMEOUT environment variable. "
                     f"The current timeout is {CONTAINER_CONNECTION_TIMEOUT} (seconds)."
                 )
+            time.sleep(backoff)
+            backoff = min(backoff * 2, self._SOCKET_CONNECTION_MAX_BACKOFF)
+
+        self._is_socket_ready = True
+        self.time_to_ready = time.monotonic() - (self._started_at or start_time)
+        LOG.debug("Container %s is ready to be invoked, time to ready: %.1f ms", self.id, self.time_to_ready * 1000)
 
     def _can_connect_to_socket(self) -> bool:
         """
@@ -393,6 +503,54 @@ class Container:
         a_socket.close()
         return connection_succeeded
 
+    def exec_run(self, command: List[str]) -> int:
+        """
+        Runs a command in the running container, and waits for it to end
+
+        Parameters
+        ----------
+        command list(str)
+            Command to run, with its arguments
+
+        Returns
+        -------
+        int
+            Exit code of the command
+        """
+        if not self.is_created():
+            raise RuntimeError("Container does not exist. Cannot run a command in this container")
+
+        real_container = self.docker_client.containers.get(self.id)
+        LOG.debug("Running %s in container %s", command, self.id)
+        exit_code: int = real_container.exec_run(command).exit_code
+        return exit_code
+
+    def pause(self) -> None:
+        """
+        Pauses all the processes of the running container, so it does not use any CPU until it is unpaused
+        """
+        if self.is_paused:
+            return
+
+        if not self.is_created():
+            raise RuntimeError("Container does not exist. Cannot pause this container")
+
+        self.docker_client.containers.get(self.id).pause()
+        self.is_paused = True
+
+    def unpause(self) -> None:
+        """
+        Resumes all the processes of the paused container
+        """
+        if not self.is_paused:
+            return
+
+        if not self.is_created():
+            raise RuntimeError("Container does not exist. Cannot unpause this container")
+
+        self.docker_client.containers.get(self.id).unpause()
+        self.is_paused = False
+
     def copy(self, from_container_path, to_host_path) -> None:
         """Copies a path from container into host path"""
 
@@ -0,0 +1,268 @@
+"""
+Reads the output of all the running containers from a single thread
+"""
+import logging
+import os
+import selectors
+import socket
+import struct
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from docker.utils.socket import read as read_socket
+
+from samcli.lib.utils.env_settings import get_float_setting
+from samcli.lib.utils.stream_writer import StreamWriter
+
+LOG = logging.getLogger(__name__)
+
+# Seconds after which a line not terminated by a new line yet is written anyway
+CONTAINER_LOG_FLUSH_INTERVAL = get_float_setting("SAM_CLI_CONTAINER_LOG_FLUSH_INTERVAL", 0.1, minimum=0)
+
+# These values are coming directly from Docker Attach Stream API spec
+_STDOUT_FRAME_TYPE = 1
+_STDERR_FRAME_TYPE = 2
+_FRAME_HEADER = struct.Struct(">BxxxL")
+
+_READ_SIZE = 64 * 1024
+
+
+class _AttachedContainer:
+    """
+    Output of a container read from its attach socket, split in lines
+    """
+
+    def __init__(
+        self, container_id: str, sock, name: str, stdout: Optional[StreamWriter], stderr: Optional[StreamWriter]
+    ):
+        self.container_id = container_id
+        self.sock = sock
+        self.name = name
+        self.writers = {_STDOUT_FRAME_TYPE: stdout, _STDERR_FRAME_TYPE: stderr}
+        # data read from the socket which does not make a complete frame yet
+        self._frames = bytearray()
+        # data of each stream which does not make a complete line yet
+        self._partial_lines = {_STDOUT_FRAME_TYPE: bytearray(), _STDERR_FRAME_TYPE: bytearray()}
+        self._partial_since: Optional[float] = None
+
+    def feed(self, data: bytes) -> List[Tuple[StreamWriter, bytes]]:
+        """
+        Decodes the Docker frames of the data read from the socket, and returns the complete lines of each stream
+        """
+        self._frames += data
+        output = []
+        while len(self._frames) >= _FRAME_HEADER.size:
+            frame_type, frame_size = _FRAME_HEADER.unpack_from(self._frames)
+            frame_end = _FRAME_HEADER.size + frame_size
+            if len(self._frames) < frame_end:
+                break
+
+            frame = self._frames[_FRAME_HEADER.size : frame_end]
+            del self._frames[:frame_end]
+
+            writer = self.writers.get(frame_type)
+            if not writer:
+                continue
+
+            partial_line = self._partial_lines[frame_type]
+            partial_line += frame
+            lines_end = partial_line.rfind(b"\n") + 1
+            if lines_end:
+                output.append((writer, bytes(partial_line[:lines_end])))
+                del partial_line[:lines_end]
+
+        if any(self._partial_lines.values()):
+            self._partial_since = self._partial_since or time.monotonic()
+        else:
+            self._partial_since = None
+        return output
+
+    def flush(self, max_age: float = 0) -> List[Tuple[StreamWriter, bytes]]:
+        """
+        Returns the lines not terminated yet, if the oldest of them was read at least max_age seconds ago
+        """
+        if self._partial_since is None or time.monotonic() - self._partial_since < max_age:
+            return []
+
+        output = []
+        for frame_type, partial_line in self._partial_lines.items():
+            writer = self.writers[frame_type]
+            if partial_line and writer:
+                output.append((writer, bytes(partial_line)))
+            partial_line.clear()
+        self._partial_since = None
+        return output
+
+
+class ContainerLogMultiplexer:
+    """
+    Reads the attach sockets of all the containers with a selector, from a single daemon thread started on the first
+    attached container, so the number of threads does not grow with the number of running containers. The output of
+    the containers is written line by line, each write gathering the lines read from every container, and the lines are
+    prefixed with the name of their function once the containers of more than one function are attached.
+
+    This class is thread-safe.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._selector = selectors.DefaultSelector()
+        self._containers: Dict[str, _AttachedContainer] = {}
+        self._to_register: List[_AttachedContainer] = []
+        self._thread: Optional[threading.Thread] = None
+        # written to by the other threads to wake up the selector when a container is attached
+        self._wakeup_reader, self._wakeup_writer = socket.socketpair()
+
+    @staticmethod
+    def is_supported(sock) -> bool:
+        """
+        Checks whether the given attach socket can be read by the multiplexer, which waits for the sockets with a
+        selector. Only sockets can be selected on Windows, so the named pipes of Docker Desktop are not supported.
+        """
+        if os.name == "nt":
+            return isinstance(sock, socket.socket)
+        try:
+            return isinstance(sock.fileno(), int)
+        except (AttributeError, OSError, ValueError):
+            return False
+
+    def is_attached(self, container_id: str) -> bool:
+        """
+        Returns True if the output of the given container is still being read
+        """
+        with self._lock:
+            return container_id in self._containers
+
+    def attach(
+        self,
+        container_id: str,
+        sock,
+        name: str,
+        stdout: Optional[StreamWriter] = None,
+        stderr: Optional[StreamWriter] = None,
+    ) -> None:
+        """
+        Reads the output of a container until its attach socket is closed
+
+        Parameters
+        ----------
+        container_id str
+            ID of the container
+        sock socket.socket
+            Attach socket of the container, with the stdout and stderr streams
+        name str
+            Name of the function run by the container, which prefixes its output lines
+        stdout samcli.lib.utils.stream_writer.StreamWriter
+            Optional. Stream writer to write the stdout data of the container into
+        stderr samcli.lib.utils.stream_writer.StreamWriter
+            Optional. Stream writer to write the stderr data of the container into
+        """
+        with self._lock:
+            if container_id in self._containers:
+                return
+
+            container = _AttachedContainer(container_id, sock, name, stdout, stderr)
+            self._containers[container_id] = container
+            self._to_register.append(container)
+
+            if not self._thread:
+                self._selector.register(self._wakeup_reader, selectors.EVENT_READ)
+                self._thread = threading.Thread(target=self._run, name="container-logs", daemon=True)
+                self._thread.start()
+
+        self._wakeup_writer.send(b"\0")
+
+    def _run(self) -> None:
+        while True:
+            self._register_attached_containers()
+            output: List[Tuple[StreamWriter, bytes]] = []
+
+            for key, _ in self._selector.select(timeout=CONTAINER_LOG_FLUSH_INTERVAL):
+                if key.fileobj is self._wakeup_reader:
+                    self._wakeup_reader.recv(_READ_SIZE)
+                else:
+                    output += self._read(key.data)
+
+            with self._lock:
+                containers = list(self._containers.values())
+            for container in containers:
+                output += self._prefix(container, container.flush(CONTAINER_LOG_FLUSH_INTERVAL))
+
+            self._write(output)
+
+    def _register_attached_containers(self) -> None:
+        with self._lock:
+            to_register, self._to_register = self._to_register, []
+
+        for container in to_register:
+            try:
+                self._selector.register(container.sock, selectors.EVENT_READ, container)
+            except (OSError, ValueError) as ex:
+                LOG.debug("Failed to get the logs from the container %s", container.container_id, exc_info=ex)
+                with self._lock:
+                    self._containers.pop(container.container_id, None)
+
+    def _read(self, container: _AttachedContainer) -> List[Tuple[StreamWriter, bytes]]:
+        """
+        Reads the available output of a container, and detaches it once its attach socket is closed
+        """
+        try:
+            data = read_socket(container.sock, _READ_SIZE)
+        except OSError as ex:
+            LOG.debug("Failed to get the logs from the container %s", container.container_id, exc_info=ex)
+            data = b""
+
+        if data is None:
+            # interrupted before any data was read
+            return []
+        if data:
+            return self._prefix(container, container.feed(data))
+
+        self._selector.unregister(container.sock)
+        container.sock.close()
+        with self._lock:
+            self._containers.pop(container.container_id, None)
+        return self._prefix(container, container.flush())
+
+    def _prefix(self, container: _AttachedContainer, output: List[Tuple[StreamWriter, bytes]]):
+        with self._lock:
+            is_shared = len({attached.name for attached in self._containers.values()} | {container.name}) > 1
+        if not is_shared:
+            return output
+
+        prefix = f"[{container.name}] ".encode()
+        return [
+            (writer, b"".join(prefix + line for line in lines.splitlines(keepends=True))) for writer, lines in output
+        ]
+
+    @staticmethod
+    def _write(output: List[Tuple[StreamWriter, bytes]]) -> None:
+        """
+        Writes the output gathered from all the containers, with a single write and flush per stream writer
+        """
+        writers: Dict[int, Tuple[StreamWriter, bytearray]] = {}
+        for writer, data in output:
+            writers.setdefault(id(writer), (writer, bytearray()))[1].extend(data)
+
+        for writer, data in writers.values():
+            try:
+                writer.write(bytes(data))
+                writer.flush()
+            except Exception as ex:  # pylint: disable=broad-except
+                LOG.debug("Failed to write the logs of the containers", exc_info=ex)
+
+
+_MULTIPLEXER: Optional[ContainerLogMultiplexer] = None
+_MULTIPLEXER_LOCK = threading.Lock()
+
+
+def get_log_multiplexer() -> ContainerLogMultiplexer:
+    """
+    Returns the multiplexer reading the output of all the containers of this process
+    """
+    global _MULTIPLEXER  # pylint: disable=global-statement
+    with _MULTIPLEXER_LOCK:
+        if not _MULTIPLEXER:
+            _MULTIPLEXER = ContainerLogMultiplexer()
+        return _MULTIPLEXER
@@ -0,0 +1,116 @@
+"""
+On-disk cache of the digests of the remote images
+"""
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+from samcli.lib.utils.env_settings import get_float_setting
+
+LOG = logging.getLogger(__name__)
+
+# Seconds the digest of a remote image is reused for without querying its registry again, 0 disables the cache
+REMOTE_IMAGE_DIGEST_CACHE_TTL = get_float_setting("SAM_CLI_REMOTE_IMAGE_DIGEST_CACHE_TTL", 3600, minimum=0)
+
+
+class RemoteImageDigestCache:
+    """
+    Keeps the digests of the remote images in a JSON file, with the time they were fetched at, so the local commands
+    run within the TTL of each other check their base images are up-to-date without a registry round trip. A corrupted
+    or unwritable cache file is ignored, and the digests are fetched from the registry again.
+
+    This class is thread-safe.
+    """
+
+    def __init__(self, cache_file: str, ttl: float = REMOTE_IMAGE_DIGEST_CACHE_TTL):
+        """
+        Parameters
+        ----------
+        cache_file str
+            Path of the JSON file the digests are kept in
+        ttl float
+            Seconds a digest is reused for, 0 disables the cache
+        """
+        self._cache_file = Path(cache_file)
+        self._ttl = ttl
+        self._lock = threading.Lock()
+
+    def get(self, image_name: str) -> Optional[str]:
+        """
+        Returns the cached digest of the remote image
+
+        Parameters
+        ----------
+        image_name str
+            Name of the image
+
+        Returns
+        -------
+        str
+            Digest of the remote image, None if it is not cached or if it expired
+        """
+        if self._ttl <= 0:
+            return None
+
+        with self._lock:
+            entry = self._read().get(image_name)
+        if not isinstance(entry, dict) or time.time() - entry.get("fetched_at", 0) >= self._ttl:
+            return None
+
+        LOG.debug("Reusing the cached digest of the remote image %s", image_name)
+        digest: Optional[str] = entry.get("digest")
+        return digest
+
+    def put(self, image_name: str, digest: str) -> None:
+        """
+        Caches the digest of the remote image, and drops the expired ones
+
+        Parameters
+        ----------
+        image_name str
+            Name of the image
+        digest str
+            Digest of the remote image
+        """
+        if self._ttl <= 0:
+            return
+
+        with self._lock:
+            now = time.time()
+            entries = {
+                name: entry
+                for name, entry in self._read().items()
+                if isinstance(entry, dict) and now - entry.get("fetched_at", 0) < self._ttl
+            }
+            entries[image_name] = {"digest": digest, "fetched_at": now}
+            self._write(entries)
+
+    def _read(self) -> Dict[str, Dict]:
+        try:
+            entries = json.loads(self._cache_file.read_text())
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as ex:
+            LOG.debug("Ignoring the remote image digests cache %s", self._cache_file, exc_info=ex)
+            return {}
+        return entries if isinstance(entries, dict) else {}
+
+    def _write(self, entries: Dict[str, Dict]) -> None:
+        # write to a temporary file first, so the concurrent commands never read a partially written cache
+        try:
+            self._cache_file.parent.mkdir(parents=True, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=str(self._cache_file.parent), prefix=self._cache_file.name)
+            try:
+                with os.fdopen(fd, "w") as temp_file:
+                    json.dump(entries, temp_file)
+                os.replace(temp_path, str(self._cache_file))
+            except BaseException:
+                os.remove(temp_path)
+                raise
+        except OSError as ex:
+            LOG.debug("Failed to write the remote image digests cache %s", self._cache_file, exc_info=ex)
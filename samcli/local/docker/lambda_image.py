@@ -6,19 +6,24 @@ import logging
 import platform
 import re
 import sys
+import threading
 import uuid
+from contextlib import contextmanager
 from enum import Enum
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Hashable, Iterator, Optional, Tuple
 
 import docker
 
 from samcli.commands.local.cli_common.user_exceptions import ImageBuildException
 from samcli.commands.local.lib.exceptions import InvalidIntermediateImageError
+from samcli.lib.providers.provider import LayerVersion
 from samcli.lib.utils.architecture import has_runtime_multi_arch_image
+from samcli.lib.utils.hash import dir_checksum, file_checksum
 from samcli.lib.utils.packagetype import IMAGE, ZIP
 from samcli.lib.utils.stream_writer import StreamWriter
 from samcli.lib.utils.tar import create_tarball
+from samcli.local.docker.image_digest_cache import RemoteImageDigestCache
 from samcli.local.docker.utils import get_docker_platform, get_rapid_name
 
 LOG = logging.getLogger(__name__)
@@ -100,7 +105,15 @@ class LambdaImage:
     _SAM_CLI_REPO_NAME = "samcli/lambda"
     _RAPID_SOURCE_PATH = Path(__file__).parent.joinpath("..", "rapid").resolve()
 
-    def __init__(self, layer_downloader, skip_pull_image, force_image_build, docker_client=None, invoke_images=None):
+    def __init__(
+        self,
+        layer_downloader,
+        skip_pull_image,
+        force_image_build,
+        docker_client=None,
+        invoke_images=None,
+        remote_image_digest_cache: Optional[RemoteImageDigestCache] = None,
+    ):
         """
 
         Parameters
@@ -113,12 +126,68 @@ class LambdaImage:
             True to download the layer and rebuild the image even if it exists already on the system
         docker_client docker.DockerClient
             Optional docker client object
+        remote_image_digest_cache samcli.local.docker.image_digest_cache.RemoteImageDigestCache
+            Optional cache of the remote images digests, the registry is queried each time if not set
         """
         self.layer_downloader = layer_downloader
         self.skip_pull_image = skip_pull_image
         self.force_image_build = force_image_build
         self.docker_client = docker_client or docker.from_env()
         self.invoke_images = invoke_images
+        self._remote_image_digest_cache = remote_image_digest_cache
+        # content digests of the downloaded layers, which never change once downloaded, keyed by their path
+        self._downloaded_layer_digests: Dict[str, str] = {}
+        # images built by image key while they are reused, None when each build checks its image again
+        self._built_images: Optional[Dict[Tuple, str]] = None
+        self._built_images_lock = threading.Lock()
+
+    @contextmanager
+    def reusing_built_images(self) -> Iterator[None]:
+        """
+        Builds each image once while the context is entered, the functions with the same image key reuse the image
+        built for the first of them without checking it again. Once the context is exited, each build checks its image
+        again, as the base images and the layers defined within the template may have changed.
+        """
+        with self._built_images_lock:
+            self._built_images = {}
+        try:
+            yield
+        finally:
+            with self._built_images_lock:
+                self._built_images = None
+
+    def get_image_key(self, runtime, packagetype, image, layers, architecture, function_name=None) -> Tuple:
+        """
+        Returns the key of the image of a function, which is the same for the functions sharing the same image
+
+        Parameters
+        ----------
+        runtime : str
+            Name of the Lambda runtime
+        packagetype : str
+            Packagetype for the Lambda
+        image : str
+            Pre-defined invocation image.
+        layers : list(samcli.commands.local.lib.provider.Layer)
+            List of layers
+        architecture : str
+            Architecture type either x86_64 or arm64 on AWS lambda
+        function_name : str
+            The name of the function that the image is built for
+
+        Returns
+        -------
+        tuple
+            Key of the image
+        """
+        invoke_image = None
+        if packagetype == ZIP and self.invoke_images:
+            invoke_image = self.invoke_images.get(function_name, self.invoke_images.get(None))
+
+        layer_keys: Tuple[Hashable, ...] = tuple(
+            (layer.arn, layer.codeuri) if isinstance(layer, LayerVersion) else repr(layer) for layer in layers or []
+        )
+        return runtime, packagetype, image, invoke_image, architecture, layer_keys
 
     def build(self, runtime, packagetype, image, layers, architecture, stream=None, function_name=None):
         """
@@ -146,6 +215,24 @@ class LambdaImage:
         str
             The image to be used (REPOSITORY:TAG)
         """
+        with self._built_images_lock:
+            built_images = self._built_images
+        if built_images is None:
+            return self._build(runtime, packagetype, image, layers, architecture, stream, function_name)
+
+        key = self.get_image_key(runtime, packagetype, image, layers, architecture, function_name)
+        with self._built_images_lock:
+            rapid_image = built_images.get(key)
+        if rapid_image:
+            LOG.debug("Reusing the image %s built for the same runtime and layers", rapid_image)
+            return rapid_image
+
+        rapid_image = self._build(runtime, packagetype, image, layers, architecture, stream, function_name)
+        with self._built_images_lock:
+            built_images[key] = rapid_image
+        return rapid_image
+
+    def _build(self, runtime, packagetype, image, layers, architecture, stream, function_name):
         base_image = None
         tag_prefix = ""
 
@@ -177,7 +264,9 @@ class LambdaImage:
         if layers and packagetype == ZIP:
             downloaded_layers = self.layer_downloader.download_all(layers, self.force_image_build)
 
-            docker_image_version = self._generate_docker_image_version(downloaded_layers, runtime_image_tag)
+            # the tag is computed from the ID of the base image, which must not change when the image is built
+            self._pull_base_image_if_outdated(base_image, architecture)
+            docker_image_version = self._generate_docker_image_version(downloaded_layers, runtime_image_tag, base_image)
             rapid_image = f"{self._SAM_CLI_REPO_NAME}-{docker_image_version}"
 
         image_not_found = False
@@ -199,12 +288,9 @@ class LambdaImage:
             else:
                 self._remove_rapid_images(image_repo)
 
-        if (
-            self.force_image_build
-            or image_not_found
-            or any(layer.is_defined_within_template for layer in downloaded_layers)
-            or not runtime
-        ):
+        # Images with layers are tagged with the digest of the layers content, so an existing image is up-to-date even
+        # if the layers are defined within the template
+        if self.force_image_build or image_not_found or not runtime:
             stream_writer = stream or StreamWriter(sys.stderr)
             stream_writer.write("Building image...")
             stream_writer.flush()
@@ -222,8 +308,7 @@ class LambdaImage:
         except docker.errors.ImageNotFound:
             return config
 
-    @staticmethod
-    def _generate_docker_image_version(layers, runtime_image_tag):
+    def _generate_docker_image_version(self, layers, runtime_image_tag, base_image):
         """
         Generate the Docker TAG that will be used to create the image
 
@@ -235,6 +320,9 @@ class LambdaImage:
         runtime_image_tag str
             Runtime version format to generate image name and tag (including architecture, e.g. "python:3.7-x86_64")
 
+        base_image str
+            Base image the layers are added to
+
         Returns
         -------
         str
@@ -242,16 +330,65 @@ class LambdaImage:
         """
 
         # Docker has a concept of a TAG on an image. This is plus the REPOSITORY is a way to determine
-        # a version of the image. We will produced a TAG for a combination of the runtime with the layers
-        # specified in the template. This will allow reuse of the runtime and layers across different
-        # functions that are defined. If two functions use the same runtime with the same layers (in the
-        # same order), SAM CLI will only produce one image and use this image across both functions for invoke.
-
-        return (
-            runtime_image_tag
-            + "-"
-            + hashlib.sha256("-".join([layer.name for layer in layers]).encode("utf-8")).hexdigest()[0:25]
-        )
+        # a version of the image. We will produced a TAG for a combination of the base image with the content of the
+        # layers specified in the template. This will allow reuse of the runtime and layers across different
+        # functions and projects. If two functions use the same base image with layers of the same content (in the
+        # same order), whatever their names or ARNs, SAM CLI will only produce one image and use it for both.
+        digests = [self._get_base_image_digest(base_image)] + [self._get_layer_digest(layer) for layer in layers]
+
+        return runtime_image_tag + "-" + hashlib.sha256("-".join(digests).encode("utf-8")).hexdigest()[0:25]
+
+    def _pull_base_image_if_outdated(self, base_image: str, architecture: str) -> None:
+        """
+        Pulls the base image if it is not found locally, or if it is out of date and may be pulled
+
+        Parameters
+        ----------
+        base_image str
+            Base image the layers are added to
+        architecture str
+            Architecture, either x86_64 or arm64
+        """
+        try:
+            self.docker_client.images.get(base_image)
+            self._check_base_image_is_current(base_image)
+            if self.skip_pull_image:
+                return
+        except docker.errors.ImageNotFound:
+            LOG.debug("Base image %s was not found locally", base_image)
+
+        LOG.info("Pulling the base image %s", base_image)
+        try:
+            self.docker_client.images.pull(base_image, platform=get_docker_platform(architecture))
+        except docker.errors.APIError as ex:
+            # the image is pulled again when it is built
+            LOG.debug("Failed to pull the base image %s: %s", base_image, ex)
+
+    def _get_base_image_digest(self, base_image: str) -> str:
+        """
+        Returns the ID of the base image, or its name if it was not pulled yet
+        """
+        try:
+            return str(self.docker_client.images.get(base_image).id)
+        except docker.errors.ImageNotFound:
+            return base_image
+
+    def _get_layer_digest(self, layer) -> str:
+        """
+        Returns the SHA-256 digest of the content of the layer. The digest of a downloaded layer is computed once,
+        layers defined within the template are hashed every time since their content can change.
+        """
+        if not layer.is_defined_within_template and layer.codeuri in self._downloaded_layer_digests:
+            return self._downloaded_layer_digests[layer.codeuri]
+
+        if Path(layer.codeuri).is_dir():
+            digest = dir_checksum(layer.codeuri, hash_generator=hashlib.sha256())
+        else:
+            digest = file_checksum(layer.codeuri, hash_generator=hashlib.sha256())
+
+        if not layer.is_defined_within_template:
+            self._downloaded_layer_digests[layer.codeuri] = digest
+        return digest
 
     def _build_image(self, base_image, docker_tag, layers, architecture, stream=None):
         """
@@ -389,6 +526,23 @@ class LambdaImage:
         except docker.errors.APIError as ex:
             LOG.warning("Failed getting images from repo %s", repo, exc_info=ex)
 
+    @staticmethod
+    def is_layer_image(image_name: str) -> bool:
+        """
+        Is the image one of the images built to add layers to a function's base image?
+
+        Parameters
+        ----------
+        image_name : str
+            Name of the image
+
+        Returns
+        -------
+        bool
+            True if the image belongs to one of the repositories of the images with layers. False, otherwise
+        """
+        return bool(image_name) and image_name.startswith(f"{LambdaImage._SAM_CLI_REPO_NAME}-")
+
     @staticmethod
     def is_rapid_image(image_name: str) -> bool:
         """
@@ -474,7 +628,7 @@ class LambdaImage:
 
     def get_remote_image_digest(self, image_name: str) -> Optional[str]:
         """
-        Get the digest of the remote version of an image
+        Get the digest of the remote version of an image, from the remote image digests cache if it is set
 
         Parameters
         ----------
@@ -486,8 +640,15 @@ class LambdaImage:
         str
             Image digest, including `sha256:` prefix
         """
+        if self._remote_image_digest_cache:
+            cached_digest = self._remote_image_digest_cache.get(image_name)
+            if cached_digest:
+                return cached_digest
+
         remote_info = self.docker_client.images.get_registry_data(image_name)
         digest: Optional[str] = remote_info.attrs.get("Descriptor", {}).get("digest")
+        if digest and self._remote_image_digest_cache:
+            self._remote_image_digest_cache.put(image_name, digest)
         return digest
 
     def get_local_image_digest(self, image_name: str) -> Optional[str]:
@@ -0,0 +1,94 @@
+"""
+Garbage collection of the images built to add layers to the functions base images
+"""
+import logging
+from typing import Dict, List, Tuple
+
+import docker
+
+from samcli.local.docker.lambda_image import LambdaImage
+
+LOG = logging.getLogger(__name__)
+
+
+class LayerImageCache:
+    """
+    The images with layers are tagged with the digest of their base image and layers content, so they are shared by
+    every function and project using the same layers. They are kept after the invokes to be reused, and this class
+    removes them once they take too much disk space.
+    """
+
+    def __init__(self, docker_client=None):
+        """
+        Parameters
+        ----------
+        docker_client docker.DockerClient
+            Optional docker client object
+        """
+        self.docker_client = docker_client or docker.from_env()
+
+    def list_images(self) -> List[Dict]:
+        """
+        Returns the images with layers, most recently created first. The size of each image only counts the Docker
+        layers which are not shared with other images, which is the disk space freed by removing it.
+
+        Returns
+        -------
+        list(dict)
+            Images with their "Id", "RepoTags", "Created" timestamp, "Size" in bytes and "Containers" count
+        """
+        images = []
+        for image in self.docker_client.df().get("Images") or []:
+            if not any(LambdaImage.is_layer_image(tag) for tag in image.get("RepoTags") or []):
+                continue
+
+            shared_size = image.get("SharedSize", -1)
+            images.append(
+                {
+                    "Id": image["Id"],
+                    "RepoTags": image["RepoTags"],
+                    "Created": image.get("Created", 0),
+                    "Size": image["Size"] - shared_size if shared_size > 0 else image["Size"],
+                    "Containers": image.get("Containers", 0),
+                }
+            )
+
+        return sorted(images, key=lambda image: image["Created"], reverse=True)
+
+    def prune(self, max_size_mb: int) -> Tuple[List[str], int]:
+        """
+        Removes the least recently created images with layers until the remaining ones take at most max_size_mb.
+        Images used by a container are never removed.
+
+        Parameters
+        ----------
+        max_size_mb int
+            Disk space in MB the images with layers can keep using
+
+        Returns
+        -------
+        tuple(list(str), int)
+            Tags of the removed images, and the disk space freed in bytes
+        """
+        max_size = max_size_mb * 1024 * 1024
+        kept_size = 0
+        removed_tags: List[str] = []
+        freed_size = 0
+
+        for image in self.list_images():
+            if image["Containers"] > 0 or kept_size + image["Size"] <= max_size:
+                kept_size += image["Size"]
+                continue
+
+            try:
+                self.docker_client.images.remove(image["Id"], force=True)
+            except docker.errors.APIError as ex:
+                LOG.warning("Failed to remove the image %s", ", ".join(image["RepoTags"]), exc_info=ex)
+                kept_size += image["Size"]
+                continue
+
+            LOG.debug("Removed the image %s", ", ".join(image["RepoTags"]))
+            removed_tags.extend(image["RepoTags"])
+            freed_size += image["Size"]
+
+        return removed_tags, freed_size
@@ -8,6 +8,7 @@ import threading
 
 import docker
 
+from samcli.lib.utils import invoke_timing
 from samcli.lib.utils.stream_writer import StreamWriter
 from samcli.local.docker import utils
 from samcli.local.docker.container import Container
@@ -81,7 +82,8 @@ class ContainerManager:
             LOG.info("Using local image: %s.\n", image_name)
         else:
             try:
-                self.pull_image(image_name)
+                with invoke_timing.phase("image_pull"):
+                    self.pull_image(image_name)
             except DockerImagePullFailedException as ex:
                 if not is_image_local:
                     raise DockerImagePullFailedException(
@@ -91,7 +93,8 @@ class ContainerManager:
                 LOG.info("Failed to download a new %s image. Invoking with the already downloaded image.", image_name)
 
         container.network_id = self.docker_network_id
-        container.create()
+        with invoke_timing.phase("container_create"):
+            container.create()
 
     def run(self, container, input_data=None):
         """
@@ -113,7 +116,25 @@ class ContainerManager:
         if not container.is_created():
             self.create(container)
 
-        container.start(input_data=input_data)
+        with invoke_timing.phase("container_start"):
+            container.start(input_data=input_data)
+
+    def pause(self, container: Container) -> None:
+        """
+        Pause all the processes of the container
+
+        :param samcli.local.docker.container.Container container: Container to pause
+        """
+        container.pause()
+
+    def unpause(self, container: Container) -> None:
+        """
+        Resume all the processes of the paused container
+
+        :param samcli.local.docker.container.Container container: Container to unpause
+        """
+        with invoke_timing.phase("container_unpause"):
+            container.unpause()
 
     def stop(self, container: Container) -> None:
         """
@@ -121,9 +142,10 @@ class ContainerManager:
 
         :param samcli.local.docker.container.Container container: Container to stop
         """
-        if self.do_shutdown_event:
-            container.stop()
-        container.delete()
+        with invoke_timing.phase("container_stop"):
+            if self.do_shutdown_event:
+                container.stop()
+            container.delete()
 
     def pull_image(self, image_name, tag=None, stream=None):
         """
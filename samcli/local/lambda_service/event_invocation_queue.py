@@ -0,0 +1,199 @@
+"""
+Queue of the asynchronous (Event) invocations of the local Lambda service
+"""
+import logging
+import queue
+import threading
+import time
+from typing import Callable, Dict, List
+
+from samcli.lib.utils.env_settings import get_float_setting, get_int_setting
+
+LOG = logging.getLogger(__name__)
+
+# Maximum number of Event invocations waiting to be run
+EVENT_INVOKE_QUEUE_SIZE = get_int_setting("SAM_CLI_EVENT_INVOKE_QUEUE_SIZE", 1000, minimum=1)
+# Number of Event invocations run at the same time
+EVENT_INVOKE_WORKERS = get_int_setting("SAM_CLI_EVENT_INVOKE_WORKERS", 4, minimum=1)
+# Seconds before the first retry of a failed Event invocation, doubled before the second one like Lambda does
+EVENT_INVOKE_RETRY_DELAY = get_float_setting("SAM_CLI_EVENT_INVOKE_RETRY_DELAY", 1, minimum=0)
+
+# Lambda retries the failed asynchronous invocations twice
+MAX_EVENT_RETRIES = 2
+
+
+class _EventInvocation:
+    """
+    Asynchronous invocation of a function, with the time it was queued and the number of times it was attempted
+    """
+
+    __slots__ = ("function_name", "event", "queued_at", "attempts")
+
+    def __init__(self, function_name: str, event: str):
+        self.function_name = function_name
+        self.event = event
+        self.queued_at = time.monotonic()
+        self.attempts = 0
+
+
+class EventInvocationQueue:
+    """
+    Bounded queue of the Event invocations, run by a pool of worker threads started on the first queued invocation.
+    A failed invocation is queued again after the retry delay, up to two retries, and dropped after that. The depth of
+    the queue and the age of the invocations, the time they waited in the queue before running, are measured.
+
+    This class is thread-safe.
+    """
+
+    def __init__(
+        self,
+        invoke: Callable[[str, str], bool],
+        workers: int = EVENT_INVOKE_WORKERS,
+        max_size: int = EVENT_INVOKE_QUEUE_SIZE,
+        retry_delay: float = EVENT_INVOKE_RETRY_DELAY,
+    ):
+        """
+        Parameters
+        ----------
+        invoke Callable[[str, str], bool]
+            Invokes a function with an event, and returns True if the invocation succeeded. The invocation fails if it
+            returns False or raises an exception
+        workers int
+            Number of invocations run at the same time
+        max_size int
+            Maximum number of invocations waiting to be run, 0 means no limit
+        retry_delay float
+            Seconds before the first retry of a failed invocation, doubled before the second one
+        """
+        self._invoke = invoke
+        self._workers = workers
+        self._max_size = max_size
+        self._retry_delay = retry_delay
+        # unbounded, as the retries are queued even when the queue is full, the size is only checked by put
+        self._queue: "queue.Queue[_EventInvocation]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._threads: List[threading.Thread] = []
+        # invocations waiting for their retry delay, which are not in the queue yet
+        self._pending_retries = 0
+        self._metrics = {"queued": 0, "rejected": 0, "succeeded": 0, "retried": 0, "failed": 0}
+        self._total_age = 0.0
+        self._max_age = 0.0
+        self._started = 0
+
+    def put(self, function_name: str, event: str) -> bool:
+        """
+        Queues the invocation of a function with an event
+
+        Parameters
+        ----------
+        function_name str
+            Name of the function to invoke
+        event str
+            Event to invoke the function with
+
+        Returns
+        -------
+        bool
+            True if the invocation was queued, False if the queue is full
+        """
+        self._start_workers()
+        with self._lock:
+            if self._max_size and self.depth >= self._max_size:
+                self._metrics["rejected"] += 1
+                LOG.warning(
+                    "Event invocation of %s rejected, %d invocations are queued already", function_name, self.depth
+                )
+                return False
+            self._queue.put(_EventInvocation(function_name, event))
+            self._metrics["queued"] += 1
+
+        LOG.debug("Queued the Event invocation of %s, queue depth: %d", function_name, self.depth)
+        return True
+
+    @property
+    def depth(self) -> int:
+        """
+        Number of invocations waiting to be run, including the ones waiting for their retry delay
+        """
+        return self._queue.qsize() + self._pending_retries
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Returns the depth of the queue, the counts of invocations by outcome, and the average and maximum ages of the
+        invocations in milliseconds
+        """
+        with self._lock:
+            stats: Dict[str, float] = dict(self._metrics)
+            stats["depth"] = self.depth
+            stats["average_age_ms"] = round(self._total_age * 1000 / self._started, 3) if self._started else 0
+            stats["max_age_ms"] = round(self._max_age * 1000, 3)
+        return stats
+
+    def _start_workers(self) -> None:
+        with self._lock:
+            if self._threads:
+                return
+            for index in range(self._workers):
+                thread = threading.Thread(target=self._run, name=f"event-invoke-{index}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def _run(self) -> None:
+        while True:
+            invocation = self._queue.get()
+            try:
+                self._process(invocation)
+            finally:
+                self._queue.task_done()
+
+    def _process(self, invocation: _EventInvocation) -> None:
+        age = time.monotonic() - invocation.queued_at
+        with self._lock:
+            self._started += 1
+            self._total_age += age
+            self._max_age = max(self._max_age, age)
+        invocation.attempts += 1
+        LOG.debug(
+            "Running the Event invocation of %s (attempt %d) after %.0f ms in the queue, queue depth: %d",
+            invocation.function_name,
+            invocation.attempts,
+            age * 1000,
+            self.depth,
+        )
+
+        try:
+            succeeded = self._invoke(invocation.function_name, invocation.event)
+        except Exception as ex:  # pylint: disable=broad-except
+            LOG.debug("Event invocation of %s raised an exception", invocation.function_name, exc_info=ex)
+            succeeded = False
+
+        if succeeded:
+            with self._lock:
+                self._metrics["succeeded"] += 1
+            return
+
+        if invocation.attempts > MAX_EVENT_RETRIES:
+            with self._lock:
+                self._metrics["failed"] += 1
+            LOG.warning(
+                "Event invocation of %s failed after %d attempts, dropping the event",
+                invocation.function_name,
+                invocation.attempts,
+            )
+            return
+
+        delay = self._retry_delay * 2 ** (invocation.attempts - 1)
+        LOG.info("Event invocation of %s failed, retrying in %s seconds", invocation.function_name, delay)
+        with self._lock:
+            self._metrics["retried"] += 1
+            self._pending_retries += 1
+        timer = threading.Timer(delay, self._retry, (invocation,))
+        timer.daemon = True
+        timer.start()
+
+    def _retry(self, invocation: _EventInvocation) -> None:
+        # the retries are queued even if the queue is full, they were accepted already
+        invocation.queued_at = time.monotonic()
+        with self._lock:
+            self._queue.put(invocation)
+            self._pending_retries -= 1
@@ -25,6 +25,10 @@ class LambdaErrorResponses:
 
     MethodNotAllowedException = ("MethodNotAllowedLocally", 405)
 
+    # The request throughput limit was exceeded. The full name of the error is kept, as the AWS SDKs retry the
+    # requests failing with it
+    TooManyRequestsException = ("TooManyRequestsException", 429)
+
     # Error Types
     USER_ERROR = "User"
     SERVICE_ERROR = "Service"
@@ -108,6 +112,29 @@ class LambdaErrorResponses:
             exception_tuple[1],
         )
 
+    @staticmethod
+    def too_many_requests(message):
+        """
+        Creates a Lambda Service TooManyRequests Response
+
+        Parameters
+        ----------
+        message str
+            Message to be added to the body of the response
+
+        Returns
+        -------
+        Flask.Response
+            A response object representing the TooManyRequests Error
+        """
+        exception_tuple = LambdaErrorResponses.TooManyRequestsException
+
+        return BaseLocalService.service_response(
+            LambdaErrorResponses._construct_error_response_body(LambdaErrorResponses.USER_ERROR, message),
+            LambdaErrorResponses._construct_headers(exception_tuple[0]),
+            exception_tuple[1],
+        )
+
     @staticmethod
     def generic_service_exception(*args):
         """
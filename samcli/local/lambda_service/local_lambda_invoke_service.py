@@ -9,13 +9,17 @@ from werkzeug.routing import BaseConverter
 
 from samcli.commands.local.lib.exceptions import UnsupportedInlineCodeError
 from samcli.lib.utils.stream_writer import StreamWriter
-from samcli.local.lambdafn.exceptions import FunctionNotFound
-from samcli.local.services.base_local_service import BaseLocalService, LambdaOutputParser
+from samcli.local.lambdafn.exceptions import FunctionNotFound, FunctionThrottled
+from samcli.local.services.base_local_service import STATS_PATH, BaseLocalService, LambdaOutputParser
 
+from .event_invocation_queue import EventInvocationQueue
 from .lambda_error_responses import LambdaErrorResponses
 
 LOG = logging.getLogger(__name__)
 
+REQUEST_RESPONSE_INVOCATION_TYPE = "RequestResponse"
+EVENT_INVOCATION_TYPE = "Event"
+
 
 class FunctionNamePathConverter(BaseConverter):
     regex = ".+"
@@ -48,6 +52,7 @@ class LocalLambdaInvokeService(BaseLocalService):
         super().__init__(lambda_runner.is_debugging(), port=port, host=host)
         self.lambda_runner = lambda_runner
         self.stderr = stderr
+        self._event_queue = EventInvocationQueue(self._invoke_event)
 
     def create(self):
         """
@@ -66,6 +71,13 @@ class LocalLambdaInvokeService(BaseLocalService):
             methods=["POST"],
             provide_automatic_options=False,
         )
+        self._app.add_url_rule(
+            STATS_PATH,
+            endpoint=STATS_PATH,
+            view_func=self._stats_request_handler,
+            methods=["GET"],
+            provide_automatic_options=False,
+        )
 
         # setup request validation before Flask calls the view_func
         self._app.before_request(LocalLambdaInvokeService.validate_request)
@@ -82,7 +94,7 @@ class LocalLambdaInvokeService(BaseLocalService):
             2. Query Parameters are sent to the endpoint
             3. The Request Content-Type is not application/json
             4. 'X-Amz-Log-Type' header is not 'None'
-            5. 'X-Amz-Invocation-Type' header is not 'RequestResponse'
+            5. 'X-Amz-Invocation-Type' header is not 'RequestResponse' or 'Event'
 
         Returns
         -------
@@ -121,11 +133,15 @@ class LocalLambdaInvokeService(BaseLocalService):
                 "log-type: {} is not supported. None is only supported.".format(log_type)
             )
 
-        invocation_type = request_headers.get("X-Amz-Invocation-Type", "RequestResponse")
-        if invocation_type != "RequestResponse":
-            LOG.warning("invocation-type: %s is not supported. RequestResponse is only supported.", invocation_type)
+        invocation_type = request_headers.get("X-Amz-Invocation-Type", REQUEST_RESPONSE_INVOCATION_TYPE)
+        if invocation_type not in (REQUEST_RESPONSE_INVOCATION_TYPE, EVENT_INVOCATION_TYPE):
+            LOG.warning(
+                "invocation-type: %s is not supported. RequestResponse and Event are only supported.", invocation_type
+            )
             return LambdaErrorResponses.not_implemented_locally(
-                "invocation-type: {} is not supported. RequestResponse is only supported.".format(invocation_type)
+                "invocation-type: {} is not supported. RequestResponse and Event are only supported.".format(
+                    invocation_type
+                )
             )
 
         return None
@@ -162,6 +178,9 @@ class LocalLambdaInvokeService(BaseLocalService):
 
         request_data = request_data.decode("utf-8")
 
+        if flask_request.headers.get("X-Amz-Invocation-Type") == EVENT_INVOCATION_TYPE:
+            return self._queue_event_invocation(function_name, request_data)
+
         stdout_stream = io.BytesIO()
         stdout_stream_writer = StreamWriter(stdout_stream, auto_flush=True)
 
@@ -170,6 +189,8 @@ class LocalLambdaInvokeService(BaseLocalService):
         except FunctionNotFound:
             LOG.debug("%s was not found to invoke.", function_name)
             return LambdaErrorResponses.resource_not_found(function_name)
+        except FunctionThrottled as ex:
+            return LambdaErrorResponses.too_many_requests(str(ex))
         except UnsupportedInlineCodeError:
             return LambdaErrorResponses.not_implemented_locally(
                 "Inline code is not supported for sam local commands. Please write your code in a separate file."
@@ -183,3 +204,62 @@ class LocalLambdaInvokeService(BaseLocalService):
             )
 
         return self.service_response(lambda_response, {"Content-Type": "application/json"}, 200)
+
+    def _queue_event_invocation(self, function_name, request_data):
+        """
+        Queues the asynchronous invocation of a function, which is run by the workers of the Event invocation queue
+
+        Parameters
+        ----------
+        function_name str
+            Name of the function to invoke
+        request_data str
+            Event to invoke the function with
+
+        Returns
+        -------
+        A Flask Response with the 202 status code of the accepted Event invocations
+        """
+        if not self.lambda_runner.provider.get(function_name):
+            LOG.debug("%s was not found to invoke.", function_name)
+            return LambdaErrorResponses.resource_not_found(function_name)
+
+        if not self._event_queue.put(function_name, request_data):
+            return LambdaErrorResponses.too_many_requests(
+                "The Event invocation queue is full, {} invocations are waiting to be run.".format(
+                    self._event_queue.depth
+                )
+            )
+
+        return self.service_response("", {"Content-Type": "application/json"}, 202)
+
+    def _invoke_event(self, function_name, request_data):
+        """
+        Runs an Event invocation of a function
+
+        Returns
+        -------
+        bool
+            True if the function succeeded, False if it returned an error, so the invocation is retried
+        """
+        stdout_stream = io.BytesIO()
+        stdout_stream_writer = StreamWriter(stdout_stream, auto_flush=True)
+        self.lambda_runner.invoke(function_name, request_data, stdout=stdout_stream_writer, stderr=self.stderr)
+
+        _, is_lambda_user_error_response = LambdaOutputParser.get_lambda_output(stdout_stream)
+        return not is_lambda_user_error_response
+
+    def _stats_request_handler(self):
+        """
+        Request Handler of the statistics of the service: the executions in flight and the throttles of the account
+        and of each function, and the depth and age metrics of the Event invocation queue
+
+        Returns
+        -------
+        A Flask Response with the statistics as JSON
+        """
+        stats = {
+            "concurrency": self.lambda_runner.concurrency_limiter.stats(),
+            "event_invocations": self._event_queue.stats(),
+        }
+        return self.service_response(json.dumps(stats), {"Content-Type": "application/json"}, 200)
@@ -0,0 +1,191 @@
+"""
+Concurrency limits of the local invocations, emulating the throttling of Lambda
+"""
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+from samcli.lib.utils.env_settings import get_float_setting, get_int_setting
+
+from .exceptions import FunctionThrottled
+
+LOG = logging.getLogger(__name__)
+
+# Maximum number of concurrent executions of the functions without reserved concurrency, 0 means no limit
+ACCOUNT_CONCURRENCY_LIMIT = get_int_setting("SAM_CLI_ACCOUNT_CONCURRENCY_LIMIT", 0, minimum=0)
+# Seconds an invocation over the concurrency limits waits for an execution to end before being throttled, 0 throttles
+# it immediately like Lambda does
+CONCURRENCY_QUEUE_TIMEOUT = get_float_setting("SAM_CLI_CONCURRENCY_QUEUE_TIMEOUT", 0, minimum=0)
+
+# Reasons of the TooManyRequestsException errors of Lambda
+RESERVED_CONCURRENCY_EXCEEDED = "ReservedFunctionConcurrentInvocationLimitExceeded"
+ACCOUNT_CONCURRENCY_EXCEEDED = "ConcurrentInvocationLimitExceeded"
+
+_THROTTLED_MESSAGE = "Rate Exceeded."
+
+
+class _FunctionConcurrency:
+    """
+    Concurrent executions of a function
+    """
+
+    __slots__ = ("reserved", "in_flight", "max_in_flight", "invocations", "throttles")
+
+    def __init__(self):
+        self.reserved: Optional[int] = None
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.invocations = 0
+        self.throttles = 0
+
+
+class ConcurrencyLimiter:
+    """
+    Counts the executions in flight of each function, and throttles the invocations exceeding the reserved concurrency
+    of their function. The functions without reserved concurrency share the account concurrency limit, minus the
+    concurrency reserved by all the functions of the template, as Lambda does with the unreserved concurrency of an
+    account. The invocations over the limits are throttled immediately, or wait for an execution to end until the queue
+    timeout. The invocations of a function reserving no concurrency at all are always throttled.
+
+    This class is thread-safe.
+    """
+
+    def __init__(
+        self, account_limit: int = ACCOUNT_CONCURRENCY_LIMIT, queue_timeout: float = CONCURRENCY_QUEUE_TIMEOUT
+    ):
+        """
+        Parameters
+        ----------
+        account_limit int
+            Maximum number of concurrent executions of the functions without reserved concurrency, 0 means no limit
+        queue_timeout float
+            Seconds an invocation over the limits waits for an execution to end before being throttled
+        """
+        self._account_limit = account_limit
+        self._queue_timeout = queue_timeout
+        self._condition = threading.Condition()
+        self._functions: Dict[str, _FunctionConcurrency] = {}
+        # executions in flight of the functions without reserved concurrency
+        self._unreserved_in_flight = 0
+        # concurrency reserved by the functions, kept up to date as their reserved concurrency changes
+        self._reserved_total = 0
+        self._throttles = 0
+
+    @contextmanager
+    def execution(self, function_name: str, reserved_concurrency: Optional[int] = None) -> Iterator[None]:
+        """
+        Counts an execution of a function while the context is entered
+
+        Parameters
+        ----------
+        function_name str
+            Full path of the function
+        reserved_concurrency int
+            Optional. ReservedConcurrentExecutions of the function, which is not limited if it is not set
+
+        Raises
+        ------
+        FunctionThrottled
+            When the execution exceeds the concurrency limits, after waiting for the queue timeout
+        """
+        deadline = time.monotonic() + self._queue_timeout
+        with self._condition:
+            function = self._set_reserved_concurrency(function_name, reserved_concurrency)
+            function.invocations += 1
+
+            reason = self._get_throttle_reason(function)
+            while reason:
+                remaining = deadline - time.monotonic()
+                # no execution ending would let the invocation run, it is not queued
+                if remaining <= 0 or function.reserved == 0:
+                    function.throttles += 1
+                    self._throttles += 1
+                    LOG.info("Invocation of %s throttled (%s)", function_name, reason)
+                    raise FunctionThrottled(_THROTTLED_MESSAGE, reason)
+                self._condition.wait(remaining)
+                reason = self._get_throttle_reason(function)
+
+            function.in_flight += 1
+            function.max_in_flight = max(function.max_in_flight, function.in_flight)
+            is_unreserved = function.reserved is None
+            if is_unreserved:
+                self._unreserved_in_flight += 1
+
+        try:
+            yield
+        finally:
+            with self._condition:
+                function.in_flight -= 1
+                if is_unreserved:
+                    self._unreserved_in_flight -= 1
+                self._condition.notify_all()
+
+    def set_reserved_concurrencies(self, reserved_concurrencies: Dict[str, Optional[int]]) -> None:
+        """
+        Sets the reserved concurrency of all the functions, before they are invoked, so the concurrency they reserve is
+        taken off the unreserved concurrency from the start. The functions missing from the given ones, which were
+        removed from the template, do not reserve concurrency anymore.
+
+        Parameters
+        ----------
+        reserved_concurrencies dict
+            ReservedConcurrentExecutions by function full path, None for the functions without reserved concurrency
+        """
+        with self._condition:
+            for function_name in self._functions.keys() - reserved_concurrencies.keys():
+                self._set_reserved_concurrency(function_name, None)
+            for function_name, reserved_concurrency in reserved_concurrencies.items():
+                self._set_reserved_concurrency(function_name, reserved_concurrency)
+            # the unreserved concurrency may have grown
+            self._condition.notify_all()
+
+    def stats(self) -> Dict:
+        """
+        Returns the account limit and throttle count, with the reserved concurrency, executions in flight, maximum
+        executions in flight, invocation and throttle counts of each invoked function
+        """
+        with self._condition:
+            return {
+                "account": {
+                    "limit": self._account_limit,
+                    "unreserved_limit": self._get_unreserved_limit(),
+                    "in_flight": sum(function.in_flight for function in self._functions.values()),
+                    "throttles": self._throttles,
+                },
+                "functions": {
+                    name: {
+                        "reserved": function.reserved,
+                        "in_flight": function.in_flight,
+                        "max_in_flight": function.max_in_flight,
+                        "invocations": function.invocations,
+                        "throttles": function.throttles,
+                    }
+                    for name, function in self._functions.items()
+                },
+            }
+
+    def _set_reserved_concurrency(
+        self, function_name: str, reserved_concurrency: Optional[int]
+    ) -> _FunctionConcurrency:
+        function = self._functions.get(function_name)
+        if not function:
+            function = self._functions[function_name] = _FunctionConcurrency()
+        self._reserved_total += (reserved_concurrency or 0) - (function.reserved or 0)
+        function.reserved = reserved_concurrency
+        return function
+
+    def _get_throttle_reason(self, function: _FunctionConcurrency) -> Optional[str]:
+        if function.reserved is not None:
+            return RESERVED_CONCURRENCY_EXCEEDED if function.in_flight >= function.reserved else None
+
+        unreserved_limit = self._get_unreserved_limit()
+        if unreserved_limit is not None and self._unreserved_in_flight >= unreserved_limit:
+            return ACCOUNT_CONCURRENCY_EXCEEDED
+        return None
+
+    def _get_unreserved_limit(self) -> Optional[int]:
+        if not self._account_limit:
+            return None
+        return max(self._account_limit - self._reserved_total, 0)
@@ -31,6 +31,7 @@ class FunctionConfig:
         timeout=None,
         runtime_management_config=None,
         env_vars=None,
+        reserved_concurrent_executions=None,
     ):
         """
         Parameters
@@ -64,6 +65,8 @@ class FunctionConfig:
         env_vars : str, optional
             Environment variables, by default None
              If it not provided, this class will generate one for you based on the function properties
+        reserved_concurrent_executions : int, optional
+            Maximum number of concurrent executions reserved for the function, by default None
 
         Raises
         ------
@@ -85,6 +88,7 @@ class FunctionConfig:
 
         self.timeout = timeout or self._DEFAULT_TIMEOUT_SECONDS
         self.runtime_management_config = runtime_management_config
+        self.reserved_concurrent_executions = reserved_concurrent_executions
 
         if not isinstance(self.timeout, int):
             try:
@@ -0,0 +1,264 @@
+"""
+Pool of warm containers serving a single Lambda function
+"""
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from samcli.local.docker.container import Container
+
+LOG = logging.getLogger(__name__)
+
+
+class ContainerPoolDrainedError(Exception):
+    """
+    The container pool got drained while a container was being checked out of it
+    """
+
+    def __init__(self, function_full_path: str, container: Optional[Container] = None):
+        """
+        Parameters
+        ----------
+        function_full_path str
+            Full path of the function of the drained pool
+        container Container
+            Container created or reused for the caller before the pool got drained, which the caller must stop
+        """
+        super().__init__(f"The warm containers pool of Lambda function '{function_full_path}' got drained")
+        self.container = container
+
+
+class ContainerPool:
+    """
+    Keeps the warm containers of one Lambda function. A container is checked out for the duration of an invoke and
+    checked back in afterwards, so each container serves one request at a time like a Lambda execution environment.
+    When every container is busy, a new one is created until the pool reaches its maximum size; after that,
+    callers queue until a container is checked back in.
+
+    This class is thread-safe.
+    """
+
+    def __init__(self, function_full_path: str, max_size: int = 1, memory_mb: int = 0):
+        """
+        Parameters
+        ----------
+        function_full_path str
+            Full path of the function the containers of this pool belong to
+        max_size int
+            Maximum number of containers this pool can hold. Defaults to 1
+        memory_mb int
+            Memory limit in MB of each container of this pool
+        """
+        self.function_full_path = function_full_path
+        self.max_size = max(1, max_size)
+        self.memory_mb = memory_mb
+
+        # most recently used containers are kept at the end of the list, so they get reused first
+        self._idle: List[Container] = []
+        self._busy: List[Container] = []
+        # number of containers which are being created or validated, and are not in any of the above lists yet
+        self._pending = 0
+        # monotonic time of the last time each idle container got checked in
+        self._last_used: Dict[Container, float] = {}
+        # set once the pool is drained, no container can be checked out of it anymore
+        self._drained = False
+        self._condition = threading.Condition()
+
+    @property
+    def size(self) -> int:
+        """
+        Returns the number of containers held by this pool, including the ones which are still being created
+        """
+        with self._condition:
+            return len(self._idle) + len(self._busy) + self._pending
+
+    @property
+    def drained(self) -> bool:
+        """
+        Returns True if the pool got drained
+        """
+        with self._condition:
+            return self._drained
+
+    @property
+    def containers(self) -> List[Container]:
+        """
+        Returns all the created containers of this pool, either idle or busy
+        """
+        with self._condition:
+            return self._idle + self._busy
+
+    @property
+    def idle_containers(self) -> List[Tuple[Container, float]]:
+        """
+        Returns the idle containers of this pool, with the monotonic time they were last used at
+        """
+        with self._condition:
+            return [(container, self._last_used[container]) for container in self._idle]
+
+    def checkout(self, container_factory: Callable[[], Container]) -> Container:
+        """
+        Checks out an idle container, creates a new one if the pool is not full yet, or blocks until a container is
+        checked back in by another caller.
+
+        Parameters
+        ----------
+        container_factory Callable[[], Container]
+            Callable which creates a new container for the function
+
+        Returns
+        -------
+        Container
+            Container reserved for the caller until it is checked in
+
+        Raises
+        ------
+        ContainerPoolDrainedError
+            If the pool is drained before a container is checked out
+        """
+        while True:
+            with self._condition:
+                while (
+                    not self._drained
+                    and not self._idle
+                    and len(self._idle) + len(self._busy) + self._pending >= self.max_size
+                ):
+                    LOG.debug(
+                        "All %d warm containers of Lambda function '%s' are busy, waiting for one to be released",
+                        self.max_size,
+                        self.function_full_path,
+                    )
+                    self._condition.wait()
+
+                if self._drained:
+                    raise ContainerPoolDrainedError(self.function_full_path)
+
+                container = self._idle.pop() if self._idle else None
+                self._last_used.pop(container, None)
+                self._pending += 1
+
+            if container is None:
+                return self._add_new_container(container_factory)
+
+            if container.is_created():
+                LOG.info("Reuse the created warm container for Lambda function '%s'", self.function_full_path)
+                self._mark_busy(container)
+                return container
+
+            LOG.debug("Warm container of Lambda function '%s' does not exist anymore", self.function_full_path)
+            self._release_pending_slot()
+
+    def checkin(self, container: Container) -> bool:
+        """
+        Returns a checked out container to the pool, so it can serve the next request
+
+        Parameters
+        ----------
+        container Container
+            Container to be returned
+
+        Returns
+        -------
+        bool
+            True if the container belongs to this pool, False if it is unknown or got drained meanwhile
+        """
+        with self._condition:
+            if container not in self._busy:
+                return False
+
+            self._busy.remove(container)
+            self._idle.append(container)
+            self._last_used[container] = time.monotonic()
+            self._condition.notify()
+            return True
+
+    def evict(self, container: Container) -> bool:
+        """
+        Removes the given container from the pool, if it is still idle. The caller is responsible for stopping it.
+
+        Parameters
+        ----------
+        container Container
+            Idle container to be removed
+
+        Returns
+        -------
+        bool
+            True if the container got removed, False if it got checked out or drained meanwhile
+        """
+        with self._condition:
+            if container not in self._idle:
+                return False
+
+            self._idle.remove(container)
+            self._last_used.pop(container, None)
+            # a slot got freed, so a new container can be created by any waiting caller
+            self._condition.notify()
+            return True
+
+    def run_if_idle(self, container: Container, action: Callable[[Container], None]) -> bool:
+        """
+        Runs the action on the given container if it is still idle, while preventing it from being checked out until
+        the action is done
+
+        Parameters
+        ----------
+        container Container
+            Idle container to run the action on
+        action Callable[[Container], None]
+            Action to run on the container
+
+        Returns
+        -------
+        bool
+            True if the action ran, False if the container got checked out, evicted or drained meanwhile
+        """
+        with self._condition:
+            if container not in self._idle:
+                return False
+
+            action(container)
+            return True
+
+    def drain(self) -> List[Container]:
+        """
+        Removes all the containers from the pool. Busy containers which are checked in later are ignored, and the
+        pending checkouts fail with ContainerPoolDrainedError, handing over the containers they created or reused.
+
+        Returns
+        -------
+        List[Container]
+            The removed containers, so the caller can stop them
+        """
+        with self._condition:
+            containers = self._idle + self._busy
+            self._idle = []
+            self._busy = []
+            self._last_used = {}
+            self._drained = True
+            self._condition.notify_all()
+            return containers
+
+    def _add_new_container(self, container_factory: Callable[[], Container]) -> Container:
+        try:
+            container = container_factory()
+        except BaseException:
+            self._release_pending_slot()
+            raise
+
+        self._mark_busy(container)
+        return container
+
+    def _mark_busy(self, container: Container) -> None:
+        with self._condition:
+            self._pending -= 1
+            if self._drained:
+                # the container is not known by the drained pool anymore, so its stopping falls to the caller
+                raise ContainerPoolDrainedError(self.function_full_path, container)
+            self._busy.append(container)
+
+    def _release_pending_slot(self) -> None:
+        with self._condition:
+            self._pending -= 1
+            self._condition.notify()
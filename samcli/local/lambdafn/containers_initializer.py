@@ -0,0 +1,207 @@
+"""
+EAGER initialization of the warm containers of the functions, bounded to avoid overwhelming the Docker daemon
+"""
+import logging
+import threading
+import time
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Hashable, List, Optional
+
+from samcli.lib.utils.env_settings import get_float_setting, get_int_setting
+from samcli.local.lambdafn.config import FunctionConfig
+
+LOG = logging.getLogger(__name__)
+
+# Number of distinct images built or pulled at the same time while initializing the containers
+EAGER_INIT_IMAGE_CONCURRENCY = get_int_setting("SAM_CLI_EAGER_INIT_IMAGE_CONCURRENCY", 2, minimum=1)
+# Number of containers created and started at the same time while initializing the containers
+EAGER_INIT_CONTAINER_CONCURRENCY = get_int_setting("SAM_CLI_EAGER_INIT_CONTAINER_CONCURRENCY", 8, minimum=1)
+# Seconds the containers are initialized within, the containers not started by then are started on the first
+# invocation of their function. 0 means no limit
+EAGER_INIT_TIME_BUDGET = get_float_setting("SAM_CLI_EAGER_INIT_TIME_BUDGET", 0, minimum=0)
+
+
+class ContainersInitializer:
+    """
+    Initializes the containers of the functions in two phases. The first one prepares the distinct images of the
+    functions, the functions sharing the same runtime, architecture and layers sharing the same image, with a bounded
+    parallelism. The second one creates and starts the containers with a bounded concurrency, reusing the prepared
+    images. Both phases share a time budget, and log their progress with the time each function was ready at.
+    """
+
+    def __init__(
+        self,
+        lambda_runtime,
+        start_container: Callable[[FunctionConfig], None],
+        image_concurrency: int = EAGER_INIT_IMAGE_CONCURRENCY,
+        container_concurrency: int = EAGER_INIT_CONTAINER_CONCURRENCY,
+        time_budget: float = EAGER_INIT_TIME_BUDGET,
+    ):
+        """
+        Parameters
+        ----------
+        lambda_runtime samcli.local.lambdafn.runtime.LambdaRuntime
+            Runtime preparing the images of the functions
+        start_container Callable[[FunctionConfig], None]
+            Creates and starts the container of a function
+        image_concurrency int
+            Number of images prepared at the same time
+        container_concurrency int
+            Number of containers created and started at the same time
+        time_budget float
+            Seconds the containers are initialized within, 0 means no limit
+        """
+        self._lambda_runtime = lambda_runtime
+        self._start_container = start_container
+        self._image_concurrency = max(image_concurrency, 1)
+        self._container_concurrency = max(container_concurrency, 1)
+        self._time_budget = time_budget
+        self._lock = threading.Lock()
+        self._started_at = 0.0
+        self._ready_count = 0
+
+    def initialize(self, function_configs: List[FunctionConfig]) -> Dict[str, float]:
+        """
+        Initializes the containers of the functions
+
+        Parameters
+        ----------
+        function_configs list(FunctionConfig)
+            Configurations of the functions to initialize the containers of
+
+        Returns
+        -------
+        dict
+            Seconds each function was ready after, since the initialization started, by function full path. The
+            functions not initialized within the time budget are missing
+        """
+        deadline = self._start()
+        ready_times: Dict[str, float] = {}
+        with self._lambda_runtime.reusing_built_images():
+            if not self._prepare_images(function_configs, deadline):
+                return ready_times
+
+            self._ready_count = 0
+            not_started = self._run(
+                lambda function_config: self._initialize_container(function_config, len(function_configs), ready_times),
+                function_configs,
+                self._container_concurrency,
+                deadline,
+            )
+            if not_started:
+                LOG.warning(
+                    "%d containers were not initialized within %s seconds, they are started on the first invocation "
+                    "of their functions",
+                    len(not_started),
+                    self._time_budget,
+                )
+        return ready_times
+
+    def prepare_images(self, function_configs: List[FunctionConfig]) -> bool:
+        """
+        Prepares the distinct images of the functions only, so their containers are started without building or
+        pulling any image on the first invocation of the functions
+
+        Parameters
+        ----------
+        function_configs list(FunctionConfig)
+            Configurations of the functions to prepare the images of
+
+        Returns
+        -------
+        bool
+            True if all the images were prepared within the time budget
+        """
+        deadline = self._start()
+        with self._lambda_runtime.reusing_built_images():
+            return self._prepare_images(function_configs, deadline)
+
+    def _start(self) -> Optional[float]:
+        """
+        Starts the time budget, and returns its monotonic deadline, None if the time budget is not limited
+        """
+        self._started_at = time.monotonic()
+        return self._started_at + self._time_budget if self._time_budget > 0 else None
+
+    def _prepare_images(self, function_configs: List[FunctionConfig], deadline: Optional[float]) -> bool:
+        images: Dict[Hashable, FunctionConfig] = {}
+        for function_config in function_configs:
+            images.setdefault(self._lambda_runtime.get_image_key(function_config), function_config)
+
+        LOG.info("Preparing %d images for %d functions", len(images), len(function_configs))
+        self._ready_count = 0
+        not_prepared = self._run(
+            lambda function_config: self._prepare_image(function_config, len(images)),
+            list(images.values()),
+            self._image_concurrency,
+            deadline,
+        )
+        if not_prepared:
+            LOG.warning(
+                "%d images were not prepared within %s seconds, they are prepared on the first invocation of their "
+                "functions",
+                len(not_prepared),
+                self._time_budget,
+            )
+        return not not_prepared
+
+    def _prepare_image(self, function_config: FunctionConfig, total: int) -> None:
+        image = self._lambda_runtime.prepare_image(function_config)
+        with self._lock:
+            self._ready_count += 1
+            LOG.info("Prepared the image %s in %.1fs (%d/%d)", image, self._get_elapsed(), self._ready_count, total)
+
+    def _initialize_container(self, function_config: FunctionConfig, total: int, ready_times: Dict[str, float]) -> None:
+        self._start_container(function_config)
+        with self._lock:
+            ready_times[function_config.full_path] = elapsed = self._get_elapsed()
+            self._ready_count += 1
+            LOG.info(
+                "Initialized the container of %s in %.1fs (%d/%d)",
+                function_config.full_path,
+                elapsed,
+                self._ready_count,
+                total,
+            )
+
+    def _get_elapsed(self) -> float:
+        return time.monotonic() - self._started_at
+
+    @staticmethod
+    def _run(
+        task: Callable[[FunctionConfig], None],
+        function_configs: List[FunctionConfig],
+        concurrency: int,
+        deadline: Optional[float],
+    ) -> List[FunctionConfig]:
+        """
+        Runs the task for each function with the given concurrency until the deadline. The tasks not started by the
+        deadline are cancelled, and the running ones complete in the background.
+
+        Returns
+        -------
+        list(FunctionConfig)
+            The functions the task did not complete for within the deadline
+
+        Raises
+        ------
+        Exception
+            The first exception raised by a task, once the running tasks completed
+        """
+        executor = ThreadPoolExecutor(max_workers=concurrency)
+        futures = {executor.submit(task, function_config): function_config for function_config in function_configs}
+        wait_for_running = False
+        try:
+            timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+            done, not_done = wait(futures, timeout=timeout, return_when=FIRST_EXCEPTION)
+            for future in done:
+                exception = future.exception()
+                if exception:
+                    # the containers being started are cleaned once they are, with the other ones
+                    wait_for_running = True
+                    raise exception
+            return [futures[future] for future in not_done]
+        finally:
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=wait_for_running)
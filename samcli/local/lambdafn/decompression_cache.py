@@ -0,0 +1,272 @@
+"""
+On-disk cache of the decompressed zip/jar code archives
+"""
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Dict, Iterator, List, Optional, Tuple
+
+from samcli.lib.utils.env_settings import get_int_setting
+from samcli.lib.utils.hash import file_checksum
+
+from .zip import unzip
+
+LOG = logging.getLogger(__name__)
+
+# Maximum disk space in MB used by the decompressed archives, 0 means no limit
+DECOMPRESSION_CACHE_MAX_SIZE_MB = get_int_setting("SAM_CLI_DECOMPRESSION_CACHE_MAX_SIZE_MB", 2048, minimum=0)
+
+_SIZE_FILE_SUFFIX = ".size"
+# leases of the trees, one file per tree and process using it, locked by this process as long as it lives
+_LEASE_FILE_INFIX = ".lease-"
+# file locked while a process looks up, decompresses or evicts the trees
+_LOCK_FILE_NAME = ".lock"
+
+if os.name == "nt":
+    import msvcrt
+
+    def _lock_file(file: IO, blocking: bool) -> None:
+        while True:
+            try:
+                # LK_LOCK retries for 10 seconds only
+                msvcrt.locking(file.fileno(), msvcrt.LK_LOCK if blocking else msvcrt.LK_NBLCK, 1)
+                return
+            except OSError:
+                if not blocking:
+                    raise
+
+    def _unlock_file(file: IO) -> None:
+        msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
+
+else:
+    import fcntl
+
+    def _lock_file(file: IO, blocking: bool) -> None:
+        fcntl.flock(file.fileno(), fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+    def _unlock_file(file: IO) -> None:
+        fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+
+
+class DecompressionCache:
+    """
+    Decompresses each archive once, into a directory named after the SHA-256 digest of its content, so the repeated
+    creations of a function container and all the containers of a pool mount the same tree. The trees are only
+    mounted read-only in the containers, and they are kept between commands for the next cold starts. Once the cache
+    takes more than its maximum size, the least recently used trees are removed, except the ones used by any running
+    process. Each process holds a locked lease file per tree as long as any of its containers uses it, and the processes
+    share the cache under a lock file.
+
+    This class is thread-safe, and the cache can be shared by concurrent processes.
+    """
+
+    def __init__(self, cache_dir: str, max_size_mb: int = DECOMPRESSION_CACHE_MAX_SIZE_MB):
+        """
+        Parameters
+        ----------
+        cache_dir str
+            Directory the archives are decompressed in
+        max_size_mb int
+            Maximum disk space in MB used by the decompressed archives, 0 means no limit
+        """
+        self._cache_dir = Path(cache_dir)
+        self._max_size = max_size_mb * 1024 * 1024
+        self._lock = threading.Lock()
+        # digests of the archives, by path, modification time and size, so unchanged archives are not hashed again
+        self._digests: Dict[Tuple[str, int, int], str] = {}
+        # leases of the trees used by this process, which must not be removed while the containers mounting them may
+        # still run, by digest
+        self._leases: Dict[str, IO] = {}
+        # number of the uses of each leased tree, the lease is released once none uses it anymore, by digest
+        self._lease_counts: Dict[str, int] = {}
+        self._lease_token = f"{os.getpid()}-{uuid.uuid4().hex}"
+
+    def get_code_dir(self, archive_path: str) -> str:
+        """
+        Returns the directory the given archive is decompressed in, decompressing it if it was not yet
+
+        Parameters
+        ----------
+        archive_path str
+            Path of the zip/jar archive
+
+        Returns
+        -------
+        str
+            Real path of the directory containing the content of the archive
+        """
+        digest = self._get_digest(archive_path)
+        code_dir = self._cache_dir.joinpath(digest)
+
+        with self._lock, self._locked_cache_dir():
+            self._acquire_lease(digest)
+            if code_dir.is_dir():
+                LOG.debug("Reusing the decompressed %s from %s", archive_path, code_dir)
+                # the modification time orders the trees from the least recently used when evicting them
+                os.utime(code_dir)
+            else:
+                self._decompress(archive_path, code_dir)
+                self._evict()
+
+        # The directory that Python returns might have symlinks. The Docker File sharing settings will not resolve
+        # symlinks. Hence get the real path before passing to Docker.
+        return os.path.realpath(code_dir)
+
+    def release(self, code_dirs: Optional[List[str]] = None) -> None:
+        """
+        Releases a use of the given trees, once the container mounting them is stopped. The lease of a tree is released
+        when none of the containers of this process uses it anymore, so it can be evicted.
+
+        Parameters
+        ----------
+        code_dirs list(str)
+            Optional. Directories returned by get_code_dir, the directories which are not in the cache are ignored.
+            Releases all the leases of this process if not given
+        """
+        with self._lock:
+            if code_dirs is None:
+                for digest in list(self._leases):
+                    self._release_lease(digest)
+                return
+
+            cache_dir = os.path.realpath(self._cache_dir)
+            for code_dir in code_dirs:
+                digest = os.path.basename(code_dir)
+                if os.path.dirname(code_dir) != cache_dir or digest not in self._leases:
+                    continue
+                self._lease_counts[digest] -= 1
+                if not self._lease_counts[digest]:
+                    self._release_lease(digest)
+
+    @contextmanager
+    def _locked_cache_dir(self) -> Iterator[None]:
+        """
+        Locks the cache directory against the other processes
+        """
+        self._cache_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+        with open(self._cache_dir.joinpath(_LOCK_FILE_NAME), "a") as lock_file:
+            _lock_file(lock_file, blocking=True)
+            try:
+                yield
+            finally:
+                _unlock_file(lock_file)
+
+    def _acquire_lease(self, digest: str) -> None:
+        if digest in self._leases:
+            self._lease_counts[digest] += 1
+            return
+        # kept open and locked until released, or until the process exits
+        lease_file = open(  # pylint: disable=consider-using-with
+            self._cache_dir.joinpath(f"{digest}{_LEASE_FILE_INFIX}{self._lease_token}"), "a"
+        )
+        _lock_file(lease_file, blocking=False)
+        self._leases[digest] = lease_file
+        self._lease_counts[digest] = 1
+
+    def _release_lease(self, digest: str) -> None:
+        lease_file = self._leases.pop(digest)
+        del self._lease_counts[digest]
+        lease_file.close()
+        try:
+            Path(lease_file.name).unlink()
+        except OSError:
+            # removed by the next eviction instead
+            pass
+
+    def _is_leased(self, digest: str) -> bool:
+        """
+        Returns True if any running process uses the tree, and removes the leases of the exited processes
+        """
+        if digest in self._leases:
+            return True
+
+        leased = False
+        for lease_path in self._cache_dir.glob(f"{digest}{_LEASE_FILE_INFIX}*"):
+            try:
+                with open(lease_path, "a") as lease_file:
+                    _lock_file(lease_file, blocking=False)
+                    _unlock_file(lease_file)
+            except OSError:
+                # the lease is locked by a running process
+                leased = True
+                continue
+            try:
+                lease_path.unlink()
+            except OSError:
+                pass
+        return leased
+
+    def _get_digest(self, archive_path: str) -> str:
+        stat = os.stat(archive_path)
+        key = (os.path.realpath(archive_path), stat.st_mtime_ns, stat.st_size)
+        digest = self._digests.get(key)
+        if not digest:
+            digest = file_checksum(archive_path, hash_generator=hashlib.sha256())
+            self._digests[key] = digest
+        return digest
+
+    def _decompress(self, archive_path: str, code_dir: Path) -> None:
+        """
+        Decompresses the archive next to its final directory, and moves it there once complete, so a partially
+        decompressed archive is never reused
+        """
+        temp_dir = tempfile.mkdtemp(dir=self._cache_dir, suffix=".tmp")
+        try:
+            if os.name == "posix":
+                os.chmod(temp_dir, 0o755)
+
+            LOG.info("Decompressing %s", archive_path)
+            unzip(archive_path, temp_dir)
+
+            size = sum(path.stat().st_size for path in Path(temp_dir).rglob("*") if path.is_file())
+            Path(f"{code_dir}{_SIZE_FILE_SUFFIX}").write_text(str(size))
+            try:
+                os.replace(temp_dir, code_dir)
+            except OSError:
+                # decompressed meanwhile by a process which does not lock the cache, the temporary tree is removed
+                if not code_dir.is_dir():
+                    raise
+                LOG.debug("Reusing %s decompressed by another process", code_dir)
+        finally:
+            if os.path.exists(temp_dir):
+                shutil.rmtree(temp_dir)
+
+    def _evict(self) -> None:
+        """
+        Removes the least recently used trees until the cache fits in its maximum size
+        """
+        if not self._max_size:
+            return
+
+        entries = []
+        for code_dir in self._cache_dir.iterdir():
+            if not code_dir.is_dir() or code_dir.suffix == ".tmp":
+                continue
+            entries.append((code_dir.stat().st_mtime, code_dir, self._get_size(code_dir)))
+
+        total_size = sum(size for _, _, size in entries)
+        for _, code_dir, size in sorted(entries, key=lambda entry: entry[0]):
+            if total_size <= self._max_size:
+                break
+            if self._is_leased(code_dir.name):
+                continue
+
+            LOG.debug("Removing the decompressed archive %s from the cache", code_dir)
+            shutil.rmtree(code_dir, ignore_errors=True)
+            size_file = Path(f"{code_dir}{_SIZE_FILE_SUFFIX}")
+            if size_file.exists():
+                size_file.unlink()
+            total_size -= size
+
+    @staticmethod
+    def _get_size(code_dir: Path) -> int:
+        try:
+            return int(Path(f"{code_dir}{_SIZE_FILE_SUFFIX}").read_text())
+        except (OSError, ValueError):
+            return sum(path.stat().st_size for path in code_dir.rglob("*") if path.is_file())
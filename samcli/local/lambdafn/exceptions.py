@@ -13,3 +13,14 @@ class ResourceNotFound(Exception):
     """
     Raised when the requested resource is not found
     """
+
+
+class FunctionThrottled(Exception):
+    """
+    Raised when the invocation of a Lambda function is throttled, because of its reserved concurrency or of the
+    account concurrency limit
+    """
+
+    def __init__(self, message: str, reason: str):
+        super().__init__(message)
+        self.reason = reason
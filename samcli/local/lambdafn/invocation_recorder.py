@@ -0,0 +1,286 @@
+"""
+On-disk recordings of the function invocations, replayed instead of running the functions again
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from samcli.lib.utils.hash import dir_checksum, file_checksum
+from samcli.local.lambdafn.config import FunctionConfig
+
+LOG = logging.getLogger(__name__)
+
+# Records the responses of the invocations
+RECORD_MODE = "record"
+# Serves the recorded responses, invoking and recording the functions only when no response was recorded
+REPLAY_MODE = "replay"
+RECORDING_MODES = (RECORD_MODE, REPLAY_MODE)
+
+# Recording mode of the local invocations, they are neither recorded nor replayed when not set
+INVOKE_RECORDING_MODE = os.environ.get("SAM_CLI_INVOKE_RECORDING_MODE")
+# Directory of the recordings, relative to the working directory of the command
+INVOKE_RECORDINGS_DIR = os.environ.get("SAM_CLI_INVOKE_RECORDINGS_DIR", os.path.join(".aws-sam", "invoke-recordings"))
+# Comma separated paths of the event fields matching a recording, such as httpMethod,path,body. When not set, the whole
+# event is matched, except the fields which change with each request such as requestContext.requestId
+INVOKE_REPLAY_MATCH_KEYS = os.environ.get("SAM_CLI_INVOKE_REPLAY_MATCH_KEYS")
+
+# Fields of the API Gateway events which are different for every request
+_VOLATILE_EVENT_KEYS = [
+    "requestContext.requestId",
+    "requestContext.extendedRequestId",
+    "requestContext.requestTime",
+    "requestContext.requestTimeEpoch",
+    "requestContext.time",
+    "requestContext.timeEpoch",
+]
+# Seconds the hash of the code of a function is reused for, before checking whether its files changed
+_CODE_CHECK_INTERVAL = 1.0
+
+_DATA_FILE = "invocations.data"
+_INDEX_FILE = "invocations.index"
+
+
+class InvocationRecorder:
+    """
+    Records the responses of the functions into an append-only data file, with an append-only index mapping the key of
+    each invocation to the position of its response in the data file. An invocation is keyed by the function and its
+    normalized event, and a recording is only replayed while the content hash of the code of the function is the one
+    it was recorded with. The index is loaded once, so a replayed invocation is served with a single read of the data
+    file, without running a container. The code is hashed outside the lock of the index, so the concurrent invocations
+    only wait for each other while the index is read or written.
+
+    This class is thread-safe.
+    """
+
+    def __init__(self, recordings_dir: str, mode: str, match_keys: Optional[List[str]] = None):
+        """
+        Parameters
+        ----------
+        recordings_dir str
+            Directory of the data and index files
+        mode str
+            record to always invoke the functions and record their responses, or replay to serve the recorded
+            responses when they are up to date
+        match_keys list(str)
+            Optional. Dotted paths of the event fields matching the recordings. Defaults to the whole event, except its
+            fields which change with each request
+        """
+        self.mode = mode
+        self._recordings_dir = Path(recordings_dir)
+        self._match_keys = match_keys
+        # lock of the index, and of the data file while it is appended to
+        self._lock = threading.Lock()
+        # (code hash, offset, size) of the recorded responses by invocation key, loaded on first use
+        self._index: Optional[Dict[str, Tuple[str, int, int]]] = None
+        # (time of the last check, fingerprint of the files, content hash) by code path
+        self._code_hashes: Dict[str, Tuple[float, Any, str]] = {}
+        # locks of the code paths, so the code of a function is hashed once for its concurrent invocations
+        self._code_hash_locks: Dict[str, threading.Lock] = {}
+        self._code_hash_locks_lock = threading.Lock()
+
+    @property
+    def is_replaying(self) -> bool:
+        return self.mode == REPLAY_MODE
+
+    def get(self, function_config: FunctionConfig, event: str) -> Optional[bytes]:
+        """
+        Returns the response recorded for the invocation of a function with an event, or None if there is no
+        recording or if the code of the function changed since
+
+        Parameters
+        ----------
+        function_config samcli.local.lambdafn.config.FunctionConfig
+            Configuration of the invoked function
+        event str
+            Event the function is invoked with
+        """
+        key = self._get_key(function_config, event)
+        with self._lock:
+            entry = self._get_index().get(key)
+        if not entry:
+            LOG.debug("No recorded response of %s for this event", function_config.full_path)
+            return None
+
+        code_hash, offset, size = entry
+        if code_hash != self._get_code_hash(function_config):
+            LOG.debug("Recorded response of %s is outdated, its code changed", function_config.full_path)
+            return None
+
+        # the recorded responses are never overwritten, so they are read without the lock
+        with open(self._recordings_dir.joinpath(_DATA_FILE), "rb") as data_file:
+            data_file.seek(offset)
+            response = data_file.read(size)
+
+        if len(response) != size:
+            LOG.debug("Recorded response of %s is truncated", function_config.full_path)
+            return None
+        return response
+
+    def record(self, function_config: FunctionConfig, event: str, response: bytes) -> None:
+        """
+        Appends the response of the invocation of a function with an event to the recordings, replacing the one
+        previously recorded for the same invocation
+
+        Parameters
+        ----------
+        function_config samcli.local.lambdafn.config.FunctionConfig
+            Configuration of the invoked function
+        event str
+            Event the function was invoked with
+        response bytes
+            Response of the function
+        """
+        key = self._get_key(function_config, event)
+        code_hash = self._get_code_hash(function_config)
+        with self._lock:
+            index = self._get_index()
+
+            self._recordings_dir.mkdir(parents=True, exist_ok=True)
+            with open(self._recordings_dir.joinpath(_DATA_FILE), "ab") as data_file:
+                offset = data_file.seek(0, os.SEEK_END)
+                data_file.write(response)
+
+            entry = {
+                "key": key,
+                "function": function_config.full_path,
+                "code_hash": code_hash,
+                "offset": offset,
+                "size": len(response),
+            }
+            # the index is written once the response is, so it never points to a partially written response
+            with open(self._recordings_dir.joinpath(_INDEX_FILE), "a", encoding="utf-8") as index_file:
+                index_file.write(json.dumps(entry) + "\n")
+            index[key] = (code_hash, offset, len(response))
+
+        LOG.debug("Recorded the response of %s", function_config.full_path)
+
+    def _get_index(self) -> Dict[str, Tuple[str, int, int]]:
+        """
+        Loads the index file, the last recording of an invocation replacing the previous ones
+        """
+        if self._index is None:
+            self._index = {}
+            index_path = self._recordings_dir.joinpath(_INDEX_FILE)
+            if index_path.exists():
+                with open(index_path, encoding="utf-8") as index_file:
+                    for line in index_file:
+                        try:
+                            entry = json.loads(line)
+                            self._index[entry["key"]] = (entry["code_hash"], entry["offset"], entry["size"])
+                        except (ValueError, KeyError, TypeError):
+                            LOG.debug("Ignoring invalid line of the recordings index %s", index_path)
+            LOG.debug("Loaded %d recorded invocations from %s", len(self._index), index_path)
+        return self._index
+
+    def _get_key(self, function_config: FunctionConfig, event: str) -> str:
+        """
+        Returns the key of the invocation of a function with an event, the hash of the function and of its event
+        normalized to the fields it is matched with
+        """
+        try:
+            normalized_event: Any = self._normalize_event(json.loads(event))
+        except ValueError:
+            normalized_event = event
+
+        content = json.dumps([function_config.full_path, normalized_event], sort_keys=True)
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    def _normalize_event(self, event: Any) -> Any:
+        if not isinstance(event, dict):
+            return event
+
+        if self._match_keys:
+            return {key: self._get_field(event, key) for key in self._match_keys}
+
+        normalized_event = json.loads(json.dumps(event))
+        for key in _VOLATILE_EVENT_KEYS:
+            *parents, name = key.split(".")
+            fields = normalized_event
+            for parent in parents:
+                fields = fields.get(parent) if isinstance(fields, dict) else None
+            if isinstance(fields, dict):
+                fields.pop(name, None)
+        return normalized_event
+
+    @staticmethod
+    def _get_field(event: Dict, key: str) -> Any:
+        value: Any = event
+        for name in key.split("."):
+            value = value.get(name) if isinstance(value, dict) else None
+        return value
+
+    def _get_code_hash(self, function_config: FunctionConfig) -> str:
+        """
+        Returns the hash of the code of a function, its handler and its runtime. The content of the code is only
+        hashed again when its files were modified, which is checked at most once per check interval.
+        """
+        code_path = function_config.code_abs_path
+        if not code_path:
+            code_hash = function_config.imageuri or ""
+        else:
+            with self._code_hash_locks_lock:
+                code_hash_lock = self._code_hash_locks.setdefault(code_path, threading.Lock())
+            with code_hash_lock:
+                checked_at, fingerprint, code_hash = self._code_hashes.get(code_path, (0.0, None, ""))
+                now = time.monotonic()
+                if now - checked_at >= _CODE_CHECK_INTERVAL:
+                    current_fingerprint = self._get_fingerprint(code_path)
+                    if current_fingerprint != fingerprint:
+                        code_hash = (
+                            dir_checksum(code_path, hash_generator=hashlib.sha256())
+                            if os.path.isdir(code_path)
+                            else file_checksum(code_path, hash_generator=hashlib.sha256())
+                        )
+                    self._code_hashes[code_path] = (now, current_fingerprint, code_hash)
+
+        return f"{code_hash}:{function_config.runtime}:{function_config.handler}"
+
+    @staticmethod
+    def _get_fingerprint(code_path: str) -> Any:
+        """
+        Returns the paths, sizes and modification times of the code files, which change when the code changes
+        """
+        if not os.path.isdir(code_path):
+            stat = os.stat(code_path)
+            return stat.st_size, stat.st_mtime_ns
+
+        fingerprint = []
+        for dirpath, _, filenames in os.walk(code_path, followlinks=True):
+            for filename in filenames:
+                path = os.path.join(dirpath, filename)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                fingerprint.append((path, stat.st_size, stat.st_mtime_ns))
+        return sorted(fingerprint)
+
+
+def get_invocation_recorder(cwd: str) -> Optional[InvocationRecorder]:
+    """
+    Returns the recorder of the invocations configured with the SAM_CLI_INVOKE_RECORDING_MODE,
+    SAM_CLI_INVOKE_RECORDINGS_DIR and SAM_CLI_INVOKE_REPLAY_MATCH_KEYS env vars, or None if the invocations are not
+    recorded
+
+    Parameters
+    ----------
+    cwd str
+        Working directory the recordings directory is relative to
+    """
+    if not INVOKE_RECORDING_MODE:
+        return None
+    if INVOKE_RECORDING_MODE not in RECORDING_MODES:
+        LOG.warning(
+            "Unknown invoke recording mode '%s', expected one of %s. The invocations are not recorded",
+            INVOKE_RECORDING_MODE,
+            ", ".join(RECORDING_MODES),
+        )
+        return None
+
+    match_keys = [key.strip() for key in (INVOKE_REPLAY_MATCH_KEYS or "").split(",") if key.strip()]
+    return InvocationRecorder(os.path.join(cwd, INVOKE_RECORDINGS_DIR), INVOKE_RECORDING_MODE, match_keys or None)
@@ -2,25 +2,58 @@
 Classes representing a local Lambda runtime
 """
 import copy
+import functools
 import logging
 import os
-import shutil
 import signal
-import tempfile
 import threading
-from typing import Dict, Optional, Union
+import time
+from typing import Dict, List, Optional, Set, Union
 
+from samcli.cli.global_config import GlobalConfig
 from samcli.lib.telemetry.metric import capture_parameter
+from samcli.lib.utils import invoke_timing
+from samcli.lib.utils.env_settings import get_float_setting, get_int_setting
 from samcli.lib.utils.file_observer import LambdaFunctionObserver
 from samcli.lib.utils.packagetype import ZIP
 from samcli.local.docker.lambda_container import LambdaContainer
 
 from ...lib.providers.provider import LayerVersion
 from ...lib.utils.stream_writer import StreamWriter
-from .zip import unzip
+from .container_pool import ContainerPool, ContainerPoolDrainedError
+from .decompression_cache import DecompressionCache
 
 LOG = logging.getLogger(__name__)
 
+# Maximum number of warm containers per function, if the function does not define ReservedConcurrentExecutions
+WARM_CONTAINERS_MAX_CONCURRENCY = get_int_setting("SAM_CLI_WARM_CONTAINERS_MAX_CONCURRENCY", 1, minimum=1)
+# Env var setting the maximum number of warm containers of some functions, taking precedence over their
+# ReservedConcurrentExecutions, as a comma separated list of function full path or logical ID and maximum number pairs,
+# such as "Function=4,Stack/OtherFunction=2"
+WARM_CONTAINERS_FUNCTION_MAX_CONCURRENCY_ENV_VAR = "SAM_CLI_WARM_CONTAINERS_FUNCTION_MAX_CONCURRENCY"
+# Seconds a warm container can stay idle before it gets stopped, 0 disables the idle eviction
+WARM_CONTAINERS_IDLE_TTL = get_float_setting("SAM_CLI_WARM_CONTAINERS_IDLE_TTL", 0, minimum=0)
+# Seconds a warm container can stay idle before its processes get paused, 0 disables pausing the idle containers
+WARM_CONTAINERS_PAUSE_AFTER = get_float_setting("SAM_CLI_WARM_CONTAINERS_PAUSE_AFTER", 0, minimum=0)
+# Maximum number of warm containers kept across all functions, 0 means no limit
+WARM_CONTAINERS_MAX_RESIDENT = get_int_setting("SAM_CLI_WARM_CONTAINERS_MAX_RESIDENT", 0, minimum=0)
+# Maximum sum of the warm containers memory limits in MB, 0 means no limit
+WARM_CONTAINERS_MEMORY_BUDGET_MB = get_int_setting("SAM_CLI_WARM_CONTAINERS_MEMORY_BUDGET_MB", 0, minimum=0)
+
+# Directory of the SAM CLI config directory the zip/jar code archives are decompressed in
+DECOMPRESSION_CACHE_DIR_NAME = "decompressed-code"
+
+# Command line patterns of the runtime processes per runtime family, whose code is reloaded by recycling the runtime
+# process in place. The containers of the other runtimes are restarted. The brackets keep the patterns from matching
+# the command line of the reload script itself
+RELOADABLE_RUNTIME_PROCESS_PATTERNS = {"python": "[/]var/runtime/bootstrap", "nodejs": "[/]var/runtime/index"}
+# Kills the runtime processes matching the pattern, the Runtime Interface Emulator starts a new one on the next invoke,
+# which loads the code from the mounted code directory again
+RUNTIME_PROCESS_RELOAD_SCRIPT = (
+    'for cmdline in /proc/[0-9]*/cmdline; do if tr "\\0" " " < "$cmdline" 2>/dev/null | grep -q "{pattern}"; then '
+    'pid="${{cmdline#/proc/}}"; kill -9 "${{pid%/cmdline}}" 2>/dev/null || true; fi; done'
+)
+
 
 class LambdaRuntime:
     """
@@ -31,7 +64,7 @@ class LambdaRuntime:
 
     SUPPORTED_ARCHIVE_EXTENSIONS = (".zip", ".jar", ".ZIP", ".JAR")
 
-    def __init__(self, container_manager, image_builder):
+    def __init__(self, container_manager, image_builder, decompression_cache: Optional[DecompressionCache] = None):
         """
         Initialize the Local Lambda runtime
 
@@ -41,10 +74,20 @@ class LambdaRuntime:
             Instance of the ContainerManager class that can run a local Docker container
         image_builder samcli.local.docker.lambda_image.LambdaImage
             Instance of the LambdaImage class that can create am image
+        decompression_cache samcli.local.lambdafn.decompression_cache.DecompressionCache
+            Optional. Cache the zip/jar code archives are decompressed in. Defaults to the decompressed-code
+            directory of the SAM CLI config directory
         """
         self._container_manager = container_manager
         self._image_builder = image_builder
-        self._temp_uncompressed_paths_to_be_cleaned = []
+        self._decompression_cache = decompression_cache or DecompressionCache(
+            str(GlobalConfig().config_dir.joinpath(DECOMPRESSION_CACHE_DIR_NAME))
+        )
+        # containers of the debugged invocations in progress, stopped when Ctrl+C can't be handled by the invocation
+        self._debugging_containers: Set[LambdaContainer] = set()
+        self._debugging_containers_lock = threading.Lock()
+        # directories of the decompression cache mounted by each container, released once the container is stopped
+        self._decompressed_paths: Dict[LambdaContainer, List[str]] = {}
 
     def create(self, function_config, debug_context=None, container_host=None, container_host_interface=None):
         """
@@ -82,23 +125,27 @@ class LambdaRuntime:
                 sam_accelerate_link,
             )
 
-        container = LambdaContainer(
-            function_config.runtime,
-            function_config.imageuri,
-            function_config.handler,
-            function_config.packagetype,
-            function_config.imageconfig,
-            code_dir,
-            layers,
-            self._image_builder,
-            function_config.architecture,
-            memory_mb=function_config.memory,
-            env_vars=env_vars,
-            debug_options=debug_context,
-            container_host=container_host,
-            container_host_interface=container_host_interface,
-            function_full_path=function_config.full_path,
-        )
+        with invoke_timing.phase("image_build"):
+            container = LambdaContainer(
+                function_config.runtime,
+                function_config.imageuri,
+                function_config.handler,
+                function_config.packagetype,
+                function_config.imageconfig,
+                code_dir,
+                layers,
+                self._image_builder,
+                function_config.architecture,
+                memory_mb=function_config.memory,
+                env_vars=env_vars,
+                debug_options=debug_context,
+                container_host=container_host,
+                container_host_interface=container_host_interface,
+                function_full_path=function_config.full_path,
+            )
+        self._decompressed_paths[container] = [
+            path for path in [code_dir] + [layer.codeuri for layer in layers if isinstance(layer, LayerVersion)] if path
+        ]
         try:
             # create the container.
             self._container_manager.create(container)
@@ -106,7 +153,65 @@ class LambdaRuntime:
 
         except KeyboardInterrupt:
             LOG.debug("Ctrl+C was pressed. Aborting container creation")
+            self._clean_decompressed_paths(container)
             raise
+        except Exception:
+            self._clean_decompressed_paths(container)
+            raise
+
+    def get_image_key(self, function_config):
+        """
+        Returns the key of the image of a function, which is the same for the functions sharing the same image
+
+        Parameters
+        ----------
+        function_config FunctionConfig
+            Configuration of the function
+
+        Returns
+        -------
+        tuple
+            Key of the image
+        """
+        return self._image_builder.get_image_key(
+            function_config.runtime,
+            function_config.packagetype,
+            function_config.imageuri,
+            function_config.layers,
+            function_config.architecture,
+            function_name=function_config.full_path,
+        )
+
+    def prepare_image(self, function_config):
+        """
+        Builds or pulls the image of a function, without creating its container
+
+        Parameters
+        ----------
+        function_config FunctionConfig
+            Configuration of the function
+
+        Returns
+        -------
+        str
+            The image of the function (REPOSITORY:TAG)
+        """
+        layers = [self._unarchived_layer(layer) for layer in function_config.layers]
+        return self._image_builder.build(
+            function_config.runtime,
+            function_config.packagetype,
+            function_config.imageuri,
+            layers,
+            function_config.architecture,
+            function_name=function_config.full_path,
+        )
+
+    def reusing_built_images(self):
+        """
+        Context manager building each image once while it is entered, the containers of the functions sharing the same
+        image reuse it without checking it again
+        """
+        return self._image_builder.reusing_built_images()
 
     def run(self, container, function_config, debug_context, container_host=None, container_host_interface=None):
         """
@@ -136,6 +241,9 @@ class LambdaRuntime:
         if not container:
             container = self.create(function_config, debug_context, container_host, container_host_interface)
 
+        if container.is_paused:
+            self._unpause_container(container, function_config)
+
         if container.is_running():
             LOG.info("Lambda function '%s' is already running", function_config.full_path)
             return container
@@ -149,6 +257,21 @@ class LambdaRuntime:
             LOG.debug("Ctrl+C was pressed. Aborting container running")
             raise
 
+    def _unpause_container(self, container, function_config):
+        """
+        Unpause the given container, just before it serves an invoke
+
+        Returns
+        -------
+        float
+            The unpause duration in milliseconds
+        """
+        started_at = time.monotonic()
+        self._container_manager.unpause(container)
+        duration = (time.monotonic() - started_at) * 1000
+        LOG.debug("Unpaused the container of Lambda function '%s' in %.0f ms", function_config.full_path, duration)
+        return duration
+
     @capture_parameter("runtimeMetric", "runtimes", 1, parameter_nested_identifier="runtime", as_list=True)
     def invoke(
         self,
@@ -183,11 +306,20 @@ class LambdaRuntime:
             Interface that Docker host binds ports to
         :raises Keyboard
         """
+        with invoke_timing.track_invoke(function_config.full_path):
+            self._invoke(
+                function_config, event, debug_context, stdout, stderr, container_host, container_host_interface
+            )
+
+    def _invoke(self, function_config, event, debug_context, stdout, stderr, container_host, container_host_interface):
         container = None
         try:
             # Start the container. This call returns immediately after the container starts
             container = self.create(function_config, debug_context, container_host, container_host_interface)
             container = self.run(container, function_config, debug_context)
+            if debug_context:
+                with self._debugging_containers_lock:
+                    self._debugging_containers.add(container)
             # Setup appropriate interrupt - timeout or Ctrl+C - before function starts executing and
             # get callback function to start timeout timer
             start_timer = self._configure_interrupt(
@@ -211,9 +343,26 @@ class LambdaRuntime:
         finally:
             # We will be done with execution, if either the execution completed or an interrupt was fired
             # Any case, cleanup the container.
-            self._on_invoke_done(container)
+            if container:
+                with self._debugging_containers_lock:
+                    self._debugging_containers.discard(container)
+            self._on_invoke_done(container, function_config)
+
+    def stop_debugging_containers(self):
+        """
+        Stops the containers of the debugged invocations still in progress. The invocations running in the threads of
+        the local services can't catch Ctrl+C, which only the main thread receives, so their containers are stopped
+        once the services are stopped.
+        """
+        with self._debugging_containers_lock:
+            containers = list(self._debugging_containers)
+            self._debugging_containers.clear()
+
+        for container in containers:
+            LOG.debug("Stopping the container of the interrupted debugged invocation")
+            self._container_manager.stop(container)
 
-    def _on_invoke_done(self, container):
+    def _on_invoke_done(self, container, function_config):
         """
         Cleanup the created resources, just before the invoke function ends
 
@@ -221,10 +370,26 @@ class LambdaRuntime:
         ----------
         container: Container
            The current running container
+        function_config: FunctionConfig
+           Configuration of the invoked function
         """
         if container:
             self._container_manager.stop(container)
-        self._clean_decompressed_paths()
+            self._clean_decompressed_paths(container)
+
+    def _clean_decompressed_paths(self, container):
+        """
+        Releases the directories of the decompression cache mounted by the given stopped container, so they can be
+        evicted from the cache once no other container uses them
+
+        Parameters
+        ----------
+        container: Container
+           The stopped container
+        """
+        decompressed_paths = self._decompressed_paths.pop(container, None)
+        if decompressed_paths:
+            self._decompression_cache.release(decompressed_paths)
 
     def _configure_interrupt(self, function_full_path, timeout, container, is_debugging):
         """
@@ -257,8 +422,11 @@ class LambdaRuntime:
             self._container_manager.stop(container)
 
         if is_debugging:
-            LOG.debug("Setting up SIGTERM interrupt handler")
-            signal.signal(signal.SIGTERM, signal_handler)
+            # signal handlers can only be set by the main thread, the debugged invocations running in other threads
+            # are stopped by stop_debugging_containers instead
+            if threading.current_thread() is threading.main_thread():
+                LOG.debug("Setting up SIGTERM interrupt handler")
+                signal.signal(signal.SIGTERM, signal_handler)
             return None
 
         return start_timer
@@ -269,7 +437,7 @@ class LambdaRuntime:
         be mounted directly inside the Docker container.
 
         This method handles a few different cases for ``code_path``:
-            - ``code_path``is a existent zip/jar file: Unzip in a temp directory and return the temp directory
+            - ``code_path``is a existent zip/jar file: Return the directory of the decompression cache it is unzipped in
             - ``code_path`` is a existent directory: Return this immediately
             - ``code_path`` is a file/dir that does not exist: Return it as is. May be this method is not clever to
                 detect the existence of the path
@@ -287,9 +455,7 @@ class LambdaRuntime:
         """
 
         if code_path and os.path.isfile(code_path) and code_path.endswith(self.SUPPORTED_ARCHIVE_EXTENSIONS):
-            decompressed_dir: str = _unzip_file(code_path)
-            self._temp_uncompressed_paths_to_be_cleaned += [decompressed_dir]
-            return decompressed_dir
+            return self._decompression_cache.get_code_dir(code_path)
 
         LOG.debug("Code %s is not a zip/jar file", code_path)
         return code_path
@@ -315,23 +481,25 @@ class LambdaRuntime:
 
         return layer
 
-    def _clean_decompressed_paths(self):
-        """
-        Clean the temporary decompressed code dirs
-        """
-        LOG.debug("Cleaning all decompressed code dirs")
-        for decompressed_dir in self._temp_uncompressed_paths_to_be_cleaned:
-            shutil.rmtree(decompressed_dir)
-        self._temp_uncompressed_paths_to_be_cleaned = []
-
 
 class WarmLambdaRuntime(LambdaRuntime):
     """
     This class extends the LambdaRuntime class to add the Warm containers feature. This class handles the
-    warm containers life cycle.
+    warm containers life cycle. Each function gets a pool of warm containers, so concurrent invokes of the same
+    function are served by different containers, up to the function max concurrency.
     """
 
-    def __init__(self, container_manager, image_builder):
+    def __init__(
+        self,
+        container_manager,
+        image_builder,
+        max_concurrency: Optional[int] = None,
+        idle_ttl: Optional[float] = None,
+        max_resident_containers: Optional[int] = None,
+        memory_budget_mb: Optional[int] = None,
+        pause_after: Optional[float] = None,
+        function_max_concurrency: Optional[Dict[str, int]] = None,
+    ):
         """
         Initialize the Local Lambda runtime
 
@@ -341,11 +509,62 @@ class WarmLambdaRuntime(LambdaRuntime):
             Instance of the ContainerManager class that can run a local Docker container
         image_builder samcli.local.docker.lambda_image.LambdaImage
             Instance of the LambdaImage class that can create am image
-        warm_containers bool
-            Determines if the warm containers is enabled or not.
+        max_concurrency int
+            Optional. Maximum number of warm containers per function, used for the functions that do not define
+            ReservedConcurrentExecutions. Defaults to the SAM_CLI_WARM_CONTAINERS_MAX_CONCURRENCY env var, or 1
+        idle_ttl float
+            Optional. Seconds after which an idle warm container is stopped. Defaults to the
+            SAM_CLI_WARM_CONTAINERS_IDLE_TTL env var, or 0 which keeps idle containers until the command ends
+        max_resident_containers int
+            Optional. Maximum number of warm containers across all the functions. Defaults to the
+            SAM_CLI_WARM_CONTAINERS_MAX_RESIDENT env var, or 0 for no limit
+        memory_budget_mb int
+            Optional. Maximum sum of the warm containers memory in MB. Defaults to the
+            SAM_CLI_WARM_CONTAINERS_MEMORY_BUDGET_MB env var, or 0 for no limit
+        pause_after float
+            Optional. Seconds after which the processes of an idle warm container are paused, until its next invoke.
+            Defaults to the SAM_CLI_WARM_CONTAINERS_PAUSE_AFTER env var, or 0 which never pauses the idle containers
+        function_max_concurrency dict
+            Optional. Maximum number of warm containers of some functions by function full path or logical ID, taking
+            precedence over their ReservedConcurrentExecutions. Defaults to the
+            SAM_CLI_WARM_CONTAINERS_FUNCTION_MAX_CONCURRENCY env var
         """
         self._function_configs = {}
-        self._containers = {}
+        self._container_pools: Dict[str, ContainerPool] = {}
+        # pools the busy containers were checked out from, so they are checked in to the same pool even if the pool
+        # of their function got replaced meanwhile
+        self._checked_out_pools: Dict[LambdaContainer, ContainerPool] = {}
+        self._max_concurrency = max_concurrency or WARM_CONTAINERS_MAX_CONCURRENCY
+        self._function_max_concurrency = (
+            function_max_concurrency
+            if function_max_concurrency is not None
+            else _get_function_max_concurrency_setting()
+        )
+        self._lock = threading.Lock()
+
+        self._idle_ttl = idle_ttl if idle_ttl is not None else WARM_CONTAINERS_IDLE_TTL
+        self._max_resident_containers = (
+            max_resident_containers if max_resident_containers is not None else WARM_CONTAINERS_MAX_RESIDENT
+        )
+        self._memory_budget_mb = memory_budget_mb if memory_budget_mb is not None else WARM_CONTAINERS_MEMORY_BUDGET_MB
+        self._eviction_lock = threading.Lock()
+        self._eviction_counts: Dict[str, int] = {}
+        self._eviction_stopped = threading.Event()
+        self._eviction_thread: Optional[threading.Thread] = None
+
+        self._pause_after = pause_after if pause_after is not None else WARM_CONTAINERS_PAUSE_AFTER
+        self._pause_lock = threading.Lock()
+        self._pause_count = 0
+        # milliseconds each unpause of a container took, to compare pausing the idle containers with evicting them
+        self._unpause_durations: List[float] = []
+
+        self._debugged_functions: Set[str] = set()
+        self._reload_lock = threading.Lock()
+        # milliseconds spent so far restarting the containers of the functions whose code changed, by function full
+        # path, until their first new container is started
+        self._pending_restarts: Dict[str, float] = {}
+        # milliseconds each code reload took, by reload strategy
+        self._code_reload_durations: Dict[str, List[float]] = {"in place": [], "restart": []}
 
         self._observer = LambdaFunctionObserver(self._on_code_change)
 
@@ -353,16 +572,17 @@ class WarmLambdaRuntime(LambdaRuntime):
 
     def create(self, function_config, debug_context=None, container_host=None, container_host_interface=None):
         """
-        Create a new Container for the passed function, then store it in a dictionary using the function name,
-        so it can be retrieved later and used in the other functions. Make sure to use the debug_context only
-        if the function_config.name equals debug_context.debug-function or the warm_containers option is disabled
+        Check out a warm container of the passed function from its container pool. A new container is created if all
+        the pooled containers are busy and the pool did not reach the function max concurrency yet, otherwise this call
+        waits until one of the containers is released. The debug_context is used as is, the Lambda runner passes it only
+        for the debug function, whether it is identified by its name, its function id or its full path
 
         Parameters
         ----------
         function_config FunctionConfig
             Configuration of the function to create a new Container for it.
         debug_context DebugContext
-            Debugging context for the function (includes port, args, and path)
+            Debugging context for the function (includes port, args, and path), if it is the debugged one
         container_host string
             Host of locally emulated Lambda container
         container_host_interface string
@@ -374,54 +594,364 @@ class WarmLambdaRuntime(LambdaRuntime):
             the created container
         """
 
-        # reuse the cached container if it is created, and if the function configuration is not changed
-        exist_function_config = self._function_configs.get(function_config.full_path, None)
-        container = self._containers.get(function_config.full_path, None)
-        if exist_function_config and _require_container_reloading(exist_function_config, function_config):
-            LOG.info(
-                "Lambda Function '%s' definition has been changed in the stack template, "
-                "terminate the created warm container.",
-                function_config.full_path,
-            )
-            self._function_configs.pop(exist_function_config.full_path, None)
-            if container:
-                self._container_manager.stop(container)
-                self._containers.pop(exist_function_config.full_path, None)
-            self._observer.unwatch(exist_function_config)
-        elif container and container.is_created():
-            LOG.info("Reuse the created warm container for Lambda function '%s'", function_config.full_path)
+        while True:
+            container_pool = self._get_container_pool(function_config, debug_context)
+            try:
+                container = container_pool.checkout(
+                    functools.partial(
+                        self._create_container, function_config, debug_context, container_host, container_host_interface
+                    )
+                )
+            except ContainerPoolDrainedError as ex:
+                # the pool got drained by a code or template change, or by the shutdown, while checking out from it
+                if ex.container:
+                    self._container_manager.stop(ex.container)
+                with self._lock:
+                    if self._container_pools.get(function_config.full_path) is container_pool:
+                        # the pool is still in use, so the warm containers are being cleaned at the command end
+                        raise
+                continue
+
+            with self._lock:
+                self._checked_out_pools[container] = container_pool
             return container
 
-        # debug_context should be used only if the function name is the one defined
-        # in debug-function option
-        if debug_context and debug_context.debug_function != function_config.name:
-            LOG.debug(
-                "Disable the debugging for Lambda Function %s, as the passed debug function is %s",
-                function_config.name,
-                debug_context.debug_function,
-            )
-            debug_context = None
+    def _get_container_pool(self, function_config, debug_context):
+        """
+        Returns the container pool of the passed function, creating it if it does not exist yet or if the function
+        configuration changed since it was created
+        """
+        with self._lock:
+            if debug_context:
+                self._debugged_functions.add(function_config.full_path)
+
+            # reuse the container pool if it is created, and if the function configuration is not changed
+            exist_function_config = self._function_configs.get(function_config.full_path, None)
+            if exist_function_config and _require_container_reloading(exist_function_config, function_config):
+                LOG.info(
+                    "Lambda Function '%s' definition has been changed in the stack template, "
+                    "terminate the created warm container.",
+                    function_config.full_path,
+                )
+                self._function_configs.pop(exist_function_config.full_path, None)
+                self._stop_container_pool(exist_function_config.full_path)
+                self._observer.unwatch(exist_function_config)
+
+            container_pool = self._container_pools.get(function_config.full_path, None)
+            if not container_pool:
+                container_pool = ContainerPool(
+                    function_config.full_path,
+                    self._get_max_concurrency(function_config, debug_context),
+                    function_config.memory,
+                )
+                self._container_pools[function_config.full_path] = container_pool
+                self._function_configs[function_config.full_path] = function_config
+
+                self._observer.watch(function_config)
+                self._observer.start()
+                self._start_idle_eviction()
+
+            return container_pool
+
+    def _create_container(self, function_config, debug_context, container_host, container_host_interface):
+        """
+        Create a new container for the passed function, after evicting the least recently used idle containers
+        if keeping one more container would exceed the resident containers or the memory limits.
+        """
+        self._evict_containers_over_limits()
+        started_at = time.monotonic()
+        container = super().create(function_config, debug_context, container_host, container_host_interface)
+        # the warm containers keep using the decompressed archives until the runtime is cleaned
+        self._decompressed_paths.pop(container, None)
+        self._add_restart_duration(function_config.full_path, started_at)
+        return container
 
-        self._observer.watch(function_config)
-        self._observer.start()
+    def run(self, container, function_config, debug_context, container_host=None, container_host_interface=None):
+        """
+        Run the given warm container. If no container is passed, a container is checked out from the function
+        pool, started, then released back to the pool so it is ready to serve the coming invokes.
 
-        container = super().create(function_config, debug_context, container_host, container_host_interface)
-        self._function_configs[function_config.full_path] = function_config
-        self._containers[function_config.full_path] = container
+        Parameters
+        ----------
+        container Container
+            the created container to be run
+        function_config FunctionConfig
+            Configuration of the function to run its created container.
+        debug_context DebugContext
+            Debugging context for the function (includes port, args, and path)
+        container_host string
+            Host of locally emulated Lambda container
+        container_host_interface string
+            Optional. Interface that Docker host binds ports to
+
+        Returns
+        -------
+        Container
+            the running container
+        """
+        if container:
+            return self._run_container(
+                container, function_config, debug_context, container_host, container_host_interface
+            )
+
+        container = self.create(function_config, debug_context, container_host, container_host_interface)
+        try:
+            return self._run_container(
+                container, function_config, debug_context, container_host, container_host_interface
+            )
+        finally:
+            self._on_invoke_done(container, function_config)
 
+    def _run_container(self, container, function_config, debug_context, container_host, container_host_interface):
+        """
+        Start the given container if it is not running yet. The first container started after the function containers
+        got restarted for a code change completes the restart, whose duration is recorded.
+        """
+        started_at = time.monotonic()
+        container = super().run(container, function_config, debug_context, container_host, container_host_interface)
+        duration = self._add_restart_duration(function_config.full_path, started_at, completed=True)
+        if duration is not None:
+            LOG.info(
+                "Restarted the warm container of Lambda Function '%s' for its code change in %.0f ms",
+                function_config.full_path,
+                duration,
+            )
         return container
 
-    def _on_invoke_done(self, container):
+    def _add_restart_duration(self, function_full_path, started_at, completed=False):
+        """
+        Add the time elapsed since started_at to the restart duration of the function, if its containers are being
+        restarted for a code change
+
+        Returns
+        -------
+        float
+            The restart duration in milliseconds if the restart is completed, None otherwise
+        """
+        with self._reload_lock:
+            if function_full_path not in self._pending_restarts:
+                return None
+            duration = self._pending_restarts[function_full_path] + (time.monotonic() - started_at) * 1000
+            if not completed:
+                self._pending_restarts[function_full_path] = duration
+                return None
+            del self._pending_restarts[function_full_path]
+            self._code_reload_durations["restart"].append(duration)
+            return duration
+
+    def _on_invoke_done(self, container, function_config):
         """
         Cleanup the created resources, just before the invoke function ends.
         In warm containers, the running containers will be closed just before the end of te command execution,
-        so no action is done here
+        so the container is only returned to its function pool here
 
         Parameters
         ----------
         container: Container
            The current running container
+        function_config: FunctionConfig
+           Configuration of the invoked function
+        """
+        if not container:
+            return
+
+        with self._lock:
+            container_pool = self._checked_out_pools.pop(container, None)
+        if not container_pool or not container_pool.checkin(container):
+            # the pool got drained while the container was busy, so nothing else would stop it
+            LOG.debug(
+                "Terminate the warm container of the replaced Lambda Function '%s' pool", function_config.full_path
+            )
+            self._container_manager.stop(container)
+
+    def _get_max_concurrency(self, function_config, debug_context=None):
+        """
+        Returns the maximum number of warm containers the given function can have. The debugged function is limited to
+        one container, as the debugger ports can be bound only once.
+
+        Parameters
+        ----------
+        function_config: FunctionConfig
+           Configuration of the function
+        debug_context: DebugContext
+            Debugging context for the function, if it is the debugged one
+
+        Returns
+        -------
+        int
+            The maximum size of the function container pool
+        """
+        if debug_context:
+            return 1
+
+        function_max_concurrency = self._function_max_concurrency.get(
+            function_config.full_path, self._function_max_concurrency.get(function_config.name)
+        )
+        if function_max_concurrency:
+            return function_max_concurrency
+
+        reserved_concurrency = function_config.reserved_concurrent_executions
+        try:
+            if reserved_concurrency is not None and int(reserved_concurrency) > 0:
+                return int(reserved_concurrency)
+        except (ValueError, TypeError):
+            LOG.debug(
+                "Ignoring invalid ReservedConcurrentExecutions value %s of Lambda function '%s'",
+                reserved_concurrency,
+                function_config.full_path,
+            )
+
+        return self._max_concurrency
+
+    def _evict_containers_over_limits(self):
+        """
+        Stop the least recently used idle containers, until the resident warm containers fit in the configured
+        resident containers count and memory budget. Busy containers are never evicted, so the limits can be
+        exceeded temporarily when all the containers are serving requests.
+        """
+        if not self._max_resident_containers and not self._memory_budget_mb:
+            return
+
+        with self._eviction_lock:
+            container_pools = list(self._container_pools.values())
+            resident_count = sum(container_pool.size for container_pool in container_pools)
+            resident_memory = sum(container_pool.size * container_pool.memory_mb for container_pool in container_pools)
+
+            # idle containers sorted from the least to the most recently used one
+            idle_containers = sorted(
+                (
+                    (last_used, container_pool, container)
+                    for container_pool in container_pools
+                    for container, last_used in container_pool.idle_containers
+                ),
+                key=lambda idle_container: idle_container[0],
+            )
+
+            for _, container_pool, container in idle_containers:
+                if self._max_resident_containers and resident_count > self._max_resident_containers:
+                    reason = "max resident containers"
+                elif self._memory_budget_mb and resident_memory > self._memory_budget_mb:
+                    reason = "memory budget"
+                else:
+                    break
+
+                if self._evict_container(container_pool, container, reason):
+                    resident_count -= 1
+                    resident_memory -= container_pool.memory_mb
+
+    def _evict_expired_containers(self):
+        """
+        Stop the warm containers which have been idle for longer than the configured idle TTL
+        """
+        with self._eviction_lock:
+            now = time.monotonic()
+            for container_pool in list(self._container_pools.values()):
+                for container, last_used in container_pool.idle_containers:
+                    if now - last_used >= self._idle_ttl:
+                        self._evict_container(container_pool, container, "idle TTL")
+
+    def _pause_idle_containers(self):
+        """
+        Pause the processes of the warm containers which have been idle for longer than the configured pause delay,
+        so they do not use any CPU until they are unpaused to serve their next invoke
+        """
+        now = time.monotonic()
+        for container_pool in list(self._container_pools.values()):
+            for container, last_used in container_pool.idle_containers:
+                if container.is_paused or now - last_used < self._pause_after:
+                    continue
+                try:
+                    paused = container_pool.run_if_idle(container, self._container_manager.pause)
+                except Exception as ex:  # pylint: disable=broad-except
+                    LOG.debug(
+                        "Failed to pause a warm container of Lambda function '%s'",
+                        container_pool.function_full_path,
+                        exc_info=ex,
+                    )
+                    continue
+                if paused:
+                    with self._pause_lock:
+                        self._pause_count += 1
+                    LOG.debug(
+                        "Paused an idle warm container of Lambda function '%s'", container_pool.function_full_path
+                    )
+
+    def _unpause_container(self, container, function_config):
+        duration = super()._unpause_container(container, function_config)
+        with self._pause_lock:
+            self._unpause_durations.append(duration)
+        return duration
+
+    def _evict_container(self, container_pool, container, reason):
+        """
+        Remove an idle container from its pool and stop it. It will be transparently recreated by the next invoke of
+        its function. This method must be called while holding the eviction lock.
+
+        Returns
+        -------
+        bool
+            True if the container got evicted, False if it is not idle anymore
         """
+        if not container_pool.evict(container):
+            return False
+
+        self._container_manager.stop(container)
+        self._eviction_counts[reason] = self._eviction_counts.get(reason, 0) + 1
+        LOG.debug(
+            "Evicted a warm container of Lambda function '%s' (%s). Evictions: %s, %s",
+            container_pool.function_full_path,
+            reason,
+            self._eviction_counts,
+            self._get_resident_stats(),
+        )
+        return True
+
+    def _get_resident_stats(self):
+        """
+        Returns a human readable summary of the resident warm containers, used for debug logging
+        """
+        container_pools = list(self._container_pools.values())
+        return "resident containers: {}, resident memory: {} MB".format(
+            sum(container_pool.size for container_pool in container_pools),
+            sum(container_pool.size * container_pool.memory_mb for container_pool in container_pools),
+        )
+
+    def _start_idle_eviction(self):
+        """
+        Start the background thread which stops the expired idle containers if the idle TTL is configured, and pauses
+        the idle containers if the pause delay is configured
+        """
+        if not (self._idle_ttl or self._pause_after) or self._eviction_thread:
+            return
+
+        interval = min(delay for delay in (self._idle_ttl, self._pause_after) if delay) / 2
+
+        def evict_expired_containers_periodically():
+            while not self._eviction_stopped.wait(interval):
+                try:
+                    if self._idle_ttl:
+                        self._evict_expired_containers()
+                    if self._pause_after:
+                        self._pause_idle_containers()
+                except Exception as ex:
+                    LOG.debug("Failed to evict the expired warm containers", exc_info=ex)
+
+        self._eviction_thread = threading.Thread(target=evict_expired_containers_periodically, daemon=True)
+        self._eviction_thread.start()
+
+    def _stop_container_pool(self, function_full_path):
+        """
+        Drop the container pool of the given function, and stop all of its containers
+
+        Parameters
+        ----------
+        function_full_path: str
+            The function full path
+        """
+        container_pool = self._container_pools.pop(function_full_path, None)
+        if container_pool:
+            for container in container_pool.drain():
+                self._container_manager.stop(container)
 
     def _configure_interrupt(self, function_full_path, timeout, container, is_debugging):
         """
@@ -462,27 +992,49 @@ class WarmLambdaRuntime(LambdaRuntime):
             LOG.info("Execution of function %s was interrupted", function_full_path)
 
         if is_debugging:
-            LOG.debug("Setting up SIGTERM interrupt handler")
-            signal.signal(signal.SIGTERM, signal_handler)
+            # signal handlers can only be set by the main thread, the debugged invocations running in other threads
+            # are stopped by stop_debugging_containers instead
+            if threading.current_thread() is threading.main_thread():
+                LOG.debug("Setting up SIGTERM interrupt handler")
+                signal.signal(signal.SIGTERM, signal_handler)
             return None
 
         return start_timer
 
     def clean_running_containers_and_related_resources(self):
         """
-        Clean the running containers, the decompressed code dirs, and stop the created observer
+        Clean the running containers, and stop the created observer
         """
+        self._eviction_stopped.set()
+        if self._eviction_counts:
+            LOG.debug("Warm containers evictions: %s", self._eviction_counts)
+        if self._pause_count:
+            LOG.debug(
+                "Warm containers pauses: %d, unpauses: %d, average unpause %.0f ms",
+                self._pause_count,
+                len(self._unpause_durations),
+                sum(self._unpause_durations) / len(self._unpause_durations) if self._unpause_durations else 0,
+            )
+        for strategy, durations in self._code_reload_durations.items():
+            if durations:
+                LOG.debug(
+                    "Code reloads %s: %d, average %.0f ms", strategy, len(durations), sum(durations) / len(durations)
+                )
+
         LOG.debug("Terminating all running warm containers")
-        for function_name, container in self._containers.items():
-            LOG.debug("Terminate running warm container for Lambda Function '%s'", function_name)
-            self._container_manager.stop(container)
-        self._clean_decompressed_paths()
+        for function_name, container_pool in self._container_pools.items():
+            for container in container_pool.drain():
+                LOG.debug("Terminate running warm container for Lambda Function '%s'", function_name)
+                self._container_manager.stop(container)
+        self._decompression_cache.release()
         self._observer.stop()
 
     def _on_code_change(self, functions):
         """
         Handles the lambda function code change event. it determines if there is a real change in the code
-        by comparing the checksum of the code path before and after the event.
+        by comparing the checksum of the code path before and after the event. The code of the functions of the
+        interpreted runtimes is reloaded in their running containers, the containers of the other functions are
+        terminated, and created again in lazy mode.
 
         Parameters
         ----------
@@ -490,44 +1042,119 @@ class WarmLambdaRuntime(LambdaRuntime):
             the lambda functions that their source code or images got changed
         """
         for function_config in functions:
+            if self._reload_code_in_place(function_config):
+                continue
+
             function_full_path = function_config.full_path
             resource = "source code" if function_config.packagetype == ZIP else f"{function_config.imageuri} image"
             LOG.info(
-                "Lambda Function '%s' %s has been changed, terminate its warm container. "
-                "The new container will be created in lazy mode",
+                "Lambda Function '%s' %s has been changed, terminate its warm containers. "
+                "The new containers will be created in lazy mode",
                 function_full_path,
                 resource,
             )
+            started_at = time.monotonic()
             self._observer.unwatch(function_config)
-            self._function_configs.pop(function_full_path, None)
-            container = self._containers.get(function_full_path, None)
-            if container:
-                self._container_manager.stop(container)
-                self._containers.pop(function_full_path, None)
-
+            with self._lock:
+                self._function_configs.pop(function_full_path, None)
+                self._stop_container_pool(function_full_path)
+            with self._reload_lock:
+                self._pending_restarts[function_full_path] = (time.monotonic() - started_at) * 1000
 
-def _unzip_file(filepath):
-    """
-    Helper method to unzip a file to a temporary directory
+    def _reload_code_in_place(self, function_config):
+        """
+        Reload the changed code of a function in its running warm containers, by killing their runtime process so the
+        Runtime Interface Emulator starts a new one loading the mounted code again on the next invoke. This applies
+        only to the interpreted runtimes whose code is a mounted directory. The layers are part of the container image,
+        so the functions using local layers are restarted, as well as the debugged function whose debugger is attached
+        to the runtime process.
 
-    :param string filepath: Absolute path to this file
-    :return string: Path to the temporary directory where it was unzipped
-    """
+        Parameters
+        ----------
+        function_config: FunctionConfig
+            the lambda function whose source code got changed
 
-    temp_dir = tempfile.mkdtemp()
+        Returns
+        -------
+        bool
+            True if the code got reloaded in all the function containers, False if they must be restarted instead
+        """
+        function_full_path = function_config.full_path
+        pattern = _get_runtime_process_pattern(function_config)
+        if (
+            not pattern
+            or not function_config.code_abs_path
+            or not os.path.isdir(function_config.code_abs_path)
+            or any(getattr(layer, "codeuri", None) for layer in function_config.layers)
+        ):
+            return False
+
+        with self._lock:
+            container_pool = self._container_pools.get(function_full_path, None)
+            if not container_pool or function_full_path in self._debugged_functions:
+                return False
+            containers = container_pool.containers
+
+        started_at = time.monotonic()
+        command = ["/bin/sh", "-c", RUNTIME_PROCESS_RELOAD_SCRIPT.format(pattern=pattern)]
+        for container in containers:
+            try:
+                exit_code = container.exec_run(command)
+            except Exception as ex:  # pylint: disable=broad-except
+                LOG.debug("Failed to reload the code of Lambda Function '%s' in place", function_full_path, exc_info=ex)
+                return False
+            if exit_code:
+                LOG.debug("Reloading the code of Lambda Function '%s' exited with %s", function_full_path, exit_code)
+                return False
+
+        duration = (time.monotonic() - started_at) * 1000
+        with self._reload_lock:
+            self._code_reload_durations["in place"].append(duration)
+        LOG.info(
+            "Lambda Function '%s' source code has been changed, reloaded it in its %d warm containers in %.0f ms",
+            function_full_path,
+            len(containers),
+            duration,
+        )
+        return True
 
-    if os.name == "posix":
-        os.chmod(temp_dir, 0o755)
 
-    LOG.info("Decompressing %s", filepath)
+def _get_function_max_concurrency_setting() -> Dict[str, int]:
+    """
+    Returns the maximum number of warm containers of the functions set with the
+    SAM_CLI_WARM_CONTAINERS_FUNCTION_MAX_CONCURRENCY env var, by function full path or logical ID. The invalid entries
+    are ignored with a warning
+    """
+    function_max_concurrency: Dict[str, int] = {}
+    for entry in os.environ.get(WARM_CONTAINERS_FUNCTION_MAX_CONCURRENCY_ENV_VAR, "").split(","):
+        if not entry.strip():
+            continue
+        function_name, _, max_concurrency = entry.partition("=")
+        try:
+            concurrency = int(max_concurrency)
+        except ValueError:
+            concurrency = 0
+        if not function_name.strip() or concurrency < 1:
+            LOG.warning(
+                "Ignoring invalid %s entry '%s', expected a function and a positive number such as Function=4",
+                WARM_CONTAINERS_FUNCTION_MAX_CONCURRENCY_ENV_VAR,
+                entry,
+            )
+            continue
+        function_max_concurrency[function_name.strip()] = concurrency
+    return function_max_concurrency
 
-    unzip(filepath, temp_dir)
 
-    # The directory that Python returns might have symlinks. The Docker File sharing settings will not resolve
-    # symlinks. Hence get the real path before passing to Docker.
-    # Especially useful in Mac OSX which returns /var/folders which is a symlink to /private/var/folders that is a
-    # part of Docker's Shared Files directories
-    return os.path.realpath(temp_dir)
+def _get_runtime_process_pattern(function_config):
+    """
+    Returns the command line pattern of the runtime process of the given function, if its code can be reloaded in place
+    """
+    if function_config.packagetype != ZIP or not function_config.runtime:
+        return None
+    for runtime_family, pattern in RELOADABLE_RUNTIME_PROCESS_PATTERNS.items():
+        if function_config.runtime.startswith(runtime_family):
+            return pattern
+    return None
 
 
 def _require_container_reloading(exist_function_config, function_config):
@@ -3,8 +3,13 @@ Downloads Layers locally
 """
 
 import logging
+import os
+import shutil
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List
+from typing import Dict, List, Set
 
 import boto3
 from botocore.exceptions import ClientError, NoCredentialsError
@@ -12,10 +17,14 @@ from botocore.exceptions import ClientError, NoCredentialsError
 from samcli.commands.local.cli_common.user_exceptions import CredentialsRequired, ResourceNotFound
 from samcli.lib.providers.provider import LayerVersion, Stack
 from samcli.lib.utils.codeuri import resolve_code_path
+from samcli.lib.utils.env_settings import get_int_setting
 from samcli.local.lambdafn.zip import unzip_from_uri
 
 LOG = logging.getLogger(__name__)
 
+# Maximum number of layers downloaded at the same time
+LAYER_DOWNLOAD_MAX_WORKERS = get_int_setting("SAM_CLI_LAYER_DOWNLOAD_MAX_WORKERS", 4, minimum=1)
+
 
 class LayerDownloader:
     def __init__(self, layer_cache, cwd, stacks: List[Stack], lambda_client=None):
@@ -37,6 +46,12 @@ class LayerDownloader:
         self._stacks = stacks
         self._lambda_client = lambda_client
 
+        # a layer is downloaded by one thread at a time, the other threads wait for it and reuse the downloaded layer
+        self._lock = threading.Lock()
+        self._layer_locks: Dict[str, threading.Lock] = {}
+        # layers downloaded by this instance, which don't have to be downloaded again even if forced
+        self._downloaded_layers: Set[str] = set()
+
     @property
     def lambda_client(self):
         self._lambda_client = self._lambda_client or boto3.client("lambda")
@@ -71,11 +86,11 @@ class LayerDownloader:
         List(Path)
             List of Paths to where the layer was cached
         """
-        layer_dirs = []
-        for layer in layers:
-            layer_dirs.append(self.download(layer, force))
+        if len(layers) <= 1:
+            return [self.download(layer, force) for layer in layers]
 
-        return layer_dirs
+        with ThreadPoolExecutor(max_workers=min(len(layers), max(1, LAYER_DOWNLOAD_MAX_WORKERS))) as executor:
+            return list(executor.map(lambda layer: self.download(layer, force), layers))
 
     def download(self, layer: LayerVersion, force=False) -> LayerVersion:
         """
@@ -99,24 +114,45 @@ class LayerDownloader:
             return layer
 
         layer_path = Path(self.layer_cache).resolve().joinpath(layer.name)
-        is_layer_downloaded = self._is_layer_cached(layer_path)
         layer.codeuri = str(layer_path)
 
-        if is_layer_downloaded and not force:
-            LOG.info("%s is already cached. Skipping download", layer.arn)
-            return layer
-
-        layer_zip_path = layer.codeuri + ".zip"
-        layer_zip_uri = self._fetch_layer_uri(layer)
-        unzip_from_uri(
-            layer_zip_uri,
-            layer_zip_path,
-            unzip_output_dir=layer.codeuri,
-            progressbar_label="Downloading {}".format(layer.layer_arn),
-        )
+        with self._get_layer_lock(layer.name):
+            is_layer_downloaded = self._is_layer_cached(layer_path)
+            if is_layer_downloaded and (not force or layer.name in self._downloaded_layers):
+                LOG.info("%s is already cached. Skipping download", layer.arn)
+                return layer
+
+            # Download and extract the layer next to the cache, and only move it in the cache once complete,
+            # so a partially extracted layer is never considered as cached
+            download_id = uuid.uuid4().hex
+            layer_tmp_path = layer_path.with_name(f"{layer.name}.{download_id}.tmp")
+            try:
+                layer_zip_uri = self._fetch_layer_uri(layer)
+                unzip_from_uri(
+                    layer_zip_uri,
+                    f"{layer_tmp_path}.zip",
+                    unzip_output_dir=str(layer_tmp_path),
+                    progressbar_label="Downloading {}".format(layer.layer_arn),
+                )
+
+                if is_layer_downloaded:
+                    shutil.rmtree(layer_path)
+                os.replace(layer_tmp_path, layer_path)
+            finally:
+                if layer_tmp_path.exists():
+                    shutil.rmtree(layer_tmp_path)
+
+            self._downloaded_layers.add(layer.name)
 
         return layer
 
+    def _get_layer_lock(self, layer_name: str) -> threading.Lock:
+        """
+        Returns the lock guarding the download of the given layer
+        """
+        with self._lock:
+            return self._layer_locks.setdefault(layer_name, threading.Lock())
+
     def _fetch_layer_uri(self, layer):
         """
         Fetch the Layer Uri based on the LayerVersion Arn
@@ -6,8 +6,20 @@ from typing import Tuple
 
 from flask import Response
 
+from samcli.local.services.http_server import (
+    HTTP_SERVER_BACKLOG,
+    HTTP_SERVER_KEEP_ALIVE,
+    HTTP_SERVER_WORKERS,
+    THREAD_POOL_ENGINE,
+    ThreadPoolWSGIServer,
+    get_http_server_engine,
+)
+
 LOG = logging.getLogger(__name__)
 
+# Local only path of the statistics of the services, such as their concurrency and throttles
+STATS_PATH = "/_sam/stats"
+
 
 class BaseLocalService:
     def __init__(self, is_debugging, port, host):
@@ -17,7 +29,8 @@ class BaseLocalService:
         Parameters
         ----------
         is_debugging bool
-            Flag to run in debug mode or not
+            Flag to run in debug mode or not. The invocations of the debugged function are serialized by the Lambda
+            Runner, the service itself is multi-threaded either way
         port int
             Optional. port for the service to start listening on Defaults to 3000
         host str
@@ -36,7 +49,8 @@ class BaseLocalService:
 
     def run(self):
         """
-        This starts up the (threaded) Local Server.
+        This starts up the (threaded) Local Server, with the HTTP server engine selected with the
+        SAM_CLI_HTTP_SERVER_ENGINE env var.
         Note: This is a **blocking call**
 
         Raises
@@ -47,14 +61,22 @@ class BaseLocalService:
         if not self._app:
             raise RuntimeError("The application must be created before running")
 
-        # Flask can operate as a single threaded server (which is default) and a multi-threaded server which is
-        # more for development. When the Lambda container is going to be debugged, then it does not make sense
-        # to turn on multi-threading because customers can realistically attach only one container at a time to
-        # the debugger. Keeping this single threaded also enables the Lambda Runner to handle Ctrl+C in order to
-        # kill the container gracefully (Ctrl+C can be handled only by the main thread)
-        multi_threaded = not self.is_debugging
-
-        LOG.debug("Localhost server is starting up. Multi-threading = %s", multi_threaded)
+        # The server is always multi-threaded. When a Lambda container is going to be debugged, the Lambda Runner
+        # serializes the invocations of the debugged function only, as customers can realistically attach only one
+        # container at a time to the debugger, while the other functions keep running concurrently. The Lambda Runtime
+        # stops the containers of the debugged invocations running in the server threads once the server is stopped
+        # with Ctrl+C, which can be handled only by the main thread
+        if get_http_server_engine() == THREAD_POOL_ENGINE:
+            LOG.debug(
+                "Localhost server is starting up. Workers = %s, backlog = %s, keep-alive = %ss",
+                HTTP_SERVER_WORKERS,
+                HTTP_SERVER_BACKLOG,
+                HTTP_SERVER_KEEP_ALIVE,
+            )
+            ThreadPoolWSGIServer(self.host, self.port, self._app).serve_forever()
+            return
+
+        LOG.debug("Localhost server is starting up. Multi-threading = True")
 
         # Suppress flask dev server output
         # See: https://github.com/cs01/gdbgui/issues/425#issuecomment-1119836533
@@ -62,7 +84,7 @@ class BaseLocalService:
 
         flask.cli.show_server_banner = lambda *args: None
 
-        self._app.run(threaded=multi_threaded, host=self.host, port=self.port)
+        self._app.run(threaded=True, host=self.host, port=self.port)
 
     @staticmethod
     def service_response(body, headers, status_code):
@@ -100,7 +122,9 @@ class LambdaOutputParser:
         bool
             If the response is an error/exception from the container
         """
-        lambda_response = stdout_stream.getvalue().decode("utf-8")
+        # decode straight from the stream's buffer, large responses would be copied once more with getvalue()
+        with stdout_stream.getbuffer() as stdout_buffer:
+            lambda_response = str(stdout_buffer, "utf-8")
 
         # When the Lambda Function returns an Error/Exception, the output is added to the stdout of the container. From
         # our perspective, the container returned some value, which is not always true. Since the output is the only
@@ -129,6 +153,10 @@ class LambdaOutputParser:
         lambda_response_error_dict_len = 2
         lambda_response_error_with_stacktrace_dict_len = 3
 
+        # avoid parsing large successful responses, an error always contains the errorType key
+        if "errorType" not in lambda_response:
+            return is_lambda_user_error_response
+
         try:
             lambda_response_dict = json.loads(lambda_response)
 
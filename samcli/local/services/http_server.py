@@ -0,0 +1,222 @@
+"""
+HTTP server engines the local services can be served with
+"""
+import logging
+import os
+import socket
+import select
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional
+
+from werkzeug.serving import BaseWSGIServer, WSGIRequestHandler
+from werkzeug.wsgi import LimitedStream, get_content_length
+
+from samcli.lib.utils.env_settings import get_float_setting, get_int_setting
+
+LOG = logging.getLogger(__name__)
+
+# Flask development server, starting a new thread for each connection
+DEVELOPMENT_ENGINE = "development"
+# WSGI server handling the connections with a bounded pool of worker threads
+THREAD_POOL_ENGINE = "thread-pool"
+HTTP_SERVER_ENGINES = (DEVELOPMENT_ENGINE, THREAD_POOL_ENGINE)
+
+# Engine serving the local services
+HTTP_SERVER_ENGINE = os.environ.get("SAM_CLI_HTTP_SERVER_ENGINE", DEVELOPMENT_ENGINE)
+# Number of connections handled at the same time by the thread-pool engine
+HTTP_SERVER_WORKERS = get_int_setting("SAM_CLI_HTTP_SERVER_WORKERS", 32, minimum=1)
+# Number of connections waiting in the listen backlog of the thread-pool engine once all the workers are busy
+HTTP_SERVER_BACKLOG = get_int_setting("SAM_CLI_HTTP_SERVER_BACKLOG", 1024, minimum=1)
+# Seconds an idle connection is kept open between two requests by the thread-pool engine, 0 disables keep-alive
+HTTP_SERVER_KEEP_ALIVE = get_float_setting("SAM_CLI_HTTP_SERVER_KEEP_ALIVE", 5, minimum=0)
+
+# Seconds the accepting loop waits for a worker before closing an idle kept alive connection
+_WORKER_WAIT_INTERVAL = 0.05
+_READ_SIZE = 64 * 1024
+# Seconds a kept alive connection must have been idle to be closed for a waiting connection, so the clients sending
+# their requests in a row don't have their connection closed while sending the next request
+_MIN_IDLE_TIME = 0.1
+
+
+class _RequestHandler(WSGIRequestHandler):
+    """
+    Closes the connections after each request. The protocol version is pinned, as the development server changes the
+    one of the WSGIRequestHandler class when it is threaded.
+    """
+
+    protocol_version = "HTTP/1.0"
+
+
+class _KeepAliveRequestHandler(WSGIRequestHandler):
+    """
+    Keeps the connections open between requests, until they have been idle for the keep-alive timeout, or until
+    another connection waits for the worker
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def setup(self) -> None:
+        super().setup()
+        # the responses are written in several chunks, don't wait for the acknowledgement of the previous one
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._handled_requests = 0
+        self._request_body: Optional[Any] = None
+
+    def handle_one_request(self) -> None:
+        # the first request of a connection is usually sent with the connection, only the next ones are waited for
+        if self._handled_requests:
+            self.server.set_idle(self.connection, True)  # type: ignore
+        # only the wait for the request line is bounded by the keep-alive timeout, not the request itself
+        self.connection.settimeout(self.server.keep_alive)  # type: ignore
+        self._request_body = None
+        try:
+            super().handle_one_request()
+        finally:
+            self.server.set_idle(self.connection, False)  # type: ignore
+        self._handled_requests += 1
+        self._skip_unread_body()
+
+    def make_environ(self) -> Dict[str, Any]:
+        environ = super().make_environ()
+        if not environ.get("wsgi.input_terminated"):
+            environ["wsgi.input"] = LimitedStream(environ["wsgi.input"], get_content_length(environ) or 0)
+        self._request_body = environ["wsgi.input"]
+        return environ
+
+    def _skip_unread_body(self) -> None:
+        """
+        Reads the end of the request body the application did not read, which would otherwise be read as the next
+        request of the connection
+        """
+        if self.close_connection or not self._request_body:
+            return
+        try:
+            while self._request_body.read(_READ_SIZE):
+                pass
+        except (OSError, ValueError) as ex:
+            LOG.debug("Failed to read the end of the request body", exc_info=ex)
+            self.close_connection = True
+
+    def parse_request(self) -> bool:
+        # the request line was received, the body and the response can take as long as the client needs
+        self.connection.settimeout(None)
+        self.server.set_idle(self.connection, False)  # type: ignore
+        return super().parse_request()
+
+    def log_error(self, format, *args) -> None:  # pylint: disable=redefined-builtin
+        # closing a connection idle for the keep-alive timeout is expected
+        if not format.startswith("Request timed out"):
+            super().log_error(format, *args)
+
+
+class ThreadPoolWSGIServer(BaseWSGIServer):
+    """
+    WSGI server handling the connections with a bounded pool of worker threads. Once all the workers are busy, new
+    connections are not accepted anymore and wait in the listen backlog, instead of starting more threads. The workers
+    waiting for the next request of a kept alive connection are freed by closing their connection, as clients expect
+    idle connections to be closed by the server.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        app,
+        workers: int = HTTP_SERVER_WORKERS,
+        backlog: int = HTTP_SERVER_BACKLOG,
+        keep_alive: float = HTTP_SERVER_KEEP_ALIVE,
+    ):
+        """
+        Parameters
+        ----------
+        host str
+            Host to listen on
+        port int
+            Port to listen on
+        app flask.Flask
+            WSGI application to serve
+        workers int
+            Maximum number of connections handled at the same time
+        backlog int
+            Maximum number of connections waiting to be accepted
+        keep_alive float
+            Seconds an idle connection is kept open between two requests, 0 disables keep-alive
+        """
+        # used when the server starts listening, in the parent constructor
+        self.request_queue_size = backlog
+        self.keep_alive = keep_alive or None
+        super().__init__(host, port, app, handler=_KeepAliveRequestHandler if keep_alive else _RequestHandler)
+
+        self._workers = threading.BoundedSemaphore(workers)
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="http-worker")
+        self._idle_lock = threading.Lock()
+        # kept alive connections waiting for their next request, with the time they started waiting
+        self._idle_connections: Dict[socket.socket, float] = {}
+
+    def set_idle(self, connection: socket.socket, is_idle: bool) -> None:
+        """
+        Marks a kept alive connection as waiting for its next request, or not
+        """
+        with self._idle_lock:
+            if is_idle:
+                self._idle_connections[connection] = time.monotonic()
+            else:
+                self._idle_connections.pop(connection, None)
+
+    def process_request(self, request, client_address) -> None:
+        # blocks the accepting loop until a worker is available
+        while not self._workers.acquire(timeout=_WORKER_WAIT_INTERVAL):
+            self._close_idle_connection()
+        self._executor.submit(self._process_request, request, client_address)
+
+    def _close_idle_connection(self) -> None:
+        """
+        Closes the connection idle for the longest time, if it is not receiving its next request already
+        """
+        with self._idle_lock:
+            if not self._idle_connections:
+                return
+            connection, idle_since = min(self._idle_connections.items(), key=lambda item: item[1])
+            if time.monotonic() - idle_since < _MIN_IDLE_TIME or select.select([connection], [], [], 0)[0]:
+                return
+            del self._idle_connections[connection]
+
+        try:
+            # the worker reading the next request sees the end of the connection, and closes it
+            connection.shutdown(socket.SHUT_RDWR)
+        except OSError as ex:
+            LOG.debug("Failed to close an idle connection", exc_info=ex)
+
+    def _process_request(self, request, client_address) -> None:
+        try:
+            self.finish_request(request, client_address)
+        except Exception:  # pylint: disable=broad-except
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+            self._workers.release()
+
+    def serve_forever(self, poll_interval: float = 0.5) -> None:
+        try:
+            super().serve_forever(poll_interval)
+        finally:
+            self._executor.shutdown(wait=False)
+
+
+def get_http_server_engine(engine: Optional[str] = None) -> str:
+    """
+    Returns the given engine, or the one selected with the SAM_CLI_HTTP_SERVER_ENGINE env var, falling back to the
+    development engine when it is unknown
+    """
+    engine = engine or HTTP_SERVER_ENGINE
+    if engine not in HTTP_SERVER_ENGINES:
+        LOG.warning(
+            "Unknown HTTP server engine '%s', expected one of %s. Using the %s engine",
+            engine,
+            ", ".join(HTTP_SERVER_ENGINES),
+            DEVELOPMENT_ENGINE,
+        )
+        return DEVELOPMENT_ENGINE
+    return engine
@@ -0,0 +1,68 @@
+"""
+Functional tests of the invoke configurations the local Lambda runner reuses between the invokes of a function
+"""
+import os
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+from samcli.commands.local.lib.local_lambda import LocalLambdaRunner
+from samcli.lib.providers.provider import Stack
+from samcli.lib.providers.sam_function_provider import SamFunctionProvider
+
+ENV_VARS_COUNT = 50
+
+
+class TestInvokeConfig(TestCase):
+    def setUp(self):
+        template = {
+            "Resources": {
+                f"Function{index}": {
+                    "Type": "AWS::Serverless::Function",
+                    "Properties": {
+                        "CodeUri": "code",
+                        "Handler": "app.handler",
+                        "Runtime": "python3.9",
+                        "Environment": {
+                            "Variables": {f"VARIABLE_{variable}": "value" for variable in range(ENV_VARS_COUNT)}
+                        },
+                    },
+                }
+                for index in range(10)
+            }
+        }
+        provider = SamFunctionProvider([Stack("", "", "template.yaml", None, template)])
+        env_vars_values = {"Parameters": {"VARIABLE_0": "global"}, "Function0": {"VARIABLE_1": "function"}}
+        self.runtime = Mock()
+        self.runner = LocalLambdaRunner(self.runtime, provider, os.getcwd(), env_vars_values=env_vars_values)
+
+        env_patch = patch.dict(os.environ, {"AWS_ACCESS_KEY_ID": "key", "AWS_SECRET_ACCESS_KEY": "secret"})
+        env_patch.start()
+        self.addCleanup(env_patch.stop)
+
+    def _get_invoke_configs(self):
+        return [call[0][0] for call in self.runtime.invoke.call_args_list]
+
+    def test_must_reuse_the_invoke_config_of_a_function(self):
+        self.runner.invoke("Function0", "{}")
+        self.runner.invoke("Function0", "{}")
+        self.runner.invoke("Function1", "{}")
+
+        first_config, second_config, other_function_config = self._get_invoke_configs()
+        self.assertIs(first_config, second_config)
+        self.assertIsNot(other_function_config, first_config)
+        env_vars = first_config.env_vars.resolve()
+        self.assertEqual(env_vars["VARIABLE_0"], "global")
+        self.assertEqual(env_vars["VARIABLE_1"], "function")
+        self.assertEqual(env_vars["VARIABLE_2"], "value")
+        self.assertEqual(other_function_config.env_vars.resolve()["VARIABLE_1"], "value")
+
+    def test_must_rebuild_the_invoke_config_when_the_credentials_change(self):
+        self.runner.invoke("Function0", "{}")
+        refreshed_creds = {"key": "new-key", "secret": "new-secret"}
+        with patch.object(self.runner, "get_aws_creds", return_value=refreshed_creds):
+            self.runner.invoke("Function0", "{}")
+
+        first_config, second_config = self._get_invoke_configs()
+        self.assertIsNot(first_config, second_config)
+        self.assertEqual(second_config.env_vars.resolve()["AWS_ACCESS_KEY_ID"], "new-key")
+        self.assertEqual(second_config.env_vars.resolve()["VARIABLE_1"], "function")
@@ -0,0 +1,54 @@
+"""
+Functional tests of the construction of the events sent to the functions by the local API Gateway
+"""
+import json
+from unittest import TestCase
+from unittest.mock import Mock
+
+from flask import Flask, request
+
+from samcli.lib.providers.provider import Api
+from samcli.local.apigw.local_apigw_service import LocalApigwService, Route
+
+
+class TestEventConstruction(TestCase):
+    def setUp(self):
+        self.app = Flask(__name__)
+        self.app.add_url_rule("/users/<id>", endpoint="/users/<id>", view_func=lambda id: "", methods=["POST"])
+        self.request_context = self.app.test_request_context(
+            "/users/42?page=1&page=2",
+            method="POST",
+            data=b'{"name": "user"}',
+            headers={"Content-Type": "application/json", "Cookie": "session=value"},
+        )
+        self.request_context.push()
+        self.addCleanup(self.request_context.pop)
+
+        api = Api(routes=[])
+        api.stage_name = "Prod"
+        api.stage_variables = {"key": "value"}
+        self.service = LocalApigwService(api, Mock())
+
+    def test_templated_v_1_0_event_must_match_the_untemplated_one(self):
+        route = Route(methods=["POST"], function_name="Function", path="/users/{id}", operation_name="getUser")
+        event_template = self.service._get_event_template(route, "POST", "/users/<id>")
+
+        untemplated_event = LocalApigwService._construct_v_1_0_event(
+            request, 3000, [], "Prod", {"key": "value"}, "getUser"
+        )
+        templated_event = LocalApigwService._construct_v_1_0_event(request, 3000, [], event_template=event_template)
+
+        self.assertEqual(json.loads(templated_event), json.loads(untemplated_event))
+
+    def test_templated_v_2_0_event_must_match_the_untemplated_one(self):
+        route = Route(methods=["POST"], function_name="Function", path="/users/{id}", event_type=Route.HTTP)
+        event_template = self.service._get_event_template(route, "POST", "/users/<id>")
+
+        untemplated_event = LocalApigwService._construct_v_2_0_event_http(
+            request, 3000, [], "Prod", {"key": "value"}, "POST /users/{id}"
+        )
+        templated_event = LocalApigwService._construct_v_2_0_event_http(
+            request, 3000, [], event_template=event_template
+        )
+
+        self.assertEqual(json.loads(templated_event), json.loads(untemplated_event))
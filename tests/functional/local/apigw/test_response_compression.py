@@ -0,0 +1,29 @@
+"""
+Functional tests of the compression of the responses of the local API
+"""
+import gzip
+import json
+import zlib
+from unittest import TestCase
+
+from flask import Response
+from parameterized import parameterized
+from werkzeug.datastructures import Accept
+
+from samcli.local.apigw.response_compression import DEFLATE_ENCODING, GZIP_ENCODING, compress_response
+
+BODY = json.dumps([{"id": index, "name": f"user-{index}", "active": index % 2 == 0} for index in range(50000)])
+
+
+class TestResponseCompression(TestCase):
+    @parameterized.expand([(GZIP_ENCODING, gzip.decompress), (DEFLATE_ENCODING, zlib.decompress)])
+    def test_must_compress_large_responses_losslessly(self, encoding, decompress):
+        response = Response(BODY, mimetype="application/json")
+
+        original_size, compressed_size = compress_response(response, Accept([(encoding, 1)]), 0)
+
+        self.assertEqual(response.headers["Content-Encoding"], encoding)
+        self.assertEqual(original_size, len(BODY))
+        self.assertEqual(compressed_size, len(response.get_data()))
+        self.assertLess(compressed_size, original_size)
+        self.assertEqual(decompress(response.get_data()).decode(), BODY)
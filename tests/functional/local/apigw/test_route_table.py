@@ -0,0 +1,90 @@
+"""
+Functional tests of the route table of the local API Gateway, against the Flask url map it replaced
+"""
+from unittest import TestCase
+from unittest.mock import Mock
+
+from flask import Flask
+from parameterized import parameterized
+from werkzeug.exceptions import HTTPException
+
+from samcli.lib.providers.provider import Api
+from samcli.local.apigw.local_apigw_service import CatchAllPathConverter, LocalApigwService, Route
+from samcli.local.apigw.path_converter import PathConverter
+
+RESOURCES_COUNT = 10
+METHODS = ["GET", "POST", "PUT", "DELETE", "PATCH"]
+
+
+def _routes():
+    # resources with static and parameter segments, and a greedy proxy
+    routes = []
+    for index in range(RESOURCES_COUNT):
+        resource = f"/resource{index}"
+        routes += [
+            Route(methods=["GET", "POST"], function_name="Function", path=resource),
+            Route(methods=["GET", "PUT", "DELETE"], function_name="Function", path=f"{resource}/{{id}}"),
+            Route(methods=["GET"], function_name="Function", path=f"{resource}/{{id}}/items"),
+            Route(methods=["GET", "POST"], function_name="Function", path=f"{resource}/{{id}}/items/{{item}}"),
+            Route(methods=["ANY"], function_name="Function", path=f"{resource}/{{id}}/files/{{proxy+}}"),
+        ]
+    return routes
+
+
+def _request_paths():
+    paths = ["/", "/unknown", "/resource"]
+    for index in range(RESOURCES_COUNT):
+        resource = f"/resource{index}"
+        paths += [
+            resource,
+            f"{resource}/",
+            f"{resource}/5",
+            f"{resource}/5/items",
+            f"{resource}/5/items/",
+            f"{resource}/5/items/7",
+            f"{resource}/5/items/7/unknown",
+            f"{resource}/5/files/a",
+            f"{resource}/5/files/a/b/c.txt",
+            f"{resource}/5/files",
+            f"{resource}/5/unknown",
+        ]
+    return paths
+
+
+class TestRouteTable(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        routes = _routes()
+        service = LocalApigwService(Api(routes=routes), Mock())
+        service.create()
+        cls.route_table_app = service._app
+
+        cls.flask_app = Flask(__name__)
+        cls.flask_app.url_map.converters["path"] = CatchAllPathConverter
+        cls.flask_app.url_map.strict_slashes = False
+        for route in routes:
+            path = PathConverter.convert_path_to_flask(route.path)
+            cls.flask_app.add_url_rule(path, endpoint=path, methods=route.methods)
+
+    @parameterized.expand([(method,) for method in METHODS])
+    def test_must_match_the_same_routes_as_the_flask_url_map(self, method):
+        route_table_adapter = self._create_url_adapter(self.route_table_app)
+        flask_adapter = self._create_url_adapter(self.flask_app)
+
+        for path in _request_paths():
+            with self.subTest(path=path):
+                self.assertEqual(
+                    self._match(route_table_adapter, path, method), self._match(flask_adapter, path, method)
+                )
+
+    @staticmethod
+    def _create_url_adapter(app):
+        return app.create_url_adapter(app.test_request_context("/").request)
+
+    @staticmethod
+    def _match(adapter, path, method):
+        try:
+            rule, view_args = adapter.match(path, method, return_rule=True)
+        except HTTPException as ex:
+            return type(ex)
+        return rule.rule, view_args
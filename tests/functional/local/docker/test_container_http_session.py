@@ -0,0 +1,74 @@
+"""
+Functional tests of the connections opened to the Runtime Interface Emulator of a warm container by its invokes
+"""
+import io
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import TestCase
+from unittest.mock import Mock
+
+import requests
+
+from samcli.local.docker.container import Container
+
+INVOKES_COUNT = 20
+
+
+class _RapidHandler(BaseHTTPRequestHandler):
+    """
+    Answers invokes like aws-lambda-rie does, keeping the connection open between requests and disabling Nagle's
+    algorithm as Go servers do
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.server.connections_count += 1
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        body = b'{"statusCode": 200}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestContainerHttpSession(TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _RapidHandler)
+        self.server.connections_count = 0
+        self.server_thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.server_thread.start()
+
+        self.container = Container("image", "cmd", "dir", "dir", docker_client=Mock(), container_host="127.0.0.1")
+        self.container.rapid_port_host = self.server.server_address[1]
+        self.url = self.container.URL.format(
+            host="127.0.0.1", port=self.container.rapid_port_host, function_name="function"
+        )
+
+    def tearDown(self):
+        self.container.stop()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_plain_requests_open_a_connection_per_invoke(self):
+        for _ in range(INVOKES_COUNT):
+            requests.post(self.url, data=b"{}", timeout=(Container.RAPID_CONNECTION_TIMEOUT, None))
+
+        self.assertEqual(self.server.connections_count, INVOKES_COUNT)
+
+    def test_invokes_reuse_the_connection_to_rapid(self):
+        stdout = io.BytesIO()
+        for _ in range(INVOKES_COUNT):
+            self.container.wait_for_http_response("function", "{}", stdout)
+
+        self.assertEqual(self.server.connections_count, 1)
+        self.assertEqual(stdout.getvalue(), b'{"statusCode": 200}' * INVOKES_COUNT)
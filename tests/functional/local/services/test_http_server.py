@@ -0,0 +1,59 @@
+"""
+Functional tests of the thread-pool engine serving the local services
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+
+import requests
+from flask import Flask
+
+from samcli.local.services.http_server import ThreadPoolWSGIServer
+
+WORKERS = 16
+CLIENTS_COUNT = 50
+REQUESTS_PER_CLIENT = 20
+# time spent by the service on each request, as if it was waiting for a warm container
+REQUEST_LATENCY = 0.005
+
+
+class TestThreadPoolWSGIServer(TestCase):
+    def setUp(self):
+        self.app = Flask(__name__)
+        self.lock = threading.Lock()
+        self.serving_threads = set()
+        self.running_requests_count = 0
+        self.max_running_requests_count = 0
+
+        @self.app.route("/", methods=["POST"])
+        def invoke():
+            with self.lock:
+                self.serving_threads.add(threading.current_thread().name)
+                self.running_requests_count += 1
+                self.max_running_requests_count = max(self.max_running_requests_count, self.running_requests_count)
+            time.sleep(REQUEST_LATENCY)
+            with self.lock:
+                self.running_requests_count -= 1
+            return '{"statusCode": 200}'
+
+    def test_must_serve_the_clients_with_a_bounded_pool_of_workers(self):
+        server = ThreadPoolWSGIServer("127.0.0.1", 0, self.app, workers=WORKERS)
+        server_thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True)
+        server_thread.start()
+        url = f"http://127.0.0.1:{server.server_port}/"
+
+        def client():
+            with requests.Session() as session:
+                return [session.post(url, data=b"{}", timeout=30).status_code for _ in range(REQUESTS_PER_CLIENT)]
+
+        with ThreadPoolExecutor(max_workers=CLIENTS_COUNT) as executor:
+            status_codes = sum(executor.map(lambda _: client(), range(CLIENTS_COUNT)), [])
+        server.shutdown()
+        server_thread.join()
+        server.server_close()
+
+        self.assertEqual(status_codes, [200] * CLIENTS_COUNT * REQUESTS_PER_CLIENT)
+        self.assertLessEqual(self.max_running_requests_count, WORKERS)
+        self.assertLessEqual(len(self.serving_threads), WORKERS)
+        self.assertTrue(all(name.startswith("http-worker") for name in self.serving_threads))
@@ -17,9 +17,10 @@ from samcli.commands.local.cli_common.invoke_context import (
     NoFunctionIdentifierProvidedException,
     InvalidEnvironmentVariablesFileException,
 )
+from samcli.commands.exceptions import ContainersInitializationException
 
 from unittest import TestCase
-from unittest.mock import Mock, PropertyMock, patch, ANY, mock_open, call
+from unittest.mock import MagicMock, Mock, PropertyMock, patch, ANY, mock_open, call
 
 from samcli.lib.providers.provider import Stack
 
@@ -477,6 +478,83 @@ class TestInvokeContext__enter__(TestCase):
         extract_func_mock.assert_called_with([], expected, False, False)
 
 
+class TestInvokeContext_initialize_all_functions_containers(TestCase):
+    def setUp(self):
+        self.context = InvokeContext(template_file="template")
+        self.functions = [Mock(), Mock()]
+        self.context._function_provider = Mock()
+        self.context._function_provider.get_all.return_value = self.functions
+        self.context._local_lambda_runner = Mock()
+        self.context._local_lambda_runner.get_invoke_config.side_effect = lambda function: function.config
+        self.context._lambda_runtimes = {ContainersMode.COLD: Mock()}
+        self.context._clean_running_containers_and_related_resources = Mock()
+
+    @patch("samcli.commands.local.cli_common.invoke_context.ContainersInitializer")
+    def test_must_initialize_containers_of_all_functions(self, ContainersInitializerMock):
+        self.context._initialize_all_functions_containers()
+
+        ContainersInitializerMock.assert_called_once_with(self.context.lambda_runtime, ANY)
+        ContainersInitializerMock.return_value.initialize.assert_called_once_with(
+            [self.functions[0].config, self.functions[1].config]
+        )
+
+        start_container = ContainersInitializerMock.call_args[0][1]
+        start_container(self.functions[0].config)
+        self.context.lambda_runtime.run.assert_called_once_with(None, self.functions[0].config, None, None, None)
+
+    @patch("samcli.commands.local.cli_common.invoke_context.ContainersInitializer")
+    def test_must_clean_containers_when_initialization_fails(self, ContainersInitializerMock):
+        ContainersInitializerMock.return_value.initialize.side_effect = ValueError("failed")
+
+        with self.assertRaises(ContainersInitializationException):
+            self.context._initialize_all_functions_containers()
+
+        self.context._clean_running_containers_and_related_resources.assert_called_once_with()
+
+
+class TestInvokeContext_prefetch_images(TestCase):
+    def setUp(self):
+        self.context = InvokeContext(template_file="template")
+        self.functions = [Mock(), Mock()]
+        self.context._function_provider = Mock()
+        self.context._function_provider.get_all.return_value = self.functions
+        self.context._local_lambda_runner = Mock()
+        self.context._local_lambda_runner.get_invoke_config.side_effect = lambda function: function.config
+        self.context._lambda_runtimes = {ContainersMode.COLD: Mock()}
+
+    @patch("samcli.commands.local.cli_common.invoke_context.ContainersInitializer")
+    def test_must_prepare_the_images_of_all_functions(self, ContainersInitializerMock):
+        self.context.prefetch_images()
+
+        ContainersInitializerMock.assert_called_once_with(self.context.lambda_runtime, ANY)
+        ContainersInitializerMock.return_value.prepare_images.assert_called_once_with(
+            [self.functions[0].config, self.functions[1].config]
+        )
+
+    @patch("samcli.commands.local.cli_common.invoke_context.ContainersInitializer")
+    def test_must_not_prepare_the_images_when_the_containers_are_initialized_eagerly(self, ContainersInitializerMock):
+        self.context._containers_initializing_mode = ContainersInitializationMode.EAGER
+
+        self.context.prefetch_images()
+
+        ContainersInitializerMock.assert_not_called()
+
+    @patch("samcli.commands.local.cli_common.invoke_context.PREFETCH_IMAGES", False)
+    @patch("samcli.commands.local.cli_common.invoke_context.ContainersInitializer")
+    def test_must_not_prepare_the_images_when_disabled(self, ContainersInitializerMock):
+        self.context.prefetch_images()
+
+        ContainersInitializerMock.assert_not_called()
+
+    @patch("samcli.commands.local.cli_common.invoke_context.ContainersInitializer")
+    def test_must_ignore_the_prefetch_failures(self, ContainersInitializerMock):
+        ContainersInitializerMock.return_value.prepare_images.side_effect = ValueError("failed")
+
+        self.context.prefetch_images()
+
+        ContainersInitializerMock.return_value.prepare_images.assert_called_once_with(ANY)
+
+
 class TestInvokeContext__exit__(TestCase):
     def test_must_close_opened_logfile(self):
         context = InvokeContext(template_file="template")
@@ -495,6 +573,16 @@ class TestInvokeContext__exit__(TestCase):
         context.__exit__()
         self.assertIsNone(context._log_file_handle)
 
+    def test_must_stop_debugging_containers(self):
+        context = InvokeContext(template_file="template")
+        context._debug_context = Mock()
+        runtime_mock = Mock()
+        context._lambda_runtimes = {ContainersMode.COLD: runtime_mock}
+
+        context.__exit__()
+
+        runtime_mock.stop_debugging_containers.assert_called_once_with()
+
 
 class TestInvokeContextAsContextManager(TestCase):
     """
@@ -609,7 +697,9 @@ class TestInvokeContext_local_lambda_runner(TestCase):
             self.assertEqual(result, runner_mock)
 
             LambdaRuntimeMock.assert_called_with(container_manager_mock, image_mock)
-            lambda_image_patch.assert_called_once_with(download_mock, True, True, invoke_images=None)
+            lambda_image_patch.assert_called_once_with(
+                download_mock, True, True, invoke_images=None, remote_image_digest_cache=ANY
+            )
             LocalLambdaMock.assert_called_with(
                 local_runtime=runtime_mock,
                 function_provider=ANY,
@@ -620,6 +710,7 @@ class TestInvokeContext_local_lambda_runner(TestCase):
                 aws_region="region",
                 container_host=None,
                 container_host_interface=None,
+                invocation_recorder=None,
             )
 
             result = self.context.local_lambda_runner
@@ -640,7 +731,7 @@ class TestInvokeContext_local_lambda_runner(TestCase):
         download_layers_mock,
         lambda_image_patch,
     ):
-        runtime_mock = Mock()
+        runtime_mock = MagicMock()
         WarmLambdaRuntimeMock.return_value = runtime_mock
 
         runner_mock = Mock()
@@ -687,7 +778,9 @@ class TestInvokeContext_local_lambda_runner(TestCase):
             self.assertEqual(result, runner_mock)
 
             WarmLambdaRuntimeMock.assert_called_with(container_manager_mock, image_mock)
-            lambda_image_patch.assert_called_once_with(download_mock, True, True, invoke_images=None)
+            lambda_image_patch.assert_called_once_with(
+                download_mock, True, True, invoke_images=None, remote_image_digest_cache=ANY
+            )
             LocalLambdaMock.assert_called_with(
                 local_runtime=runtime_mock,
                 function_provider=ANY,
@@ -698,6 +791,7 @@ class TestInvokeContext_local_lambda_runner(TestCase):
                 aws_region="region",
                 container_host=None,
                 container_host_interface=None,
+                invocation_recorder=None,
             )
 
             result = self.context.local_lambda_runner
@@ -761,7 +855,9 @@ class TestInvokeContext_local_lambda_runner(TestCase):
             self.assertEqual(result, runner_mock)
 
             LambdaRuntimeMock.assert_called_with(container_manager_mock, image_mock)
-            lambda_image_patch.assert_called_once_with(download_mock, True, True, invoke_images=None)
+            lambda_image_patch.assert_called_once_with(
+                download_mock, True, True, invoke_images=None, remote_image_digest_cache=ANY
+            )
             LocalLambdaMock.assert_called_with(
                 local_runtime=runtime_mock,
                 function_provider=ANY,
@@ -772,6 +868,7 @@ class TestInvokeContext_local_lambda_runner(TestCase):
                 aws_region="region",
                 container_host="abcdef",
                 container_host_interface="192.168.100.101",
+                invocation_recorder=None,
             )
 
             result = self.context.local_lambda_runner
@@ -834,7 +931,9 @@ class TestInvokeContext_local_lambda_runner(TestCase):
             self.assertEqual(result, runner_mock)
 
             LambdaRuntimeMock.assert_called_with(container_manager_mock, image_mock)
-            lambda_image_patch.assert_called_once_with(download_mock, True, True, invoke_images={None: "image"})
+            lambda_image_patch.assert_called_once_with(
+                download_mock, True, True, invoke_images={None: "image"}, remote_image_digest_cache=ANY
+            )
             LocalLambdaMock.assert_called_with(
                 local_runtime=runtime_mock,
                 function_provider=ANY,
@@ -845,6 +944,7 @@ class TestInvokeContext_local_lambda_runner(TestCase):
                 aws_region="region",
                 container_host=None,
                 container_host_interface=None,
+                invocation_recorder=None,
             )
 
             result = self.context.local_lambda_runner
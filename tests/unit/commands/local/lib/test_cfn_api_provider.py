@@ -237,6 +237,53 @@ class TestCloudFormationStageValues(TestCase):
         self.assertEqual(provider.api.stage_name, "dev")
         self.assertEqual(provider.api.stage_variables, {"vis": "data", "random": "test", "foo": "bar"})
 
+    def test_provider_stage_cache_settings(self):
+        method_settings = [{"ResourcePath": "/*", "HttpMethod": "*", "CachingEnabled": True, "CacheTtlInSeconds": 60}]
+        template = {
+            "Resources": {
+                "Stage": {
+                    "Type": "AWS::ApiGateway::Stage",
+                    "Properties": {
+                        "StageName": "dev",
+                        "CacheClusterEnabled": True,
+                        "MethodSettings": method_settings,
+                        "RestApiId": "TestApi",
+                    },
+                },
+                "TestApi": {
+                    "Type": "AWS::ApiGateway::RestApi",
+                    "Properties": {
+                        "Body": {
+                            "paths": {
+                                "/path": {
+                                    "get": {
+                                        "x-amazon-apigateway-integration": {
+                                            "httpMethod": "POST",
+                                            "type": "aws_proxy",
+                                            "uri": {
+                                                "Fn::Sub": "arn:aws:apigateway:${AWS::Region}:lambda:path/2015-03-31"
+                                                "/functions/${NoApiEventFunction.Arn}/invocations"
+                                            },
+                                            "cacheKeyParameters": ["method.request.querystring.page"],
+                                            "responses": {},
+                                        }
+                                    }
+                                }
+                            }
+                        }
+                    },
+                },
+            }
+        }
+        provider = ApiProvider(make_mock_stacks_from_template(template))
+
+        self.assertEqual(provider.api.cache_cluster_enabled, True)
+        self.assertEqual(provider.api.method_settings, method_settings)
+        self.assertIsNone(provider.api.minimum_compression_size)
+        self.assertEqual(
+            [route.cache_key_parameters for route in provider.routes], [["method.request.querystring.page"]]
+        )
+
     def test_multi_stage_get_all(self):
         resources = OrderedDict(
             {
@@ -334,6 +381,43 @@ class TestCloudFormationResourceMethod(TestCase):
 
         self.assertEqual(provider.routes, [Route(function_name=None, path="/{proxy+}", methods=["POST"])])
 
+    def test_rest_api_minimum_compression_size(self):
+        template = {
+            "Resources": {
+                "TestApi": {"Type": "AWS::ApiGateway::RestApi", "Properties": {"MinimumCompressionSize": 1024}},
+                "ApiResource": {"Properties": {"PathPart": "{id}", "RestApiId": "TestApi"}},
+                "ApiMethod": {
+                    "Type": "AWS::ApiGateway::Method",
+                    "Properties": {"HttpMethod": "GET", "RestApiId": "TestApi", "ResourceId": "ApiResource"},
+                },
+            }
+        }
+
+        provider = ApiProvider(make_mock_stacks_from_template(template))
+
+        self.assertEqual(provider.api.minimum_compression_size, 1024)
+
+    def test_rest_api_resource_method_cache_key_parameters(self):
+        template = {
+            "Resources": {
+                "TestApi": {"Type": "AWS::ApiGateway::RestApi", "Properties": {"StageName": "Prod"}},
+                "ApiResource": {"Properties": {"PathPart": "{id}", "RestApiId": "TestApi"}},
+                "ApiMethod": {
+                    "Type": "AWS::ApiGateway::Method",
+                    "Properties": {
+                        "HttpMethod": "GET",
+                        "RestApiId": "TestApi",
+                        "ResourceId": "ApiResource",
+                        "Integration": {"CacheKeyParameters": ["method.request.header.Accept"]},
+                    },
+                },
+            }
+        }
+
+        provider = ApiProvider(make_mock_stacks_from_template(template))
+
+        self.assertEqual(provider.routes[0].cache_key_parameters, ["method.request.header.Accept"])
+
     def test_resolve_correct_resource_path(self):
         resources = {
             "RootApiResource": {
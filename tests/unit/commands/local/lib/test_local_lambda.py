@@ -1,19 +1,23 @@
 """
 Testing local lambda runner
 """
+import io
 import os
 import posixpath
+import threading
 from unittest import TestCase
 from unittest.mock import Mock, patch
 from parameterized import parameterized, param
 
-from samcli.lib.utils.architecture import X86_64, ARM64
+from samcli.lib.utils.architecture import X86_64, ARM64, InvalidArchitecture
 
 from samcli.commands.local.lib.local_lambda import LocalLambdaRunner
 from samcli.lib.providers.provider import Function
 from samcli.lib.utils.packagetype import ZIP, IMAGE
+from samcli.lib.utils.stream_writer import StreamWriter
 from samcli.local.docker.container import ContainerResponseException
-from samcli.local.lambdafn.exceptions import FunctionNotFound
+from samcli.local.lambdafn.concurrency import ConcurrencyLimiter
+from samcli.local.lambdafn.exceptions import FunctionNotFound, FunctionThrottled
 from samcli.commands.local.lib.exceptions import (
     OverridesNotWellDefinedError,
     NoPrivilegeException,
@@ -390,7 +394,7 @@ class TestLocalLambda_get_invoke_config(TestCase):
         )
 
     @patch("samcli.commands.local.lib.local_lambda.resolve_code_path")
-    @patch("samcli.commands.local.lib.local_lambda.LocalLambdaRunner.is_debugging")
+    @patch("samcli.commands.local.lib.local_lambda.LocalLambdaRunner.is_debugging_function")
     @patch("samcli.commands.local.lib.local_lambda.FunctionConfig")
     def test_must_work(self, FunctionConfigMock, is_debugging_mock, resolve_code_path_patch):
         is_debugging_mock.return_value = False
@@ -449,13 +453,14 @@ class TestLocalLambda_get_invoke_config(TestCase):
             architecture=ARM64,
             full_path=function.full_path,
             runtime_management_config=function.runtime_management_config,
+            reserved_concurrent_executions=function.reserved_concurrent_executions,
         )
 
         resolve_code_path_patch.assert_called_with(self.cwd, function.codeuri)
         self.local_lambda._make_env_vars.assert_called_with(function)
 
     @patch("samcli.commands.local.lib.local_lambda.resolve_code_path")
-    @patch("samcli.commands.local.lib.local_lambda.LocalLambdaRunner.is_debugging")
+    @patch("samcli.commands.local.lib.local_lambda.LocalLambdaRunner.is_debugging_function")
     @patch("samcli.commands.local.lib.local_lambda.FunctionConfig")
     def test_timeout_set_to_max_during_debugging(
         self,
@@ -517,6 +522,7 @@ class TestLocalLambda_get_invoke_config(TestCase):
             architecture=X86_64,
             full_path=function.full_path,
             runtime_management_config=function.runtime_management_config,
+            reserved_concurrent_executions=function.reserved_concurrent_executions,
         )
 
         resolve_code_path_patch.assert_called_with(self.cwd, "codeuri")
@@ -527,6 +533,7 @@ class TestLocalLambda_invoke(TestCase):
     def setUp(self):
         self.runtime_mock = Mock()
         self.function_provider_mock = Mock()
+        self.function_provider_mock.get_all.return_value = []
         self.cwd = "/my/current/working/directory"
         self.debug_context = None
         self.aws_profile = "myprofile"
@@ -706,6 +713,267 @@ class TestLocalLambda_invoke(TestCase):
             self.local_lambda.invoke(name, event, stdout, stderr)
 
 
+class TestLocalLambda_invoke_with_invocation_recorder(TestCase):
+    def setUp(self):
+        self.runtime_mock = Mock()
+        self.runtime_mock.invoke.side_effect = lambda *args, **kwargs: kwargs["stdout"].write(b"response")
+        self.function_provider_mock = Mock()
+        self.function_provider_mock.get.return_value = Mock(packagetype=IMAGE, imageuri="image")
+        self.function_provider_mock.get_all.return_value = [self.function_provider_mock.get.return_value]
+        self.recorder_mock = Mock()
+        self.stdout = StreamWriter(io.BytesIO())
+
+        self.local_lambda = LocalLambdaRunner(
+            self.runtime_mock, self.function_provider_mock, "cwd", invocation_recorder=self.recorder_mock
+        )
+        self.local_lambda.get_invoke_config = Mock(return_value="config")
+
+    @patch("samcli.commands.local.lib.local_lambda.validate_architecture_runtime")
+    def test_must_replay_recorded_response(self, patched_validate_architecture_runtime):
+        self.recorder_mock.is_replaying = True
+        self.recorder_mock.get.return_value = b"recorded"
+
+        self.local_lambda.invoke("name", "event", self.stdout)
+
+        self.runtime_mock.invoke.assert_not_called()
+        self.recorder_mock.get.assert_called_once_with("config", "event")
+        self.assertEqual(self.stdout.stream.getvalue(), b"recorded")
+
+    @patch("samcli.commands.local.lib.local_lambda.validate_architecture_runtime")
+    def test_must_invoke_and_record_when_not_recorded(self, patched_validate_architecture_runtime):
+        self.recorder_mock.is_replaying = True
+        self.recorder_mock.get.return_value = None
+
+        self.local_lambda.invoke("name", "event", self.stdout)
+
+        self.runtime_mock.invoke.assert_called_once()
+        self.recorder_mock.record.assert_called_once_with("config", "event", b"response")
+        self.assertEqual(self.stdout.stream.getvalue(), b"response")
+
+    @patch("samcli.commands.local.lib.local_lambda.validate_architecture_runtime")
+    def test_must_record_without_replaying(self, patched_validate_architecture_runtime):
+        self.recorder_mock.is_replaying = False
+
+        self.local_lambda.invoke("name", "event", self.stdout)
+
+        self.recorder_mock.get.assert_not_called()
+        self.recorder_mock.record.assert_called_once_with("config", "event", b"response")
+        self.assertEqual(self.stdout.stream.getvalue(), b"response")
+
+    @patch("samcli.commands.local.lib.local_lambda.validate_architecture_runtime")
+    def test_must_not_record_empty_response(self, patched_validate_architecture_runtime):
+        self.recorder_mock.is_replaying = False
+        self.runtime_mock.invoke.side_effect = ContainerResponseException
+
+        self.local_lambda.invoke("name", "event", self.stdout)
+
+        self.recorder_mock.record.assert_not_called()
+
+    @patch("samcli.commands.local.lib.local_lambda.validate_architecture_runtime")
+    def test_must_neither_record_nor_replay_when_debugging(self, patched_validate_architecture_runtime):
+        self.local_lambda.debug_context = Mock(debug_function=None)
+
+        self.local_lambda.invoke("name", "event", self.stdout)
+
+        self.recorder_mock.get.assert_not_called()
+        self.recorder_mock.record.assert_not_called()
+        self.assertEqual(self.stdout.stream.getvalue(), b"response")
+
+
+class TestLocalLambda_invoke_with_concurrency_limits(TestCase):
+    def setUp(self):
+        self.runtime_mock = Mock()
+        self.function = Mock(packagetype=IMAGE, imageuri="image", full_path="Function")
+        self.function_provider_mock = Mock()
+        self.function_provider_mock.get.return_value = self.function
+        self.function_provider_mock.get_all.return_value = [self.function]
+        self.local_lambda = LocalLambdaRunner(self.runtime_mock, self.function_provider_mock, "cwd")
+        self.local_lambda.get_invoke_config = Mock(return_value="config")
+
+    @patch("samcli.commands.local.lib.local_lambda.validate_architecture_runtime")
+    def test_must_count_executions_with_reserved_concurrency(self, patched_validate_architecture_runtime):
+        self.function.reserved_concurrent_executions = "2"
+        self.runtime_mock.invoke.side_effect = lambda *args, **kwargs: self.assertEqual(
+            self.local_lambda.concurrency_limiter.stats()["functions"]["Function"]["in_flight"], 1
+        )
+
+        self.local_lambda.invoke("Function", "event")
+
+        self.runtime_mock.invoke.assert_called_once()
+        stats = self.local_lambda.concurrency_limiter.stats()["functions"]["Function"]
+        self.assertEqual(stats["reserved"], 2)
+        self.assertEqual(stats["in_flight"], 0)
+
+    @patch("samcli.commands.local.lib.local_lambda.validate_architecture_runtime")
+    def test_must_raise_when_throttled(self, patched_validate_architecture_runtime):
+        self.function.reserved_concurrent_executions = 1
+
+        with self.local_lambda.concurrency_limiter.execution("Function", 1):
+            with self.assertRaises(FunctionThrottled):
+                self.local_lambda.invoke("Function", "event")
+
+        self.runtime_mock.invoke.assert_not_called()
+
+    @patch("samcli.commands.local.lib.local_lambda.validate_architecture_runtime")
+    def test_must_not_throttle_when_debugging(self, patched_validate_architecture_runtime):
+        self.function.reserved_concurrent_executions = 1
+        self.local_lambda.debug_context = Mock(debug_function=None)
+
+        with self.local_lambda.concurrency_limiter.execution("Function", 1):
+            self.local_lambda.invoke("Function", "event")
+
+        self.runtime_mock.invoke.assert_called_once()
+
+    @patch("samcli.commands.local.lib.local_lambda.validate_architecture_runtime")
+    def test_must_throttle_every_invocation_without_reserved_concurrency(self, patched_validate_architecture_runtime):
+        self.function.reserved_concurrent_executions = 0
+
+        with self.assertRaises(FunctionThrottled):
+            self.local_lambda.invoke("Function", "event")
+
+        self.runtime_mock.invoke.assert_not_called()
+        self.assertEqual(self.local_lambda.concurrency_limiter.stats()["functions"]["Function"]["reserved"], 0)
+
+    @patch("samcli.commands.local.lib.local_lambda.validate_architecture_runtime")
+    def test_must_take_concurrency_of_functions_not_invoked_yet_off_unreserved_concurrency(
+        self, patched_validate_architecture_runtime
+    ):
+        self.function.reserved_concurrent_executions = None
+        reserved_function = Mock(full_path="ReservedFunction", reserved_concurrent_executions=2)
+        self.function_provider_mock.get_all.return_value = [self.function, reserved_function]
+        self.local_lambda.concurrency_limiter = ConcurrencyLimiter(account_limit=3)
+
+        with self.local_lambda.concurrency_limiter.execution("OtherFunction"):
+            with self.assertRaises(FunctionThrottled):
+                self.local_lambda.invoke("Function", "event")
+
+        self.runtime_mock.invoke.assert_not_called()
+        self.assertEqual(self.local_lambda.concurrency_limiter.stats()["account"]["unreserved_limit"], 1)
+
+
+class TestLocalLambda_invoke_while_debugging(TestCase):
+    def setUp(self):
+        self.runtime_mock = Mock()
+        self.functions = {
+            "Debugged": Mock(packagetype=IMAGE, imageuri="image", full_path="Debugged", function_id="Debugged"),
+            "Other": Mock(packagetype=IMAGE, imageuri="image", full_path="Other", function_id="Other"),
+        }
+        for name, function in self.functions.items():
+            function.name = name
+        self.function_provider_mock = Mock()
+        self.function_provider_mock.get.side_effect = self.functions.get
+        self.function_provider_mock.get_all.side_effect = lambda: iter(self.functions.values())
+        self.debug_context = Mock(debug_function="Debugged")
+        self.local_lambda = LocalLambdaRunner(
+            self.runtime_mock, self.function_provider_mock, "cwd", debug_context=self.debug_context
+        )
+        self.local_lambda.get_invoke_config = Mock(side_effect=lambda function: function.name)
+
+    @patch("samcli.commands.local.lib.local_lambda.validate_architecture_runtime")
+    def test_must_pass_debug_context_to_debugged_function_only(self, patched_validate_architecture_runtime):
+        self.local_lambda.invoke("Debugged", "event")
+        self.local_lambda.invoke("Other", "event")
+
+        debug_contexts = {
+            call_args[0][0]: call_args[1]["debug_context"] for call_args in self.runtime_mock.invoke.call_args_list
+        }
+        self.assertEqual(debug_contexts, {"Debugged": self.debug_context, "Other": None})
+
+    @patch("samcli.commands.local.lib.local_lambda.validate_architecture_runtime")
+    def test_must_serialize_debugged_invocations_only(self, patched_validate_architecture_runtime):
+        debugged_invoked = threading.Event()
+        other_invoked = threading.Event()
+        second_debugged_invoked = threading.Event()
+        release_debugged = threading.Event()
+        invocations = []
+
+        def invoke(config, event, **kwargs):
+            invocations.append(config)
+            if config == "Other":
+                other_invoked.set()
+            elif not debugged_invoked.is_set():
+                debugged_invoked.set()
+                release_debugged.wait(5)
+            else:
+                second_debugged_invoked.set()
+
+        self.runtime_mock.invoke.side_effect = invoke
+        threads = [threading.Thread(target=self.local_lambda.invoke, args=("Debugged", "event"))]
+        threads[0].start()
+        self.assertTrue(debugged_invoked.wait(5))
+
+        threads.append(threading.Thread(target=self.local_lambda.invoke, args=("Debugged", "event")))
+        threads.append(threading.Thread(target=self.local_lambda.invoke, args=("Other", "event")))
+        threads[1].start()
+        threads[2].start()
+
+        # the other function runs while the debugged one is paused, the second debugged invocation waits for it
+        self.assertTrue(other_invoked.wait(5))
+        self.assertFalse(second_debugged_invoked.wait(0.1))
+        release_debugged.set()
+        for thread in threads:
+            thread.join(5)
+
+        self.assertTrue(second_debugged_invoked.is_set())
+        self.assertEqual(invocations, ["Debugged", "Other", "Debugged"])
+
+
+class TestLocalLambda_invoke_config_cache(TestCase):
+    def setUp(self):
+        self.runtime_mock = Mock()
+        self.function = Mock(packagetype=IMAGE, imageuri="image", full_path="Function")
+        self.function_provider_mock = Mock()
+        self.function_provider_mock.get.return_value = self.function
+        self.function_provider_mock.get_all.side_effect = lambda: iter([self.function_provider_mock.get.return_value])
+        self.local_lambda = LocalLambdaRunner(self.runtime_mock, self.function_provider_mock, "cwd")
+        self.local_lambda.get_invoke_config = Mock(side_effect=lambda function: Mock())
+        self.local_lambda.get_aws_creds = Mock(return_value={"key": "key", "secret": "secret"})
+
+    def _invoked_configs(self):
+        return [call_args[0][0] for call_args in self.runtime_mock.invoke.call_args_list]
+
+    @patch("samcli.commands.local.lib.local_lambda.validate_architecture_runtime")
+    def test_must_reuse_invoke_config(self, validate_architecture_runtime_mock):
+        self.local_lambda.invoke("Function", "event")
+        self.local_lambda.invoke("Function", "event")
+
+        configs = self._invoked_configs()
+        self.assertIs(configs[0], configs[1])
+        self.local_lambda.get_invoke_config.assert_called_once_with(self.function)
+        validate_architecture_runtime_mock.assert_called_once_with(self.function)
+
+    @patch("samcli.commands.local.lib.local_lambda.validate_architecture_runtime")
+    def test_must_make_invoke_config_again_for_reloaded_function(self, validate_architecture_runtime_mock):
+        self.local_lambda.invoke("Function", "event")
+        # the provider returns a new function once the template changed
+        self.function_provider_mock.get.return_value = Mock(packagetype=IMAGE, imageuri="image", full_path="Function")
+        self.local_lambda.invoke("Function", "event")
+
+        configs = self._invoked_configs()
+        self.assertIsNot(configs[0], configs[1])
+        self.assertEqual(validate_architecture_runtime_mock.call_count, 2)
+
+    @patch("samcli.commands.local.lib.local_lambda.validate_architecture_runtime")
+    def test_must_make_invoke_config_again_when_credentials_changed(self, validate_architecture_runtime_mock):
+        self.local_lambda.invoke("Function", "event")
+        self.local_lambda.get_aws_creds.return_value = {"key": "key", "secret": "secret", "sessiontoken": "refreshed"}
+        self.local_lambda.invoke("Function", "event")
+
+        configs = self._invoked_configs()
+        self.assertIsNot(configs[0], configs[1])
+
+    @patch("samcli.commands.local.lib.local_lambda.validate_architecture_runtime")
+    def test_must_not_cache_invalid_function(self, validate_architecture_runtime_mock):
+        validate_architecture_runtime_mock.side_effect = [InvalidArchitecture("error"), None]
+
+        with self.assertRaises(InvalidArchitecture):
+            self.local_lambda.invoke("Function", "event")
+        self.local_lambda.invoke("Function", "event")
+
+        self.assertEqual(validate_architecture_runtime_mock.call_count, 2)
+        self.local_lambda.get_invoke_config.assert_called_once_with(self.function)
+
+
 class TestLocalLambda_invoke_with_container_host_option(TestCase):
     def setUp(self):
         self.runtime_mock = Mock()
@@ -775,6 +1043,26 @@ class TestLocalLambda_is_debugging(TestCase):
     def test_must_be_on(self):
         self.assertTrue(self.local_lambda.is_debugging())
 
+    @parameterized.expand(
+        [
+            (None, "Function", True),
+            ("Function", "Function", True),
+            ("Stack/Function", "Function", True),
+            ("Other", "Function", False),
+        ]
+    )
+    def test_must_debug_the_debug_function_only(self, debug_function, function_name, expected):
+        self.debug_context.debug_function = debug_function
+        function = Mock(function_id=function_name, full_path=f"Stack/{function_name}")
+        function.name = function_name
+
+        self.assertEqual(self.local_lambda.is_debugging_function(function), expected)
+
+    def test_must_not_debug_any_function_when_off(self):
+        self.local_lambda.debug_context = None
+
+        self.assertFalse(self.local_lambda.is_debugging_function(Mock()))
+
     def test_must_be_off(self):
         self.local_lambda = LocalLambdaRunner(
             self.runtime_mock,
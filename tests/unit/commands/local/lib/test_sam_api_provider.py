@@ -808,6 +808,44 @@ class TestSamStageValues(TestCase):
         self.assertEqual(provider.api.stage_name, "dev")
         self.assertEqual(provider.api.stage_variables, {"vis": "data", "random": "test", "foo": "bar"})
 
+    def test_provider_stage_cache_and_compression_settings(self):
+        method_settings = [{"ResourcePath": "/~1path", "HttpMethod": "GET", "CachingEnabled": True}]
+        template = {
+            "Resources": {
+                "TestApi": {
+                    "Type": "AWS::Serverless::Api",
+                    "Properties": {
+                        "StageName": "dev",
+                        "CacheClusterEnabled": True,
+                        "MethodSettings": method_settings,
+                        "MinimumCompressionSize": 0,
+                        "DefinitionBody": {
+                            "paths": {
+                                "/path": {
+                                    "get": {
+                                        "x-amazon-apigateway-integration": {
+                                            "httpMethod": "POST",
+                                            "type": "aws_proxy",
+                                            "uri": {
+                                                "Fn::Sub": "arn:aws:apigateway:${AWS::Region}:lambda:path/2015-03-31"
+                                                "/functions/${NoApiEventFunction.Arn}/invocations"
+                                            },
+                                            "responses": {},
+                                        }
+                                    }
+                                }
+                            }
+                        },
+                    },
+                }
+            }
+        }
+        provider = ApiProvider(make_mock_stacks_from_template(template))
+
+        self.assertEqual(provider.api.cache_cluster_enabled, True)
+        self.assertEqual(provider.api.method_settings, method_settings)
+        self.assertEqual(provider.api.minimum_compression_size, 0)
+
     def test_multi_stage_get_all(self):
         template = OrderedDict({"Resources": {}})
         template["Resources"]["TestApi"] = {
@@ -2000,6 +2000,24 @@ class TestSamFunctionProvider_get(TestCase):
 
         self.assertIsNone(provider.get("somefunc"), "Must return None when Function is not found")
 
+    def test_functions_index_is_made_again_when_functions_are_loaded_again(self):
+        provider = SamFunctionProvider([])
+        function1 = Mock(function_id="id1", functionname="name1", full_path="Stack/Logical1")
+        function1.name = "Logical1"
+        function2 = Mock(function_id="id2", functionname="name2", full_path="Stack/Logical2")
+        function2.name = "Logical2"
+
+        provider.functions = {"Stack/Logical1": function1}
+        self.assertEqual(function1, provider.get("name1"))
+        functions_index = provider._functions_index
+        self.assertEqual(function1, provider.get("id1"))
+        self.assertIs(functions_index, provider._functions_index)
+
+        provider.functions = {"Stack/Logical2": function2}
+        self.assertIsNone(provider.get("name1"))
+        self.assertEqual(function2, provider.get("Logical2"))
+        self.assertIsNot(functions_index, provider._functions_index)
+
 
 class TestSamFunctionProvider_get_all(TestCase):
     def test_must_work_with_no_functions(self):
@@ -0,0 +1,30 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+from samcli.commands.exceptions import UserException
+from samcli.commands.local.prune_images.cli import do_cli
+
+
+class TestCli(TestCase):
+    @patch("samcli.commands.local.prune_images.cli.click")
+    @patch("samcli.local.docker.utils.is_docker_reachable")
+    @patch("samcli.local.docker.layer_image_cache.LayerImageCache")
+    def test_must_prune_layer_images(self, layer_image_cache_mock, is_docker_reachable_mock, click_mock):
+        is_docker_reachable_mock.return_value = True
+        layer_image_cache_mock.return_value.prune.return_value = (["samcli/lambda-python:3.9-x86_64-abc"], 3145728)
+
+        do_cli(100)
+
+        layer_image_cache_mock.return_value.prune.assert_called_once_with(100)
+        click_mock.echo.assert_any_call("Removed samcli/lambda-python:3.9-x86_64-abc")
+        click_mock.echo.assert_any_call("Freed 3.0 MB")
+
+    @patch("samcli.local.docker.utils.is_docker_reachable")
+    @patch("samcli.local.docker.layer_image_cache.LayerImageCache")
+    def test_must_raise_if_docker_is_not_reachable(self, layer_image_cache_mock, is_docker_reachable_mock):
+        is_docker_reachable_mock.return_value = False
+
+        with self.assertRaises(UserException):
+            do_cli(0)
+
+        layer_image_cache_mock.return_value.prune.assert_not_called()
@@ -95,6 +95,7 @@ class TestCli(TestCase):
             lambda_invoke_context=context_mock, port=self.port, host=self.host, static_dir=self.static_dir
         )
 
+        context_mock.prefetch_images.assert_called_once_with()
         service_mock.start.assert_called_with()
 
     @patch("samcli.commands.local.cli_common.invoke_context.InvokeContext")
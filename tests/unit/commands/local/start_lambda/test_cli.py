@@ -86,6 +86,7 @@ class TestCli(TestCase):
 
         local_lambda_service_mock.assert_called_with(lambda_invoke_context=context_mock, port=self.port, host=self.host)
 
+        context_mock.prefetch_images.assert_called_once_with()
         service_mock.start.assert_called_with()
 
     @parameterized.expand(
@@ -0,0 +1,50 @@
+import os
+from unittest import TestCase
+from unittest.mock import patch
+
+from parameterized import parameterized
+
+from samcli.lib.utils.env_settings import get_float_setting, get_int_setting
+
+
+class TestGetIntSetting(TestCase):
+    @parameterized.expand([("4", 4), (" 4 ", 4), ("-1", -1)])
+    def test_must_parse_value(self, value, expected):
+        with patch.dict(os.environ, {"SAM_CLI_SETTING": value}):
+            self.assertEqual(get_int_setting("SAM_CLI_SETTING", 1), expected)
+
+    @parameterized.expand([("",), ("abc",), ("1.5",)])
+    def test_must_fall_back_to_default_value(self, value):
+        with patch.dict(os.environ, {"SAM_CLI_SETTING": value}):
+            self.assertEqual(get_int_setting("SAM_CLI_SETTING", 1), 1)
+
+    def test_must_fall_back_to_default_value_when_not_set(self):
+        with patch.dict(os.environ, clear=True):
+            self.assertEqual(get_int_setting("SAM_CLI_SETTING", 1), 1)
+
+    def test_must_warn_about_invalid_value(self):
+        with patch.dict(os.environ, {"SAM_CLI_SETTING": "abc"}):
+            with self.assertLogs("samcli.lib.utils.env_settings", "WARNING") as logs:
+                get_int_setting("SAM_CLI_SETTING", 1)
+
+        self.assertIn("SAM_CLI_SETTING", logs.output[0])
+
+    def test_must_fall_back_to_default_value_below_minimum(self):
+        with patch.dict(os.environ, {"SAM_CLI_SETTING": "0"}):
+            self.assertEqual(get_int_setting("SAM_CLI_SETTING", 4, minimum=1), 4)
+
+    def test_must_fall_back_to_default_value_above_maximum(self):
+        with patch.dict(os.environ, {"SAM_CLI_SETTING": "10"}):
+            self.assertEqual(get_int_setting("SAM_CLI_SETTING", 6, minimum=1, maximum=9), 6)
+
+
+class TestGetFloatSetting(TestCase):
+    @parameterized.expand([("0.5", 0.5), ("2", 2.0)])
+    def test_must_parse_value(self, value, expected):
+        with patch.dict(os.environ, {"SAM_CLI_SETTING": value}):
+            self.assertEqual(get_float_setting("SAM_CLI_SETTING", 1.0), expected)
+
+    @parameterized.expand([("abc",), ("-1",)])
+    def test_must_fall_back_to_default_value(self, value):
+        with patch.dict(os.environ, {"SAM_CLI_SETTING": value}):
+            self.assertEqual(get_float_setting("SAM_CLI_SETTING", 1.0, minimum=0), 1.0)
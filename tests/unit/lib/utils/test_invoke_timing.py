@@ -0,0 +1,126 @@
+import json
+import os
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+
+from samcli.lib.utils import invoke_timing
+from samcli.lib.utils.invoke_timing import InvokeTiming, InvokeTimingRecorder
+
+
+class TestInvokeTiming(TestCase):
+    def setUp(self):
+        self.timing = InvokeTiming("HelloFunction")
+        self.timing.started_at = 10
+        self.timing.ended_at = 10.5
+        self.timing.record("container_start", 10, 10.1)
+        self.timing.record("function", 10.2, 10.4)
+        self.timing.record("function", 10.4, 10.45)
+
+    def test_must_sum_durations_of_repeated_phases(self):
+        durations = self.timing.phase_durations_ms()
+
+        self.assertAlmostEqual(durations["container_start"], 100)
+        self.assertAlmostEqual(durations["function"], 250)
+        self.assertAlmostEqual(self.timing.duration_ms, 500)
+
+    def test_must_build_server_timing_header(self):
+        self.assertEqual(
+            self.timing.server_timing_header(), "container_start;dur=100.000, function;dur=250.000, total;dur=500.000"
+        )
+
+    def test_must_convert_to_dict_with_offsets(self):
+        result = self.timing.to_dict()
+
+        self.assertEqual(result["function"], "HelloFunction")
+        self.assertEqual(result["duration_ms"], 500)
+        self.assertEqual(result["phases"][1], {"name": "function", "start_ms": 200, "duration_ms": 200})
+        self.assertEqual(result["counters"], {})
+
+    def test_must_sum_counters(self):
+        self.timing.add("compression_saved_bytes", 100)
+        self.timing.add("compression_saved_bytes", 20)
+
+        self.assertEqual(self.timing.to_dict()["counters"], {"compression_saved_bytes": 120})
+
+
+class TestInvokeTimingRecorder(TestCase):
+    def setUp(self):
+        self.timing = InvokeTiming("HelloFunction")
+        self.timing.record("function", self.timing.started_at, self.timing.started_at + 0.2)
+        self.timing.ended_at = self.timing.started_at + 0.3
+
+    def test_must_append_json_line_per_invoke(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            timing_file = os.path.join(tmp_dir, "timing.jsonl")
+            recorder = InvokeTimingRecorder(timing_file)
+
+            recorder.record(self.timing)
+            recorder.record(self.timing)
+
+            with open(timing_file, encoding="utf-8") as f:
+                lines = [json.loads(line) for line in f]
+
+        self.assertEqual(len(lines), 2)
+        self.assertEqual(lines[0]["function"], "HelloFunction")
+        self.assertEqual(lines[0]["phases"][0]["name"], "function")
+
+    def test_must_summarize_phases(self):
+        recorder = InvokeTimingRecorder()
+        self.assertIsNone(recorder.summary())
+
+        recorder.record(self.timing)
+        summary = recorder.summary()
+
+        self.assertIn("Latency breakdown of 1 invoke(s):", summary)
+        self.assertIn("function: count=1 avg=200.0ms max=200.0ms", summary)
+        self.assertIn("total: count=1 avg=300.0ms max=300.0ms", summary)
+
+    def test_must_summarize_counters(self):
+        recorder = InvokeTimingRecorder()
+        self.timing.add("compression_saved_bytes", 100)
+        recorder.record(self.timing)
+        self.timing.add("compression_saved_bytes", 200)
+        recorder.record(self.timing)
+
+        self.assertIn("compression_saved_bytes: count=2 total=400 avg=200 max=300", recorder.summary())
+
+
+class TestTrackInvoke(TestCase):
+    @patch("samcli.lib.utils.invoke_timing._RECORDER")
+    def test_must_record_phases_of_outermost_invoke_only(self, recorder_mock):
+        with invoke_timing.track_invoke("HelloFunction") as timing:
+            with invoke_timing.phase("event_construction"):
+                pass
+            with invoke_timing.track_invoke("HelloFunction") as nested_timing:
+                with invoke_timing.phase("function"):
+                    pass
+            recorder_mock.record.assert_not_called()
+
+        self.assertIs(nested_timing, timing)
+        self.assertEqual([phase[0] for phase in timing.phases], ["event_construction", "function"])
+        recorder_mock.record.assert_called_once_with(timing)
+        self.assertIsNone(invoke_timing.current_invoke())
+
+    @patch("samcli.lib.utils.invoke_timing._RECORDER")
+    def test_must_record_invoke_which_raised(self, recorder_mock):
+        with self.assertRaises(ValueError):
+            with invoke_timing.track_invoke("HelloFunction"):
+                raise ValueError()
+
+        recorder_mock.record.assert_called_once()
+        self.assertIsNone(invoke_timing.current_invoke())
+
+    def test_phase_does_nothing_outside_of_an_invoke(self):
+        with invoke_timing.phase("function"):
+            pass
+
+        self.assertIsNone(invoke_timing.current_invoke())
+
+    @patch("samcli.lib.utils.invoke_timing._RECORDER")
+    def test_must_add_to_counters_of_current_invoke(self, recorder_mock):
+        invoke_timing.add("compression_saved_bytes", 10)
+        with invoke_timing.track_invoke("HelloFunction") as timing:
+            invoke_timing.add("compression_saved_bytes", 20)
+
+        self.assertEqual(timing.counters, {"compression_saved_bytes": 20})
@@ -1,16 +1,19 @@
 import base64
 import copy
+import gzip
 import json
 from time import time
 from datetime import datetime
 from unittest import TestCase
 
-from unittest.mock import Mock, patch, ANY, MagicMock
+from unittest.mock import Mock, patch, ANY, MagicMock, call
 from parameterized import parameterized, param
+from flask import request
 from werkzeug.datastructures import Headers
 
 from samcli.lib.providers.provider import Api
 from samcli.lib.providers.provider import Cors
+from samcli.lib.utils import invoke_timing
 from samcli.local.apigw.local_apigw_service import (
     LocalApigwService,
     Route,
@@ -18,7 +21,8 @@ from samcli.local.apigw.local_apigw_service import (
     PayloadFormatVersionValidateException,
     CatchAllPathConverter,
 )
-from samcli.local.lambdafn.exceptions import FunctionNotFound
+from samcli.local.lambdafn.exceptions import FunctionNotFound, FunctionThrottled
+from samcli.local.services.base_local_service import STATS_PATH
 from samcli.commands.local.lib.exceptions import UnsupportedInlineCodeError
 
 
@@ -104,7 +108,9 @@ class TestApiGatewayService(TestCase):
 
         self.assertEqual(result, make_response_mock)
         self.lambda_runner.invoke.assert_called_with(ANY, ANY, stdout=ANY, stderr=self.stderr)
-        self.api_service._construct_v_1_0_event.assert_called_with(ANY, ANY, ANY, ANY, ANY, "getRestApi")
+        self.api_service._construct_v_1_0_event.assert_called_with(
+            ANY, ANY, ANY, ANY, ANY, "getRestApi", event_template=ANY
+        )
 
     @patch.object(LocalApigwService, "get_request_methods_endpoints")
     def test_http_request_must_invoke_lambda(self, request_mock):
@@ -132,7 +138,9 @@ class TestApiGatewayService(TestCase):
 
         self.assertEqual(result, make_response_mock)
         self.lambda_runner.invoke.assert_called_with(ANY, ANY, stdout=ANY, stderr=self.stderr)
-        self.http_service._construct_v_2_0_event_http.assert_called_with(ANY, ANY, ANY, ANY, ANY, ANY)
+        self.http_service._construct_v_2_0_event_http.assert_called_with(
+            ANY, ANY, ANY, ANY, ANY, ANY, event_template=ANY
+        )
 
     @patch.object(LocalApigwService, "get_request_methods_endpoints")
     def test_http_v1_payload_request_must_invoke_lambda(self, request_mock):
@@ -160,7 +168,7 @@ class TestApiGatewayService(TestCase):
 
         self.assertEqual(result, make_response_mock)
         self.lambda_runner.invoke.assert_called_with(ANY, ANY, stdout=ANY, stderr=self.stderr)
-        self.http_service._construct_v_1_0_event.assert_called_with(ANY, ANY, ANY, ANY, ANY, None)
+        self.http_service._construct_v_1_0_event.assert_called_with(ANY, ANY, ANY, ANY, ANY, None, event_template=ANY)
 
     @patch.object(LocalApigwService, "get_request_methods_endpoints")
     def test_http_v2_payload_request_must_invoke_lambda(self, request_mock):
@@ -188,7 +196,9 @@ class TestApiGatewayService(TestCase):
 
         self.assertEqual(result, make_response_mock)
         self.lambda_runner.invoke.assert_called_with(ANY, ANY, stdout=ANY, stderr=self.stderr)
-        self.http_service._construct_v_2_0_event_http.assert_called_with(ANY, ANY, ANY, ANY, ANY, ANY)
+        self.http_service._construct_v_2_0_event_http.assert_called_with(
+            ANY, ANY, ANY, ANY, ANY, ANY, event_template=ANY
+        )
 
     @patch.object(LocalApigwService, "get_request_methods_endpoints")
     def test_api_options_request_must_invoke_lambda(self, request_mock):
@@ -274,6 +284,33 @@ class TestApiGatewayService(TestCase):
         # Make sure the parse method is called only on the returned response and not on the raw data from stdout
         parse_output_mock.assert_called_with(lambda_response, ANY, ANY, Route.API)
 
+    @parameterized.expand([(True,), (False,)])
+    @patch.object(LocalApigwService, "get_request_methods_endpoints")
+    @patch("samcli.local.apigw.local_apigw_service.LambdaOutputParser")
+    def test_request_handler_adds_server_timing_header(
+        self, server_timing_enabled, lambda_output_parser_mock, request_mock
+    ):
+        request_mock.return_value = ("GET", "test")
+        current_route = Mock()
+        current_route.function_name = "HelloFunction"
+        current_route.payload_format_version = "1.0"
+        current_route.event_type = Route.API
+        self.api_service._get_current_route = Mock(return_value=current_route)
+        self.api_service._construct_v_1_0_event = Mock()
+        self.api_service._parse_v1_payload_format_lambda_output = Mock(return_value=(200, Headers(), "body"))
+        lambda_output_parser_mock.get_lambda_output.return_value = "response", False
+
+        with patch("samcli.local.apigw.local_apigw_service.invoke_timing.INVOKE_SERVER_TIMING", server_timing_enabled):
+            result = self.api_service._request_handler()
+
+        if server_timing_enabled:
+            self.assertRegex(
+                result.headers["Server-Timing"],
+                r"^event_construction;dur=[\d.]+, response_parsing;dur=[\d.]+, total;dur=[\d.]+$",
+            )
+        else:
+            self.assertNotIn("Server-Timing", result.headers)
+
     @patch.object(LocalApigwService, "get_request_methods_endpoints")
     def test_request_handler_returns_make_response(self, request_mock):
         make_response_mock = Mock()
@@ -330,23 +367,109 @@ class TestApiGatewayService(TestCase):
         self.assertEqual(service._dict_of_routes["/<path:any_path>:OPTIONS"].function_name, function_name_3)
         self.assertEqual(service._dict_of_routes["/<path:any_path>:PATCH"].function_name, function_name_3)
 
-    @patch("samcli.local.apigw.local_apigw_service.Flask")
-    def test_create_creates_flask_app_with_url_rules(self, flask):
+    def test_create_creates_dict_of_event_templates(self):
+        api_gateway_route = Route(methods=["GET"], function_name=Mock(), path="/id/{id}", operation_name="getId")
+        http_route = Route(methods=["POST"], function_name=Mock(), path="/id/{id}", event_type=Route.HTTP)
+        default_route = Route(
+            methods=["x-amazon-apigateway-any-method"], function_name=Mock(), path="$default", event_type=Route.HTTP
+        )
+        api = Api(routes=[api_gateway_route, http_route, default_route])
+        api.stage_name = "Dev"
+        api.stage_variables = {"key": "value"}
+        service = LocalApigwService(api, Mock())
+
+        service.create()
+
+        api_template = service._dict_of_event_templates["/id/<id>:GET"]
+        self.assertEqual(api_template["resource"], "/id/{id}")
+        self.assertEqual(api_template["stageVariables"], {"key": "value"})
+        self.assertEqual(api_template["requestContext"]["stage"], "Dev")
+        self.assertEqual(api_template["requestContext"]["operationName"], "getId")
+        http_template = service._dict_of_event_templates["/id/<id>:POST"]
+        self.assertEqual(http_template["routeKey"], "POST /id/{id}")
+        self.assertEqual(http_template["requestContext"]["http"]["method"], "POST")
+        self.assertEqual(service._dict_of_event_templates["/:PUT"]["routeKey"], "$default")
+        self.assertEqual(service._dict_of_event_templates["/<path:any_path>:PATCH"]["routeKey"], "$default")
+
+    def test_get_event_template_computes_missing_templates(self):
+        self.api_service._create_event_template = Mock(return_value={"resource": "/"})
+
+        self.assertEqual(self.api_service._get_event_template(self.api_gateway_route, "GET", "/"), {"resource": "/"})
+        self.assertEqual(self.api_service._get_event_template(self.api_gateway_route, "GET", "/"), {"resource": "/"})
+
+        self.api_service._create_event_template.assert_called_once_with(self.api_gateway_route, "GET", "/")
+        self.assertEqual(self.api_service._dict_of_event_templates, {"/:GET": {"resource": "/"}})
+
+    @patch("samcli.local.apigw.local_apigw_service.RouteTableFlask")
+    def test_create_creates_flask_app_with_routes(self, flask):
         app_mock = MagicMock()
         app_mock.config = {}
+        app_mock.route_table.methods.return_value = set()
         flask.return_value = app_mock
 
         self.api_service._construct_error_handling = Mock()
 
         self.api_service.create()
 
-        app_mock.add_url_rule.assert_called_once_with(
-            "/",
-            endpoint="/",
-            view_func=self.api_service._request_handler,
-            methods=["GET"],
-            provide_automatic_options=False,
+        app_mock.add_route.assert_has_calls(
+            [
+                call("/", self.api_service._request_handler, ["GET"]),
+                call(STATS_PATH, self.api_service._stats_request_handler, ["GET"]),
+            ]
         )
+        self.assertEqual(app_mock.add_route.call_count, 2)
+        app_mock.add_url_rule.assert_not_called()
+
+    def test_create_adds_stats_route_not_shadowed_by_default_route(self):
+        self.lambda_runner.concurrency_limiter.stats.return_value = {"account": {"throttles": 1}}
+        default_route = Route(methods=["ANY"], function_name="DefaultFunction", path="$default", event_type=Route.HTTP)
+        service = LocalApigwService(Api(routes=[default_route]), self.lambda_runner)
+        service.create()
+
+        response = service._app.test_client().get(STATS_PATH)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()["concurrency"], {"account": {"throttles": 1}})
+
+    def test_stats_route_reports_response_cache_hits_and_misses(self):
+        self.lambda_runner.concurrency_limiter.stats.return_value = {}
+        service = LocalApigwService(Api(routes=[]), self.lambda_runner)
+        service.create()
+        service._response_cache.put(("key",), "response", 60)
+        service._response_cache.get(("key",))
+        service._response_cache.get(("other-key",))
+
+        response = service._app.test_client().get(STATS_PATH)
+
+        self.assertEqual(
+            response.get_json()["response_cache"], {"hits": 1, "misses": 1, "entries": 1, "size": len("response")}
+        )
+
+    def test_create_does_not_add_stats_route_over_api_route(self):
+        stats_route = Route(methods=["POST"], function_name="StatsFunction", path=STATS_PATH)
+        service = LocalApigwService(Api(routes=[stats_route]), self.lambda_runner)
+        service.create()
+
+        with service._app.test_request_context(STATS_PATH, method="POST"):
+            self.assertEqual(service._get_current_route(request), stats_route)
+        self.assertEqual(service._app.route_table.methods(STATS_PATH), {"POST"})
+
+    def test_create_dispatches_requests_with_route_table(self):
+        get_route = Route(methods=["GET"], function_name="GetFunction", path="/id/{id}")
+        proxy_route = Route(methods=["POST"], function_name="ProxyFunction", path="/id/{id}/{proxy+}")
+        default_route = Route(methods=["ANY"], function_name="DefaultFunction", path="$default", event_type=Route.HTTP)
+        service = LocalApigwService(Api(routes=[get_route, proxy_route, default_route]), self.lambda_runner)
+        service.create()
+
+        with service._app.test_request_context("/id/42/a/b", method="POST"):
+            self.assertEqual(service._get_current_route(request), proxy_route)
+            self.assertEqual(request.view_args, {"id": "42", "proxy": "a/b"})
+        with service._app.test_request_context("/id/42/", method="GET"):
+            self.assertEqual(service._get_current_route(request), get_route)
+            self.assertEqual(request.view_args, {"id": "42"})
+        with service._app.test_request_context("/unknown", method="DELETE"):
+            self.assertEqual(service._get_current_route(request).function_name, "DefaultFunction")
+            self.assertEqual(request.view_args, {"any_path": "unknown"})
 
     def test_api_initalize_creates_default_values(self):
         self.assertEqual(self.api_service.port, 3000)
@@ -388,6 +511,23 @@ class TestApiGatewayService(TestCase):
 
         self.assertEqual(response, not_found_response_mock)
 
+    @patch.object(LocalApigwService, "get_request_methods_endpoints")
+    @patch("samcli.local.apigw.local_apigw_service.ServiceErrorResponses")
+    def test_request_handles_error_when_invoke_is_throttled(self, service_error_responses_patch, request_mock):
+        too_many_requests_response_mock = Mock()
+        self.api_service._construct_v_1_0_event = Mock()
+        self.api_service._get_current_route = MagicMock()
+        self.api_service._get_current_route.return_value.payload_format_version = "2.0"
+        self.api_service._get_current_route.methods = []
+
+        service_error_responses_patch.too_many_requests.return_value = too_many_requests_response_mock
+
+        self.lambda_runner.invoke.side_effect = FunctionThrottled("Rate Exceeded.", "ConcurrentInvocationLimitExceeded")
+        request_mock.return_value = ("test", "test")
+        response = self.api_service._request_handler()
+
+        self.assertEqual(response, too_many_requests_response_mock)
+
     @patch.object(LocalApigwService, "get_request_methods_endpoints")
     @patch("samcli.local.apigw.local_apigw_service.ServiceErrorResponses")
     def test_request_handles_error_when_invoke_function_with_inline_code(
@@ -508,6 +648,135 @@ class TestApiGatewayService(TestCase):
             self.api_service._get_current_route(request_mock)
 
 
+class TestServiceResponseCache(TestCase):
+    def setUp(self):
+        self.lambda_runner = Mock()
+        self.lambda_runner.is_debugging.return_value = False
+        self.status_code = 200
+
+        def invoke(function_name, event, stdout, stderr):
+            event = json.loads(event)
+            path = event.get("path") or event.get("rawPath")
+            stdout.write(json.dumps({"statusCode": self.status_code, "body": path}).encode())
+
+        self.lambda_runner.invoke.side_effect = invoke
+
+        self.api = Api(
+            routes=[
+                Route(
+                    methods=["GET", "POST"],
+                    function_name="Function",
+                    path="/users/{id}",
+                    cache_key_parameters=["method.request.querystring.page"],
+                ),
+                Route(methods=["GET"], function_name="HttpFunction", path="/http", event_type=Route.HTTP),
+            ]
+        )
+        self.api.cache_cluster_enabled = True
+        self.api.method_settings = [{"ResourcePath": "/*", "HttpMethod": "*", "CachingEnabled": True}]
+        self.service = LocalApigwService(self.api, self.lambda_runner)
+        self.service.create()
+
+    def _request(self, path, method="GET", headers=None):
+        with self.service._app.test_request_context(path, method=method, headers=headers):
+            return self.service._request_handler()
+
+    def test_create_computes_cache_ttls_of_cached_routes(self):
+        self.assertEqual(self.service._dict_of_cache_ttls, {"/users/<id>:GET": 300})
+
+    def test_must_serve_cached_responses(self):
+        first_response = self._request("/users/1?page=1")
+        cached_response = self._request("/users/1?page=1&sort=name")
+        other_response = self._request("/users/2?page=1")
+
+        self.assertEqual(first_response.data, b"/users/1")
+        self.assertEqual(cached_response.data, b"/users/1")
+        self.assertEqual(other_response.data, b"/users/2")
+        self.assertEqual(self.lambda_runner.invoke.call_count, 2)
+        self.assertEqual(self.service._response_cache.stats()["hits"], 1)
+
+    def test_must_not_cache_methods_without_caching(self):
+        self._request("/users/1", method="POST")
+        self._request("/users/1", method="POST")
+        self._request("/http")
+        self._request("/http")
+
+        self.assertEqual(self.lambda_runner.invoke.call_count, 4)
+
+    def test_must_refresh_cached_response_with_max_age_0(self):
+        self._request("/users/1")
+        self._request("/users/1", headers={"Cache-Control": "max-age=0"})
+        self._request("/users/1")
+
+        self.assertEqual(self.lambda_runner.invoke.call_count, 2)
+
+    def test_must_not_cache_failed_responses(self):
+        self.status_code = 500
+        self._request("/users/1")
+        self._request("/users/1")
+
+        self.assertEqual(self.lambda_runner.invoke.call_count, 2)
+
+    def test_must_not_cache_without_cache_cluster(self):
+        self.api.cache_cluster_enabled = False
+        service = LocalApigwService(self.api, self.lambda_runner)
+        service.create()
+
+        self.assertEqual(service._dict_of_cache_ttls, {})
+
+
+class TestServiceResponseCompression(TestCase):
+    def setUp(self):
+        self.lambda_runner = Mock()
+        self.lambda_runner.is_debugging.return_value = False
+        self.body = json.dumps({"items": ["item"] * 1000})
+
+        def invoke(function_name, event, stdout, stderr):
+            stdout.write(json.dumps({"statusCode": 200, "body": self.body}).encode())
+
+        self.lambda_runner.invoke.side_effect = invoke
+        self.api = Api(
+            routes=[
+                Route(methods=["GET"], function_name="Function", path="/rest"),
+                Route(methods=["GET"], function_name="HttpFunction", path="/http", event_type=Route.HTTP),
+            ]
+        )
+        self.api.minimum_compression_size = "1024"
+
+    def _request(self, path, accept_encoding="gzip"):
+        service = LocalApigwService(self.api, self.lambda_runner)
+        service.create()
+        with service._app.test_request_context(path, headers={"Accept-Encoding": accept_encoding}):
+            with invoke_timing.track_invoke("Function") as timing:
+                return service._request_handler(), timing
+
+    @patch("samcli.lib.utils.invoke_timing._RECORDER")
+    def test_must_compress_rest_api_responses(self, recorder_mock):
+        response, timing = self._request("/rest")
+
+        self.assertEqual(response.headers["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(response.get_data()).decode(), self.body)
+        self.assertEqual(timing.counters["compression_saved_bytes"], len(self.body) - len(response.get_data()))
+        self.assertIn("response_compression", timing.phase_durations_ms())
+
+    @parameterized.expand([("/rest", "identity"), ("/http", "gzip")])
+    @patch("samcli.lib.utils.invoke_timing._RECORDER")
+    def test_must_not_compress_responses(self, path, accept_encoding, recorder_mock):
+        response, timing = self._request(path, accept_encoding)
+
+        self.assertNotIn("Content-Encoding", response.headers)
+        self.assertEqual(response.get_data().decode(), self.body)
+        self.assertEqual(timing.counters, {})
+
+    @patch("samcli.lib.utils.invoke_timing._RECORDER")
+    def test_must_not_compress_without_minimum_compression_size(self, recorder_mock):
+        self.api.minimum_compression_size = None
+
+        response, _ = self._request("/rest")
+
+        self.assertNotIn("Content-Encoding", response.headers)
+
+
 class TestApiGatewayModel(TestCase):
     def setUp(self):
         self.function_name = "name"
@@ -1402,6 +1671,25 @@ class TestService_construct_event(TestCase):
 
         self.assertEqual(actual_event_json["body"], None)
 
+    def test_construct_event_with_event_template(self):
+        event_template = LocalApigwService._v_1_0_event_template("endpoint", "GET", "Dev", {"key": "value"}, "getId")
+
+        actual_event_str = LocalApigwService._construct_v_1_0_event(
+            self.request_mock, 3000, binary_types=[], event_template=event_template
+        )
+        actual_event_json = json.loads(actual_event_str)
+        self.validate_request_context_and_remove_request_time_data(actual_event_json)
+        actual_event_json["requestContext"]["requestId"] = self.expected_dict["requestContext"]["requestId"]
+
+        self.expected_dict["version"] = "1.0"
+        self.expected_dict["stageVariables"] = {"key": "value"}
+        self.expected_dict["requestContext"]["stage"] = "Dev"
+        self.expected_dict["requestContext"]["operationName"] = "getId"
+        self.assertEqual(actual_event_json, self.expected_dict)
+        # the template is shared by all the events of the route
+        self.assertEqual(event_template["requestContext"]["identity"]["sourceIp"], "127.0.0.1")
+        self.assertIsNone(event_template["body"])
+
     @patch("samcli.local.apigw.local_apigw_service.LocalApigwService._should_base64_encode")
     def test_construct_event_with_binary_data(self, should_base64_encode_patch):
         should_base64_encode_patch.return_value = True
@@ -1600,6 +1888,25 @@ class TestService_construct_event_http(TestCase):
         actual_event_dict["requestContext"]["requestId"] = ""
         self.assertEqual(actual_event_dict, self.expected_dict)
 
+    def test_construct_event_with_event_template(self):
+        event_template = LocalApigwService._v_2_0_event_template("GET", route_key="GET /endpoint")
+
+        actual_event_str = LocalApigwService._construct_v_2_0_event_http(
+            self.request_mock,
+            3000,
+            binary_types=[],
+            request_time_epoch=self.request_time_epoch,
+            request_time=self.request_time,
+            event_template=event_template,
+        )
+        actual_event_dict = json.loads(actual_event_str)
+        actual_event_dict["requestContext"]["requestId"] = ""
+
+        self.assertEqual(actual_event_dict, self.expected_dict)
+        # the template is shared by all the events of the route
+        self.assertEqual(event_template["requestContext"]["http"]["sourceIp"], "127.0.0.1")
+        self.assertIsNone(event_template["rawPath"])
+
     def test_v2_route_key(self):
         route_key = LocalApigwService._v2_route_key("GET", "/path", False)
         self.assertEqual(route_key, "GET /path")
@@ -0,0 +1,120 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+from flask import Flask, request
+from parameterized import parameterized
+
+from samcli.local.apigw.response_cache import ResponseCache, get_cache_key, get_cache_ttl, is_enabled
+
+
+class TestGetCacheTtl(TestCase):
+    def setUp(self):
+        self.method_settings = [
+            {"ResourcePath": "/*", "HttpMethod": "*", "CachingEnabled": True},
+            {"ResourcePath": "/~1users~1{id}", "HttpMethod": "*", "CachingEnabled": True, "CacheTtlInSeconds": 60},
+            {"ResourcePath": "/~1users~1{id}", "HttpMethod": "POST", "CachingEnabled": "true", "CacheTtlInSeconds": 10},
+            {"ResourcePath": "/~1orders", "HttpMethod": "GET", "CachingEnabled": False},
+            {"ResourcePath": "/*", "HttpMethod": "PUT", "CachingEnabled": True, "CacheTtlInSeconds": 0},
+        ]
+
+    @parameterized.expand(
+        [
+            ("/items", "GET", 300),
+            ("/users/{id}", "GET", 60),
+            ("/users/{id}", "POST", 10),
+            ("/users/{id}", "DELETE", None),
+            ("/orders", "GET", None),
+            ("/items", "PUT", None),
+        ]
+    )
+    def test_must_use_most_specific_settings(self, resource_path, method, expected_ttl):
+        self.assertEqual(get_cache_ttl(self.method_settings, resource_path, method), expected_ttl)
+
+    def test_must_not_cache_without_settings(self):
+        self.assertIsNone(get_cache_ttl(None, "/items", "GET"))
+
+    def test_must_cap_ttl(self):
+        method_settings = [{"CachingEnabled": True, "CacheTtlInSeconds": 100000}]
+
+        self.assertEqual(get_cache_ttl(method_settings, "/items", "GET"), 3600)
+
+
+class TestGetCacheKey(TestCase):
+    def test_must_key_by_method_path_and_cache_key_parameters(self):
+        app = Flask(__name__)
+        parameters = ["method.request.querystring.page", "method.request.header.Accept", "method.request.path.id"]
+
+        with app.test_request_context("/users/42?page=2&sort=name", headers={"Accept": "text/html"}):
+            key = get_cache_key(request, parameters)
+        with app.test_request_context("/users/42?page=2&sort=date", headers={"Accept": "text/html", "X-Id": "1"}):
+            same_key = get_cache_key(request, parameters)
+        with app.test_request_context("/users/42?page=3", headers={"Accept": "text/html"}):
+            other_key = get_cache_key(request, parameters)
+        with app.test_request_context("/users/42?page=3", headers={"Accept": "text/html"}):
+            key_without_parameters = get_cache_key(request, None)
+
+        self.assertEqual(key, same_key)
+        self.assertNotEqual(key, other_key)
+        self.assertEqual(key_without_parameters, ("GET", "/users/42"))
+
+
+class TestIsEnabled(TestCase):
+    @parameterized.expand(
+        [(True, True), ("true", True), ("True", True), (False, False), ("false", False), (None, False)]
+    )
+    def test_must_read_booleans_and_strings(self, value, expected):
+        self.assertEqual(is_enabled(value), expected)
+
+
+class TestResponseCache(TestCase):
+    def test_must_count_hits_and_misses(self):
+        cache = ResponseCache()
+
+        self.assertIsNone(cache.get(("GET", "/")))
+        cache.put(("GET", "/"), "response", ttl=60)
+
+        self.assertEqual(cache.get(("GET", "/")), "response")
+        self.assertEqual(cache.stats(), {"hits": 1, "misses": 1, "entries": 1, "size": len("response")})
+
+    @patch("samcli.local.apigw.response_cache.time")
+    def test_must_expire_responses(self, time_mock):
+        time_mock.monotonic.return_value = 100
+        cache = ResponseCache()
+        cache.put(("GET", "/"), "response", ttl=60)
+
+        time_mock.monotonic.return_value = 159
+        self.assertEqual(cache.get(("GET", "/")), "response")
+        time_mock.monotonic.return_value = 160
+        self.assertIsNone(cache.get(("GET", "/")))
+        self.assertEqual(cache.stats()["entries"], 0)
+
+    def test_must_evict_least_recently_used_responses(self):
+        cache = ResponseCache(max_entries=2)
+        cache.put(("GET", "/1"), "1", ttl=60)
+        cache.put(("GET", "/2"), "2", ttl=60)
+        cache.get(("GET", "/1"))
+
+        cache.put(("GET", "/3"), "3", ttl=60)
+
+        self.assertEqual(cache.get(("GET", "/1")), "1")
+        self.assertIsNone(cache.get(("GET", "/2")))
+        self.assertEqual(cache.get(("GET", "/3")), "3")
+
+    def test_must_stay_within_max_size(self):
+        cache = ResponseCache(max_size_mb=1)
+        cache.put(("GET", "/1"), "a" * 600 * 1024, ttl=60)
+        cache.put(("GET", "/2"), "b" * 600 * 1024, ttl=60)
+        cache.put(("GET", "/3"), "c" * 2 * 1024 * 1024, ttl=60)
+
+        self.assertIsNone(cache.get(("GET", "/1")))
+        self.assertIsNotNone(cache.get(("GET", "/2")))
+        self.assertIsNone(cache.get(("GET", "/3")))
+        self.assertEqual(cache.stats()["size"], 600 * 1024)
+
+    def test_must_replace_response(self):
+        cache = ResponseCache()
+        cache.put(("GET", "/"), "old", ttl=60)
+        cache.put(("GET", "/"), "new response", ttl=60)
+
+        self.assertEqual(cache.get(("GET", "/")), "new response")
+        self.assertEqual(cache.stats()["size"], len("new response"))
@@ -0,0 +1,60 @@
+import gzip
+import zlib
+from unittest import TestCase
+from unittest.mock import patch
+
+from flask import Response
+from parameterized import parameterized
+from werkzeug.datastructures import Headers
+from werkzeug.http import parse_accept_header
+
+from samcli.local.apigw.response_compression import compress_response, get_minimum_compression_size
+
+
+class TestCompressResponse(TestCase):
+    def setUp(self):
+        self.body = b'{"items": [' + b'{"name": "item"}, ' * 1000 + b"]}"
+        self.response = Response(self.body)
+
+    def test_must_compress_with_gzip(self):
+        sizes = compress_response(self.response, parse_accept_header("deflate, gzip"), 1024)
+
+        self.assertEqual(sizes, (len(self.body), len(self.response.get_data())))
+        self.assertEqual(gzip.decompress(self.response.get_data()), self.body)
+        self.assertEqual(self.response.headers["Content-Encoding"], "gzip")
+        self.assertEqual(self.response.headers["Content-Length"], str(sizes[1]))
+        self.assertEqual(self.response.headers["Vary"], "Accept-Encoding")
+
+    def test_must_compress_with_deflate(self):
+        compress_response(self.response, parse_accept_header("deflate, gzip;q=0"), 0)
+
+        self.assertEqual(zlib.decompress(self.response.get_data()), self.body)
+        self.assertEqual(self.response.headers["Content-Encoding"], "deflate")
+
+    @parameterized.expand([("identity",), ("br",), ("",)])
+    def test_must_not_compress_with_unsupported_encodings(self, accept_encoding):
+        self.assertIsNone(compress_response(self.response, parse_accept_header(accept_encoding), 0))
+        self.assertEqual(self.response.get_data(), self.body)
+
+    def test_must_not_compress_small_bodies(self):
+        self.assertIsNone(compress_response(self.response, parse_accept_header("gzip"), len(self.body) + 1))
+        self.assertEqual(self.response.get_data(), self.body)
+        self.assertNotIn("Content-Encoding", self.response.headers)
+
+    def test_must_not_compress_encoded_bodies(self):
+        response = Response(self.body, headers=Headers({"Content-Encoding": "br"}))
+
+        self.assertIsNone(compress_response(response, parse_accept_header("gzip"), 0))
+        self.assertEqual(response.get_data(), self.body)
+
+
+class TestGetMinimumCompressionSize(TestCase):
+    @parameterized.expand([(None, None), (0, 0), ("1024", 1024), (10485760, 10485760)])
+    def test_must_return_valid_sizes(self, value, expected):
+        self.assertEqual(get_minimum_compression_size(value), expected)
+
+    @parameterized.expand([("big",), (-1,), (10485761,)])
+    @patch("samcli.local.apigw.response_compression.LOG")
+    def test_must_disable_compression_with_invalid_sizes(self, value, log_mock):
+        self.assertIsNone(get_minimum_compression_size(value))
+        log_mock.warning.assert_called_once()
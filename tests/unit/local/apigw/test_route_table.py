@@ -0,0 +1,89 @@
+import os
+import shutil
+from tempfile import mkdtemp
+from unittest import TestCase
+
+from parameterized import parameterized
+
+from samcli.local.apigw.route_table import RouteTable, RouteTableFlask
+
+
+class TestRouteTable(TestCase):
+    def setUp(self):
+        self.route_table = RouteTable()
+        self.route_table.add("/", ["GET"])
+        self.route_table.add("/users", ["GET", "POST"])
+        self.route_table.add("/users/me", ["GET"])
+        self.route_table.add("/users/<id>", ["GET", "DELETE"])
+        self.route_table.add("/users/<id>/<path:proxy>", ["ANY"])
+        self.route_table.add("/<path:any_path>", ["GET"])
+
+    @parameterized.expand(
+        [
+            ("/", "GET", "/", {}),
+            ("/users", "POST", "/users", {}),
+            ("/users/", "GET", "/users", {}),
+            ("/users/me", "GET", "/users/me", {}),
+            ("/users/me", "DELETE", "/users/<id>", {"id": "me"}),
+            ("/users/42", "GET", "/users/<id>", {"id": "42"}),
+            ("/users/42/orders/7", "ANY", "/users/<id>/<path:proxy>", {"id": "42", "proxy": "orders/7"}),
+            ("/users/42/orders/", "ANY", "/users/<id>/<path:proxy>", {"id": "42", "proxy": "orders"}),
+            ("/users/42/orders", "GET", "/<path:any_path>", {"any_path": "users/42/orders"}),
+            ("/other", "GET", "/<path:any_path>", {"any_path": "other"}),
+        ]
+    )
+    def test_must_match_most_specific_route(self, path, method, endpoint, view_args):
+        rule, actual_view_args = self.route_table.match(path, method)
+
+        self.assertEqual(rule.endpoint, endpoint)
+        self.assertEqual(actual_view_args, view_args)
+
+    @parameterized.expand([("/users", "DELETE"), ("/users//", "DELETE"), ("/other", "POST"), ("/", "POST")])
+    def test_must_not_match_unknown_routes(self, path, method):
+        self.assertIsNone(self.route_table.match(path, method))
+
+    def test_must_return_allowed_methods_of_matching_routes(self):
+        self.assertEqual(self.route_table.allowed_methods("/users/42"), {"GET", "DELETE"})
+        self.assertEqual(self.route_table.allowed_methods("/users/42/orders"), {"ANY", "GET"})
+        self.assertEqual(self.route_table.allowed_methods("/"), {"GET"})
+
+    def test_must_return_methods_of_path(self):
+        self.route_table.add("/users/<id>", ["PUT"])
+
+        self.assertEqual(self.route_table.methods("/users/<id>"), {"GET", "DELETE", "PUT"})
+        self.assertEqual(self.route_table.methods("/users/<name>"), set())
+        self.assertIs(self.route_table.match("/users/42", "PUT")[0], self.route_table.match("/users/42", "GET")[0])
+
+    def test_must_reject_greedy_parameter_before_last_segment(self):
+        with self.assertRaises(ValueError):
+            self.route_table.add("/<path:proxy>/users", ["GET"])
+
+
+class TestRouteTableFlask(TestCase):
+    def setUp(self):
+        self.static_dir = mkdtemp()
+        with open(os.path.join(self.static_dir, "index.html"), "w") as index:
+            index.write("static")
+        self.app = RouteTableFlask(__name__, static_url_path="", static_folder=self.static_dir)
+        self.app.add_route("/users/<id>", lambda id: f"user {id}", ["GET"])
+        self.client = self.app.test_client()
+
+    def tearDown(self):
+        shutil.rmtree(self.static_dir)
+
+    def test_must_dispatch_requests_to_routes(self):
+        response = self.client.get("/users/42")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, b"user 42")
+        self.assertEqual([rule.endpoint for rule in self.app.url_map.iter_rules()], ["static"])
+
+    def test_must_fall_back_to_static_files(self):
+        response = self.client.get("/index.html")
+
+        self.assertEqual(response.data, b"static")
+        response.close()
+
+    def test_must_respond_method_not_allowed(self):
+        self.assertEqual(self.client.post("/users/42").status_code, 405)
+        self.assertEqual(self.client.get("/unknown/path").status_code, 404)
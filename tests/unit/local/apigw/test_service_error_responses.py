@@ -18,6 +18,19 @@ class TestServiceErrorResponses(TestCase):
         jsonify_patch.assert_called_with({"message": "Internal server error"})
         make_response_patch.assert_called_with({"json": "Response"}, 502)
 
+    @patch("samcli.local.apigw.service_error_responses.make_response")
+    @patch("samcli.local.apigw.service_error_responses.jsonify")
+    def test_too_many_requests(self, jsonify_patch, make_response_patch):
+        jsonify_patch.return_value = {"json": "Response"}
+        make_response_patch.return_value = {"Some Response"}
+
+        response = ServiceErrorResponses.too_many_requests()
+
+        self.assertEqual(response, {"Some Response"})
+
+        jsonify_patch.assert_called_with({"message": "Too Many Requests"})
+        make_response_patch.assert_called_with({"json": "Response"}, 429)
+
     @patch("samcli.local.apigw.service_error_responses.make_response")
     @patch("samcli.local.apigw.service_error_responses.jsonify")
     def test_lambda_not_found_response(self, jsonify_patch, make_response_patch):
@@ -6,6 +6,7 @@ from docker.errors import NotFound, APIError
 from unittest import TestCase
 from unittest.mock import Mock, call, patch, ANY
 
+from parameterized import parameterized
 from requests import RequestException
 
 from samcli.lib.utils.packagetype import IMAGE
@@ -345,6 +346,16 @@ class TestContainer_stop(TestCase):
         # Ensure ID remains set
         self.assertIsNotNone(self.container.id)
 
+    def test_must_unpause_paused_container_before_stopping_it(self):
+        self.container.is_created.return_value = True
+        real_container_mock = self.mock_docker_client.containers.get.return_value
+        self.container.is_paused = True
+
+        self.container.stop(timeout=3)
+
+        self.assertEqual(real_container_mock.method_calls, [call.unpause(), call.stop(timeout=3)])
+        self.assertFalse(self.container.is_paused)
+
     def test_must_work_when_container_is_not_found(self):
         self.container.is_created.return_value = True
         real_container_mock = Mock()
@@ -553,8 +564,8 @@ class TestContainer_wait_for_result(TestCase):
         self.socket_mock.connect_ex.return_value = 0
 
     @patch("socket.socket")
-    @patch("samcli.local.docker.container.requests")
-    def test_wait_for_result_no_error(self, mock_requests, patched_socket):
+    @patch("samcli.local.docker.container.requests.Session")
+    def test_wait_for_result_no_error(self, mock_session_class, patched_socket):
         self.container.is_created.return_value = True
 
         real_container_mock = Mock()
@@ -567,8 +578,8 @@ class TestContainer_wait_for_result(TestCase):
         stdout_mock = Mock()
         stderr_mock = Mock()
         response = Mock()
-        response.content = b'{"hello":"world"}'
-        mock_requests.post.return_value = response
+        response.iter_content.return_value = [b'{"hello":', b'"world"}']
+        mock_session_class.return_value.post.return_value = response
 
         patched_socket.return_value = self.socket_mock
 
@@ -589,16 +600,20 @@ class TestContainer_wait_for_result(TestCase):
         host = self.container._container_host
         port = self.container.rapid_port_host
         self.socket_mock.connect_ex.assert_called_with((host, port))
-        mock_requests.post.assert_called_with(
+        mock_session_class.return_value.post.assert_called_with(
             self.container.URL.format(host=host, port=port, function_name="function"),
             data=b"{}",
             timeout=(self.container.RAPID_CONNECTION_TIMEOUT, None),
+            stream=True,
         )
+        response.iter_content.assert_called_with(chunk_size=self.container.RAPID_RESPONSE_CHUNK_SIZE)
+        stdout_mock.write.assert_has_calls([call(b'{"hello":'), call(b'"world"}')])
+        response.close.assert_called_once_with()
 
     @patch("socket.socket")
-    @patch("samcli.local.docker.container.requests")
+    @patch("samcli.local.docker.container.requests.Session")
     @patch("time.sleep")
-    def test_wait_for_result_error_retried(self, patched_sleep, mock_requests, patched_socket):
+    def test_wait_for_result_error_retried(self, patched_sleep, mock_session_class, patched_socket):
         self.container.is_created.return_value = True
 
         real_container_mock = Mock()
@@ -611,7 +626,7 @@ class TestContainer_wait_for_result(TestCase):
         stdout_mock = Mock()
         stderr_mock = Mock()
         self.container.rapid_port_host = "7077"
-        mock_requests.post.side_effect = [RequestException(), RequestException(), RequestException()]
+        mock_session_class.return_value.post.side_effect = [RequestException(), RequestException(), RequestException()]
 
         patched_socket.return_value = self.socket_mock
 
@@ -620,8 +635,11 @@ class TestContainer_wait_for_result(TestCase):
                 event=self.event, full_path=self.name, stdout=stdout_mock, stderr=stderr_mock
             )
 
-        self.assertEqual(mock_requests.post.call_count, 3)
-        calls = mock_requests.post.call_args_list
+        self.assertEqual(mock_session_class.return_value.post.call_count, 3)
+        # a new session is opened after each failed attempt
+        self.assertEqual(mock_session_class.call_count, 3)
+        self.assertEqual(mock_session_class.return_value.close.call_count, 3)
+        calls = mock_session_class.return_value.post.call_args_list
         self.assertEqual(
             calls,
             [
@@ -629,24 +647,27 @@ class TestContainer_wait_for_result(TestCase):
                     "http://localhost:7077/2015-03-31/functions/function/invocations",
                     data=b"{}",
                     timeout=(self.timeout, None),
+                    stream=True,
                 ),
                 call(
                     "http://localhost:7077/2015-03-31/functions/function/invocations",
                     data=b"{}",
                     timeout=(self.timeout, None),
+                    stream=True,
                 ),
                 call(
                     "http://localhost:7077/2015-03-31/functions/function/invocations",
                     data=b"{}",
                     timeout=(self.timeout, None),
+                    stream=True,
                 ),
             ],
         )
 
     @patch("socket.socket")
-    @patch("samcli.local.docker.container.requests")
+    @patch("samcli.local.docker.container.requests.Session")
     @patch("time.sleep")
-    def test_wait_for_result_error(self, patched_sleep, mock_requests, patched_socket):
+    def test_wait_for_result_error(self, patched_sleep, mock_session_class, patched_socket):
         self.container.is_created.return_value = True
 
         real_container_mock = Mock()
@@ -658,7 +679,7 @@ class TestContainer_wait_for_result(TestCase):
 
         stdout_mock = Mock()
         stderr_mock = Mock()
-        mock_requests.post.side_effect = ContainerResponseException()
+        mock_session_class.return_value.post.side_effect = ContainerResponseException()
 
         patched_socket.return_value = self.socket_mock
 
@@ -667,14 +688,30 @@ class TestContainer_wait_for_result(TestCase):
                 event=self.event, full_path=self.name, stdout=stdout_mock, stderr=stderr_mock
             )
 
+    @patch("samcli.local.docker.container.requests.Session")
+    def test_must_not_retry_invoke_if_response_is_interrupted(self, mock_session_class):
+        response = Mock()
+        response.iter_content.return_value.__iter__ = Mock(side_effect=RequestException())
+        mock_session_class.return_value.post.return_value = response
+        stdout_mock = Mock()
+
+        with self.assertRaises(ContainerResponseException):
+            self.container.wait_for_http_response(self.name, self.event, stdout_mock)
+
+        mock_session_class.return_value.post.assert_called_once()
+        mock_session_class.return_value.close.assert_called_once_with()
+        response.close.assert_called_once_with()
+
     # set timeout to be 0.1ms
     @patch("samcli.local.docker.container.CONTAINER_CONNECTION_TIMEOUT", 0.0001)
     @patch("socket.socket")
-    @patch("samcli.local.docker.container.requests")
+    @patch("samcli.local.docker.container.requests.Session")
     @patch("time.sleep")
-    def test_wait_for_result_waits_for_socket_before_post_request(self, patched_time, mock_requests, patched_socket):
+    def test_wait_for_result_waits_for_socket_before_post_request(
+        self, patched_time, mock_session_class, patched_socket
+    ):
         self.container.is_created.return_value = True
-        mock_requests.post = Mock(return_value=None)
+        mock_session_class.return_value.post = Mock(return_value=None)
         real_container_mock = Mock()
         self.mock_docker_client.containers.get.return_value = real_container_mock
 
@@ -694,7 +731,7 @@ class TestContainer_wait_for_result(TestCase):
                 event=self.event, full_path=self.name, stdout=stdout_mock, stderr=stderr_mock
             )
 
-        self.assertEqual(mock_requests.post.call_count, 0)
+        self.assertEqual(mock_session_class.return_value.post.call_count, 0)
 
     def test_write_container_output_successful(self):
         stdout_mock = Mock()
@@ -710,6 +747,62 @@ class TestContainer_wait_for_result(TestCase):
         stderr_mock.assert_has_calls([call.write("World")])
 
 
+class TestContainer_read_logs(TestCase):
+    def setUp(self):
+        self.mock_docker_client = Mock()
+        self.container = Container(IMAGE, ["cmd"], "working_dir", "host_dir", docker_client=self.mock_docker_client)
+        self.container.id = "someid"
+        self.container.is_created = Mock(return_value=True)
+        self.stream = Mock()
+
+    @patch("samcli.local.docker.container.get_log_multiplexer")
+    def test_must_attach_container_to_log_multiplexer(self, get_log_multiplexer_mock):
+        log_multiplexer = get_log_multiplexer_mock.return_value
+        log_multiplexer.is_supported.return_value = True
+        attach_socket = self.mock_docker_client.api.attach_socket.return_value
+
+        self.container._read_logs("function", self.stream)
+
+        self.mock_docker_client.api.attach_socket.assert_called_once_with(
+            "someid", params={"stdout": 1, "stderr": 1, "stream": 1, "logs": 1}
+        )
+        log_multiplexer.attach.assert_called_once_with(
+            "someid", attach_socket, "function", stdout=self.stream, stderr=self.stream
+        )
+        self.assertIsNone(self.container._logs_thread)
+
+        log_multiplexer.is_attached.return_value = True
+        self.assertTrue(self.container._are_logs_read())
+        log_multiplexer.is_attached.assert_called_once_with("someid")
+
+    @patch("samcli.local.docker.container.threading")
+    @patch("samcli.local.docker.container.get_log_multiplexer")
+    def test_must_read_logs_from_a_thread_if_not_supported(self, get_log_multiplexer_mock, threading_mock):
+        get_log_multiplexer_mock.return_value.is_supported.return_value = False
+        attach_socket = self.mock_docker_client.api.attach_socket.return_value
+
+        self.container._read_logs("function", self.stream)
+
+        attach_socket.close.assert_called_once_with()
+        get_log_multiplexer_mock.return_value.attach.assert_not_called()
+        threading_mock.Thread.assert_called_once_with(
+            target=self.container.wait_for_logs, args=(self.stream, self.stream), daemon=True
+        )
+        threading_mock.Thread.return_value.start.assert_called_once_with()
+
+        threading_mock.Thread.return_value.is_alive.return_value = False
+        self.assertFalse(self.container._are_logs_read())
+
+    @patch("samcli.local.docker.container.get_log_multiplexer")
+    def test_must_not_read_logs_if_container_not_created(self, get_log_multiplexer_mock):
+        self.container.is_created.return_value = False
+
+        self.container._read_logs("function", self.stream)
+
+        self.mock_docker_client.api.attach_socket.assert_not_called()
+        get_log_multiplexer_mock.return_value.attach.assert_not_called()
+
+
 class TestContainer_wait_for_logs(TestCase):
     def setUp(self):
         self.image = IMAGE
@@ -831,6 +924,73 @@ class TestContainer_wait_for_socket_connection(TestCase):
 
         self.container._wait_for_socket_connection()
 
+    @patch("samcli.local.docker.container.time.sleep")
+    @patch("socket.socket")
+    def test_must_retry_with_exponential_backoff(self, patched_socket, patched_sleep):
+        socket_mock = Mock()
+        socket_mock.connect_ex.side_effect = [111] * 9 + [0]
+        patched_socket.return_value = socket_mock
+
+        self.container._wait_for_socket_connection()
+
+        patched_sleep.assert_has_calls(
+            [call(0.001), call(0.002), call(0.004), call(0.008), call(0.016), call(0.032), call(0.064)]
+        )
+        self.assertEqual(patched_sleep.call_args_list[-2:], [call(0.1), call(0.1)])
+        self.assertIsNotNone(self.container.time_to_ready)
+
+    @patch("socket.socket")
+    def test_must_not_probe_socket_again_once_ready(self, patched_socket):
+        socket_mock = Mock()
+        socket_mock.connect_ex.return_value = 0
+        patched_socket.return_value = socket_mock
+
+        self.container._wait_for_socket_connection()
+        self.container._wait_for_socket_connection()
+
+        socket_mock.connect_ex.assert_called_once()
+
+    @patch("socket.socket")
+    def test_must_probe_socket_again_after_restart(self, patched_socket):
+        socket_mock = Mock()
+        socket_mock.connect_ex.return_value = 0
+        patched_socket.return_value = socket_mock
+        real_container_mock = self.mock_docker_client.containers.get.return_value
+        real_container_mock.status = "exited"
+
+        self.container._wait_for_socket_connection()
+        self.container.start()
+        self.container._wait_for_socket_connection()
+
+        self.assertEqual(socket_mock.connect_ex.call_count, 2)
+
+
+class TestContainer_http_session(TestCase):
+    def setUp(self):
+        self.mock_docker_client = Mock()
+        self.container = Container(IMAGE, "cmd", "dir", "dir", docker_client=self.mock_docker_client)
+        self.container.id = "someid"
+        self.stdout_mock = Mock()
+
+    @patch("samcli.local.docker.container.requests.Session")
+    def test_must_reuse_session_between_invokes(self, session_class_mock):
+        self.container.wait_for_http_response("name", "{}", self.stdout_mock)
+        self.container.wait_for_http_response("name", "{}", self.stdout_mock)
+
+        session_class_mock.assert_called_once_with()
+        self.assertEqual(session_class_mock.return_value.post.call_count, 2)
+
+    @parameterized.expand(["stop", "start", "delete"])
+    @patch("samcli.local.docker.container.requests.Session")
+    def test_must_close_session(self, method_name, session_class_mock):
+        self.container.wait_for_http_response("name", "{}", self.stdout_mock)
+
+        getattr(self.container, method_name)()
+        self.container.wait_for_http_response("name", "{}", self.stdout_mock)
+
+        session_class_mock.return_value.close.assert_called_once_with()
+        self.assertEqual(session_class_mock.call_count, 2)
+
 
 class TestContainer_image(TestCase):
     def test_must_return_image_value(self):
@@ -881,6 +1041,56 @@ class TestContainer_copy(TestCase):
             self.container.copy(source, dest)
 
 
+class TestContainer_exec_run(TestCase):
+    def setUp(self):
+        self.mock_client = Mock()
+        self.container = Container(IMAGE, "cmd", "dir", "dir", docker_client=self.mock_client)
+        self.container.id = "containerid"
+        self.container.is_created = Mock(return_value=True)
+
+    def test_must_run_the_command_in_the_container(self):
+        real_container_mock = self.mock_client.containers.get.return_value
+        real_container_mock.exec_run.return_value = Mock(exit_code=3)
+
+        exit_code = self.container.exec_run(["kill", "1"])
+
+        self.assertEqual(exit_code, 3)
+        self.mock_client.containers.get.assert_called_with("containerid")
+        real_container_mock.exec_run.assert_called_with(["kill", "1"])
+
+    def test_raise_if_container_is_not_created(self):
+        self.container.is_created.return_value = False
+
+        with self.assertRaises(RuntimeError):
+            self.container.exec_run(["kill", "1"])
+
+
+class TestContainer_pause(TestCase):
+    def setUp(self):
+        self.mock_client = Mock()
+        self.container = Container(IMAGE, "cmd", "dir", "dir", docker_client=self.mock_client)
+        self.container.id = "containerid"
+        self.container.is_created = Mock(return_value=True)
+        self.real_container_mock = self.mock_client.containers.get.return_value
+
+    def test_must_pause_and_unpause_the_container_once(self):
+        self.container.pause()
+        self.container.pause()
+        self.assertTrue(self.container.is_paused)
+
+        self.container.unpause()
+        self.container.unpause()
+        self.assertFalse(self.container.is_paused)
+
+        self.assertEqual(self.real_container_mock.method_calls, [call.pause(), call.unpause()])
+
+    def test_raise_if_container_is_not_created(self):
+        self.container.is_created.return_value = False
+
+        with self.assertRaises(RuntimeError):
+            self.container.pause()
+
+
 class TestContainer_is_created(TestCase):
     def setUp(self):
         self.mock_client = Mock()
@@ -0,0 +1,130 @@
+import io
+import socket
+import struct
+import threading
+import time
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+from samcli.lib.utils.stream_writer import StreamWriter
+from samcli.local.docker import container_log_multiplexer
+from samcli.local.docker.container_log_multiplexer import ContainerLogMultiplexer, _AttachedContainer
+
+
+def _frame(frame_type, data):
+    return struct.pack(">BxxxL", frame_type, len(data)) + data
+
+
+class TestAttachedContainer(TestCase):
+    def setUp(self):
+        self.stdout = Mock()
+        self.stderr = Mock()
+        self.container = _AttachedContainer("id", Mock(), "HelloFunction", self.stdout, self.stderr)
+
+    def test_must_demultiplex_complete_lines(self):
+        data = _frame(1, b"out1\nout") + _frame(2, b"err1\n")
+
+        self.assertEqual(self.container.feed(data), [(self.stdout, b"out1\n"), (self.stderr, b"err1\n")])
+        self.assertEqual(self.container.feed(_frame(1, b"2\n")), [(self.stdout, b"out2\n")])
+
+    def test_must_wait_for_complete_frames(self):
+        data = _frame(2, b"error\n")
+
+        self.assertEqual(self.container.feed(data[:5]), [])
+        self.assertEqual(self.container.feed(data[5:]), [(self.stderr, b"error\n")])
+
+    def test_must_skip_streams_without_writer(self):
+        container = _AttachedContainer("id", Mock(), "HelloFunction", None, self.stderr)
+
+        self.assertEqual(container.feed(_frame(1, b"out\n") + _frame(2, b"err\n")), [(self.stderr, b"err\n")])
+
+    def test_must_flush_partial_lines_once_old_enough(self):
+        self.container.feed(_frame(1, b"partial"))
+
+        self.assertEqual(self.container.flush(max_age=60), [])
+        self.assertEqual(self.container.flush(), [(self.stdout, b"partial")])
+        self.assertEqual(self.container.flush(), [])
+
+
+class TestContainerLogMultiplexer(TestCase):
+    def setUp(self):
+        self.multiplexer = ContainerLogMultiplexer()
+        self.stream = io.BytesIO()
+        self.writer = StreamWriter(self.stream)
+        self.sockets = []
+
+    def tearDown(self):
+        for sock in self.sockets:
+            sock.close()
+
+    def _attach(self, container_id, name):
+        container_sock, docker_sock = socket.socketpair()
+        self.sockets.append(docker_sock)
+        self.multiplexer.attach(container_id, container_sock, name, stdout=self.writer, stderr=self.writer)
+        return docker_sock
+
+    def _wait_for(self, condition):
+        deadline = time.monotonic() + 5
+        while not condition():
+            self.assertLess(time.monotonic(), deadline, "Timed out waiting for the container logs")
+            time.sleep(0.01)
+
+    def test_must_read_all_containers_from_a_single_thread(self):
+        threads_count = threading.active_count()
+        docker_socks = [self._attach(f"id{i}", "HelloFunction") for i in range(10)]
+
+        for i, docker_sock in enumerate(docker_socks):
+            docker_sock.sendall(_frame(2, f"log {i}\n".encode()))
+
+        self._wait_for(lambda: self.stream.getvalue().count(b"\n") == 10)
+        self.assertEqual(threading.active_count(), threads_count + 1)
+        self.assertEqual(sorted(self.stream.getvalue().splitlines()), [f"log {i}".encode() for i in range(10)])
+
+    def test_must_prefix_lines_once_several_functions_are_attached(self):
+        hello_sock = self._attach("id1", "HelloFunction")
+        hello_sock.sendall(_frame(1, b"hello\n"))
+        self._wait_for(lambda: self.stream.getvalue() == b"hello\n")
+
+        world_sock = self._attach("id2", "WorldFunction")
+        world_sock.sendall(_frame(1, b"world\nagain\n"))
+
+        self._wait_for(lambda: self.stream.getvalue().count(b"\n") == 3)
+        self.assertEqual(self.stream.getvalue(), b"hello\n[WorldFunction] world\n[WorldFunction] again\n")
+
+    def test_must_detach_closed_containers(self):
+        docker_sock = self._attach("id", "HelloFunction")
+        self.assertTrue(self.multiplexer.is_attached("id"))
+
+        docker_sock.sendall(_frame(2, b"last words"))
+        docker_sock.close()
+
+        self._wait_for(lambda: not self.multiplexer.is_attached("id"))
+        self.assertEqual(self.stream.getvalue(), b"last words")
+
+    def test_must_not_attach_container_twice(self):
+        self._attach("id", "HelloFunction")
+        other_sock = Mock()
+
+        self.multiplexer.attach("id", other_sock, "HelloFunction")
+
+        self.assertTrue(self.multiplexer.is_attached("id"))
+        other_sock.fileno.assert_not_called()
+
+    def test_must_support_sockets_only(self):
+        container_sock, docker_sock = socket.socketpair()
+        self.sockets += [container_sock, docker_sock]
+
+        self.assertTrue(ContainerLogMultiplexer.is_supported(container_sock))
+        self.assertFalse(ContainerLogMultiplexer.is_supported(Mock()))
+
+    @patch("samcli.local.docker.container_log_multiplexer.os")
+    def test_must_not_support_named_pipes_on_windows(self, os_mock):
+        os_mock.name = "nt"
+
+        self.assertFalse(ContainerLogMultiplexer.is_supported(Mock(fileno=Mock(return_value=3))))
+
+
+class TestGetLogMultiplexer(TestCase):
+    @patch("samcli.local.docker.container_log_multiplexer._MULTIPLEXER", None)
+    def test_must_return_same_multiplexer(self):
+        self.assertIs(container_log_multiplexer.get_log_multiplexer(), container_log_multiplexer.get_log_multiplexer())
@@ -0,0 +1,52 @@
+import json
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+from unittest.mock import patch
+
+from samcli.local.docker.image_digest_cache import RemoteImageDigestCache
+
+
+class TestRemoteImageDigestCache(TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.cache_dir.cleanup)
+        self.cache_file = Path(self.cache_dir.name, "config", "remote-image-digests.json")
+
+    def test_must_return_the_cached_digest(self):
+        RemoteImageDigestCache(str(self.cache_file)).put("image", "sha256:digest")
+
+        # another command reads the digest cached by the previous one
+        self.assertEqual(RemoteImageDigestCache(str(self.cache_file)).get("image"), "sha256:digest")
+        self.assertIsNone(RemoteImageDigestCache(str(self.cache_file)).get("other-image"))
+
+    @patch("samcli.local.docker.image_digest_cache.time")
+    def test_must_expire_the_digests_after_the_ttl(self, time_mock):
+        cache = RemoteImageDigestCache(str(self.cache_file), ttl=60)
+        time_mock.time.return_value = 1000
+        cache.put("image", "sha256:digest")
+
+        time_mock.time.return_value = 1059
+        self.assertEqual(cache.get("image"), "sha256:digest")
+        time_mock.time.return_value = 1060
+        self.assertIsNone(cache.get("image"))
+
+        cache.put("other-image", "sha256:other-digest")
+        self.assertEqual(list(json.loads(self.cache_file.read_text())), ["other-image"])
+
+    def test_must_not_cache_when_the_ttl_is_zero(self):
+        cache = RemoteImageDigestCache(str(self.cache_file), ttl=0)
+
+        cache.put("image", "sha256:digest")
+
+        self.assertIsNone(cache.get("image"))
+        self.assertFalse(self.cache_file.exists())
+
+    def test_must_ignore_a_corrupted_cache_file(self):
+        self.cache_file.parent.mkdir(parents=True)
+        self.cache_file.write_text("{not json")
+        cache = RemoteImageDigestCache(str(self.cache_file))
+
+        self.assertIsNone(cache.get("image"))
+        cache.put("image", "sha256:digest")
+        self.assertEqual(cache.get("image"), "sha256:digest")
@@ -1,5 +1,6 @@
 import io
 import tempfile
+from pathlib import Path
 
 from unittest import TestCase
 from unittest.mock import patch, Mock, mock_open, ANY, call
@@ -174,6 +175,48 @@ class TestLambdaImage(TestCase):
             stream=stream,
         )
 
+    @patch("samcli.local.docker.lambda_image.LambdaImage.is_base_image_current")
+    @patch("samcli.local.docker.lambda_image.LambdaImage._build_image")
+    def test_building_image_once_while_reusing_built_images(self, build_image_patch, is_base_image_current_patch):
+        docker_client_mock = Mock()
+        is_base_image_current_patch.return_value = False
+        lambda_image = LambdaImage(Mock(), False, False, docker_client=docker_client_mock)
+
+        with lambda_image.reusing_built_images():
+            images = [
+                lambda_image.build("python3.9", ZIP, None, [], ARM64, stream=Mock(), function_name="Function1"),
+                lambda_image.build("python3.9", ZIP, None, [], ARM64, stream=Mock(), function_name="Function2"),
+                lambda_image.build("python3.9", ZIP, None, [], X86_64, stream=Mock(), function_name="Function3"),
+            ]
+
+        self.assertEqual(
+            images,
+            [
+                f"public.ecr.aws/lambda/python:3.9-{RAPID_IMAGE_TAG_PREFIX}-arm64",
+                f"public.ecr.aws/lambda/python:3.9-{RAPID_IMAGE_TAG_PREFIX}-arm64",
+                f"public.ecr.aws/lambda/python:3.9-{RAPID_IMAGE_TAG_PREFIX}-x86_64",
+            ],
+        )
+        self.assertEqual(build_image_patch.call_count, 2)
+
+        # each build checks its image again once the context is exited
+        lambda_image.build("python3.9", ZIP, None, [], ARM64, stream=Mock(), function_name="Function1")
+        self.assertEqual(build_image_patch.call_count, 3)
+
+    def test_image_key_includes_the_invoke_image_of_the_function(self):
+        lambda_image = LambdaImage(
+            Mock(), False, False, docker_client=Mock(), invoke_images={None: "default", "Function2": "custom"}
+        )
+
+        self.assertEqual(
+            lambda_image.get_image_key("python3.9", ZIP, None, [], ARM64, "Function1"),
+            lambda_image.get_image_key("python3.9", ZIP, None, [], ARM64, "Function3"),
+        )
+        self.assertNotEqual(
+            lambda_image.get_image_key("python3.9", ZIP, None, [], ARM64, "Function1"),
+            lambda_image.get_image_key("python3.9", ZIP, None, [], ARM64, "Function2"),
+        )
+
     @patch("samcli.local.docker.lambda_image.LambdaImage.is_base_image_current")
     @patch("samcli.local.docker.lambda_image.LambdaImage._build_image")
     def test_not_building_image_with_no_layers_if_up_to_date(self, build_image_patch, is_base_image_current_patch):
@@ -244,8 +287,14 @@ class TestLambdaImage(TestCase):
         self.assertEqual(actual_image_id, "samcli/lambda-runtime:image-version")
 
         layer_downloader_mock.download_all.assert_called_once_with([layer_mock], False)
-        generate_docker_image_version_patch.assert_called_once_with([layer_mock], "python:3.7")
-        docker_client_mock.images.get.assert_called_once_with("samcli/lambda-runtime:image-version")
+        generate_docker_image_version_patch.assert_called_once_with(
+            [layer_mock], "python:3.7", "public.ecr.aws/lambda/python:3.7"
+        )
+        self.assertEqual(
+            docker_client_mock.images.get.call_args_list,
+            [call("public.ecr.aws/lambda/python:3.7"), call("samcli/lambda-runtime:image-version")],
+        )
+        docker_client_mock.images.pull.assert_not_called()
         build_image_patch.assert_not_called()
 
     @parameterized.expand(
@@ -278,8 +327,12 @@ class TestLambdaImage(TestCase):
         self.assertEqual(actual_image_id, "samcli/lambda-runtime:image-version")
 
         layer_downloader_mock.download_all.assert_called_once_with(["layers1"], True)
-        generate_docker_image_version_patch.assert_called_once_with(["layers1"], f"{image_suffix}")
-        docker_client_mock.images.get.assert_called_once_with("samcli/lambda-runtime:image-version")
+        generate_docker_image_version_patch.assert_called_once_with(["layers1"], f"{image_suffix}", image_name)
+        self.assertEqual(
+            docker_client_mock.images.get.call_args_list,
+            [call(image_name), call("samcli/lambda-runtime:image-version")],
+        )
+        docker_client_mock.images.pull.assert_called_once_with(image_name, platform="linux/amd64")
         build_image_patch.assert_called_once_with(
             image_name,
             "samcli/lambda-runtime:image-version",
@@ -318,8 +371,12 @@ class TestLambdaImage(TestCase):
         self.assertEqual(actual_image_id, "samcli/lambda-runtime:image-version")
 
         layer_downloader_mock.download_all.assert_called_once_with(["layers1"], False)
-        generate_docker_image_version_patch.assert_called_once_with(["layers1"], f"{image_suffix}")
-        docker_client_mock.images.get.assert_called_once_with("samcli/lambda-runtime:image-version")
+        generate_docker_image_version_patch.assert_called_once_with(["layers1"], f"{image_suffix}", image_name)
+        self.assertEqual(
+            docker_client_mock.images.get.call_args_list,
+            [call(image_name), call("samcli/lambda-runtime:image-version")],
+        )
+        docker_client_mock.images.pull.assert_called_once_with(image_name, platform="linux/arm64")
         build_image_patch.assert_called_once_with(
             image_name,
             "samcli/lambda-runtime:image-version",
@@ -337,11 +394,134 @@ class TestLambdaImage(TestCase):
         layer_mock = Mock()
         layer_mock.name = "layer1"
 
-        image_version = LambdaImage._generate_docker_image_version([layer_mock], "runtime:1-arm64")
+        lambda_image = LambdaImage(Mock(), False, False, docker_client=Mock())
+        lambda_image._get_base_image_digest = Mock(return_value="sha256:base")
+        lambda_image._get_layer_digest = Mock(return_value="layer1digest")
+
+        image_version = lambda_image._generate_docker_image_version([layer_mock], "runtime:1-arm64", "base:1")
 
         self.assertEqual(image_version, "runtime:1-arm64-thisisahexdigestofshahash")
 
-        hashlib_patch.sha256.assert_called_once_with(b"layer1")
+        lambda_image._get_base_image_digest.assert_called_once_with("base:1")
+        lambda_image._get_layer_digest.assert_called_once_with(layer_mock)
+        hashlib_patch.sha256.assert_called_once_with(b"sha256:base-layer1digest")
+
+    def test_generate_same_docker_image_version_for_same_layers_content(self):
+        docker_client_mock = Mock()
+        docker_client_mock.images.get.return_value.id = "sha256:base"
+        lambda_image = LambdaImage(Mock(), False, False, docker_client=docker_client_mock)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            layers = []
+            for name, content in [("layer1", "same"), ("layer2", "same"), ("layer3", "different")]:
+                Path(tmp_dir, name).mkdir()
+                Path(tmp_dir, name, "file.py").write_text(content)
+                layer_mock = Mock(codeuri=str(Path(tmp_dir, name)), is_defined_within_template=True)
+                layer_mock.name = name
+                layers.append(layer_mock)
+
+            versions = [
+                lambda_image._generate_docker_image_version([layer], "python:3.9", "base:1") for layer in layers
+            ]
+
+        self.assertEqual(versions[0], versions[1])
+        self.assertNotEqual(versions[0], versions[2])
+
+    def test_generate_docker_image_version_depends_on_base_image_digest(self):
+        docker_client_mock = Mock()
+        docker_client_mock.images.get.side_effect = [Mock(id="sha256:base1"), Mock(id="sha256:base2")]
+        lambda_image = LambdaImage(Mock(), False, False, docker_client=docker_client_mock)
+        lambda_image._get_layer_digest = Mock(return_value="layer1digest")
+
+        version1 = lambda_image._generate_docker_image_version([Mock()], "python:3.9", "base:1")
+        version2 = lambda_image._generate_docker_image_version([Mock()], "python:3.9", "base:1")
+
+        self.assertNotEqual(version1, version2)
+
+    @patch("samcli.local.docker.lambda_image.LambdaImage._build_image")
+    def test_tagging_image_with_layers_after_pulling_base_image(self, build_image_patch):
+        base_image = "public.ecr.aws/lambda/python:3.9-x86_64"
+        layer_downloader_mock = Mock()
+        layer_downloader_mock.download_all.return_value = [Mock()]
+        local_images = {}
+
+        def get_image(name):
+            if name not in local_images:
+                raise ImageNotFound("image not found")
+            return local_images[name]
+
+        def build_image(base, rapid_image, *args, **kwargs):
+            local_images[rapid_image] = Mock()
+
+        docker_client_mock = Mock()
+        docker_client_mock.images.get.side_effect = get_image
+        docker_client_mock.images.pull.side_effect = lambda name, **kwargs: local_images.update(
+            {name: Mock(id="sha256:pulled")}
+        )
+        docker_client_mock.images.list.return_value = []
+        build_image_patch.side_effect = build_image
+
+        rapid_images = []
+        for _ in range(2):
+            lambda_image = LambdaImage(layer_downloader_mock, False, False, docker_client=docker_client_mock)
+            lambda_image._get_layer_digest = Mock(return_value="layer1digest")
+            lambda_image.is_base_image_current = Mock(return_value=True)
+            rapid_images.append(lambda_image.build("python3.9", ZIP, None, [Mock()], X86_64, function_name="Function"))
+
+        # the image built on the first run is reused on the next one
+        self.assertEqual(rapid_images[0], rapid_images[1])
+        docker_client_mock.images.pull.assert_called_once_with(base_image, platform="linux/amd64")
+        build_image_patch.assert_called_once()
+
+    def test_pulling_outdated_base_image(self):
+        docker_client_mock = Mock()
+        lambda_image = LambdaImage(Mock(), False, False, docker_client=docker_client_mock)
+        lambda_image.is_base_image_current = Mock(return_value=False)
+
+        lambda_image._pull_base_image_if_outdated("base:1", ARM64)
+
+        docker_client_mock.images.pull.assert_called_once_with("base:1", platform="linux/arm64")
+        self.assertTrue(lambda_image.force_image_build)
+
+    def test_not_pulling_base_image_when_skipping_pull(self):
+        docker_client_mock = Mock()
+        lambda_image = LambdaImage(Mock(), True, False, docker_client=docker_client_mock)
+
+        lambda_image._pull_base_image_if_outdated("base:1", ARM64)
+
+        docker_client_mock.images.pull.assert_not_called()
+
+    def test_base_image_name_is_used_if_not_pulled_yet(self):
+        docker_client_mock = Mock()
+        docker_client_mock.images.get.side_effect = ImageNotFound("image not found")
+        lambda_image = LambdaImage(Mock(), False, False, docker_client=docker_client_mock)
+
+        self.assertEqual(lambda_image._get_base_image_digest("base:1"), "base:1")
+
+    @patch("samcli.local.docker.lambda_image.dir_checksum")
+    @patch("samcli.local.docker.lambda_image.Path")
+    def test_downloaded_layer_digest_is_computed_once(self, path_mock, dir_checksum_mock):
+        path_mock.return_value.is_dir.return_value = True
+        dir_checksum_mock.return_value = "digest"
+        downloaded_layer = Mock(codeuri="downloaded", is_defined_within_template=False)
+        local_layer = Mock(codeuri="local", is_defined_within_template=True)
+        lambda_image = LambdaImage(Mock(), False, False, docker_client=Mock())
+
+        for _ in range(2):
+            self.assertEqual(lambda_image._get_layer_digest(downloaded_layer), "digest")
+            self.assertEqual(lambda_image._get_layer_digest(local_layer), "digest")
+
+        self.assertEqual(dir_checksum_mock.call_count, 3)
+
+    @parameterized.expand(
+        [
+            ("samcli/lambda-python:3.9-x86_64-0123456789", True),
+            ("public.ecr.aws/lambda/python:3.9-rapid-x86_64", False),
+            (None, False),
+        ]
+    )
+    def test_is_layer_image(self, image_name, expected):
+        self.assertEqual(LambdaImage.is_layer_image(image_name), expected)
 
     @patch("samcli.local.docker.lambda_image.docker")
     def test_generate_dockerfile(self, docker_patch):
@@ -694,6 +874,34 @@ class TestLambdaImage(TestCase):
         lambda_image = LambdaImage("layer_downloader", False, False, docker_client=docker_client_mock)
         self.assertEqual("sha256:remote-digest", lambda_image.get_remote_image_digest("image_name"))
 
+    def test_get_remote_image_digest_from_cache(self):
+        docker_client_mock = Mock()
+        cache_mock = Mock()
+        cache_mock.get.return_value = "sha256:cached-digest"
+        lambda_image = LambdaImage(
+            "layer_downloader", False, False, docker_client=docker_client_mock, remote_image_digest_cache=cache_mock
+        )
+
+        self.assertEqual("sha256:cached-digest", lambda_image.get_remote_image_digest("image_name"))
+
+        cache_mock.get.assert_called_once_with("image_name")
+        docker_client_mock.images.get_registry_data.assert_not_called()
+
+    def test_get_remote_image_digest_caches_fetched_digest(self):
+        docker_client_mock = Mock()
+        docker_client_mock.images.get_registry_data.return_value = Mock(
+            attrs={"Descriptor": {"digest": "sha256:remote-digest"}}
+        )
+        cache_mock = Mock()
+        cache_mock.get.return_value = None
+        lambda_image = LambdaImage(
+            "layer_downloader", False, False, docker_client=docker_client_mock, remote_image_digest_cache=cache_mock
+        )
+
+        self.assertEqual("sha256:remote-digest", lambda_image.get_remote_image_digest("image_name"))
+
+        cache_mock.put.assert_called_once_with("image_name", "sha256:remote-digest")
+
     def test_get_local_image_digest(self):
         docker_client_mock = Mock()
         local_image_data = Mock(
@@ -0,0 +1,77 @@
+from unittest import TestCase
+from unittest.mock import Mock, call
+
+from docker.errors import APIError
+
+from samcli.local.docker.layer_image_cache import LayerImageCache
+
+MB = 1024 * 1024
+
+
+class TestLayerImageCache(TestCase):
+    def setUp(self):
+        self.docker_client_mock = Mock()
+        self.docker_client_mock.df.return_value = {
+            "Images": [
+                {
+                    "Id": "old",
+                    "RepoTags": ["samcli/lambda-python:3.9-x86_64-old"],
+                    "Created": 1,
+                    "Size": 600 * MB,
+                    "SharedSize": 500 * MB,
+                    "Containers": 0,
+                },
+                {
+                    "Id": "base",
+                    "RepoTags": ["public.ecr.aws/lambda/python:3.9-rapid-x86_64"],
+                    "Created": 2,
+                    "Size": 500 * MB,
+                    "SharedSize": 500 * MB,
+                    "Containers": 0,
+                },
+                {
+                    "Id": "used",
+                    "RepoTags": ["samcli/lambda-python:3.9-x86_64-used"],
+                    "Created": 3,
+                    "Size": 700 * MB,
+                    "SharedSize": 500 * MB,
+                    "Containers": 1,
+                },
+                {
+                    "Id": "new",
+                    "RepoTags": ["samcli/lambda-python:3.9-x86_64-new"],
+                    "Created": 4,
+                    "Size": 550 * MB,
+                    "SharedSize": 500 * MB,
+                    "Containers": 0,
+                },
+            ]
+        }
+        self.cache = LayerImageCache(self.docker_client_mock)
+
+    def test_must_list_layer_images_with_their_own_size(self):
+        images = self.cache.list_images()
+
+        self.assertEqual([image["Id"] for image in images], ["new", "used", "old"])
+        self.assertEqual([image["Size"] for image in images], [50 * MB, 200 * MB, 100 * MB])
+
+    def test_must_remove_all_unused_images(self):
+        removed_tags, freed_size = self.cache.prune(0)
+
+        self.assertEqual(removed_tags, ["samcli/lambda-python:3.9-x86_64-new", "samcli/lambda-python:3.9-x86_64-old"])
+        self.assertEqual(freed_size, 150 * MB)
+        self.docker_client_mock.images.remove.assert_has_calls([call("new", force=True), call("old", force=True)])
+
+    def test_must_keep_most_recent_images_within_max_size(self):
+        removed_tags, freed_size = self.cache.prune(260)
+
+        self.assertEqual(removed_tags, ["samcli/lambda-python:3.9-x86_64-old"])
+        self.assertEqual(freed_size, 100 * MB)
+
+    def test_must_skip_images_which_cannot_be_removed(self):
+        self.docker_client_mock.images.remove.side_effect = APIError("conflict")
+
+        removed_tags, freed_size = self.cache.prune(0)
+
+        self.assertEqual(removed_tags, [])
+        self.assertEqual(freed_size, 0)
@@ -366,6 +366,17 @@ class TestContainerManager_has_image(TestCase):
         self.assertFalse(self.manager.has_image(self.image_name))
 
 
+class TestContainerManager_pause(TestCase):
+    def test_must_pause_and_unpause_container(self):
+        manager = ContainerManager()
+        container = Mock()
+
+        manager.pause(container)
+        manager.unpause(container)
+
+        self.assertEqual(container.method_calls, [call.pause(), call.unpause()])
+
+
 class TestContainerManager_stop(TestCase):
     def test_must_call_delete_on_container(self):
         manager = ContainerManager()
@@ -0,0 +1,69 @@
+import threading
+import time
+from unittest import TestCase
+from unittest.mock import Mock
+
+from samcli.local.lambda_service.event_invocation_queue import EventInvocationQueue
+
+
+class TestEventInvocationQueue(TestCase):
+    def setUp(self):
+        self.invoked = []
+        self.done = threading.Event()
+
+    def _wait_until(self, condition):
+        deadline = time.monotonic() + 5
+        while not condition() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertTrue(condition())
+
+    def test_must_run_queued_invocations(self):
+        invoke_mock = Mock(return_value=True)
+        event_queue = EventInvocationQueue(invoke_mock, workers=2)
+
+        self.assertTrue(event_queue.put("Function", '{"key": 1}'))
+        self.assertTrue(event_queue.put("Function", '{"key": 2}'))
+        self._wait_until(lambda: event_queue.stats()["succeeded"] == 2)
+
+        self.assertEqual(
+            sorted(call.args for call in invoke_mock.call_args_list),
+            [("Function", '{"key": 1}'), ("Function", '{"key": 2}')],
+        )
+        stats = event_queue.stats()
+        self.assertEqual(stats["queued"], 2)
+        self.assertEqual(stats["depth"], 0)
+        self.assertGreaterEqual(stats["max_age_ms"], stats["average_age_ms"])
+
+    def test_must_reject_invocations_when_full(self):
+        release = threading.Event()
+        event_queue = EventInvocationQueue(lambda *args: release.wait(5), workers=1, max_size=1)
+        self.addCleanup(release.set)
+
+        self.assertTrue(event_queue.put("Function", "{}"))
+        # the worker runs the first invocation, the second one waits in the queue
+        self._wait_until(lambda: event_queue.depth == 0)
+        self.assertTrue(event_queue.put("Function", "{}"))
+        self.assertFalse(event_queue.put("Function", "{}"))
+
+        self.assertEqual(event_queue.stats()["rejected"], 1)
+
+    def test_must_retry_failed_invocations_twice(self):
+        invoke_mock = Mock(side_effect=[False, Exception("error"), True])
+        event_queue = EventInvocationQueue(invoke_mock, workers=1, retry_delay=0.01)
+
+        event_queue.put("Function", "{}")
+        self._wait_until(lambda: event_queue.stats()["succeeded"] == 1)
+
+        self.assertEqual(invoke_mock.call_count, 3)
+        self.assertEqual(event_queue.stats()["retried"], 2)
+
+    def test_must_drop_invocations_failing_after_retries(self):
+        invoke_mock = Mock(return_value=False)
+        event_queue = EventInvocationQueue(invoke_mock, workers=1, retry_delay=0.01)
+
+        event_queue.put("Function", "{}")
+        self._wait_until(lambda: event_queue.stats()["failed"] == 1)
+
+        self.assertEqual(invoke_mock.call_count, 3)
+        self.assertEqual(event_queue.stats()["retried"], 2)
+        self.assertEqual(event_queue.depth, 0)
@@ -45,6 +45,19 @@ class TestLambdaErrorResponses(TestCase):
             415,
         )
 
+    @patch("samcli.local.services.base_local_service.BaseLocalService.service_response")
+    def test_too_many_requests(self, service_response_mock):
+        service_response_mock.return_value = "TooManyRequests"
+
+        response = LambdaErrorResponses.too_many_requests("Rate Exceeded.")
+
+        self.assertEqual(response, "TooManyRequests")
+        service_response_mock.assert_called_once_with(
+            '{"Type": "User", "Message": "Rate Exceeded."}',
+            {"x-amzn-errortype": "TooManyRequestsException", "Content-Type": "application/json"},
+            429,
+        )
+
     @patch("samcli.local.services.base_local_service.BaseLocalService.service_response")
     def test_generic_service_exception(self, service_response_mock):
         service_response_mock.return_value = "GenericServiceException"
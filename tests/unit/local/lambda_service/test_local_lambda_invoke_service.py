@@ -1,9 +1,11 @@
 from unittest import TestCase
 from unittest.mock import Mock, patch, ANY, call
 
+from parameterized import parameterized
+
 from samcli.local.lambda_service import local_lambda_invoke_service
 from samcli.local.lambda_service.local_lambda_invoke_service import LocalLambdaInvokeService, FunctionNamePathConverter
-from samcli.local.lambdafn.exceptions import FunctionNotFound
+from samcli.local.lambdafn.exceptions import FunctionNotFound, FunctionThrottled
 from samcli.commands.local.lib.exceptions import UnsupportedInlineCodeError
 
 
@@ -39,12 +41,23 @@ class TestLocalLambdaService(TestCase):
 
         service.create()
 
-        app_mock.add_url_rule.assert_called_once_with(
-            "/2015-03-31/functions/<function_path:function_name>/invocations",
-            endpoint="/2015-03-31/functions/<function_path:function_name>/invocations",
-            view_func=service._invoke_request_handler,
-            methods=["POST"],
-            provide_automatic_options=False,
+        app_mock.add_url_rule.assert_has_calls(
+            [
+                call(
+                    "/2015-03-31/functions/<function_path:function_name>/invocations",
+                    endpoint="/2015-03-31/functions/<function_path:function_name>/invocations",
+                    view_func=service._invoke_request_handler,
+                    methods=["POST"],
+                    provide_automatic_options=False,
+                ),
+                call(
+                    "/_sam/stats",
+                    endpoint="/_sam/stats",
+                    view_func=service._stats_request_handler,
+                    methods=["GET"],
+                    provide_automatic_options=False,
+                ),
+            ]
         )
         self.assertEqual({"function_path": FunctionNamePathConverter}, app_mock.url_map.converters)
 
@@ -90,6 +103,41 @@ class TestLocalLambdaService(TestCase):
 
         lambda_error_responses_mock.resource_not_found.assert_called_once_with("NotFound")
 
+    @patch("samcli.local.lambda_service.local_lambda_invoke_service.LambdaErrorResponses")
+    def test_invoke_request_handler_on_throttled_function(self, lambda_error_responses_mock):
+        request_mock = Mock()
+        request_mock.get_data.return_value = b"{}"
+        local_lambda_invoke_service.request = request_mock
+
+        lambda_runner_mock = Mock()
+        lambda_runner_mock.invoke.side_effect = FunctionThrottled("Rate Exceeded.", "ConcurrentInvocationLimitExceeded")
+        lambda_error_responses_mock.too_many_requests.return_value = "TooManyRequests"
+
+        service = LocalLambdaInvokeService(lambda_runner=lambda_runner_mock, port=3000, host="localhost")
+
+        response = service._invoke_request_handler(function_name="ThrottledFunction")
+
+        self.assertEqual(response, "TooManyRequests")
+        lambda_error_responses_mock.too_many_requests.assert_called_once_with("Rate Exceeded.")
+
+    @patch("samcli.local.lambda_service.local_lambda_invoke_service.LocalLambdaInvokeService.service_response")
+    def test_stats_request_handler(self, service_response_mock):
+        service_response_mock.return_value = "stats"
+        lambda_runner_mock = Mock()
+        lambda_runner_mock.concurrency_limiter.stats.return_value = {"account": {"throttles": 1}}
+        service = LocalLambdaInvokeService(lambda_runner=lambda_runner_mock, port=3000, host="localhost")
+        service._event_queue = Mock()
+        service._event_queue.stats.return_value = {"depth": 2}
+
+        response = service._stats_request_handler()
+
+        self.assertEqual(response, "stats")
+        service_response_mock.assert_called_once_with(
+            '{"concurrency": {"account": {"throttles": 1}}, "event_invocations": {"depth": 2}}',
+            {"Content-Type": "application/json"},
+            200,
+        )
+
     @patch("samcli.local.lambda_service.local_lambda_invoke_service.LambdaErrorResponses")
     def test_invoke_request_function_contains_inline_code(self, lambda_error_responses_mock):
         request_mock = Mock()
@@ -195,6 +243,62 @@ class TestLocalLambdaService(TestCase):
         service_response_mock.assert_called_once_with("hello world", {"Content-Type": "application/json"}, 200)
 
 
+class TestLocalLambdaServiceEventInvocation(TestCase):
+    def setUp(self):
+        self.lambda_runner_mock = Mock()
+        self.service = LocalLambdaInvokeService(lambda_runner=self.lambda_runner_mock, port=3000, host="localhost")
+        self.service._event_queue = Mock()
+
+        request_mock = Mock()
+        request_mock.get_data.return_value = b'{"key": "value"}'
+        request_mock.headers = {"X-Amz-Invocation-Type": "Event"}
+        local_lambda_invoke_service.request = request_mock
+
+    @patch("samcli.local.lambda_service.local_lambda_invoke_service.LocalLambdaInvokeService.service_response")
+    def test_must_queue_event_invocation(self, service_response_mock):
+        service_response_mock.return_value = "accepted"
+        self.service._event_queue.put.return_value = True
+
+        response = self.service._invoke_request_handler(function_name="HelloWorld")
+
+        self.assertEqual(response, "accepted")
+        self.service._event_queue.put.assert_called_once_with("HelloWorld", '{"key": "value"}')
+        self.lambda_runner_mock.invoke.assert_not_called()
+        service_response_mock.assert_called_once_with("", {"Content-Type": "application/json"}, 202)
+
+    @patch("samcli.local.lambda_service.local_lambda_invoke_service.LambdaErrorResponses")
+    def test_must_not_queue_invocation_of_unknown_function(self, lambda_error_responses_mock):
+        lambda_error_responses_mock.resource_not_found.return_value = "Couldn't find Lambda"
+        self.lambda_runner_mock.provider.get.return_value = None
+
+        response = self.service._invoke_request_handler(function_name="NotFound")
+
+        self.assertEqual(response, "Couldn't find Lambda")
+        self.service._event_queue.put.assert_not_called()
+
+    @patch("samcli.local.lambda_service.local_lambda_invoke_service.LambdaErrorResponses")
+    def test_must_throttle_when_queue_is_full(self, lambda_error_responses_mock):
+        lambda_error_responses_mock.too_many_requests.return_value = "TooManyRequests"
+        self.service._event_queue.put.return_value = False
+
+        response = self.service._invoke_request_handler(function_name="HelloWorld")
+
+        self.assertEqual(response, "TooManyRequests")
+
+    @patch("samcli.local.lambda_service.local_lambda_invoke_service.LambdaOutputParser")
+    def test_event_invocation_fails_on_function_error(self, lambda_output_parser_mock):
+        lambda_output_parser_mock.get_lambda_output.return_value = "error", True
+
+        self.assertFalse(self.service._invoke_event("HelloWorld", "{}"))
+        self.lambda_runner_mock.invoke.assert_called_once_with("HelloWorld", "{}", stdout=ANY, stderr=None)
+
+    @patch("samcli.local.lambda_service.local_lambda_invoke_service.LambdaOutputParser")
+    def test_event_invocation_succeeds(self, lambda_output_parser_mock):
+        lambda_output_parser_mock.get_lambda_output.return_value = "hello world", False
+
+        self.assertTrue(self.service._invoke_event("HelloWorld", "{}"))
+
+
 class TestValidateRequestHandling(TestCase):
     @patch("samcli.local.lambda_service.local_lambda_invoke_service.LambdaErrorResponses")
     def test_request_with_non_json_data(self, lambda_error_responses_mock):
@@ -269,9 +373,19 @@ class TestValidateRequestHandling(TestCase):
         self.assertEqual(response, "NotImplementedLocally")
 
         lambda_error_responses_mock.not_implemented_locally.assert_called_once_with(
-            "invocation-type: DryRun is not supported. RequestResponse is only supported."
+            "invocation-type: DryRun is not supported. RequestResponse and Event are only supported."
         )
 
+    @parameterized.expand(["RequestResponse", "Event"])
+    def test_request_with_supported_invocation_type(self, invocation_type):
+        flask_request = Mock()
+        flask_request.get_data.return_value = None
+        flask_request.headers = {"X-Amz-Invocation-Type": invocation_type}
+        flask_request.args = {}
+        local_lambda_invoke_service.request = flask_request
+
+        self.assertIsNone(LocalLambdaInvokeService.validate_request())
+
     @patch("samcli.local.lambda_service.local_lambda_invoke_service.request")
     def test_request_with_no_data(self, flask_request):
         flask_request.get_data.return_value = None
@@ -0,0 +1,131 @@
+import threading
+from unittest import TestCase
+
+from samcli.local.lambdafn.concurrency import (
+    ACCOUNT_CONCURRENCY_EXCEEDED,
+    RESERVED_CONCURRENCY_EXCEEDED,
+    ConcurrencyLimiter,
+)
+from samcli.local.lambdafn.exceptions import FunctionThrottled
+
+
+class TestConcurrencyLimiter(TestCase):
+    def test_must_not_limit_functions_by_default(self):
+        limiter = ConcurrencyLimiter(account_limit=0)
+
+        with limiter.execution("Function"), limiter.execution("Function"), limiter.execution("Function"):
+            stats = limiter.stats()
+
+        self.assertEqual(stats["functions"]["Function"]["in_flight"], 3)
+        self.assertEqual(stats["account"]["in_flight"], 3)
+        self.assertEqual(limiter.stats()["functions"]["Function"]["in_flight"], 0)
+        self.assertEqual(limiter.stats()["functions"]["Function"]["max_in_flight"], 3)
+
+    def test_must_throttle_over_reserved_concurrency(self):
+        limiter = ConcurrencyLimiter(account_limit=0)
+
+        with limiter.execution("Function", 1):
+            with self.assertRaises(FunctionThrottled) as context:
+                with limiter.execution("Function", 1):
+                    pass
+            # the other functions are not limited by the reserved concurrency of the function
+            with limiter.execution("OtherFunction"):
+                pass
+
+        self.assertEqual(context.exception.reason, RESERVED_CONCURRENCY_EXCEEDED)
+        self.assertEqual(str(context.exception), "Rate Exceeded.")
+        with limiter.execution("Function", 1):
+            pass
+
+        stats = limiter.stats()
+        self.assertEqual(stats["functions"]["Function"]["throttles"], 1)
+        self.assertEqual(stats["functions"]["Function"]["invocations"], 3)
+        self.assertEqual(stats["account"]["throttles"], 1)
+
+    def test_must_throttle_unreserved_functions_over_account_limit(self):
+        limiter = ConcurrencyLimiter(account_limit=3)
+
+        with limiter.execution("ReservedFunction", 2):
+            # one execution is left to the functions without reserved concurrency
+            with limiter.execution("Function"):
+                with self.assertRaises(FunctionThrottled) as context:
+                    with limiter.execution("OtherFunction"):
+                        pass
+                # the reserved concurrency is not shared
+                with limiter.execution("ReservedFunction", 2):
+                    pass
+
+        self.assertEqual(context.exception.reason, ACCOUNT_CONCURRENCY_EXCEEDED)
+        self.assertEqual(limiter.stats()["account"]["unreserved_limit"], 1)
+        self.assertEqual(limiter.stats()["functions"]["OtherFunction"]["throttles"], 1)
+
+    def test_must_update_unreserved_limit_when_reserved_concurrency_changes(self):
+        limiter = ConcurrencyLimiter(account_limit=10)
+
+        with limiter.execution("Function", 3), limiter.execution("OtherFunction", 2):
+            pass
+        self.assertEqual(limiter.stats()["account"]["unreserved_limit"], 5)
+
+        # the template was reloaded with another reserved concurrency
+        with limiter.execution("Function", 4):
+            pass
+        self.assertEqual(limiter.stats()["account"]["unreserved_limit"], 4)
+
+        # the reserved concurrency was removed
+        with limiter.execution("OtherFunction"):
+            pass
+        self.assertEqual(limiter.stats()["account"]["unreserved_limit"], 6)
+
+    def test_must_take_concurrency_of_functions_not_invoked_yet_off_unreserved_limit(self):
+        limiter = ConcurrencyLimiter(account_limit=3)
+        limiter.set_reserved_concurrencies({"ReservedFunction": 2, "Function": None, "OtherFunction": None})
+
+        with limiter.execution("Function"):
+            with self.assertRaises(FunctionThrottled) as context:
+                with limiter.execution("OtherFunction"):
+                    pass
+
+        self.assertEqual(context.exception.reason, ACCOUNT_CONCURRENCY_EXCEEDED)
+        self.assertEqual(limiter.stats()["functions"]["ReservedFunction"]["invocations"], 0)
+
+        # the template was reloaded without the reserved function
+        limiter.set_reserved_concurrencies({"Function": None, "OtherFunction": None})
+        self.assertEqual(limiter.stats()["account"]["unreserved_limit"], 3)
+        self.assertIsNone(limiter.stats()["functions"]["ReservedFunction"]["reserved"])
+
+    def test_must_throttle_without_queueing_when_no_concurrency_is_reserved(self):
+        limiter = ConcurrencyLimiter(account_limit=0, queue_timeout=60)
+
+        with self.assertRaises(FunctionThrottled) as context:
+            with limiter.execution("Function", 0):
+                pass
+
+        self.assertEqual(context.exception.reason, RESERVED_CONCURRENCY_EXCEEDED)
+        self.assertEqual(limiter.stats()["functions"]["Function"]["throttles"], 1)
+
+    def test_must_queue_invocations_until_timeout(self):
+        limiter = ConcurrencyLimiter(account_limit=0, queue_timeout=5)
+        execution = limiter.execution("Function", 1)
+        execution.__enter__()
+        queued = threading.Event()
+
+        def invoke():
+            with limiter.execution("Function", 1):
+                queued.set()
+
+        thread = threading.Thread(target=invoke)
+        thread.start()
+        self.assertFalse(queued.wait(0.1))
+        execution.__exit__(None, None, None)
+        thread.join(5)
+
+        self.assertTrue(queued.is_set())
+        self.assertEqual(limiter.stats()["functions"]["Function"]["throttles"], 0)
+
+    def test_must_throttle_queued_invocations_after_timeout(self):
+        limiter = ConcurrencyLimiter(account_limit=0, queue_timeout=0.05)
+
+        with limiter.execution("Function", 1):
+            with self.assertRaises(FunctionThrottled):
+                with limiter.execution("Function", 1):
+                    pass
@@ -0,0 +1,190 @@
+"""
+Unit tests for the warm containers pool
+"""
+import threading
+from unittest import TestCase
+from unittest.mock import ANY, Mock, patch
+
+from samcli.local.lambdafn.container_pool import ContainerPool, ContainerPoolDrainedError
+
+
+class TestContainerPool_checkout(TestCase):
+    def setUp(self):
+        self.container_factory = Mock()
+        self.container_factory.side_effect = lambda: Mock()
+
+    def test_must_create_container_if_pool_is_empty(self):
+        container_pool = ContainerPool("stack/function", 2)
+
+        container = container_pool.checkout(self.container_factory)
+
+        self.container_factory.assert_called_once_with()
+        self.assertEqual(container_pool.containers, [container])
+        self.assertEqual(container_pool.size, 1)
+
+    def test_must_reuse_idle_container(self):
+        container_pool = ContainerPool("stack/function", 2)
+        container = container_pool.checkout(self.container_factory)
+        container_pool.checkin(container)
+
+        result = container_pool.checkout(self.container_factory)
+
+        self.assertEqual(result, container)
+        self.container_factory.assert_called_once_with()
+
+    def test_must_create_new_container_while_others_are_busy(self):
+        container_pool = ContainerPool("stack/function", 2)
+
+        container1 = container_pool.checkout(self.container_factory)
+        container2 = container_pool.checkout(self.container_factory)
+
+        self.assertNotEqual(container1, container2)
+        self.assertEqual(container_pool.size, 2)
+
+    def test_must_replace_idle_container_that_does_not_exist_anymore(self):
+        container_pool = ContainerPool("stack/function", 1)
+        container = container_pool.checkout(self.container_factory)
+        container_pool.checkin(container)
+        container.is_created.return_value = False
+
+        result = container_pool.checkout(self.container_factory)
+
+        self.assertNotEqual(result, container)
+        self.assertEqual(container_pool.containers, [result])
+
+    def test_must_free_slot_if_container_creation_failed(self):
+        container_pool = ContainerPool("stack/function", 1)
+        self.container_factory.side_effect = ValueError("failed")
+
+        with self.assertRaises(ValueError):
+            container_pool.checkout(self.container_factory)
+
+        self.assertEqual(container_pool.size, 0)
+
+    def test_must_wait_for_container_to_be_released_if_pool_is_full(self):
+        container_pool = ContainerPool("stack/function", 1)
+        container = container_pool.checkout(self.container_factory)
+        result = {}
+
+        waiting_thread = threading.Thread(
+            target=lambda: result.update(container=container_pool.checkout(self.container_factory))
+        )
+        waiting_thread.start()
+        waiting_thread.join(0.1)
+        self.assertTrue(waiting_thread.is_alive())
+
+        container_pool.checkin(container)
+        waiting_thread.join(5)
+
+        self.assertFalse(waiting_thread.is_alive())
+        self.assertEqual(result["container"], container)
+        self.container_factory.assert_called_once_with()
+
+
+class TestContainerPool_drain_while_checking_out(TestCase):
+    def _checkout_in_thread(self, container_pool, container_factory):
+        result = {}
+
+        def checkout():
+            try:
+                result["container"] = container_pool.checkout(container_factory)
+            except ContainerPoolDrainedError as ex:
+                result["error"] = ex
+
+        checkout_thread = threading.Thread(target=checkout)
+        checkout_thread.start()
+        return checkout_thread, result
+
+    def test_must_fail_blocked_checkout_when_drained(self):
+        container_pool = ContainerPool("stack/function", 1)
+        container = container_pool.checkout(Mock)
+        checkout_thread, result = self._checkout_in_thread(container_pool, Mock)
+        checkout_thread.join(0.1)
+        self.assertTrue(checkout_thread.is_alive())
+
+        self.assertEqual(container_pool.drain(), [container])
+        checkout_thread.join(5)
+
+        self.assertFalse(checkout_thread.is_alive())
+        self.assertIsNone(result["error"].container)
+        self.assertTrue(container_pool.drained)
+        self.assertFalse(container_pool.checkin(container))
+
+    def test_must_hand_over_container_created_while_drained(self):
+        container_pool = ContainerPool("stack/function", 1)
+        factory_started = threading.Event()
+        drained = threading.Event()
+        container = Mock()
+
+        def container_factory():
+            factory_started.set()
+            drained.wait(5)
+            return container
+
+        checkout_thread, result = self._checkout_in_thread(container_pool, container_factory)
+        factory_started.wait(5)
+        self.assertEqual(container_pool.drain(), [])
+        drained.set()
+        checkout_thread.join(5)
+
+        # the created container is not kept by the drained pool, so the caller has to stop it
+        self.assertEqual(result["error"].container, container)
+        self.assertEqual(container_pool.containers, [])
+        self.assertEqual(container_pool.size, 0)
+
+
+class TestContainerPool_checkin_and_drain(TestCase):
+    def setUp(self):
+        self.container_pool = ContainerPool("stack/function", 2)
+        self.container1 = self.container_pool.checkout(Mock)
+        self.container2 = self.container_pool.checkout(Mock)
+
+    def test_must_ignore_unknown_containers(self):
+        self.assertFalse(self.container_pool.checkin(Mock()))
+        self.assertTrue(self.container_pool.checkin(self.container1))
+
+    def test_must_drain_idle_and_busy_containers(self):
+        self.container_pool.checkin(self.container1)
+
+        containers = self.container_pool.drain()
+
+        self.assertCountEqual(containers, [self.container1, self.container2])
+        self.assertEqual(self.container_pool.size, 0)
+        # container checked in after draining the pool is not reused
+        self.assertFalse(self.container_pool.checkin(self.container2))
+        self.assertEqual(self.container_pool.containers, [])
+
+    def test_max_size_is_at_least_one(self):
+        self.assertEqual(ContainerPool("stack/function", 0).max_size, 1)
+
+
+class TestContainerPool_evict(TestCase):
+    def setUp(self):
+        self.container_pool = ContainerPool("stack/function", 2, 128)
+        self.container1 = self.container_pool.checkout(Mock)
+        self.container2 = self.container_pool.checkout(Mock)
+
+    @patch("samcli.local.lambdafn.container_pool.time")
+    def test_must_list_idle_containers_with_last_used_time(self, time_mock):
+        time_mock.monotonic.return_value = 10
+        self.container_pool.checkin(self.container1)
+
+        self.assertEqual(self.container_pool.idle_containers, [(self.container1, 10)])
+
+    def test_must_evict_only_idle_containers(self):
+        self.container_pool.checkin(self.container1)
+
+        self.assertTrue(self.container_pool.evict(self.container1))
+        self.assertFalse(self.container_pool.evict(self.container2))
+        self.assertEqual(self.container_pool.containers, [self.container2])
+        self.assertEqual(self.container_pool.idle_containers, [])
+
+    def test_must_run_action_only_on_idle_containers(self):
+        action = Mock()
+        self.container_pool.checkin(self.container1)
+
+        self.assertTrue(self.container_pool.run_if_idle(self.container1, action))
+        self.assertFalse(self.container_pool.run_if_idle(self.container2, action))
+
+        action.assert_called_once_with(self.container1)
+        self.assertEqual(self.container_pool.idle_containers, [(self.container1, ANY)])
@@ -0,0 +1,109 @@
+import threading
+import time
+from contextlib import nullcontext
+from unittest import TestCase
+from unittest.mock import Mock
+
+from samcli.local.lambdafn.containers_initializer import ContainersInitializer
+
+
+class TestContainersInitializer(TestCase):
+    def setUp(self):
+        self.runtime = Mock()
+        self.runtime.get_image_key.side_effect = lambda function_config: function_config.runtime
+        self.runtime.prepare_image.side_effect = lambda function_config: f"image-{function_config.runtime}"
+        self.runtime.reusing_built_images.return_value = nullcontext()
+        self.started = []
+        self.start_container = Mock(side_effect=lambda function_config: self.started.append(function_config.full_path))
+        self.function_configs = [
+            Mock(full_path="Function1", runtime="python3.9"),
+            Mock(full_path="Function2", runtime="python3.9"),
+            Mock(full_path="Function3", runtime="nodejs18.x"),
+        ]
+
+    def test_must_prepare_distinct_images_then_start_containers(self):
+        initializer = ContainersInitializer(self.runtime, self.start_container)
+
+        ready_times = initializer.initialize(self.function_configs)
+
+        self.assertEqual(
+            [call_args[0][0] for call_args in self.runtime.prepare_image.call_args_list],
+            [self.function_configs[0], self.function_configs[2]],
+        )
+        self.assertEqual(sorted(self.started), ["Function1", "Function2", "Function3"])
+        self.assertEqual(sorted(ready_times), ["Function1", "Function2", "Function3"])
+        self.runtime.reusing_built_images.assert_called_once_with()
+
+    def test_must_only_prepare_the_images(self):
+        initializer = ContainersInitializer(self.runtime, self.start_container)
+
+        self.assertTrue(initializer.prepare_images(self.function_configs))
+
+        self.assertEqual(self.runtime.prepare_image.call_count, 2)
+        self.start_container.assert_not_called()
+        self.runtime.reusing_built_images.assert_called_once_with()
+
+    def test_must_report_the_images_not_prepared_within_the_time_budget(self):
+        release = threading.Event()
+        self.runtime.prepare_image.side_effect = lambda function_config: release.wait(5)
+        initializer = ContainersInitializer(self.runtime, self.start_container, time_budget=0.05)
+
+        prepared = initializer.prepare_images(self.function_configs)
+        release.set()
+
+        self.assertFalse(prepared)
+
+    def test_must_bound_the_concurrency_of_the_containers(self):
+        in_flight = []
+        max_in_flight = []
+        lock = threading.Lock()
+
+        def start_container(function_config):
+            with lock:
+                in_flight.append(function_config)
+                max_in_flight.append(len(in_flight))
+            time.sleep(0.01)
+            with lock:
+                in_flight.remove(function_config)
+
+        function_configs = [Mock(full_path=f"Function{index}", runtime="python3.9") for index in range(10)]
+        initializer = ContainersInitializer(self.runtime, start_container, container_concurrency=2)
+
+        ready_times = initializer.initialize(function_configs)
+
+        self.assertEqual(len(ready_times), 10)
+        self.assertLessEqual(max(max_in_flight), 2)
+
+    def test_must_stop_waiting_once_the_time_budget_is_spent(self):
+        release = threading.Event()
+        self.start_container.side_effect = lambda function_config: release.wait(5)
+        initializer = ContainersInitializer(
+            self.runtime, self.start_container, container_concurrency=1, time_budget=0.05
+        )
+
+        ready_times = initializer.initialize(self.function_configs)
+
+        self.assertEqual(ready_times, {})
+        release.set()
+        # the containers not started yet were cancelled
+        self.assertEqual(self.start_container.call_count, 1)
+
+    def test_must_not_start_containers_when_images_are_not_prepared_within_the_time_budget(self):
+        release = threading.Event()
+        self.runtime.prepare_image.side_effect = lambda function_config: release.wait(5)
+        initializer = ContainersInitializer(self.runtime, self.start_container, time_budget=0.05)
+
+        ready_times = initializer.initialize(self.function_configs)
+        release.set()
+
+        self.assertEqual(ready_times, {})
+        self.start_container.assert_not_called()
+
+    def test_must_raise_the_first_exception(self):
+        self.runtime.prepare_image.side_effect = ValueError("build failed")
+        initializer = ContainersInitializer(self.runtime, self.start_container)
+
+        with self.assertRaises(ValueError):
+            initializer.initialize(self.function_configs)
+
+        self.start_container.assert_not_called()
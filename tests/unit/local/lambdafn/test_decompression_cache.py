@@ -0,0 +1,167 @@
+import os
+import shutil
+import zipfile
+from pathlib import Path
+from tempfile import mkdtemp
+from unittest import TestCase
+from unittest.mock import patch
+
+from samcli.local.lambdafn.decompression_cache import DecompressionCache
+from samcli.local.lambdafn.zip import unzip
+
+
+class TestDecompressionCache(TestCase):
+    def setUp(self):
+        self.tmp_dir = mkdtemp()
+        self.cache_dir = os.path.join(self.tmp_dir, "cache")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def _make_cache(self, *args, **kwargs):
+        cache = DecompressionCache(*args, **kwargs)
+        self.addCleanup(cache.release)
+        return cache
+
+    def _make_archive(self, name, content):
+        archive_path = os.path.join(self.tmp_dir, name)
+        with zipfile.ZipFile(archive_path, "w") as archive:
+            archive.writestr("app.py", content)
+        return archive_path
+
+    def test_must_decompress_archive_once(self):
+        archive_path = self._make_archive("code.zip", "print('hello')")
+        cache = self._make_cache(self.cache_dir)
+
+        with patch("samcli.local.lambdafn.decompression_cache.unzip", wraps=unzip) as unzip_mock:
+            code_dir = cache.get_code_dir(archive_path)
+            self.assertEqual(cache.get_code_dir(archive_path), code_dir)
+
+        unzip_mock.assert_called_once()
+        self.assertEqual(Path(code_dir, "app.py").read_text(), "print('hello')")
+        self.assertEqual(code_dir, os.path.realpath(code_dir))
+        self.assertEqual(Path(f"{code_dir}.size").read_text(), str(len("print('hello')")))
+
+    def test_must_share_decompressed_dir_between_archives_with_same_content(self):
+        cache = self._make_cache(self.cache_dir)
+
+        first_dir = cache.get_code_dir(self._make_archive("first.zip", "content"))
+        second_dir = cache.get_code_dir(self._make_archive("second.zip", "other content"))
+        copy_path = os.path.join(self.tmp_dir, "copy.zip")
+        shutil.copy(os.path.join(self.tmp_dir, "first.zip"), copy_path)
+
+        self.assertNotEqual(first_dir, second_dir)
+        self.assertEqual(cache.get_code_dir(copy_path), first_dir)
+
+    def test_must_reuse_decompressed_dir_of_other_processes(self):
+        archive_path = self._make_archive("code.zip", "content")
+        code_dir = self._make_cache(self.cache_dir).get_code_dir(archive_path)
+
+        with patch("samcli.local.lambdafn.decompression_cache.unzip") as unzip_mock:
+            self.assertEqual(self._make_cache(self.cache_dir).get_code_dir(archive_path), code_dir)
+
+        unzip_mock.assert_not_called()
+
+    @patch("samcli.local.lambdafn.decompression_cache.file_checksum")
+    def test_must_hash_unchanged_archive_once(self, file_checksum_mock):
+        file_checksum_mock.return_value = "digest"
+        archive_path = self._make_archive("code.zip", "content")
+        cache = self._make_cache(self.cache_dir)
+
+        cache.get_code_dir(archive_path)
+        cache.get_code_dir(archive_path)
+        file_checksum_mock.assert_called_once()
+
+        os.utime(archive_path, ns=(0, 0))
+        cache.get_code_dir(archive_path)
+        self.assertEqual(file_checksum_mock.call_count, 2)
+
+    @patch("samcli.local.lambdafn.decompression_cache.unzip")
+    def test_must_not_keep_partially_decompressed_archive(self, unzip_mock):
+        unzip_mock.side_effect = OSError("disk full")
+        archive_path = self._make_archive("code.zip", "content")
+        cache = self._make_cache(self.cache_dir)
+
+        with self.assertRaises(OSError):
+            cache.get_code_dir(archive_path)
+
+        # only the lock and lease files are left
+        self.assertEqual([path for path in Path(self.cache_dir).iterdir() if path.is_dir()], [])
+        self.assertEqual(list(Path(self.cache_dir).glob("*.size")), [])
+
+    def test_must_reuse_dir_decompressed_meanwhile_by_another_process(self):
+        archive_path = self._make_archive("code.zip", "content")
+        cache = self._make_cache(self.cache_dir)
+
+        def unzip_while_another_process_does(source, destination):
+            unzip(source, destination)
+            # an older process, which does not lock the cache, moves its decompressed tree in place first
+            shutil.copytree(destination, Path(self.cache_dir, cache._get_digest(source)))
+
+        with patch("samcli.local.lambdafn.decompression_cache.unzip", side_effect=unzip_while_another_process_does):
+            code_dir = cache.get_code_dir(archive_path)
+
+        self.assertEqual(Path(code_dir, "app.py").read_text(), "content")
+        self.assertEqual(list(Path(self.cache_dir).glob("*.tmp")), [])
+
+    def test_must_evict_least_recently_used_dirs_not_in_use(self):
+        first_archive = self._make_archive("first.zip", "a" * 600 * 1024)
+        second_archive = self._make_archive("second.zip", "b" * 600 * 1024)
+        # the other process exited, so its lease is released
+        other_process_cache = self._make_cache(self.cache_dir)
+        other_process_dir = other_process_cache.get_code_dir(first_archive)
+        other_process_cache.release()
+        os.utime(other_process_dir, (0, 0))
+
+        cache = self._make_cache(self.cache_dir, max_size_mb=1)
+        code_dir = cache.get_code_dir(second_archive)
+
+        self.assertFalse(os.path.exists(other_process_dir))
+        self.assertFalse(os.path.exists(f"{other_process_dir}.size"))
+        self.assertTrue(os.path.isdir(code_dir))
+
+        # the dirs used by this process are kept even if the cache is over its maximum size
+        first_dir = cache.get_code_dir(first_archive)
+        self.assertTrue(os.path.isdir(first_dir))
+        self.assertTrue(os.path.isdir(code_dir))
+
+    def test_must_not_evict_dirs_used_by_other_running_processes(self):
+        first_archive = self._make_archive("first.zip", "a" * 600 * 1024)
+        second_archive = self._make_archive("second.zip", "b" * 600 * 1024)
+        # the other process keeps its lease of the dir as long as it is running
+        other_process_cache = self._make_cache(self.cache_dir)
+        other_process_dir = other_process_cache.get_code_dir(first_archive)
+        os.utime(other_process_dir, (0, 0))
+
+        cache = self._make_cache(self.cache_dir, max_size_mb=1)
+        code_dir = cache.get_code_dir(second_archive)
+
+        self.assertTrue(os.path.isdir(other_process_dir))
+        self.assertTrue(os.path.isdir(code_dir))
+
+        # once the other process exited, its lease is released and the dir can be evicted
+        other_process_cache.release()
+        cache.get_code_dir(self._make_archive("third.zip", "c" * 600 * 1024))
+
+        self.assertFalse(os.path.exists(other_process_dir))
+        self.assertEqual(list(Path(self.cache_dir).glob(f"{Path(other_process_dir).name}.lease-*")), [])
+
+    def test_must_release_lease_once_no_container_uses_dir(self):
+        archive_path = self._make_archive("code.zip", "content")
+        cache = self._make_cache(self.cache_dir)
+        code_dir = cache.get_code_dir(archive_path)
+        self.assertEqual(cache.get_code_dir(archive_path), code_dir)
+        lease_pattern = f"{Path(code_dir).name}.lease-*"
+
+        # the directories which are not in the cache are ignored
+        cache.release([code_dir, self.tmp_dir])
+        self.assertEqual(len(list(Path(self.cache_dir).glob(lease_pattern))), 1)
+
+        cache.release([code_dir])
+        self.assertEqual(list(Path(self.cache_dir).glob(lease_pattern)), [])
+
+        # the released dir can be evicted by another process
+        other_process_cache = self._make_cache(self.cache_dir, max_size_mb=1)
+        os.utime(code_dir, (0, 0))
+        other_process_cache.get_code_dir(self._make_archive("other.zip", "a" * 1100 * 1024))
+        self.assertFalse(os.path.exists(code_dir))
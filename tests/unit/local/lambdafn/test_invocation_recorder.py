@@ -0,0 +1,182 @@
+import json
+import os
+import shutil
+import threading
+from pathlib import Path
+from tempfile import mkdtemp
+from unittest import TestCase
+from unittest.mock import patch
+
+from samcli.local.lambdafn.config import FunctionConfig
+from samcli.local.lambdafn.invocation_recorder import (
+    RECORD_MODE,
+    REPLAY_MODE,
+    InvocationRecorder,
+    get_invocation_recorder,
+)
+
+
+class TestInvocationRecorder(TestCase):
+    def setUp(self):
+        self.tmp_dir = mkdtemp()
+        self.recordings_dir = os.path.join(self.tmp_dir, "recordings")
+        self.code_dir = os.path.join(self.tmp_dir, "code")
+        os.makedirs(self.code_dir)
+        Path(self.code_dir, "app.py").write_text("def handler(event, context): pass")
+        self.config = FunctionConfig(
+            name="Function",
+            full_path="Function",
+            runtime="python3.9",
+            handler="app.handler",
+            imageuri=None,
+            imageconfig=None,
+            packagetype="Zip",
+            code_abs_path=self.code_dir,
+            layers=[],
+            architecture="x86_64",
+        )
+        self.event = json.dumps(
+            {
+                "httpMethod": "GET",
+                "path": "/users",
+                "requestContext": {"requestId": "1", "requestTimeEpoch": 1, "stage": "Prod"},
+            }
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_must_replay_recorded_response(self):
+        recorder = InvocationRecorder(self.recordings_dir, REPLAY_MODE)
+        recorder.record(self.config, self.event, b'{"statusCode": 200}')
+
+        self.assertEqual(recorder.get(self.config, self.event), b'{"statusCode": 200}')
+        self.assertTrue(recorder.is_replaying)
+
+    def test_must_replay_responses_recorded_by_previous_recorder(self):
+        InvocationRecorder(self.recordings_dir, RECORD_MODE).record(self.config, self.event, b"first")
+        InvocationRecorder(self.recordings_dir, RECORD_MODE).record(self.config, "other event", b"other")
+        InvocationRecorder(self.recordings_dir, RECORD_MODE).record(self.config, self.event, b"second")
+
+        recorder = InvocationRecorder(self.recordings_dir, REPLAY_MODE)
+
+        self.assertEqual(recorder.get(self.config, self.event), b"second")
+        self.assertEqual(recorder.get(self.config, "other event"), b"other")
+        self.assertEqual(Path(self.recordings_dir, "invocations.data").read_bytes(), b"firstothersecond")
+
+    def test_must_not_replay_unknown_invocation(self):
+        recorder = InvocationRecorder(self.recordings_dir, REPLAY_MODE)
+        recorder.record(self.config, self.event, b"response")
+        self.config.full_path = "OtherFunction"
+
+        self.assertIsNone(recorder.get(self.config, self.event))
+
+    def test_must_ignore_volatile_event_fields(self):
+        recorder = InvocationRecorder(self.recordings_dir, REPLAY_MODE)
+        recorder.record(self.config, self.event, b"response")
+        event = json.loads(self.event)
+        event["requestContext"].update({"requestId": "2", "requestTimeEpoch": 2})
+        other_stage_event = json.loads(self.event)
+        other_stage_event["requestContext"]["stage"] = "Dev"
+
+        self.assertEqual(recorder.get(self.config, json.dumps(event)), b"response")
+        self.assertIsNone(recorder.get(self.config, json.dumps(other_stage_event)))
+
+    def test_must_match_configured_event_fields(self):
+        recorder = InvocationRecorder(self.recordings_dir, REPLAY_MODE, match_keys=["httpMethod", "path"])
+        recorder.record(self.config, self.event, b"response")
+        other_stage_event = json.loads(self.event)
+        other_stage_event["requestContext"]["stage"] = "Dev"
+        other_path_event = json.loads(self.event)
+        other_path_event["path"] = "/orders"
+
+        self.assertEqual(recorder.get(self.config, json.dumps(other_stage_event)), b"response")
+        self.assertIsNone(recorder.get(self.config, json.dumps(other_path_event)))
+
+    @patch("samcli.local.lambdafn.invocation_recorder._CODE_CHECK_INTERVAL", 0)
+    def test_must_not_replay_when_code_changed(self):
+        recorder = InvocationRecorder(self.recordings_dir, REPLAY_MODE)
+        recorder.record(self.config, self.event, b"response")
+
+        Path(self.code_dir, "app.py").write_text("def handler(event, context): return 1")
+
+        self.assertIsNone(recorder.get(self.config, self.event))
+
+    @patch("samcli.local.lambdafn.invocation_recorder._CODE_CHECK_INTERVAL", 0)
+    def test_must_hash_unchanged_code_once(self):
+        recorder = InvocationRecorder(self.recordings_dir, REPLAY_MODE)
+
+        with patch("samcli.local.lambdafn.invocation_recorder.dir_checksum", return_value="hash") as checksum_mock:
+            recorder.record(self.config, self.event, b"response")
+            self.assertEqual(recorder.get(self.config, self.event), b"response")
+
+        checksum_mock.assert_called_once()
+
+    def test_must_not_block_other_invocations_while_hashing_code(self):
+        recorder = InvocationRecorder(self.recordings_dir, REPLAY_MODE)
+        recorder.record(self.config, self.event, b"response")
+        other_config = FunctionConfig(
+            name="OtherFunction",
+            full_path="OtherFunction",
+            runtime="python3.9",
+            handler="app.handler",
+            imageuri="image",
+            imageconfig=None,
+            packagetype="Image",
+            code_abs_path=None,
+            layers=[],
+            architecture="x86_64",
+        )
+        recorder.record(other_config, self.event, b"other response")
+        # the code of the function changed, so it is hashed again
+        Path(self.code_dir, "app.py").write_text("def handler(event, context): return 1")
+        hashing = threading.Event()
+        hashed = threading.Event()
+
+        def slow_dir_checksum(*args, **kwargs):
+            hashing.set()
+            hashed.wait(5)
+            return "hash"
+
+        with patch("samcli.local.lambdafn.invocation_recorder._CODE_CHECK_INTERVAL", 0), patch(
+            "samcli.local.lambdafn.invocation_recorder.dir_checksum", side_effect=slow_dir_checksum
+        ):
+            thread = threading.Thread(target=recorder.get, args=(self.config, self.event))
+            thread.start()
+            self.assertTrue(hashing.wait(5))
+            try:
+                self.assertEqual(recorder.get(other_config, self.event), b"other response")
+                # replayed while the code of the first function was still hashed
+                self.assertTrue(thread.is_alive())
+            finally:
+                hashed.set()
+                thread.join(5)
+
+    def test_must_ignore_invalid_index_lines(self):
+        InvocationRecorder(self.recordings_dir, RECORD_MODE).record(self.config, self.event, b"response")
+        with open(os.path.join(self.recordings_dir, "invocations.index"), "a") as index_file:
+            index_file.write('{"key": \n')
+
+        self.assertEqual(InvocationRecorder(self.recordings_dir, REPLAY_MODE).get(self.config, self.event), b"response")
+
+
+class TestGetInvocationRecorder(TestCase):
+    @patch("samcli.local.lambdafn.invocation_recorder.INVOKE_RECORDING_MODE", None)
+    def test_must_not_record_by_default(self):
+        self.assertIsNone(get_invocation_recorder("/cwd"))
+
+    @patch("samcli.local.lambdafn.invocation_recorder.LOG")
+    @patch("samcli.local.lambdafn.invocation_recorder.INVOKE_RECORDING_MODE", "unknown")
+    def test_must_not_record_with_unknown_mode(self, log_mock):
+        self.assertIsNone(get_invocation_recorder("/cwd"))
+        log_mock.warning.assert_called_once()
+
+    @patch("samcli.local.lambdafn.invocation_recorder.INVOKE_REPLAY_MATCH_KEYS", "httpMethod, path")
+    @patch("samcli.local.lambdafn.invocation_recorder.INVOKE_RECORDINGS_DIR", "recordings")
+    @patch("samcli.local.lambdafn.invocation_recorder.INVOKE_RECORDING_MODE", "replay")
+    def test_must_return_configured_recorder(self):
+        recorder = get_invocation_recorder("/cwd")
+
+        self.assertEqual(recorder.mode, REPLAY_MODE)
+        self.assertEqual(recorder._recordings_dir, Path("/cwd", "recordings"))
+        self.assertEqual(recorder._match_keys, ["httpMethod", "path"])
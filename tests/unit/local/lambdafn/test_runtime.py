@@ -2,6 +2,9 @@
 Unit tests for Lambda runtime
 """
 
+import os
+import tempfile
+from pathlib import Path
 from unittest import TestCase
 from unittest.mock import Mock, patch, MagicMock, ANY, call
 from parameterized import parameterized
@@ -9,8 +12,16 @@ from parameterized import parameterized
 from samcli.lib.utils.packagetype import ZIP, IMAGE
 from samcli.lib.providers.provider import LayerVersion
 from samcli.local.lambdafn.env_vars import EnvironmentVariables
-from samcli.local.lambdafn.runtime import LambdaRuntime, _unzip_file, WarmLambdaRuntime, _require_container_reloading
+from samcli.local.lambdafn.runtime import LambdaRuntime, WarmLambdaRuntime, _require_container_reloading
 from samcli.local.lambdafn.config import FunctionConfig
+from samcli.local.lambdafn.container_pool import ContainerPool, ContainerPoolDrainedError
+
+
+def _container_pool(function_full_path, container):
+    container_pool = ContainerPool(function_full_path)
+    container_pool.checkout(lambda: container)
+    container_pool.checkin(container)
+    return container_pool
 
 
 class LambdaRuntime_create(TestCase):
@@ -212,6 +223,16 @@ class LambdaRuntime_run(TestCase):
         self.runtime.run(container, self.func_config, debug_context=debug_options)
         self.manager_mock.run.assert_called_with(container)
 
+    def test_must_unpause_paused_container_before_running_it(self):
+        container = Mock(is_paused=True)
+        container.is_running.return_value = True
+        self.runtime = LambdaRuntime(self.manager_mock, Mock())
+
+        self.runtime.run(container, self.func_config, debug_context=None)
+
+        self.manager_mock.unpause.assert_called_once_with(container)
+        self.manager_mock.run.assert_not_called()
+
     def test_must_create_container_first_if_passed_container_is_none(self):
         container = Mock()
         container.is_running.return_value = False
@@ -304,8 +325,6 @@ class LambdaRuntime_invoke(TestCase):
         self.runtime._get_code_dir = MagicMock()
         self.runtime._get_code_dir.return_value = code_dir
 
-        self.runtime._clean_decompressed_paths = MagicMock()
-
         # Configure interrupt handler
         self.runtime._configure_interrupt = Mock()
         self.runtime._configure_interrupt.return_value = start_timer
@@ -349,7 +368,67 @@ class LambdaRuntime_invoke(TestCase):
 
         # Finally block
         self.manager_mock.stop.assert_called_with(container)
-        self.runtime._clean_decompressed_paths.assert_called_with()
+
+    @patch("samcli.local.lambdafn.runtime.LambdaContainer")
+    def test_must_stop_containers_of_debugged_invocations_in_progress(self, LambdaContainerMock):
+        container = Mock()
+        container.is_running.return_value = False
+        LambdaContainerMock.return_value = container
+        self.runtime = LambdaRuntime(self.manager_mock, Mock())
+        self.runtime._get_code_dir = Mock(return_value="code dir")
+        self.runtime._configure_interrupt = Mock()
+
+        # the service is stopped with Ctrl+C while the debugged function is running
+        container.wait_for_result.side_effect = lambda **kwargs: self.runtime.stop_debugging_containers()
+
+        self.runtime.invoke(self.func_config, "event", debug_context=Mock())
+
+        self.assertEqual(self.manager_mock.stop.call_args_list, [call(container), call(container)])
+        self.manager_mock.stop.reset_mock()
+        self.runtime.stop_debugging_containers()
+        self.manager_mock.stop.assert_not_called()
+
+    @patch("samcli.local.lambdafn.runtime.invoke_timing")
+    @patch("samcli.local.lambdafn.runtime.LambdaContainer")
+    def test_must_track_invoke_timing(self, LambdaContainerMock, invoke_timing_mock):
+        self.runtime = LambdaRuntime(self.manager_mock, Mock())
+        self.runtime._get_code_dir = MagicMock()
+        self.runtime._configure_interrupt = Mock()
+        LambdaContainerMock.return_value.is_running.return_value = False
+
+        self.runtime.invoke(self.func_config, "event")
+
+        invoke_timing_mock.track_invoke.assert_called_once_with(self.full_path)
+        invoke_timing_mock.phase.assert_called_once_with("image_build")
+
+    @patch("samcli.local.lambdafn.runtime.LambdaContainer")
+    def test_must_release_decompressed_code_once_container_is_stopped(self, LambdaContainerMock):
+        decompression_cache_mock = Mock()
+        self.runtime = LambdaRuntime(self.manager_mock, Mock(), decompression_cache_mock)
+        self.runtime._get_code_dir = Mock(return_value="code dir")
+        self.runtime._unarchived_layer = Mock(side_effect=[LayerVersion("Layer", "layer dir"), "layer arn"])
+        self.runtime._configure_interrupt = Mock()
+        LambdaContainerMock.return_value.is_running.return_value = False
+        self.func_config.layers = [Mock(), Mock()]
+
+        self.runtime.invoke(self.func_config, "event")
+
+        self.manager_mock.stop.assert_called_once_with(LambdaContainerMock.return_value)
+        decompression_cache_mock.release.assert_called_once_with(["code dir", "layer dir"])
+        self.assertEqual(self.runtime._decompressed_paths, {})
+
+    @patch("samcli.local.lambdafn.runtime.LambdaContainer")
+    def test_must_release_decompressed_code_when_container_creation_fails(self, LambdaContainerMock):
+        decompression_cache_mock = Mock()
+        self.runtime = LambdaRuntime(self.manager_mock, Mock(), decompression_cache_mock)
+        self.runtime._get_code_dir = Mock(return_value="code dir")
+        self.manager_mock.create.side_effect = ValueError("some exception")
+
+        with self.assertRaises(ValueError):
+            self.runtime.invoke(self.func_config, "event")
+
+        decompression_cache_mock.release.assert_called_once_with(["code dir"])
+        self.assertEqual(self.runtime._decompressed_paths, {})
 
     @patch("samcli.local.lambdafn.runtime.LambdaContainer")
     def test_exception_from_run_must_trigger_cleanup(self, LambdaContainerMock):
@@ -486,6 +565,7 @@ class TestLambdaRuntime_configure_interrupt(TestCase):
     def test_must_setup_signal_handler(self, SignalMock, ThreadingMock):
         is_debugging = True  # We are debugging. So setup signal
         SignalMock.SIGTERM = sigterm = "sigterm"
+        ThreadingMock.main_thread.return_value = ThreadingMock.current_thread.return_value
 
         result = self.runtime._configure_interrupt(self.name, self.timeout, self.container, is_debugging)
 
@@ -494,6 +574,16 @@ class TestLambdaRuntime_configure_interrupt(TestCase):
         SignalMock.signal.assert_called_with(sigterm, ANY)
         ThreadingMock.Timer.signal.assert_not_called()  # must not setup timer
 
+    @patch("samcli.local.lambdafn.runtime.threading")
+    @patch("samcli.local.lambdafn.runtime.signal")
+    def test_must_not_setup_signal_handler_outside_main_thread(self, SignalMock, ThreadingMock):
+        is_debugging = True  # We are debugging, but from a thread of the local service
+
+        result = self.runtime._configure_interrupt(self.name, self.timeout, self.container, is_debugging)
+
+        self.assertIsNone(result)
+        SignalMock.signal.assert_not_called()
+
     @patch("samcli.local.lambdafn.runtime.threading")
     @patch("samcli.local.lambdafn.runtime.signal")
     def test_verify_signal_handler(self, SignalMock, ThreadingMock):
@@ -502,6 +592,7 @@ class TestLambdaRuntime_configure_interrupt(TestCase):
         """
         is_debugging = True  # We are debugging. So setup signal
         SignalMock.SIGTERM = "sigterm"
+        ThreadingMock.main_thread.return_value = ThreadingMock.current_thread.return_value
 
         # Fake the real method with a Lambda. Also run the handler immediately.
         SignalMock.signal = lambda term, handler: handler("a", "b")
@@ -533,33 +624,57 @@ class TestLambdaRuntime_configure_interrupt(TestCase):
         self.manager_mock.stop.assert_called_with(self.container)
 
 
+class TestLambdaRuntime_prepare_image(TestCase):
+    def setUp(self):
+        self.image_builder = Mock()
+        self.runtime = LambdaRuntime(Mock(), self.image_builder, Mock())
+        self.runtime._unarchived_layer = Mock(side_effect=lambda layer: f"unarchived-{layer}")
+        self.function_config = Mock(
+            runtime="python3.9", packagetype=ZIP, imageuri=None, layers=["layer"], architecture="arm64"
+        )
+        self.function_config.full_path = "Stack/Function"
+
+    def test_must_build_image_with_unarchived_layers(self):
+        self.assertEqual(self.runtime.prepare_image(self.function_config), self.image_builder.build.return_value)
+
+        self.image_builder.build.assert_called_once_with(
+            "python3.9", ZIP, None, ["unarchived-layer"], "arm64", function_name="Stack/Function"
+        )
+
+    def test_must_return_image_key(self):
+        self.assertEqual(
+            self.runtime.get_image_key(self.function_config), self.image_builder.get_image_key.return_value
+        )
+
+        self.image_builder.get_image_key.assert_called_once_with(
+            "python3.9", ZIP, None, ["layer"], "arm64", function_name="Stack/Function"
+        )
+
+
 class TestLambdaRuntime_get_code_dir(TestCase):
     def setUp(self):
         self.manager_mock = Mock()
         self.layer_downloader = Mock()
-        self.runtime = LambdaRuntime(self.manager_mock, self.layer_downloader)
+        self.decompression_cache_mock = Mock()
+        self.runtime = LambdaRuntime(self.manager_mock, self.layer_downloader, self.decompression_cache_mock)
 
     @parameterized.expand([(".zip"), (".ZIP"), (".JAR"), (".jar")])
     @patch("samcli.local.lambdafn.runtime.os")
-    @patch("samcli.local.lambdafn.runtime.shutil")
-    @patch("samcli.local.lambdafn.runtime._unzip_file")
-    def test_must_uncompress_zip_files(self, extension, unzip_file_mock, shutil_mock, os_mock):
+    def test_must_uncompress_zip_files(self, extension, os_mock):
         code_path = "foo" + extension
         decompressed_dir = "decompressed-dir"
 
-        unzip_file_mock.return_value = decompressed_dir
+        self.decompression_cache_mock.get_code_dir.return_value = decompressed_dir
         os_mock.path.isfile.return_value = True
 
         result = self.runtime._get_code_dir(code_path)
         self.assertEqual(result, decompressed_dir)
 
-        unzip_file_mock.assert_called_with(code_path)
+        self.decompression_cache_mock.get_code_dir.assert_called_with(code_path)
         os_mock.path.isfile.assert_called_with(code_path)
 
     @patch("samcli.local.lambdafn.runtime.os")
-    @patch("samcli.local.lambdafn.runtime.shutil")
-    @patch("samcli.local.lambdafn.runtime._unzip_file")
-    def test_must_return_a_valid_file(self, unzip_file_mock, shutil_mock, os_mock):
+    def test_must_return_a_valid_file(self, os_mock):
         """
         Input is a file that exists, but is not a zip/jar file
         """
@@ -571,11 +686,18 @@ class TestLambdaRuntime_get_code_dir(TestCase):
         # code path must be returned. No decompression
         self.assertEqual(result, code_path)
 
-        unzip_file_mock.assert_not_called()  # Unzip must not be called
+        self.decompression_cache_mock.get_code_dir.assert_not_called()  # Unzip must not be called
         os_mock.path.isfile.assert_called_with(code_path)
 
-        # Because we never unzipped anything, we should never delete
-        shutil_mock.rmtree.assert_not_called()
+    @patch("samcli.local.lambdafn.runtime.GlobalConfig")
+    @patch("samcli.local.lambdafn.runtime.DecompressionCache")
+    def test_must_default_to_decompression_cache_in_config_dir(self, DecompressionCacheMock, GlobalConfigMock):
+        GlobalConfigMock.return_value.config_dir = Path("config-dir")
+
+        runtime = LambdaRuntime(self.manager_mock, self.layer_downloader)
+
+        DecompressionCacheMock.assert_called_once_with(str(Path("config-dir", "decompressed-code")))
+        self.assertEqual(runtime._decompression_cache, DecompressionCacheMock.return_value)
 
 
 class TestLambdaRuntime_unarchived_layer(TestCase):
@@ -796,7 +918,7 @@ class TestWarmLambdaRuntime_create(TestCase):
 
         self.manager_mock.create.assert_called_with(container)
         # validate that the created container got cached
-        self.assertEqual(self.runtime._containers[self.full_path], container)
+        self.assertEqual(self.runtime._container_pools[self.full_path].containers, [container])
         lambda_function_observer_mock.watch.assert_called_with(self.func_config)
         lambda_function_observer_mock.start.assert_called_with()
 
@@ -818,6 +940,7 @@ class TestWarmLambdaRuntime_create(TestCase):
 
         LambdaContainerMock.side_effect = [container, container2]
         self.runtime.create(self.func_config, debug_context=debug_options)
+        self.runtime._on_invoke_done(container, self.func_config)
         result = self.runtime.create(self.func_config2, debug_context=debug_options)
 
         LambdaContainerMock.assert_has_calls(
@@ -862,7 +985,7 @@ class TestWarmLambdaRuntime_create(TestCase):
         self.manager_mock.create.assert_has_calls([call(container), call(container2)])
         self.manager_mock.stop.assert_called_with(container)
         # validate that the created container got cached
-        self.assertEqual(self.runtime._containers[self.full_path], container2)
+        self.assertEqual(self.runtime._container_pools[self.full_path].containers, [container2])
         self.assertEqual(result, container2)
 
     @patch("samcli.local.lambdafn.runtime.LambdaFunctionObserver")
@@ -882,6 +1005,7 @@ class TestWarmLambdaRuntime_create(TestCase):
 
         LambdaContainerMock.return_value = container
         self.runtime.create(self.func_config, debug_context=debug_options)
+        self.runtime._on_invoke_done(container, self.func_config)
         result = self.runtime.create(self.func_config, debug_context=debug_options)
 
         # validate that the manager.create method got called only one time
@@ -890,13 +1014,55 @@ class TestWarmLambdaRuntime_create(TestCase):
 
     @patch("samcli.local.lambdafn.runtime.LambdaFunctionObserver")
     @patch("samcli.local.lambdafn.runtime.LambdaContainer")
-    def test_must_ignore_debug_options_if_function_name_is_not_debug_function(
+    def test_must_create_new_container_if_cached_one_is_busy(self, LambdaContainerMock, LambdaFunctionObserverMock):
+        container = Mock()
+        container2 = Mock()
+        lambda_image_mock = Mock()
+        self.func_config.reserved_concurrent_executions = 2
+
+        self.runtime = WarmLambdaRuntime(self.manager_mock, lambda_image_mock)
+        self.runtime._get_code_dir = MagicMock()
+
+        LambdaContainerMock.side_effect = [container, container2]
+        result = self.runtime.create(self.func_config)
+        result2 = self.runtime.create(self.func_config)
+
+        self.assertEqual(result, container)
+        self.assertEqual(result2, container2)
+        self.manager_mock.create.assert_has_calls([call(container), call(container2)])
+        self.assertEqual(self.runtime._container_pools[self.full_path].max_size, 2)
+
+    @patch("samcli.local.lambdafn.runtime.LambdaFunctionObserver")
+    @patch("samcli.local.lambdafn.runtime.LambdaContainer")
+    def test_must_run_and_release_container_if_no_container_passed(
+        self, LambdaContainerMock, LambdaFunctionObserverMock
+    ):
+        container = Mock()
+        container.is_running.return_value = False
+        lambda_image_mock = Mock()
+
+        self.runtime = WarmLambdaRuntime(self.manager_mock, lambda_image_mock)
+        self.runtime._get_code_dir = MagicMock()
+
+        LambdaContainerMock.return_value = container
+        result = self.runtime.run(None, self.func_config, None)
+
+        self.assertEqual(result, container)
+        self.manager_mock.run.assert_called_with(container)
+        # container got released, so it can be reused by the next invoke without waiting
+        self.assertEqual(self.runtime.create(self.func_config), container)
+        self.manager_mock.create.assert_called_once_with(container)
+
+    @patch("samcli.local.lambdafn.runtime.LambdaFunctionObserver")
+    @patch("samcli.local.lambdafn.runtime.LambdaContainer")
+    def test_must_use_debug_options_of_debug_function_identified_by_full_path(
         self, LambdaContainerMock, LambdaFunctionObserverMock
     ):
         code_dir = "some code dir"
         container = Mock()
         debug_options = Mock()
-        debug_options.debug_function = "name2"
+        # the Lambda runner decides the function is debugged, whatever identifier the debug function is
+        debug_options.debug_function = "Stack/name"
         lambda_image_mock = Mock()
 
         self.runtime = WarmLambdaRuntime(self.manager_mock, lambda_image_mock)
@@ -920,7 +1086,7 @@ class TestWarmLambdaRuntime_create(TestCase):
             self.layers,
             lambda_image_mock,
             self.architecture,
-            debug_options=None,
+            debug_options=debug_options,
             env_vars=self.env_var_value,
             memory_mb=self.DEFAULT_MEMORY,
             container_host=None,
@@ -929,12 +1095,251 @@ class TestWarmLambdaRuntime_create(TestCase):
         )
         self.manager_mock.create.assert_called_with(container)
         # validate that the created container got cached
-        self.assertEqual(self.runtime._containers[self.full_path], container)
+        self.assertEqual(self.runtime._container_pools[self.full_path].containers, [container])
+
+    @patch("samcli.local.lambdafn.runtime.LambdaFunctionObserver")
+    @patch("samcli.local.lambdafn.runtime.LambdaContainer")
+    def test_must_keep_decompressed_code_until_cleaned(self, LambdaContainerMock, LambdaFunctionObserverMock):
+        decompression_cache_mock = Mock()
+        self.runtime = WarmLambdaRuntime(self.manager_mock, Mock())
+        self.runtime._decompression_cache = decompression_cache_mock
+        self.runtime._get_code_dir = Mock(return_value="code dir")
+
+        container = self.runtime.create(self.func_config)
+        self.runtime._on_invoke_done(container, self.func_config)
+
+        decompression_cache_mock.release.assert_not_called()
+        self.assertEqual(self.runtime._decompressed_paths, {})
+
+
+class TestWarmLambdaRuntime_get_max_concurrency(TestCase):
+    @patch("samcli.local.lambdafn.runtime.LambdaFunctionObserver")
+    def setUp(self, LambdaFunctionObserverMock):
+        self.runtime = WarmLambdaRuntime(Mock(), Mock(), max_concurrency=3)
+        self.func_config = Mock()
+
+    @parameterized.expand([(None, 3), (0, 3), (5, 5), ("7", 7), ("invalid", 3), ({"Ref": "Param"}, 3)])
+    def test_must_use_reserved_concurrency_or_default(self, reserved_concurrency, expected_max_concurrency):
+        self.func_config.reserved_concurrent_executions = reserved_concurrency
+        self.assertEqual(self.runtime._get_max_concurrency(self.func_config), expected_max_concurrency)
+
+    def test_must_limit_debugged_function_to_one_container(self):
+        self.func_config.reserved_concurrent_executions = 5
+        self.assertEqual(self.runtime._get_max_concurrency(self.func_config, Mock()), 1)
+
+    @parameterized.expand([("Stack/Function",), ("Function",)])
+    @patch("samcli.local.lambdafn.runtime.LambdaFunctionObserver")
+    def test_must_use_function_max_concurrency_over_reserved_concurrency(
+        self, function_key, LambdaFunctionObserverMock
+    ):
+        self.runtime = WarmLambdaRuntime(Mock(), Mock(), max_concurrency=3, function_max_concurrency={function_key: 8})
+        self.func_config.full_path = "Stack/Function"
+        self.func_config.name = "Function"
+        self.func_config.reserved_concurrent_executions = 5
+
+        self.assertEqual(self.runtime._get_max_concurrency(self.func_config), 8)
+        self.assertEqual(self.runtime._get_max_concurrency(self.func_config, Mock()), 1)
+
+    @patch("samcli.local.lambdafn.runtime.LambdaFunctionObserver")
+    def test_must_read_function_max_concurrency_from_env_var(self, LambdaFunctionObserverMock):
+        env_var_value = "Function=4, Stack/Other=2,Invalid=abc,Zero=0,=3,"
+        with patch.dict(os.environ, {"SAM_CLI_WARM_CONTAINERS_FUNCTION_MAX_CONCURRENCY": env_var_value}):
+            with self.assertLogs("samcli.local.lambdafn.runtime", "WARNING") as logs:
+                runtime = WarmLambdaRuntime(Mock(), Mock())
+
+        self.assertEqual(runtime._function_max_concurrency, {"Function": 4, "Stack/Other": 2})
+        self.assertEqual(len(logs.output), 3)
+
+
+class TestWarmLambdaRuntime_eviction(TestCase):
+    @patch("samcli.local.lambdafn.runtime.LambdaFunctionObserver")
+    def setUp(self, LambdaFunctionObserverMock):
+        self.manager_mock = Mock()
+        self.runtime = WarmLambdaRuntime(self.manager_mock, Mock(), idle_ttl=0)
+
+        self.old_container = Mock()
+        self.new_container = Mock()
+        self.busy_container = Mock()
+        self.pool1 = ContainerPool("func1", 2, 512)
+        self.pool2 = ContainerPool("func2", 2, 128)
+
+        with patch("samcli.local.lambdafn.container_pool.time") as time_mock:
+            time_mock.monotonic.return_value = 0
+            self.pool1.checkout(lambda: self.old_container)
+            self.pool2.checkout(lambda: self.busy_container)
+            self.pool2.checkout(lambda: self.new_container)
+            self.pool1.checkin(self.old_container)
+            time_mock.monotonic.return_value = 1
+            self.pool2.checkin(self.new_container)
+
+        self.runtime._container_pools = {"func1": self.pool1, "func2": self.pool2}
+
+    def test_must_not_evict_if_no_limits_configured(self):
+        self.runtime._evict_containers_over_limits()
+
+        self.manager_mock.stop.assert_not_called()
+
+    def test_must_evict_least_recently_used_container_over_max_resident_count(self):
+        self.runtime._max_resident_containers = 2
+
+        self.runtime._evict_containers_over_limits()
+
+        self.manager_mock.stop.assert_called_once_with(self.old_container)
+        self.assertEqual(self.pool1.containers, [])
+        self.assertEqual(self.runtime._eviction_counts, {"max resident containers": 1})
+
+    def test_must_evict_containers_until_memory_fits_budget(self):
+        self.runtime._memory_budget_mb = 200
+
+        self.runtime._evict_containers_over_limits()
+
+        # the busy container can not be evicted, so the budget stays exceeded
+        self.assertEqual(self.manager_mock.stop.call_args_list, [call(self.old_container), call(self.new_container)])
+        self.assertEqual(self.pool2.containers, [self.busy_container])
+        self.assertEqual(self.runtime._eviction_counts, {"memory budget": 2})
+
+    @patch("samcli.local.lambdafn.container_pool.time")
+    @patch("samcli.local.lambdafn.runtime.time")
+    def test_must_evict_expired_idle_containers(self, runtime_time_mock, pool_time_mock):
+        self.runtime._idle_ttl = 60
+        pool_time_mock.monotonic.return_value = 100
+        self.pool2.checkin(self.busy_container)
+        runtime_time_mock.monotonic.return_value = 120
+
+        self.runtime._evict_expired_containers()
+
+        # the old and the new containers were checked in at 0 and 1 seconds, the busy one at 100 seconds
+        self.assertCountEqual(
+            self.manager_mock.stop.call_args_list, [call(self.old_container), call(self.new_container)]
+        )
+        self.assertEqual(self.pool2.containers, [self.busy_container])
+        self.assertEqual(self.runtime._eviction_counts, {"idle TTL": 2})
+
+    @patch("samcli.local.lambdafn.container_pool.time")
+    @patch("samcli.local.lambdafn.runtime.time")
+    def test_must_pause_idle_containers(self, runtime_time_mock, pool_time_mock):
+        self.runtime._pause_after = 30
+        for container in (self.old_container, self.new_container, self.busy_container):
+            container.is_paused = False
+        pool_time_mock.monotonic.return_value = 100
+        self.pool2.checkin(self.busy_container)
+        runtime_time_mock.monotonic.return_value = 120
+
+        self.runtime._pause_idle_containers()
+
+        # the old and the new containers were checked in at 0 and 1 seconds, the busy one at 100 seconds
+        self.assertCountEqual(
+            self.manager_mock.pause.call_args_list, [call(self.old_container), call(self.new_container)]
+        )
+        self.assertEqual(self.runtime._pause_count, 2)
+        self.manager_mock.stop.assert_not_called()
+
+    def test_must_not_pause_paused_containers(self):
+        self.runtime._pause_after = 30
+        self.old_container.is_paused = True
+        self.new_container.is_paused = False
+        self.manager_mock.pause.side_effect = RuntimeError("container is gone")
+
+        self.runtime._pause_idle_containers()
+
+        self.manager_mock.pause.assert_called_once_with(self.new_container)
+        self.assertEqual(self.runtime._pause_count, 0)
+
+    def test_must_record_unpause_durations(self):
+        container = Mock(is_paused=True)
+        container.is_running.return_value = True
+
+        self.runtime.run(container, Mock(full_path="func1"), None)
+
+        self.manager_mock.unpause.assert_called_once_with(container)
+        self.assertEqual(len(self.runtime._unpause_durations), 1)
+
+    @patch("samcli.local.lambdafn.runtime.threading")
+    def test_must_start_idle_eviction_thread_if_pause_configured(self, threading_mock):
+        self.runtime._pause_after = 30
+
+        self.runtime._start_idle_eviction()
+
+        threading_mock.Thread.assert_called_once_with(target=ANY, daemon=True)
+
+    @patch("samcli.local.lambdafn.runtime.threading")
+    def test_must_start_idle_eviction_thread_only_if_ttl_configured(self, threading_mock):
+        self.runtime._start_idle_eviction()
+        threading_mock.Thread.assert_not_called()
+
+        self.runtime._idle_ttl = 60
+        self.runtime._start_idle_eviction()
+        self.runtime._start_idle_eviction()
+        threading_mock.Thread.assert_called_once_with(target=ANY, daemon=True)
+        threading_mock.Thread.return_value.start.assert_called_once_with()
+
+
+class TestWarmLambdaRuntime_drained_pools(TestCase):
+    @patch("samcli.local.lambdafn.runtime.LambdaFunctionObserver")
+    def setUp(self, LambdaFunctionObserverMock):
+        self.manager_mock = Mock()
+        self.runtime = WarmLambdaRuntime(self.manager_mock, Mock())
+        self.func_config = Mock(full_path="stack/func", memory=128, reserved_concurrent_executions=None, layers=[])
+
+    @patch.object(LambdaRuntime, "create")
+    def test_must_stop_container_created_while_its_pool_got_replaced(self, create_mock):
+        old_container = Mock()
+        new_container = Mock()
+
+        def create(*args):
+            if create_mock.call_count == 1:
+                # a code change replaces the pool while the container is being created
+                self.runtime._stop_container_pool(self.func_config.full_path)
+                return old_container
+            return new_container
+
+        create_mock.side_effect = create
+
+        container = self.runtime.create(self.func_config)
+
+        self.assertEqual(container, new_container)
+        self.manager_mock.stop.assert_called_once_with(old_container)
+        self.runtime._on_invoke_done(container, self.func_config)
+        self.assertEqual(
+            self.runtime._container_pools[self.func_config.full_path].idle_containers, [(new_container, ANY)]
+        )
+
+    @patch.object(LambdaRuntime, "create")
+    def test_must_stop_busy_container_whose_pool_got_replaced(self, create_mock):
+        old_container = Mock()
+        create_mock.return_value = old_container
+        container = self.runtime.create(self.func_config)
+
+        old_pool = self.runtime._container_pools.pop(self.func_config.full_path)
+        old_pool.drain()
+        self.runtime._container_pools[self.func_config.full_path] = ContainerPool(self.func_config.full_path)
+        self.runtime._on_invoke_done(container, self.func_config)
+
+        self.manager_mock.stop.assert_called_once_with(old_container)
+        self.assertEqual(self.runtime._container_pools[self.func_config.full_path].containers, [])
+        self.assertEqual(self.runtime._checked_out_pools, {})
+
+    @patch.object(LambdaRuntime, "create")
+    def test_must_fail_checkout_when_pools_are_drained_at_shutdown(self, create_mock):
+        container = Mock()
+
+        def create(*args):
+            for container_pool in self.runtime._container_pools.values():
+                container_pool.drain()
+            return container
+
+        create_mock.side_effect = create
+
+        with self.assertRaises(ContainerPoolDrainedError):
+            self.runtime.create(self.func_config)
+
+        self.manager_mock.stop.assert_called_once_with(container)
 
 
 class TestWarmLambdaRuntime_get_code_dir(TestCase):
     def setUp(self):
         self.manager_mock = Mock()
+        self.decompression_cache_mock = Mock()
 
     @patch("samcli.local.lambdafn.runtime.os")
     def test_must_return_same_path_if_path_is_not_compressed_file(self, os_mock):
@@ -943,23 +1348,22 @@ class TestWarmLambdaRuntime_get_code_dir(TestCase):
         code_path = "path"
 
         self.runtime = WarmLambdaRuntime(self.manager_mock, lambda_image_mock)
+        self.runtime._decompression_cache = self.decompression_cache_mock
         res = self.runtime._get_code_dir(code_path)
-        self.assertEqual(self.runtime._temp_uncompressed_paths_to_be_cleaned, [])
+        self.decompression_cache_mock.get_code_dir.assert_not_called()
         self.assertEqual(res, code_path)
 
-    @patch("samcli.local.lambdafn.runtime._unzip_file")
     @patch("samcli.local.lambdafn.runtime.os")
-    def test_must_cache_temp_uncompressed_dirs_to_be_cleared_later(self, os_mock, _unzip_file_mock):
+    def test_must_reuse_decompressed_dirs_from_cache(self, os_mock):
         lambda_image_mock = Mock()
         os_mock.path.isfile.return_value = True
-        uncompressed_dir_mock = Mock()
-        _unzip_file_mock.return_value = uncompressed_dir_mock
         code_path = "path.zip"
 
         self.runtime = WarmLambdaRuntime(self.manager_mock, lambda_image_mock)
+        self.runtime._decompression_cache = self.decompression_cache_mock
         res = self.runtime._get_code_dir(code_path)
-        self.assertEqual(self.runtime._temp_uncompressed_paths_to_be_cleaned, [uncompressed_dir_mock])
-        self.assertEqual(res, uncompressed_dir_mock)
+        self.decompression_cache_mock.get_code_dir.assert_called_once_with(code_path)
+        self.assertEqual(res, self.decompression_cache_mock.get_code_dir.return_value)
 
 
 class TestWarmLambdaRuntime_clean_warm_containers_related_resources(TestCase):
@@ -970,17 +1374,17 @@ class TestWarmLambdaRuntime_clean_warm_containers_related_resources(TestCase):
         self.observer_mock = Mock()
         self.func1_container_mock = Mock()
         self.func2_container_mock = Mock()
-        self.runtime._containers = {
-            "func_name1": self.func1_container_mock,
-            "func_name2": self.func2_container_mock,
+        self.runtime._container_pools = {
+            "func_name1": _container_pool("func_name1", self.func1_container_mock),
+            "func_name2": _container_pool("func_name2", self.func2_container_mock),
         }
         self.runtime._observer = self.observer_mock
         self.runtime._observer.is_alive.return_value = True
-        self.runtime._temp_uncompressed_paths_to_be_cleaned = ["path1", "path2"]
+        self.runtime._decompression_cache = Mock()
 
-    @patch("samcli.local.lambdafn.runtime.shutil")
-    def test_must_container_stopped_when_its_code_dir_got_changed(self, shutil_mock):
+    def test_must_container_stopped_when_its_code_dir_got_changed(self):
         self.runtime.clean_running_containers_and_related_resources()
+        self.runtime._decompression_cache.release.assert_called_once_with()
         self.assertEqual(
             self.runtime._container_manager.stop.call_args_list,
             [
@@ -988,13 +1392,6 @@ class TestWarmLambdaRuntime_clean_warm_containers_related_resources(TestCase):
                 call(self.func2_container_mock),
             ],
         )
-        self.assertEqual(
-            shutil_mock.rmtree.call_args_list,
-            [
-                call("path1"),
-                call("path2"),
-            ],
-        )
         self.runtime._observer.stop.assert_called_once_with()
 
 
@@ -1054,9 +1451,11 @@ class TestWarmLambdaRuntime_on_code_change(TestCase):
 
         self.func1_container_mock = Mock()
         self.func2_container_mock = Mock()
-        self.runtime._containers = {
-            self.func1_full_path: self.func1_container_mock,
-            self.func2_full_path: self.func2_container_mock,
+        self.func1_container_pool = _container_pool(self.func1_full_path, self.func1_container_mock)
+        self.func2_container_pool = _container_pool(self.func2_full_path, self.func2_container_mock)
+        self.runtime._container_pools = {
+            self.func1_full_path: self.func1_container_pool,
+            self.func2_full_path: self.func2_container_pool,
         }
 
     def test_only_one_container_get_stopped_when_its_code_dir_got_changed(self):
@@ -1064,9 +1463,9 @@ class TestWarmLambdaRuntime_on_code_change(TestCase):
 
         self.manager_mock.stop.assert_called_with(self.func1_container_mock)
         self.assertEqual(
-            self.runtime._containers,
+            self.runtime._container_pools,
             {
-                self.func2_full_path: self.func2_container_mock,
+                self.func2_full_path: self.func2_container_pool,
             },
         )
 
@@ -1082,7 +1481,7 @@ class TestWarmLambdaRuntime_on_code_change(TestCase):
                 call(self.func2_container_mock),
             ],
         )
-        self.assertEqual(self.runtime._containers, {})
+        self.assertEqual(self.runtime._container_pools, {})
 
         self.assertEqual(
             self.observer_mock.unwatch.call_args_list,
@@ -1093,46 +1492,116 @@ class TestWarmLambdaRuntime_on_code_change(TestCase):
         )
 
 
-class TestUnzipFile(TestCase):
-    @patch("samcli.local.lambdafn.runtime.tempfile")
-    @patch("samcli.local.lambdafn.runtime.unzip")
-    @patch("samcli.local.lambdafn.runtime.os")
-    def test_must_unzip_not_posix(self, os_mock, unzip_mock, tempfile_mock):
-        inputpath = "somepath"
-        tmpdir = "/tmp/dir"
-        realpath = "/foo/bar/tmp/dir/code.zip"
+class TestWarmLambdaRuntime_reload_code_in_place(TestCase):
+    def setUp(self):
+        self.manager_mock = Mock()
+        self.runtime = WarmLambdaRuntime(self.manager_mock, Mock())
+        self.runtime._observer = Mock()
+
+        self.code_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.code_dir.cleanup)
+        self.func_config = FunctionConfig(
+            "func_name",
+            "stack/func_name",
+            "python3.9",
+            "handler",
+            None,
+            None,
+            ZIP,
+            self.code_dir.name,
+            [],
+            "x86_64",
+        )
 
-        tempfile_mock.mkdtemp.return_value = tmpdir
-        os_mock.path.realpath.return_value = realpath
-        os_mock.name = "not-posix"
+        self.container_mocks = [Mock(), Mock()]
+        for container_mock in self.container_mocks:
+            container_mock.exec_run.return_value = 0
+        self.container_pool = ContainerPool(self.func_config.full_path, max_size=2)
+        for container_mock in self.container_mocks:
+            self.container_pool.checkout(lambda container=container_mock: container)
+        self.container_pool.checkin(self.container_mocks[0])
+        self.runtime._container_pools = {self.func_config.full_path: self.container_pool}
+        self.runtime._function_configs = {self.func_config.full_path: self.func_config}
+
+    def _assert_restarted(self):
+        self.assertEqual(self.runtime._container_pools, {})
+        self.assertEqual(self.runtime._function_configs, {})
+        self.runtime._observer.unwatch.assert_called_once_with(self.func_config)
+        self.assertIn(self.func_config.full_path, self.runtime._pending_restarts)
+
+    @parameterized.expand([("python3.9", "[/]var/runtime/bootstrap"), ("nodejs18.x", "[/]var/runtime/index")])
+    def test_must_reload_the_code_in_all_the_containers(self, runtime, pattern):
+        self.func_config.runtime = runtime
+
+        self.runtime._on_code_change([self.func_config])
+
+        for container_mock in self.container_mocks:
+            command = container_mock.exec_run.call_args[0][0]
+            self.assertEqual(command[:2], ["/bin/sh", "-c"])
+            self.assertIn(pattern, command[2])
+        self.manager_mock.stop.assert_not_called()
+        self.runtime._observer.unwatch.assert_not_called()
+        self.assertEqual(self.runtime._container_pools, {self.func_config.full_path: self.container_pool})
+        self.assertEqual(len(self.runtime._code_reload_durations["in place"]), 1)
 
-        output = _unzip_file(inputpath)
-        self.assertEqual(output, realpath)
+    def test_must_restart_the_containers_of_the_compiled_runtimes(self):
+        self.func_config.runtime = "java11"
 
-        tempfile_mock.mkdtemp.assert_called_with()
-        unzip_mock.assert_called_with(inputpath, tmpdir)  # unzip files to temporary directory
-        os_mock.path.realpath(tmpdir)  # Return the real path of temporary directory
-        os_mock.chmod.assert_not_called()  # Assert we do not chmod the temporary directory
+        self.runtime._on_code_change([self.func_config])
 
-    @patch("samcli.local.lambdafn.runtime.tempfile")
-    @patch("samcli.local.lambdafn.runtime.unzip")
-    @patch("samcli.local.lambdafn.runtime.os")
-    def test_must_unzip_posix(self, os_mock, unzip_mock, tempfile_mock):
-        inputpath = "somepath"
-        tmpdir = "/tmp/dir"
-        realpath = "/foo/bar/tmp/dir/code.zip"
-
-        tempfile_mock.mkdtemp.return_value = tmpdir
-        os_mock.path.realpath.return_value = realpath
-        os_mock.name = "posix"
-
-        output = _unzip_file(inputpath)
-        self.assertEqual(output, realpath)
-
-        tempfile_mock.mkdtemp.assert_called_with()
-        unzip_mock.assert_called_with(inputpath, tmpdir)  # unzip files to temporary directory
-        os_mock.path.realpath(tmpdir)  # Return the real path of temporary directory
-        os_mock.chmod.assert_called_with(tmpdir, 0o755)  # Assert we do chmod the temporary directory
+        for container_mock in self.container_mocks:
+            container_mock.exec_run.assert_not_called()
+            self.manager_mock.stop.assert_any_call(container_mock)
+        self._assert_restarted()
+
+    def test_must_restart_the_containers_of_the_archived_code(self):
+        self.func_config.code_abs_path = os.path.join(self.code_dir.name, "code.zip")
+
+        self.runtime._on_code_change([self.func_config])
+
+        self.container_mocks[0].exec_run.assert_not_called()
+        self._assert_restarted()
+
+    def test_must_restart_the_containers_of_the_functions_with_local_layers(self):
+        self.func_config.layers = [LayerVersion(arn="layer-arn", codeuri="layer-code-path")]
+
+        self.runtime._on_code_change([self.func_config])
+
+        self.container_mocks[0].exec_run.assert_not_called()
+        self._assert_restarted()
+
+    def test_must_restart_the_containers_of_the_debugged_function(self):
+        self.runtime._debugged_functions.add(self.func_config.full_path)
+
+        self.runtime._on_code_change([self.func_config])
+
+        self.container_mocks[0].exec_run.assert_not_called()
+        self._assert_restarted()
+
+    @parameterized.expand([(1, None), (0, RuntimeError("container is gone"))])
+    def test_must_restart_the_containers_when_the_reload_fails(self, exit_code, exception):
+        self.container_mocks[1].exec_run.return_value = exit_code
+        self.container_mocks[1].exec_run.side_effect = exception
+
+        self.runtime._on_code_change([self.func_config])
+
+        self._assert_restarted()
+        self.assertEqual(self.runtime._code_reload_durations["in place"], [])
+
+    def test_must_record_the_restart_duration_once_the_first_new_container_is_started(self):
+        self.func_config.runtime = "java11"
+        self.runtime._on_code_change([self.func_config])
+        container_mock = Mock()
+
+        with patch.object(LambdaRuntime, "create", return_value=container_mock), patch.object(
+            LambdaRuntime, "run", return_value=container_mock
+        ):
+            container = self.runtime.create(self.func_config)
+            self.runtime.run(container, self.func_config, None)
+            self.runtime.run(container, self.func_config, None)
+
+        self.assertEqual(self.runtime._pending_restarts, {})
+        self.assertEqual(len(self.runtime._code_reload_durations["restart"]), 1)
 
 
 class TestRequireContainerReloading(TestCase):
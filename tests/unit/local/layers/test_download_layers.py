@@ -1,4 +1,7 @@
 import os
+import tempfile
+import threading
+import time
 from unittest import TestCase
 from unittest.mock import Mock, call, patch
 
@@ -23,7 +26,7 @@ class TestDownloadLayers(TestCase):
 
     @patch("samcli.local.layers.layer_downloader.LayerDownloader.download")
     def test_download_all_without_force(self, download_patch):
-        download_patch.side_effect = ["/home/layer1", "/home/layer2"]
+        download_patch.side_effect = lambda layer, force: f"/home/{layer}"
 
         download_layers = LayerDownloader("/home", ".", Mock())
 
@@ -31,11 +34,33 @@ class TestDownloadLayers(TestCase):
 
         self.assertEqual(acutal_results, ["/home/layer1", "/home/layer2"])
 
-        download_patch.assert_has_calls([call("layer1", False), call("layer2", False)])
+        download_patch.assert_has_calls([call("layer1", False), call("layer2", False)], any_order=True)
+
+    @patch("samcli.local.layers.layer_downloader.LAYER_DOWNLOAD_MAX_WORKERS", 2)
+    @patch("samcli.local.layers.layer_downloader.LayerDownloader.download")
+    def test_download_all_in_parallel_and_keep_order(self, download_patch):
+        running = []
+        max_running = []
+
+        def download(layer, force):
+            running.append(layer)
+            max_running.append(len(running))
+            time.sleep(0.05 if layer == "layer1" else 0.01)
+            running.remove(layer)
+            return f"/home/{layer}"
+
+        download_patch.side_effect = download
+
+        download_layers = LayerDownloader("/home", ".", Mock())
+
+        acutal_results = download_layers.download_all(["layer1", "layer2", "layer3"])
+
+        self.assertEqual(acutal_results, ["/home/layer1", "/home/layer2", "/home/layer3"])
+        self.assertEqual(max(max_running), 2)
 
     @patch("samcli.local.layers.layer_downloader.LayerDownloader.download")
     def test_download_all_with_force(self, download_patch):
-        download_patch.side_effect = ["/home/layer1", "/home/layer2"]
+        download_patch.side_effect = lambda layer, force: f"/home/{layer}"
 
         download_layers = LayerDownloader("/home", ".", Mock())
 
@@ -43,7 +68,7 @@ class TestDownloadLayers(TestCase):
 
         self.assertEqual(acutal_results, ["/home/layer1", "/home/layer2"])
 
-        download_patch.assert_has_calls([call("layer1", True), call("layer2", True)])
+        download_patch.assert_has_calls([call("layer1", True), call("layer2", True)], any_order=True)
 
     @patch("samcli.local.layers.layer_downloader.LayerDownloader._create_cache")
     @patch("samcli.local.layers.layer_downloader.LayerDownloader._is_layer_cached")
@@ -91,14 +116,23 @@ class TestDownloadLayers(TestCase):
         create_cache_patch.assert_not_called()
         resolve_code_path_patch.assert_called_once_with(".", "codeuri")
 
+    @patch("samcli.local.layers.layer_downloader.os.replace")
+    @patch("samcli.local.layers.layer_downloader.uuid")
     @patch("samcli.local.layers.layer_downloader.unzip_from_uri")
     @patch("samcli.local.layers.layer_downloader.LayerDownloader._fetch_layer_uri")
     @patch("samcli.local.layers.layer_downloader.LayerDownloader._create_cache")
     @patch("samcli.local.layers.layer_downloader.LayerDownloader._is_layer_cached")
     def test_download_layer(
-        self, is_layer_cached_patch, create_cache_patch, fetch_layer_uri_patch, unzip_from_uri_patch
+        self,
+        is_layer_cached_patch,
+        create_cache_patch,
+        fetch_layer_uri_patch,
+        unzip_from_uri_patch,
+        uuid_patch,
+        replace_patch,
     ):
         is_layer_cached_patch.return_value = False
+        uuid_patch.uuid4.return_value.hex = "downloadid"
 
         download_layers = LayerDownloader("/home", ".", Mock())
 
@@ -118,10 +152,58 @@ class TestDownloadLayers(TestCase):
         fetch_layer_uri_patch.assert_called_once_with(layer_mock)
         unzip_from_uri_patch.assert_called_once_with(
             "layer/uri",
-            str(Path("/home/layer1.zip").resolve()),
-            unzip_output_dir=str(Path("/home/layer1").resolve()),
+            str(Path("/home/layer1.downloadid.tmp.zip").resolve()),
+            unzip_output_dir=str(Path("/home/layer1.downloadid.tmp").resolve()),
             progressbar_label="Downloading arn:layer:layer1",
         )
+        replace_patch.assert_called_once_with(
+            Path("/home/layer1.downloadid.tmp").resolve(), Path("/home/layer1").resolve()
+        )
+
+    @patch("samcli.local.layers.layer_downloader.unzip_from_uri")
+    @patch("samcli.local.layers.layer_downloader.LayerDownloader._fetch_layer_uri")
+    def test_download_layer_once_when_requested_concurrently(self, fetch_layer_uri_patch, unzip_from_uri_patch):
+        def unzip(uri, zip_path, unzip_output_dir, progressbar_label):
+            time.sleep(0.05)
+            Path(unzip_output_dir).mkdir()
+
+        unzip_from_uri_patch.side_effect = unzip
+
+        with tempfile.TemporaryDirectory() as layer_cache:
+            download_layers = LayerDownloader(layer_cache, ".", Mock())
+            layers = [Mock(is_defined_within_template=False) for _ in range(4)]
+            for layer in layers:
+                layer.name = "layer1"
+
+            # simulates functions initialized concurrently in EAGER mode, which all use the same layer
+            threads = [threading.Thread(target=download_layers.download_all, args=([layer], True)) for layer in layers]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            self.assertEqual(os.listdir(layer_cache), ["layer1"])
+
+        unzip_from_uri_patch.assert_called_once()
+
+    @patch("samcli.local.layers.layer_downloader.unzip_from_uri")
+    @patch("samcli.local.layers.layer_downloader.LayerDownloader._fetch_layer_uri")
+    def test_partially_extracted_layer_is_not_cached(self, fetch_layer_uri_patch, unzip_from_uri_patch):
+        def unzip(uri, zip_path, unzip_output_dir, progressbar_label):
+            Path(unzip_output_dir).mkdir()
+            raise OSError("No space left on device")
+
+        unzip_from_uri_patch.side_effect = unzip
+
+        with tempfile.TemporaryDirectory() as layer_cache:
+            download_layers = LayerDownloader(layer_cache, ".", Mock())
+            layer = Mock(is_defined_within_template=False)
+            layer.name = "layer1"
+
+            with self.assertRaises(OSError):
+                download_layers.download(layer)
+
+            self.assertEqual(os.listdir(layer_cache), [])
 
     def test_layer_is_cached(self):
         download_layers = LayerDownloader("/", ".", Mock())
@@ -1,3 +1,4 @@
+import io
 from unittest import TestCase
 from unittest.mock import Mock, patch
 
@@ -26,8 +27,8 @@ class TestLocalHostRunner(TestCase):
 
         app_run_mock.assert_called_once_with(threaded=True, host="127.0.0.1", port=3000)
 
-    def test_run_starts_service_singlethreaded(self):
-        is_debugging = True  # singlethreaded
+    def test_run_starts_service_multithreaded_when_debugging(self):
+        is_debugging = True  # the debugged invocations are serialized by the lambda runner
         service = BaseLocalService(is_debugging=is_debugging, port=3000, host="127.0.0.1")
 
         service._app = Mock()
@@ -36,7 +37,32 @@ class TestLocalHostRunner(TestCase):
 
         service.run()
 
-        app_run_mock.assert_called_once_with(threaded=False, host="127.0.0.1", port=3000)
+        app_run_mock.assert_called_once_with(threaded=True, host="127.0.0.1", port=3000)
+
+    @patch("samcli.local.services.base_local_service.ThreadPoolWSGIServer")
+    @patch("samcli.local.services.base_local_service.get_http_server_engine")
+    def test_run_starts_thread_pool_server(self, get_http_server_engine_mock, server_mock):
+        get_http_server_engine_mock.return_value = "thread-pool"
+        service = BaseLocalService(is_debugging=False, port=3000, host="127.0.0.1")
+        service._app = Mock()
+
+        service.run()
+
+        server_mock.assert_called_once_with("127.0.0.1", 3000, service._app)
+        server_mock.return_value.serve_forever.assert_called_once_with()
+        service._app.run.assert_not_called()
+
+    @patch("samcli.local.services.base_local_service.ThreadPoolWSGIServer")
+    @patch("samcli.local.services.base_local_service.get_http_server_engine")
+    def test_run_starts_thread_pool_server_when_debugging(self, get_http_server_engine_mock, server_mock):
+        get_http_server_engine_mock.return_value = "thread-pool"
+        service = BaseLocalService(is_debugging=True, port=3000, host="127.0.0.1")
+        service._app = Mock()
+
+        service.run()
+
+        server_mock.assert_called_once_with("127.0.0.1", 3000, service._app)
+        service._app.run.assert_not_called()
 
     @patch("samcli.local.services.base_local_service.Response")
     def test_service_response(self, flask_response_patch):
@@ -82,8 +108,7 @@ class TestLambdaOutputParser(TestCase):
         ]
     )
     def test_get_lambda_output_extracts_response(self, test_case_name, stdout_data, expected_response):
-        stdout = Mock()
-        stdout.getvalue.return_value = stdout_data
+        stdout = io.BytesIO(stdout_data)
 
         response, is_customer_error = LambdaOutputParser.get_lambda_output(stdout)
         self.assertEqual(response, expected_response)
@@ -0,0 +1,137 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+import requests
+from flask import Flask, request
+
+from samcli.local.services.http_server import ThreadPoolWSGIServer, get_http_server_engine
+
+
+class TestThreadPoolWSGIServer(TestCase):
+    def setUp(self):
+        self.app = Flask(__name__)
+        self.active_requests = 0
+        self.max_active_requests = 0
+        self.lock = threading.Lock()
+        self.release_requests = threading.Event()
+
+        @self.app.route("/")
+        def index():
+            with self.lock:
+                self.active_requests += 1
+                self.max_active_requests = max(self.max_active_requests, self.active_requests)
+            self.release_requests.wait(5)
+            with self.lock:
+                self.active_requests -= 1
+            return "hello"
+
+    def _start(self, **kwargs):
+        server = ThreadPoolWSGIServer("127.0.0.1", 0, self.app, **kwargs)
+        threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True).start()
+        self.addCleanup(server.shutdown)
+        return server, f"http://127.0.0.1:{server.port}/"
+
+    def test_must_limit_concurrent_requests_to_workers(self):
+        _, url = self._start(workers=2)
+
+        with ThreadPoolExecutor(max_workers=6) as executor:
+            responses = [executor.submit(requests.get, url, timeout=5) for _ in range(6)]
+            threading.Timer(0.2, self.release_requests.set).start()
+            bodies = [response.result().text for response in responses]
+
+        self.assertEqual(bodies, ["hello"] * 6)
+        self.assertEqual(self.max_active_requests, 2)
+
+    def test_must_keep_connections_alive(self):
+        self.release_requests.set()
+        server, url = self._start(workers=2, keep_alive=5)
+        server.process_request = Mock(wraps=server.process_request)
+
+        with requests.Session() as session:
+            responses = [session.get(url, timeout=5) for _ in range(3)]
+
+        self.assertEqual([response.text for response in responses], ["hello"] * 3)
+        server.process_request.assert_called_once()
+
+    def test_must_skip_request_body_not_read_by_application(self):
+        self.app.add_url_rule("/ignore-body", "ignore_body", lambda: "ignored", methods=["POST"])
+        _, url = self._start(workers=2, keep_alive=5)
+
+        with requests.Session() as session:
+            responses = [session.post(url + "ignore-body", data=b'{"key": "value"}', timeout=5) for _ in range(3)]
+
+        self.assertEqual([response.status_code for response in responses], [200] * 3)
+
+    def test_must_not_apply_keep_alive_timeout_to_slow_requests(self):
+        self.app.add_url_rule("/upload", "upload", lambda: str(len(request.get_data())), methods=["POST"])
+        _, url = self._start(workers=2, keep_alive=0.1)
+
+        def slow_body():
+            for _ in range(3):
+                time.sleep(0.3)
+                yield b"chunk"
+
+        with requests.Session() as session:
+            response = session.post(url + "upload", data=slow_body(), timeout=5)
+
+        self.assertEqual(response.text, str(3 * len(b"chunk")))
+
+    def test_must_close_connections_idle_for_keep_alive_timeout(self):
+        self.release_requests.set()
+        server, url = self._start(workers=2, keep_alive=0.1)
+        server.process_request = Mock(wraps=server.process_request)
+
+        with requests.Session() as session:
+            session.get(url, timeout=5)
+            time.sleep(0.3)
+            response = session.get(url, timeout=5)
+
+        self.assertEqual(response.text, "hello")
+        self.assertEqual(server.process_request.call_count, 2)
+
+    def test_must_close_idle_connections_when_workers_are_busy(self):
+        self.release_requests.set()
+        server, url = self._start(workers=1, keep_alive=60)
+
+        with requests.Session() as idle_session:
+            idle_session.get(url, timeout=5)
+            # the only worker waits for the next request of the idle session
+            response = requests.get(url, timeout=5)
+            idle_response = idle_session.get(url, timeout=5)
+
+        self.assertEqual(response.text, "hello")
+        self.assertEqual(idle_response.text, "hello")
+
+    def test_must_close_connections_without_keep_alive(self):
+        self.release_requests.set()
+        server, url = self._start(workers=2, keep_alive=0)
+        server.process_request = Mock(wraps=server.process_request)
+
+        with requests.Session() as session:
+            responses = [session.get(url, timeout=5) for _ in range(3)]
+
+        self.assertEqual([response.text for response in responses], ["hello"] * 3)
+        self.assertEqual(server.process_request.call_count, 3)
+
+    def test_must_listen_with_backlog(self):
+        server = ThreadPoolWSGIServer("127.0.0.1", 0, self.app, backlog=7)
+        self.addCleanup(server.server_close)
+
+        self.assertEqual(server.request_queue_size, 7)
+
+
+class TestGetHttpServerEngine(TestCase):
+    def test_must_return_given_engine(self):
+        self.assertEqual(get_http_server_engine("thread-pool"), "thread-pool")
+
+    @patch("samcli.local.services.http_server.HTTP_SERVER_ENGINE", "thread-pool")
+    def test_must_default_to_configured_engine(self):
+        self.assertEqual(get_http_server_engine(), "thread-pool")
+
+    @patch("samcli.local.services.http_server.LOG")
+    def test_must_fall_back_to_development_engine(self, log_mock):
+        self.assertEqual(get_http_server_engine("unknown"), "development")
+        log_mock.warning.assert_called_once()